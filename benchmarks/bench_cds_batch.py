@@ -0,0 +1,57 @@
+"""Benchmark for converting many raw CDS short timestamps into a time axis.
+
+The timestamps are converted one by one with :py:meth:`CdsShortTimestamp.as_date_time` and at
+once with :py:func:`spacepackets.ccsds.time.cds_short_to_datetime64`. Run it with
+
+    python benchmarks/bench_cds_batch.py --num-stamps 1000000
+
+Results with CPython 3.11 on x86_64 for the default arguments:
+
+==================  ==================
+Method              Stamps per second
+==================  ==================
+One by one          0.19 M
+Vectorized          10.6 M
+==================  ==================
+"""
+import argparse
+import random
+import time
+
+from spacepackets.ccsds.time import (
+    CdsShortTimestamp,
+    MS_PER_DAY,
+    cds_short_to_datetime64,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--num-stamps", type=int, default=1_000_000)
+    args = parser.parse_args()
+    rng = random.Random(0)
+    raw = b"".join(
+        CdsShortTimestamp(rng.randrange(24000, 25000), rng.randrange(MS_PER_DAY)).pack()
+        for _ in range(args.num_stamps)
+    )
+
+    def one_by_one():
+        return [
+            CdsShortTimestamp.unpack(raw[idx : idx + 7]).as_date_time()
+            for idx in range(0, len(raw), 7)
+        ]
+
+    methods = {
+        "One by one": one_by_one,
+        "Vectorized": lambda: cds_short_to_datetime64(raw),
+    }
+    print(f"{'Method':<16} {'Stamps per second':>20}")
+    for name, method in methods.items():
+        start = time.perf_counter()
+        method()
+        duration = time.perf_counter() - start
+        print(f"{name:<16} {args.num_stamps / duration / 1e6:>18.2f} M")
+
+
+if __name__ == "__main__":
+    main()
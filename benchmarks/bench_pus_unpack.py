@@ -0,0 +1,51 @@
+"""Unpack benchmark for PUS telemetry and telecommands.
+
+A ping reply with a CDS short timestamp and 16 bytes of source data and a telecommand with
+8 bytes of application data are unpacked repeatedly, and the best time per packet is printed.
+Run it with
+
+    python benchmarks/bench_pus_unpack.py --num 50000
+
+Results with CPython 3.11 on x86_64. The baseline is the release before the packed bytes cache
+was added. The first cache implementation tracked the changes of the header fields with a
+``__setattr__`` hook, which made every field write during unpacking a Python call. The headers
+now only track changes in their property setters, while the unpack methods write the fields
+directly and skip the validating constructors.
+
+==========================  ========  ==================  ================
+Operation                   Baseline  ``__setattr__``     Property setters
+==========================  ========  ==================  ================
+``PusTelemetry.unpack``     23.2 us   43.5 us             14.1 us
+``PusTelecommand.unpack``   10.6 us   28.1 us             3.3 us
+==========================  ========  ==================  ================
+"""
+import argparse
+import timeit
+
+from spacepackets.ccsds import CdsShortTimestamp
+from spacepackets.ecss import PusTelecommand, PusTelemetry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--num", type=int, default=50_000, help="Number of packets per repetition"
+    )
+    args = parser.parse_args()
+    tm_raw = PusTelemetry(
+        17, 2, CdsShortTimestamp(1, 2), apid=0x22, source_data=bytes(16)
+    ).pack()
+    time_reader = CdsShortTimestamp.empty()
+    tc_raw = PusTelecommand(17, 1, apid=0x22, app_data=bytes(8)).pack()
+    cases = {
+        "PusTelemetry.unpack": lambda: PusTelemetry.unpack(tm_raw, time_reader),
+        "PusTelecommand.unpack": lambda: PusTelecommand.unpack(tc_raw),
+    }
+    print(f"{'Operation':<24} {'Time per packet':>16}")
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=args.num, repeat=5))
+        print(f"{name:<24} {best / args.num * 1e6:>13.1f} us")
+
+
+if __name__ == "__main__":
+    main()
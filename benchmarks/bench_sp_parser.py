@@ -0,0 +1,101 @@
+"""Benchmark for space packet stream parsing on a corrupted capture.
+
+The generated capture consists of PUS telemetry packets which are interleaved with bursts of
+random garbage, which simulates link glitches. Run it with
+
+    python benchmarks/bench_sp_parser.py --size-mb 100
+"""
+import argparse
+import collections
+import random
+import time
+
+from spacepackets.ccsds import CdsShortTimestamp, PacketId, PacketType
+from spacepackets.ccsds.spacepacket import SpacePacketParser, parse_space_packets
+from spacepackets.ecss.tm import PusTelemetry
+
+CHUNK_SIZE = 4096
+
+
+def generate_capture(size: int, garbage_ratio: float, seed: int = 0):
+    rng = random.Random(seed)
+    packets = [
+        PusTelemetry(
+            service=3,
+            subservice=25,
+            apid=0x65,
+            seq_count=idx,
+            source_data=bytes(rng.getrandbits(8) for _ in range(rng.randint(8, 200))),
+            time_provider=CdsShortTimestamp.empty(),
+        ).pack()
+        for idx in range(64)
+    ]
+    capture = bytearray()
+    num_packets = 0
+    while len(capture) < size:
+        if rng.random() < garbage_ratio:
+            garbage_len = rng.randint(16, 4096)
+            capture.extend(
+                rng.getrandbits(garbage_len * 8).to_bytes(garbage_len, "big")
+            )
+        else:
+            capture.extend(packets[num_packets % len(packets)])
+            num_packets += 1
+    return capture, num_packets
+
+
+def bench_parse_space_packets(capture: bytes, packet_ids) -> int:
+    analysis_queue = collections.deque()
+    num_packets = 0
+    for idx in range(0, len(capture), CHUNK_SIZE):
+        analysis_queue.append(capture[idx : idx + CHUNK_SIZE])
+        num_packets += len(parse_space_packets(analysis_queue, packet_ids))
+    return num_packets
+
+
+def bench_parser(capture: bytes, packet_ids, check_crc: bool) -> int:
+    parser = SpacePacketParser(packet_ids, check_crc=check_crc)
+    num_packets = 0
+    capture_view = memoryview(capture)
+    for idx in range(0, len(capture), CHUNK_SIZE):
+        num_packets += len(parser.feed(capture_view[idx : idx + CHUNK_SIZE]))
+    return num_packets
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--size-mb", type=float, default=100.0)
+    arg_parser.add_argument(
+        "--garbage-ratio",
+        type=float,
+        default=0.05,
+        help="Probability that a garbage burst is inserted instead of a packet",
+    )
+    args = arg_parser.parse_args()
+    capture, num_generated = generate_capture(
+        int(args.size_mb * 1024 * 1024), args.garbage_ratio
+    )
+    packet_ids = (PacketId(ptype=PacketType.TM, sec_header_flag=True, apid=0x65),)
+    print(
+        f"Capture size: {len(capture) / 1024 / 1024:.1f} MB, "
+        f"{num_generated} valid packets"
+    )
+    for name, bench in (
+        ("parse_space_packets", lambda: bench_parse_space_packets(capture, packet_ids)),
+        ("SpacePacketParser", lambda: bench_parser(capture, packet_ids, False)),
+        (
+            "SpacePacketParser (CRC check)",
+            lambda: bench_parser(capture, packet_ids, True),
+        ),
+    ):
+        start = time.perf_counter()
+        num_packets = bench()
+        duration = time.perf_counter() - start
+        print(
+            f"{name:<32}: {duration:7.2f} s, {len(capture) / 1024 / 1024 / duration:7.1f} MB/s, "
+            f"{num_packets} packets"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,5 +9,7 @@ from .spacepacket import (
     AbstractSpacePacket,
     SPACE_PACKET_HEADER_SIZE,
     get_total_space_packet_len_from_len_field,
+    SpacePacketParser,
+    SpacePacketView,
 )
 from .time import *  # noqa: F403  # re-export
@@ -0,0 +1,161 @@
+"""asyncio support for reading space packets from byte streams, for example TCP connections."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Optional, Sequence
+
+from spacepackets.ccsds.spacepacket import (
+    SPACE_PACKET_HEADER_SIZE,
+    PacketId,
+    _compile_packet_id_matcher,
+)
+
+_EOF = object()
+# Number of bytes which are read at once while searching for the next valid packet ID.
+_RESYNC_CHUNK_SIZE = 4096
+
+
+class SpacePacketStreamReader:
+    """Reads complete space packets from an :py:class:`asyncio.StreamReader`.
+
+    The 6 byte primary header is read with :py:meth:`asyncio.StreamReader.readexactly` first,
+    followed by the packet data field with the length specified in the header. The reader can
+    be used as an asynchronous iterator, which stops when the stream is closed at a packet
+    boundary.
+
+    Optionally, a decoder can be supplied, for example to return PUS telemetry objects::
+
+        reader = SpacePacketStreamReader(
+            stream_reader,
+            decoder=lambda raw: PusTelemetry.unpack(raw, CdsShortTimestamp.empty()),
+            max_queued=64,
+        )
+        async for pus_tm in reader:
+            ...
+
+    If ``max_queued`` is larger than 0, a separate task reads the raw packets into a bounded
+    queue, and decoding happens when iterating. When the queue is full, the reading task stops
+    reading from the stream, which propagates backpressure to the transport.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        packet_ids: Optional[Sequence[PacketId]] = None,
+        decoder: Optional[Callable[[bytes], Any]] = None,
+        max_queued: int = 0,
+    ):
+        """Create a new stream reader.
+
+        :param reader: Stream to read from.
+        :param packet_ids: Optional valid packet IDs. If these are supplied, bytes which do not
+            start a space packet with one of these packet IDs are skipped. The skipped data is
+            read in chunks and searched for the next packet ID candidate.
+        :param decoder: Optional decoder which is applied to the raw packets when iterating.
+        :param max_queued: Maximum number of raw packets queued between the reading task and
+            the consumer. If this is 0, packets are read directly when iterating.
+        """
+        self.reader = reader
+        self.decoder = decoder
+        self.max_queued = max_queued
+        self._id_matcher = None
+        if packet_ids is not None:
+            self._id_matcher = _compile_packet_id_matcher(
+                packet_id.raw() for packet_id in packet_ids
+            )
+        # Data which was read from the stream while resynchronizing, but not consumed yet.
+        self._buf = bytearray()
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def read_packet(self) -> bytes:
+        """Read the next raw space packet.
+
+        :raises asyncio.IncompleteReadError: The stream was closed before a packet was complete.
+        """
+        header = await self._read_exactly(SPACE_PACKET_HEADER_SIZE)
+        if self._id_matcher is not None and self._id_matcher.match(header) is None:
+            header = await self._resync(header)
+        data = await self._read_exactly(((header[4] << 8) | header[5]) + 1)
+        return header + data
+
+    async def _read_exactly(self, size: int) -> bytes:
+        buf = self._buf
+        if not buf:
+            return await self.reader.readexactly(size)
+        if len(buf) < size:
+            try:
+                buf += await self.reader.readexactly(size - len(buf))
+            except asyncio.IncompleteReadError as e:
+                partial = bytes(buf) + e.partial
+                buf.clear()
+                raise asyncio.IncompleteReadError(partial, size)
+        data = bytes(buf[:size])
+        del buf[:size]
+        return data
+
+    async def _resync(self, header: bytes) -> bytes:
+        buf = self._buf
+        # The first byte of the header was checked already.
+        buf[0:0] = header[1:]
+        while True:
+            match = self._id_matcher.search(buf)
+            if match is not None:
+                del buf[: match.start()]
+                return await self._read_exactly(SPACE_PACKET_HEADER_SIZE)
+            # The last byte might be the first byte of a packet ID.
+            del buf[:-1]
+            chunk = await self.reader.read(_RESYNC_CHUNK_SIZE)
+            if not chunk:
+                partial = bytes(buf)
+                buf.clear()
+                raise asyncio.IncompleteReadError(partial, SPACE_PACKET_HEADER_SIZE)
+            buf += chunk
+
+    def __aiter__(self) -> SpacePacketStreamReader:
+        return self
+
+    async def __anext__(self) -> Any:
+        if self.max_queued > 0:
+            if self._task is None:
+                self._queue = asyncio.Queue(maxsize=self.max_queued)
+                self._task = asyncio.ensure_future(self._read_into_queue())
+            item = await self._queue.get()
+            if item is _EOF:
+                # Keep signalling the end for subsequent calls.
+                self._queue.put_nowait(_EOF)
+                raise StopAsyncIteration
+            if isinstance(item, BaseException):
+                raise item
+            raw = item
+        else:
+            try:
+                raw = await self.read_packet()
+            except asyncio.IncompleteReadError as e:
+                if e.partial:
+                    raise
+                raise StopAsyncIteration
+        if self.decoder is not None:
+            return self.decoder(raw)
+        return raw
+
+    async def close(self):
+        """Stop the reading task if one was started."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _read_into_queue(self):
+        try:
+            while True:
+                await self._queue.put(await self.read_packet())
+        except asyncio.IncompleteReadError as e:
+            if e.partial:
+                await self._queue.put(e)
+        except Exception as e:
+            await self._queue.put(e)
+        await self._queue.put(_EOF)
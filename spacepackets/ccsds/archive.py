@@ -0,0 +1,316 @@
+"""Indexed, memory-mapped reader for archives of raw space packets which are stored back to back,
+for example daily telemetry archives."""
+from __future__ import annotations
+
+import bisect
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from spacepackets.ccsds.spacepacket import SPACE_PACKET_HEADER_SIZE
+
+_INDEX_MAGIC = b"SPIX"
+_INDEX_VERSION = 3
+# Magic, version, indexed archive length, offset of the last indexed packet, CRC32 of the
+# checked archive data, number of APIDs
+_INDEX_HEADER = struct.Struct("!4sBxxxQQII")
+# Size of the first block of the archive which is included in the index CRC32
+_CHECK_BLOCK_SIZE = 4096
+# APID, number of packets
+_APID_BLOCK_HEADER = struct.Struct("!HI")
+
+
+class _ApidIndex:
+    def __init__(self):
+        self.offsets = array("Q")
+        self.seq_counts = array("H")
+        # Packet indexes sorted by sequence count. Built lazily for sequence count queries.
+        self._sorted_idxs: Optional[List[int]] = None
+        self._sorted_seq_counts: Optional[List[int]] = None
+
+    def append(self, offset: int, seq_count: int):
+        self.offsets.append(offset)
+        self.seq_counts.append(seq_count)
+        self._sorted_idxs = None
+
+    def idxs_in_seq_range(self, first: int, last: int) -> List[int]:
+        if self._sorted_idxs is None:
+            self._sorted_idxs = sorted(
+                range(len(self.seq_counts)), key=self.seq_counts.__getitem__
+            )
+            self._sorted_seq_counts = [self.seq_counts[i] for i in self._sorted_idxs]
+        start = bisect.bisect_left(self._sorted_seq_counts, first)
+        end = bisect.bisect_right(self._sorted_seq_counts, last)
+        return sorted(self._sorted_idxs[start:end])
+
+
+class SpacePacketArchive:
+    """Random access reader for a file which contains raw space packets stored back to back.
+
+    The archive is memory-mapped and an offset index is built in one pass. The index is keyed by
+    APID, and packets of an APID can be retrieved by their position or by their sequence count.
+    All packets are returned as read-only :py:class:`memoryview` slices of the memory mapping, so
+    no data is copied. These views need to be released before the archive is closed.
+
+    The index is persisted next to the archive in a compact binary sidecar file with the
+    :py:attr:`INDEX_SUFFIX` appended to the archive name. When the archive is re-opened, the
+    index is loaded from this file. If packets were appended to the archive in the meantime,
+    only the new packets are indexed. The index file stores a CRC32 of the first block of the
+    archive and of the last indexed packet, and the whole archive is indexed again if these were
+    modified, for example because the archive was replaced. Checking only these parts keeps
+    opening large archives cheap, so modifications in the middle of the indexed part are not
+    detected.
+
+    A trailing packet which is not complete yet is not indexed.
+    """
+
+    INDEX_SUFFIX = ".spidx"
+
+    def __init__(
+        self,
+        path: Union[str, os.PathLike],
+        index_path: Optional[Union[str, os.PathLike]] = None,
+        persist_index: bool = True,
+    ):
+        """Open an archive and load or build its index.
+
+        :param path: Path of the archive file.
+        :param index_path: Path of the index sidecar file. Defaults to the archive path with the
+            :py:attr:`INDEX_SUFFIX` appended.
+        :param persist_index: Store the index in the sidecar file after it was built or updated.
+        """
+        self.path = Path(path)
+        if index_path is None:
+            index_path = self.path.with_name(self.path.name + self.INDEX_SUFFIX)
+        self.index_path = Path(index_path)
+        self._file = open(self.path, "rb")
+        self._mmap: Optional[mmap.mmap] = None
+        self._view = memoryview(b"")
+        try:
+            self._size = os.fstat(self._file.fileno()).st_size
+            if self._size > 0:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._view = memoryview(self._mmap)
+            self._open_index(persist_index)
+        except BaseException:
+            self._view.release()
+            if self._mmap is not None:
+                self._mmap.close()
+            self._file.close()
+            raise
+
+    def _open_index(self, persist_index: bool):
+        self._index: Dict[int, _ApidIndex] = dict()
+        self._indexed_len = 0
+        self._last_offset = 0
+        self._num_packets = 0
+        index_updated = True
+        if self.index_path.exists() and self._load_index():
+            index_updated = self._indexed_len < self._size
+        else:
+            self._index.clear()
+            self._indexed_len = 0
+            self._last_offset = 0
+            self._num_packets = 0
+        self._build_index()
+        if persist_index and index_updated:
+            self._store_index()
+
+    def close(self):
+        """Close the archive.
+
+        :raises BufferError: Packet views returned by this archive are still alive.
+        """
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._file.close()
+
+    def __enter__(self) -> SpacePacketArchive:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            self.close()
+        except BufferError:
+            # Do not mask the original exception. Packet views might still be referenced by
+            # its traceback.
+            if exc_type is None:
+                raise
+
+    def __len__(self):
+        return self._num_packets
+
+    @property
+    def apids(self) -> List[int]:
+        """All APIDs contained in the archive."""
+        return sorted(self._index.keys())
+
+    def num_packets(self, apid: int) -> int:
+        apid_index = self._index.get(apid)
+        if apid_index is None:
+            return 0
+        return len(apid_index.offsets)
+
+    def packet(self, apid: int, n: int) -> memoryview:
+        """Retrieve the n-th packet of the given APID.
+
+        :raises KeyError: APID not contained in archive.
+        :raises IndexError: Less than n packets with the given APID in archive.
+        """
+        return self._packet_at(self._index[apid].offsets[n])
+
+    def packets(self, apid: int) -> Iterator[memoryview]:
+        """Iterate over all packets with the given APID in archive order."""
+        apid_index = self._index.get(apid)
+        if apid_index is None:
+            return
+        for offset in apid_index.offsets:
+            yield self._packet_at(offset)
+
+    def packets_in_seq_range(
+        self, apid: int, first_seq_count: int, last_seq_count: int
+    ) -> List[memoryview]:
+        """Retrieve all packets of an APID with a sequence count inside the given range,
+        in archive order.
+
+        :param apid:
+        :param first_seq_count: First sequence count of the range, inclusive.
+        :param last_seq_count: Last sequence count of the range, inclusive. If this is smaller
+            than the first sequence count, the range wraps around the maximum sequence count.
+        """
+        apid_index = self._index.get(apid)
+        if apid_index is None:
+            return []
+        if first_seq_count <= last_seq_count:
+            idxs = apid_index.idxs_in_seq_range(first_seq_count, last_seq_count)
+        else:
+            idxs = sorted(
+                apid_index.idxs_in_seq_range(first_seq_count, 0x3FFF)
+                + apid_index.idxs_in_seq_range(0, last_seq_count)
+            )
+        return [self._packet_at(apid_index.offsets[idx]) for idx in idxs]
+
+    def _packet_at(self, offset: int) -> memoryview:
+        view = self._view
+        packet_len = (
+            SPACE_PACKET_HEADER_SIZE + ((view[offset + 4] << 8) | view[offset + 5]) + 1
+        )
+        return view[offset : offset + packet_len]
+
+    def _build_index(self):
+        view = self._view
+        size = self._size
+        current_idx = self._indexed_len
+        last_offset = self._last_offset
+        index = self._index
+        num_packets = 0
+        while current_idx + SPACE_PACKET_HEADER_SIZE <= size:
+            next_idx = (
+                current_idx
+                + SPACE_PACKET_HEADER_SIZE
+                + ((view[current_idx + 4] << 8) | view[current_idx + 5])
+                + 1
+            )
+            if next_idx > size:
+                break
+            apid = ((view[current_idx] & 0b111) << 8) | view[current_idx + 1]
+            apid_index = index.get(apid)
+            if apid_index is None:
+                apid_index = _ApidIndex()
+                index[apid] = apid_index
+            apid_index.append(
+                current_idx,
+                ((view[current_idx + 2] & 0x3F) << 8) | view[current_idx + 3],
+            )
+            num_packets += 1
+            last_offset = current_idx
+            current_idx = next_idx
+        self._num_packets += num_packets
+        self._indexed_len = current_idx
+        self._last_offset = last_offset
+
+    def _load_index(self) -> bool:
+        raw = self.index_path.read_bytes()
+        if len(raw) < _INDEX_HEADER.size:
+            return False
+        (
+            magic,
+            version,
+            indexed_len,
+            last_offset,
+            crc,
+            num_apids,
+        ) = _INDEX_HEADER.unpack_from(raw)
+        if (
+            magic != _INDEX_MAGIC
+            or version != _INDEX_VERSION
+            or indexed_len > self._size
+            or last_offset > indexed_len
+            or self._check_crc(indexed_len, last_offset) != crc
+        ):
+            return False
+        current_idx = _INDEX_HEADER.size
+        try:
+            for _ in range(num_apids):
+                apid, num_packets = _APID_BLOCK_HEADER.unpack_from(raw, current_idx)
+                current_idx += _APID_BLOCK_HEADER.size
+                apid_index = _ApidIndex()
+                current_idx = _load_array(
+                    apid_index.offsets, raw, current_idx, num_packets
+                )
+                current_idx = _load_array(
+                    apid_index.seq_counts, raw, current_idx, num_packets
+                )
+                self._index[apid] = apid_index
+                self._num_packets += num_packets
+        except (struct.error, ValueError):
+            return False
+        self._indexed_len = indexed_len
+        self._last_offset = last_offset
+        return True
+
+    def _check_crc(self, indexed_len: int, last_offset: int) -> int:
+        """CRC32 of the first block of the archive and of the last indexed packet, which is
+        used to check whether a stored index belongs to the archive."""
+        crc = zlib.crc32(self._view[: min(indexed_len, _CHECK_BLOCK_SIZE)])
+        return zlib.crc32(self._view[last_offset:indexed_len], crc)
+
+    def _store_index(self):
+        with open(self.index_path, "wb") as index_file:
+            index_file.write(
+                _INDEX_HEADER.pack(
+                    _INDEX_MAGIC,
+                    _INDEX_VERSION,
+                    self._indexed_len,
+                    self._last_offset,
+                    self._check_crc(self._indexed_len, self._last_offset),
+                    len(self._index),
+                )
+            )
+            for apid, apid_index in self._index.items():
+                index_file.write(_APID_BLOCK_HEADER.pack(apid, len(apid_index.offsets)))
+                index_file.write(_array_to_be_bytes(apid_index.offsets))
+                index_file.write(_array_to_be_bytes(apid_index.seq_counts))
+
+
+def _array_to_be_bytes(values: array) -> bytes:
+    if sys.byteorder == "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _load_array(values: array, raw: bytes, start: int, num_items: int) -> int:
+    end = start + num_items * values.itemsize
+    if end > len(raw):
+        raise ValueError("index file too short")
+    values.frombytes(raw[start:end])
+    if sys.byteorder == "little":
+        values.byteswap()
+    return end
@@ -0,0 +1,103 @@
+"""Vectorized bulk decoding of space packet headers for captures which contain many space packets
+stored back to back.
+
+This module requires the optional `NumPy <https://numpy.org/>`_ dependency, which can be
+installed with ``pip install spacepackets[numpy]``.
+"""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+from spacepackets.ccsds.spacepacket import SPACE_PACKET_HEADER_SIZE
+
+if TYPE_CHECKING:
+    import numpy as np
+
+#: Field names and NumPy types of the structured array returned by :py:func:`decode_sp_headers`.
+SP_HEADER_FIELDS = (
+    ("offset", "u8"),
+    ("version", "u1"),
+    ("packet_type", "u1"),
+    ("sec_header_flag", "?"),
+    ("apid", "u2"),
+    ("seq_flags", "u1"),
+    ("seq_count", "u2"),
+    ("data_len", "u2"),
+)
+
+
+def find_space_packet_offsets(data: bytes, start: int = 0) -> np.ndarray:
+    """Walk a buffer of space packets stored back to back using the length fields of the
+    space packet headers.
+
+    A trailing packet which is not complete is ignored.
+
+    :param data: Any object supporting the buffer protocol.
+    :param start: Offset of the first space packet.
+    :return: Offsets of all complete space packets as a NumPy array.
+    """
+    import numpy as np
+
+    raw = memoryview(data).cast("B")
+    data_len = len(raw)
+    offsets = []
+    current_idx = start
+    while current_idx + SPACE_PACKET_HEADER_SIZE <= data_len:
+        next_idx = (
+            current_idx
+            + SPACE_PACKET_HEADER_SIZE
+            + ((raw[current_idx + 4] << 8) | raw[current_idx + 5])
+            + 1
+        )
+        if next_idx > data_len:
+            break
+        offsets.append(current_idx)
+        current_idx = next_idx
+    return np.array(offsets, dtype=np.uint64)
+
+
+def decode_sp_headers(data: bytes, offsets: Optional[np.ndarray] = None) -> np.ndarray:
+    """Decode the primary headers of all space packets inside a buffer at once.
+
+    The bit-field extraction is vectorized across all packets, no
+    :py:class:`spacepackets.ccsds.spacepacket.SpacePacketHeader` is created.
+
+    >>> from spacepackets.ccsds import SpacePacketHeader, PacketType
+    >>> capture = bytearray()
+    >>> for seq_count in range(3):
+    ...     sp_header = SpacePacketHeader(PacketType.TM, 0x65, seq_count, data_len=1)
+    ...     capture.extend(sp_header.pack() + bytes(2))
+    >>> headers = decode_sp_headers(capture)
+    >>> headers["offset"].tolist()
+    [0, 8, 16]
+    >>> headers["seq_count"].tolist()
+    [0, 1, 2]
+    >>> [hex(apid) for apid in headers["apid"]]
+    ['0x65', '0x65', '0x65']
+
+    :param data: Any object supporting the buffer protocol.
+    :param offsets: Offsets of the space packets. If this is not supplied, they are determined
+        with :py:func:`find_space_packet_offsets`.
+    :return: Structured NumPy array with the fields specified in :py:data:`SP_HEADER_FIELDS`.
+    """
+    import numpy as np
+
+    if offsets is None:
+        offsets = find_space_packet_offsets(data)
+    offsets = np.asarray(offsets, dtype=np.uint64)
+    buf = np.frombuffer(data, dtype=np.uint8)
+    if len(offsets) > 0 and int(offsets.max()) + SPACE_PACKET_HEADER_SIZE > len(buf):
+        raise ValueError("space packet offset exceeds the buffer")
+    idx = offsets.astype(np.intp)
+    packet_id = (buf[idx].astype(np.uint16) << 8) | buf[idx + 1]
+    psc = (buf[idx + 2].astype(np.uint16) << 8) | buf[idx + 3]
+    headers = np.empty(len(idx), dtype=list(SP_HEADER_FIELDS))
+    headers["offset"] = offsets
+    headers["version"] = packet_id >> 13
+    headers["packet_type"] = (packet_id >> 12) & 0b1
+    headers["sec_header_flag"] = (packet_id >> 11) & 0b1
+    headers["apid"] = packet_id & 0x7FF
+    headers["seq_flags"] = psc >> 14
+    headers["seq_count"] = psc & 0x3FFF
+    headers["data_len"] = (buf[idx + 4].astype(np.uint16) << 8) | buf[idx + 5]
+    return headers
@@ -0,0 +1,224 @@
+"""Reassembly of segmented user data which is transported in multiple space packets using
+the sequence flags of the space packet header."""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+from spacepackets.ccsds.spacepacket import (
+    SPACE_PACKET_HEADER_SIZE,
+    SequenceFlags,
+    get_total_space_packet_len_from_len_field,
+)
+from spacepackets.exceptions import BytesTooShortError
+
+
+@dataclass
+class ReassemblyCounters:
+    #: Number of completely reassembled payloads.
+    completed: int = 0
+    #: Number of incomplete segment groups which were dropped because of missing segments,
+    #: timeouts or memory limits.
+    dropped_groups: int = 0
+    #: Number of segments which could not be assigned to a segment group.
+    dropped_segments: int = 0
+
+
+class _SegmentGroup:
+    def __init__(self, capacity: int, last_seq_count: int, start_time: float):
+        self.buf = bytearray(capacity)
+        self.size = 0
+        self.last_seq_count = last_seq_count
+        self.start_time = start_time
+
+
+class SegmentReassembler:
+    """Reassembles segmented user data per APID.
+
+    The first segment of a group starts a new group for its APID. Continuation segments and the
+    last segment are appended into a buffer which is preallocated and grown geometrically, so
+    reassembling a payload has a cost linear in its size. The complete payload is returned as a
+    :py:class:`memoryview` of that buffer. The buffer is handed over to the caller and not
+    re-used by the reassembler.
+
+    Incomplete groups are dropped if a segment is missing, which is detected using the sequence
+    count, if they exceed the configured size limits or if they time out. Timed out groups are
+    dropped whenever a segment is added, so no periodic call of :py:meth:`check_timeouts` is
+    required. Unsegmented packets are returned directly.
+
+    >>> reassembler = SegmentReassembler()
+    >>> reassembler.add_segment(0x65, SequenceFlags.FIRST_SEGMENT, 0, b"ab") is None
+    True
+    >>> reassembler.add_segment(0x65, SequenceFlags.CONTINUATION_SEGMENT, 1, b"cd") is None
+    True
+    >>> bytes(reassembler.add_segment(0x65, SequenceFlags.LAST_SEGMENT, 2, b"ef"))
+    b'abcdef'
+    """
+
+    def __init__(
+        self,
+        max_payload_size: int = 16 * 1024 * 1024,
+        max_total_size: Optional[int] = None,
+        timeout: Optional[float] = None,
+        initial_capacity: int = 4096,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Create a new reassembler.
+
+        :param max_payload_size: Maximum size of a reassembled payload. Groups exceeding this size
+            are dropped.
+        :param max_total_size: Optional maximum memory which may be allocated by all incomplete
+            groups. A group which would exceed this limit is dropped.
+        :param timeout: Optional timeout in seconds. Incomplete groups older than this are dropped
+            when the next segment is added or by :py:meth:`check_timeouts`.
+        :param initial_capacity: Initial buffer capacity allocated for a new group.
+        :param clock: Time source for the timeout handling.
+        """
+        self.max_payload_size = max_payload_size
+        self.max_total_size = max_total_size
+        self.timeout = timeout
+        self.initial_capacity = initial_capacity
+        self.counters = ReassemblyCounters()
+        self._clock = clock
+        # Groups are only inserted when they are created, so the dictionary is ordered by the
+        # start time and the oldest group is always the first one.
+        self._groups: Dict[int, _SegmentGroup] = dict()
+        self._allocated = 0
+
+    @property
+    def num_pending(self) -> int:
+        """Number of incomplete segment groups."""
+        return len(self._groups)
+
+    @property
+    def allocated_size(self) -> int:
+        """Memory allocated for all incomplete segment groups."""
+        return self._allocated
+
+    def add_packet(self, packet: bytes) -> Optional[memoryview]:
+        """Add a raw space packet. The packet data field is treated as the segment.
+
+        :raises BytesTooShortError: Packet is shorter than specified by its header.
+        :return: The complete payload if this packet completed a group or was unsegmented.
+        """
+        if len(packet) < SPACE_PACKET_HEADER_SIZE:
+            raise BytesTooShortError(SPACE_PACKET_HEADER_SIZE, len(packet))
+        packet_len = get_total_space_packet_len_from_len_field(
+            (packet[4] << 8) | packet[5]
+        )
+        if len(packet) < packet_len:
+            raise BytesTooShortError(packet_len, len(packet))
+        return self.add_segment(
+            apid=((packet[0] & 0b111) << 8) | packet[1],
+            seq_flags=SequenceFlags(packet[2] >> 6),
+            seq_count=((packet[2] & 0x3F) << 8) | packet[3],
+            data=memoryview(packet)[SPACE_PACKET_HEADER_SIZE:packet_len],
+        )
+
+    def add_segment(
+        self, apid: int, seq_flags: SequenceFlags, seq_count: int, data: bytes
+    ) -> Optional[memoryview]:
+        """Add a segment.
+
+        :return: The complete payload if this segment completed a group or was unsegmented.
+        """
+        now = None
+        if self.timeout is not None and self._groups:
+            now = self._clock()
+            self._expire(now)
+        if seq_flags == SequenceFlags.UNSEGMENTED:
+            self._drop_group(apid)
+            self.counters.completed += 1
+            return memoryview(data)
+        if seq_flags == SequenceFlags.FIRST_SEGMENT:
+            self._drop_group(apid)
+            if len(data) > self.max_payload_size:
+                self.counters.dropped_segments += 1
+                return None
+            capacity = min(max(self.initial_capacity, len(data)), self.max_payload_size)
+            if (
+                self.max_total_size is not None
+                and self._allocated + capacity > self.max_total_size
+            ):
+                self.counters.dropped_segments += 1
+                return None
+            group = _SegmentGroup(
+                capacity, seq_count, self._clock() if now is None else now
+            )
+            self._groups.update({apid: group})
+            self._allocated += len(group.buf)
+            self._append(apid, group, data)
+            return None
+        group = self._groups.get(apid)
+        if group is None:
+            self.counters.dropped_segments += 1
+            return None
+        if seq_count != (group.last_seq_count + 1) % (1 << 14):
+            # Missing segment, the group can not be completed anymore.
+            self._drop_group(apid)
+            self.counters.dropped_segments += 1
+            return None
+        group.last_seq_count = seq_count
+        if not self._append(apid, group, data):
+            return None
+        if seq_flags == SequenceFlags.LAST_SEGMENT:
+            del self._groups[apid]
+            self._allocated -= len(group.buf)
+            self.counters.completed += 1
+            return memoryview(group.buf)[: group.size]
+        return None
+
+    def check_timeouts(self, now: Optional[float] = None) -> List[int]:
+        """Drop all groups which timed out.
+
+        :param now: Current time of the configured clock. Retrieved from the clock if not
+            specified.
+        :return: APIDs of the dropped groups.
+        """
+        if self.timeout is None:
+            return []
+        if now is None:
+            now = self._clock()
+        return self._expire(now)
+
+    def reset(self):
+        """Drop all incomplete groups without counting them as dropped."""
+        self._groups.clear()
+        self._allocated = 0
+
+    def _append(self, apid: int, group: _SegmentGroup, data: bytes) -> bool:
+        new_size = group.size + len(data)
+        if new_size > self.max_payload_size:
+            self._drop_group(apid)
+            return False
+        capacity = len(group.buf)
+        if new_size > capacity:
+            new_capacity = min(max(2 * capacity, new_size), self.max_payload_size)
+            if (
+                self.max_total_size is not None
+                and self._allocated + new_capacity - capacity > self.max_total_size
+            ):
+                self._drop_group(apid)
+                return False
+            group.buf.extend(bytes(new_capacity - capacity))
+            self._allocated += new_capacity - capacity
+        group.buf[group.size : new_size] = data
+        group.size = new_size
+        return True
+
+    def _expire(self, now: float) -> List[int]:
+        timed_out = []
+        for apid, group in self._groups.items():
+            if now - group.start_time <= self.timeout:
+                break
+            timed_out.append(apid)
+        for apid in timed_out:
+            self._drop_group(apid)
+        return timed_out
+
+    def _drop_group(self, apid: int):
+        group = self._groups.pop(apid, None)
+        if group is not None:
+            self._allocated -= len(group.buf)
+            self.counters.dropped_groups += 1
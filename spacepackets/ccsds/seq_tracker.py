@@ -0,0 +1,177 @@
+"""Sequence count tracking for space packet streams."""
+from __future__ import annotations
+
+import enum
+from array import array
+from typing import NamedTuple, Optional
+
+from spacepackets.ccsds.spacepacket import AbstractSpacePacket
+
+#: Number of distinct APIDs, which is determined by the 11 bit APID field.
+NUM_APIDS = 1 << 11
+#: Modulo of the 14 bit sequence count.
+SEQ_COUNT_MODULO = 1 << 14
+
+
+class SeqCountEventType(enum.IntEnum):
+    #: One or more packets are missing.
+    GAP = 0
+    #: The packet has the same sequence count as the previous packet.
+    DUPLICATE = 1
+    #: The packet is older than the previous packet.
+    REORDERED = 2
+
+
+class SeqCountEvent(NamedTuple):
+    event_type: SeqCountEventType
+    apid: int
+    #: Sequence count which was expected.
+    expected: int
+    #: Sequence count which was received.
+    received: int
+
+    @property
+    def num_missing(self) -> int:
+        """Number of missing packets for a :py:attr:`SeqCountEventType.GAP` event."""
+        if self.event_type != SeqCountEventType.GAP:
+            return 0
+        return (self.received - self.expected) % SEQ_COUNT_MODULO
+
+
+class SeqCountCounters(NamedTuple):
+    received: int
+    gaps: int
+    missing: int
+    duplicates: int
+    reordered: int
+
+
+class SeqCountTracker:
+    """Tracks the 14 bit sequence count of space packets per APID, taking the wrap-around into
+    account. Gaps, duplicates and reorderings are reported as :py:class:`SeqCountEvent`\\s and
+    running counters are kept for each APID.
+
+    All state is kept in flat arrays sized for all 2048 APIDs, so tracking a packet only
+    requires a few array lookups.
+
+    A received sequence count which is ahead of the expected one by less than the reorder
+    window is treated as a gap. All other unexpected sequence counts are treated as late packets
+    which arrived out of order, except for a repetition of the previous sequence count, which is
+    treated as a duplicate.
+
+    >>> tracker = SeqCountTracker()
+    >>> tracker.add(apid=0x65, seq_count=0x3FFF) is None
+    True
+    >>> tracker.add(apid=0x65, seq_count=0) is None
+    True
+    >>> event = tracker.add(apid=0x65, seq_count=3)
+    >>> event.event_type, event.num_missing
+    (<SeqCountEventType.GAP: 0>, 2)
+    >>> tracker.add(apid=0x65, seq_count=3).event_type
+    <SeqCountEventType.DUPLICATE: 1>
+    >>> tracker.counters(0x65)
+    SeqCountCounters(received=4, gaps=1, missing=2, duplicates=1, reordered=0)
+    """
+
+    def __init__(self, reorder_window: int = SEQ_COUNT_MODULO // 2):
+        """Create a new tracker.
+
+        :param reorder_window: Sequence counts which are behind the expected sequence count by
+            less than this value are treated as reordered packets. Defaults to half of the
+            sequence count range.
+        """
+        if reorder_window < 1 or reorder_window >= SEQ_COUNT_MODULO:
+            raise ValueError(f"invalid reorder window {reorder_window}")
+        self._gap_window = SEQ_COUNT_MODULO - reorder_window
+        self._init_state()
+
+    def _init_state(self):
+        # -1 indicates that no packet was received for the APID yet
+        self._last = array("l", [-1]) * NUM_APIDS
+        self._received = array("Q", [0]) * NUM_APIDS
+        self._gaps = array("Q", [0]) * NUM_APIDS
+        self._missing = array("Q", [0]) * NUM_APIDS
+        self._duplicates = array("Q", [0]) * NUM_APIDS
+        self._reordered = array("Q", [0]) * NUM_APIDS
+
+    def add(self, apid: int, seq_count: int) -> Optional[SeqCountEvent]:
+        """Track a received sequence count.
+
+        :return: An event if the sequence count was not the expected one, None otherwise.
+        """
+        self._received[apid] += 1
+        last = self._last[apid]
+        if last < 0:
+            self._last[apid] = seq_count
+            return None
+        expected = (last + 1) % SEQ_COUNT_MODULO
+        if seq_count == expected:
+            self._last[apid] = seq_count
+            return None
+        if seq_count == last:
+            self._duplicates[apid] += 1
+            return SeqCountEvent(SeqCountEventType.DUPLICATE, apid, expected, seq_count)
+        num_missing = (seq_count - expected) % SEQ_COUNT_MODULO
+        if num_missing < self._gap_window:
+            self._last[apid] = seq_count
+            self._gaps[apid] += 1
+            self._missing[apid] += num_missing
+            return SeqCountEvent(SeqCountEventType.GAP, apid, expected, seq_count)
+        self._reordered[apid] += 1
+        return SeqCountEvent(SeqCountEventType.REORDERED, apid, expected, seq_count)
+
+    def add_packet(self, packet: AbstractSpacePacket) -> Optional[SeqCountEvent]:
+        """Track the sequence count of a space packet, for example a
+        :py:class:`spacepackets.ccsds.spacepacket.SpacePacketHeader` or a
+        :py:class:`spacepackets.ccsds.spacepacket.SpacePacketView`."""
+        return self.add(packet.apid, packet.seq_count)
+
+    def add_raw(self, data: bytes, offset: int = 0) -> Optional[SeqCountEvent]:
+        """Track the sequence count of a raw space packet starting at the given offset. Only the
+        first four bytes of the packet are read."""
+        return self.add(
+            ((data[offset] & 0b111) << 8) | data[offset + 1],
+            ((data[offset + 2] & 0x3F) << 8) | data[offset + 3],
+        )
+
+    def last_seq_count(self, apid: int) -> Optional[int]:
+        """Last in-order sequence count received for the APID, or None if no packet was received
+        for it yet."""
+        last = self._last[apid]
+        if last < 0:
+            return None
+        return last
+
+    def counters(self, apid: int) -> SeqCountCounters:
+        return SeqCountCounters(
+            received=self._received[apid],
+            gaps=self._gaps[apid],
+            missing=self._missing[apid],
+            duplicates=self._duplicates[apid],
+            reordered=self._reordered[apid],
+        )
+
+    def total_counters(self) -> SeqCountCounters:
+        """Counters summed up over all APIDs."""
+        return SeqCountCounters(
+            received=sum(self._received),
+            gaps=sum(self._gaps),
+            missing=sum(self._missing),
+            duplicates=sum(self._duplicates),
+            reordered=sum(self._reordered),
+        )
+
+    def reset(self, apid: Optional[int] = None):
+        """Reset the state and the counters of one APID, or of all APIDs if None is passed."""
+        if apid is None:
+            self._init_state()
+            return
+        self._last[apid] = -1
+        for counter in (
+            self._received,
+            self._gaps,
+            self._missing,
+            self._duplicates,
+            self._reordered,
+        ):
+            counter[apid] = 0
@@ -4,17 +4,22 @@ from __future__ import annotations
 
 from abc import abstractmethod, ABC
 import enum
+import re
 import struct
 
-from typing import Tuple, Deque, List, Final, Optional, Sequence
+from typing import Tuple, Deque, List, Final, Optional, Sequence, Iterable, Pattern
 
+from spacepackets.crc import crc16_ccitt
 from spacepackets.exceptions import BytesTooShortError
+from spacepackets.util import GenerationTracked, tracked_field
 
 SPACE_PACKET_HEADER_SIZE: Final = 6
 SEQ_FLAG_MASK = 0xC000
 APID_MASK = 0x7FF
 PACKET_ID_MASK = 0x1FFF
 
+_SP_HEADER_STRUCT = struct.Struct("!HHH")
+
 
 class PacketType(enum.IntEnum):
     TM = 0
@@ -28,18 +33,28 @@ class SequenceFlags(enum.IntEnum):
     UNSEGMENTED = 0b11
 
 
-class PacketSeqCtrl:
+_PACKET_TYPES = tuple(PacketType)
+_SEQUENCE_FLAGS = tuple(SequenceFlags)
+
+
+class PacketSeqCtrl(GenerationTracked):
     """The packet sequence control is the third and fourth byte of the space packet header.
     It contains the sequence flags and the 14-bit sequence count.
     """
 
+    __slots__ = ("_seq_flags", "_seq_count")
+
+    seq_flags = tracked_field("_seq_flags")
+    seq_count = tracked_field("_seq_count")
+
     def __init__(self, seq_flags: SequenceFlags, seq_count: int):
         if seq_count > pow(2, 14) - 1 or seq_count < 0:
             raise ValueError(
                 f"Sequence count larger than allowed {pow(2, 14) - 1} or negative"
             )
-        self.seq_flags = seq_flags
-        self.seq_count = seq_count
+        self._seq_flags = seq_flags
+        self._seq_count = seq_count
+        self._generation = 0
 
     def __repr__(self):
         return (
@@ -61,7 +76,7 @@ class PacketSeqCtrl:
         return f"PSC: [Seq Flags: {seqstr}, Seq Count: {self.seq_count}]"
 
     def raw(self) -> int:
-        return self.seq_flags << 14 | self.seq_count
+        return self._seq_flags << 14 | self._seq_count
 
     @classmethod
     def empty(cls):
@@ -74,18 +89,25 @@ class PacketSeqCtrl:
         )
 
 
-class PacketId:
+class PacketId(GenerationTracked):
     """The packet ID forms the last thirteen bits of the first two bytes of the
     space packet header."""
 
+    __slots__ = ("_ptype", "_sec_header_flag", "_apid")
+
+    ptype = tracked_field("_ptype")
+    sec_header_flag = tracked_field("_sec_header_flag")
+    apid = tracked_field("_apid")
+
     def __init__(self, ptype: PacketType, sec_header_flag: bool, apid: int):
         if apid > pow(2, 11) - 1 or apid < 0:
             raise ValueError(
                 f"Invalid APID, exceeds maximum value {pow(2, 11) - 1} or negative"
             )
-        self.ptype = ptype
-        self.sec_header_flag = sec_header_flag
-        self.apid = apid
+        self._ptype = ptype
+        self._sec_header_flag = sec_header_flag
+        self._apid = apid
+        self._generation = 0
 
     @classmethod
     def empty(cls):
@@ -105,7 +127,7 @@ class PacketId:
         )
 
     def raw(self) -> int:
-        return self.ptype << 12 | self.sec_header_flag << 11 | self.apid
+        return self._ptype << 12 | self._sec_header_flag << 11 | self._apid
 
     @classmethod
     def from_raw(cls, raw: int) -> PacketId:
@@ -117,6 +139,8 @@ class PacketId:
 
 
 class AbstractSpacePacket(ABC):
+    __slots__ = ()
+
     @property
     @abstractmethod
     def apid(self) -> int:
@@ -131,11 +155,51 @@ class AbstractSpacePacket(ABC):
     def pack(self) -> bytearray:
         pass
 
+    def packed_len(self) -> int:
+        """Length of the packet when packed. The default implementation packs the packet,
+        so subclasses should override this if the length can be determined more efficiently.
+        """
+        return len(self.pack())
+
+    def pack_into(self, buf: bytearray, offset: int = 0) -> int:
+        """Pack the packet directly into a writable buffer, for example a
+        :py:class:`bytearray`, a :py:class:`memoryview` or a :py:class:`mmap.mmap`.
+
+        The default implementation packs the packet and copies it into the buffer, so subclasses
+        should override this if the packet can be written into the buffer directly.
+
+        :param buf: Writable buffer.
+        :param offset: Offset at which the packet is written.
+        :raises BytesTooShortError: Buffer too short for the packet.
+        :return: Number of bytes written.
+        """
+        packed = self.pack()
+        check_pack_buf_len(buf, offset, len(packed))
+        buf[offset : offset + len(packed)] = packed
+        return len(packed)
+
+
+def check_pack_buf_len(buf: bytearray, offset: int, packed_len: int):
+    """Check that a buffer has enough space to pack a packet with the given length at the given
+    offset.
 
-class SpacePacketHeader(AbstractSpacePacket):
+    :raises BytesTooShortError: Buffer too short.
+    """
+    if len(buf) - offset < packed_len:
+        raise BytesTooShortError(packed_len, len(buf) - offset)
+
+
+class SpacePacketHeader(AbstractSpacePacket, GenerationTracked):
     """This class encapsulates the space packet header.
     Packet reference: Blue Book CCSDS 133.0-B-2"""
 
+    __slots__ = ("_ccsds_version", "_packet_id", "_psc", "_data_len")
+
+    ccsds_version = tracked_field("_ccsds_version")
+    packet_id = tracked_field("_packet_id")
+    psc = tracked_field("_psc")
+    data_len = tracked_field("_data_len")
+
     def __init__(
         self,
         packet_type: PacketType,
@@ -179,12 +243,13 @@ class SpacePacketHeader(AbstractSpacePacket):
                 "Invalid data length value, exceeds maximum value of"
                 f" {pow(2, 16) - 1} or negative"
             )
-        self.ccsds_version = ccsds_version
-        self.packet_id = PacketId(
+        self._ccsds_version = ccsds_version
+        self._packet_id = PacketId(
             ptype=packet_type, sec_header_flag=sec_header_flag, apid=apid
         )
-        self.psc = PacketSeqCtrl(seq_flags=seq_flags, seq_count=seq_count)
-        self.data_len = data_len
+        self._psc = PacketSeqCtrl(seq_flags=seq_flags, seq_count=seq_count)
+        self._data_len = data_len
+        self._generation = 0
 
     @classmethod
     def from_composite_fields(
@@ -207,16 +272,32 @@ class SpacePacketHeader(AbstractSpacePacket):
     def pack(self) -> bytearray:
         """Serialize raw space packet header into a bytearray, using big endian for each
         2 octet field of the space packet header."""
-        header = bytearray()
-        packet_id_with_version = self.ccsds_version << 13 | self.packet_id.raw()
-        header.extend(struct.pack("!H", packet_id_with_version))
-        header.extend(struct.pack("!H", self.psc.raw()))
-        header.extend(struct.pack("!H", self.data_len))
+        header = bytearray(SPACE_PACKET_HEADER_SIZE)
+        self.pack_into(header)
         return header
 
+    def pack_into(self, buf: bytearray, offset: int = 0) -> int:
+        """Serialize the space packet header directly into a writable buffer.
+
+        :raises BytesTooShortError: Buffer too short.
+        :return: Number of bytes written.
+        """
+        check_pack_buf_len(buf, offset, SPACE_PACKET_HEADER_SIZE)
+        _SP_HEADER_STRUCT.pack_into(
+            buf,
+            offset,
+            self._ccsds_version << 13 | self._packet_id.raw(),
+            self._psc.raw(),
+            self._data_len,
+        )
+        return SPACE_PACKET_HEADER_SIZE
+
+    def packed_len(self) -> int:
+        return SPACE_PACKET_HEADER_SIZE
+
     @property
     def packet_type(self):
-        return self.packet_id.ptype
+        return self._packet_id._ptype
 
     @packet_type.setter
     def packet_type(self, packet_type):
@@ -224,11 +305,11 @@ class SpacePacketHeader(AbstractSpacePacket):
 
     @property
     def apid(self):
-        return self.packet_id.apid
+        return self._packet_id._apid
 
     @property
     def sec_header_flag(self):
-        return self.packet_id.sec_header_flag
+        return self._packet_id._sec_header_flag
 
     @sec_header_flag.setter
     def sec_header_flag(self, value):
@@ -236,7 +317,7 @@ class SpacePacketHeader(AbstractSpacePacket):
 
     @property
     def seq_count(self):
-        return self.psc.seq_count
+        return self._psc._seq_count
 
     @seq_count.setter
     def seq_count(self, seq_cnt):
@@ -244,7 +325,7 @@ class SpacePacketHeader(AbstractSpacePacket):
 
     @property
     def seq_flags(self):
-        return self.psc.seq_flags
+        return self._psc._seq_flags
 
     @seq_flags.setter
     def seq_flags(self, value):
@@ -264,7 +345,7 @@ class SpacePacketHeader(AbstractSpacePacket):
 
         :return: Size of the TM packet based on the space packet header data length field.
         """
-        return SPACE_PACKET_HEADER_SIZE + self.data_len + 1
+        return SPACE_PACKET_HEADER_SIZE + self._data_len + 1
 
     @classmethod
     def unpack(cls, data: bytes) -> SpacePacketHeader:
@@ -274,22 +355,24 @@ class SpacePacketHeader(AbstractSpacePacket):
         """
         if len(data) < SPACE_PACKET_HEADER_SIZE:
             raise BytesTooShortError(SPACE_PACKET_HEADER_SIZE, len(data))
-        packet_version = (data[0] >> 5) & 0b111
-        packet_type = PacketType((data[0] >> 4) & 0b1)
-        secondary_header_flag = (data[0] >> 3) & 0b1
-        apid = ((data[0] & 0b111) << 8) | data[1]
-        psc = struct.unpack("!H", data[2:4])[0]
-        sequence_flags = (psc & SEQ_FLAG_MASK) >> 14
-        ssc = psc & (~SEQ_FLAG_MASK)
-        return SpacePacketHeader(
-            packet_type=packet_type,
-            apid=apid,
-            sec_header_flag=bool(secondary_header_flag),
-            ccsds_version=packet_version,
-            data_len=struct.unpack("!H", data[4:6])[0],
-            seq_flags=SequenceFlags(sequence_flags),
-            seq_count=ssc,
-        )
+        first_word, psc_raw, data_len = _SP_HEADER_STRUCT.unpack_from(data)
+        # All fields of the raw header are in range, so the validating constructors are skipped.
+        packet_id = PacketId.__new__(PacketId)
+        packet_id._ptype = _PACKET_TYPES[(first_word >> 12) & 0b1]
+        packet_id._sec_header_flag = bool((first_word >> 11) & 0b1)
+        packet_id._apid = first_word & APID_MASK
+        packet_id._generation = 0
+        psc = PacketSeqCtrl.__new__(PacketSeqCtrl)
+        psc._seq_flags = _SEQUENCE_FLAGS[psc_raw >> 14]
+        psc._seq_count = psc_raw & ~SEQ_FLAG_MASK
+        psc._generation = 0
+        sp_header = SpacePacketHeader.__new__(SpacePacketHeader)
+        sp_header._ccsds_version = (first_word >> 13) & 0b111
+        sp_header._packet_id = packet_id
+        sp_header._psc = psc
+        sp_header._data_len = data_len
+        sp_header._generation = 0
+        return sp_header
 
     def __repr__(self):
         return (
@@ -329,21 +412,44 @@ class SpacePacket:
     def pack(self) -> bytearray:
         """Pack the raw byte representation of the space packet
         :raises ValueError: Mandatory fields were not supplied properly"""
-        packet = self.sp_header.pack()
+        packet = bytearray(self.packed_len())
+        self.pack_into(packet)
+        return packet
+
+    def pack_into(self, buf: bytearray, offset: int = 0) -> int:
+        """Pack the raw byte representation of the space packet directly into a writable buffer.
+
+        :raises ValueError: Mandatory fields were not supplied properly
+        :raises BytesTooShortError: Buffer too short.
+        :return: Number of bytes written.
+        """
         if self.sp_header.sec_header_flag:
             if self.sec_header is None:
                 raise ValueError(
                     "Secondary header flag is set but no secondary header was supplied"
                 )
-            packet.extend(self.sec_header)
         else:
             if self.user_data is None:
                 raise ValueError(
                     "Secondary header not present but no user data supplied"
                 )
+        packed_len = self.packed_len()
+        check_pack_buf_len(buf, offset, packed_len)
+        current_idx = offset + self.sp_header.pack_into(buf, offset)
+        if self.sp_header.sec_header_flag:
+            buf[current_idx : current_idx + len(self.sec_header)] = self.sec_header
+            current_idx += len(self.sec_header)
         if self.user_data is not None:
-            packet.extend(self.user_data)
-        return packet
+            buf[current_idx : current_idx + len(self.user_data)] = self.user_data
+        return packed_len
+
+    def packed_len(self) -> int:
+        packed_len = SPACE_PACKET_HEADER_SIZE
+        if self.sp_header.sec_header_flag and self.sec_header is not None:
+            packed_len += len(self.sec_header)
+        if self.user_data is not None:
+            packed_len += len(self.user_data)
+        return packed_len
 
     @property
     def apid(self):
@@ -365,6 +471,123 @@ class SpacePacket:
         )
 
 
+class SpacePacketView(AbstractSpacePacket):
+    """Read-only, zero-copy view on a raw space packet.
+
+    All header fields are decoded lazily from the raw bytes on access, and the packet data field
+    is exposed as a :py:class:`memoryview` without copying. This is useful if only a few fields
+    like the APID or the sequence count are required, for example for routing purposes.
+
+    >>> raw = bytes([0x08, 0x65, 0xc0, 0x02, 0x00, 0x01, 0xaa, 0xbb])
+    >>> view = SpacePacketView(raw)
+    >>> hex(view.apid)
+    '0x65'
+    >>> view.seq_count
+    2
+    >>> view.packet_type
+    <PacketType.TM: 0>
+    >>> view.user_data.hex(sep=",")
+    'aa,bb'
+    """
+
+    __slots__ = ("_raw",)
+
+    def __init__(self, data: bytes, offset: int = 0):
+        """Create a view on the space packet starting at the given offset.
+
+        :param data: Any object supporting the buffer protocol, for example :py:class:`bytes`,
+            :py:class:`bytearray`, :py:class:`memoryview` or :py:class:`mmap.mmap`.
+        :param offset: Start of the space packet inside the buffer.
+        :raises BytesTooShortError: The buffer is too short for the header or for the packet
+            length specified in the header.
+        """
+        raw = memoryview(data)
+        if raw.format != "B" or raw.ndim != 1:
+            raw = raw.cast("B")
+        if len(raw) - offset < SPACE_PACKET_HEADER_SIZE:
+            raise BytesTooShortError(SPACE_PACKET_HEADER_SIZE, len(raw) - offset)
+        packet_len = get_total_space_packet_len_from_len_field(
+            (raw[offset + 4] << 8) | raw[offset + 5]
+        )
+        if len(raw) - offset < packet_len:
+            raise BytesTooShortError(packet_len, len(raw) - offset)
+        self._raw = raw[offset : offset + packet_len].toreadonly()
+
+    @property
+    def raw(self) -> memoryview:
+        """The raw space packet."""
+        return self._raw
+
+    @property
+    def ccsds_version(self) -> int:
+        return (self._raw[0] >> 5) & 0b111
+
+    @property
+    def packet_type(self) -> PacketType:
+        return PacketType((self._raw[0] >> 4) & 0b1)
+
+    @property
+    def sec_header_flag(self) -> bool:
+        return bool((self._raw[0] >> 3) & 0b1)
+
+    @property
+    def apid(self) -> int:
+        return ((self._raw[0] & 0b111) << 8) | self._raw[1]
+
+    @property
+    def packet_id(self) -> PacketId:
+        return PacketId.from_raw((self._raw[0] << 8) | self._raw[1])
+
+    @property
+    def seq_flags(self) -> SequenceFlags:
+        return SequenceFlags((self._raw[2] >> 6) & 0b11)
+
+    @property
+    def seq_count(self) -> int:
+        return ((self._raw[2] & 0x3F) << 8) | self._raw[3]
+
+    @property
+    def psc(self) -> PacketSeqCtrl:
+        return PacketSeqCtrl.from_raw((self._raw[2] << 8) | self._raw[3])
+
+    @property
+    def data_len(self) -> int:
+        return (self._raw[4] << 8) | self._raw[5]
+
+    @property
+    def header_len(self) -> int:
+        return SPACE_PACKET_HEADER_SIZE
+
+    @property
+    def packet_len(self) -> int:
+        return len(self._raw)
+
+    @property
+    def user_data(self) -> memoryview:
+        """Packet data field following the primary header, including the secondary header
+        if one is present."""
+        return self._raw[SPACE_PACKET_HEADER_SIZE:]
+
+    @property
+    def sp_header(self) -> SpacePacketHeader:
+        """Fully decode the space packet header."""
+        return SpacePacketHeader.unpack(self._raw)
+
+    def pack(self) -> bytearray:
+        return bytearray(self._raw)
+
+    def pack_into(self, buf: bytearray, offset: int = 0) -> int:
+        check_pack_buf_len(buf, offset, len(self._raw))
+        buf[offset : offset + len(self._raw)] = self._raw
+        return len(self._raw)
+
+    def packed_len(self) -> int:
+        return len(self._raw)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({bytes(self._raw)!r})"
+
+
 def get_space_packet_id_bytes(
     packet_type: PacketType,
     secondary_header_flag: bool,
@@ -432,7 +655,7 @@ def parse_space_packets(
     :param packet_ids:
     :return:
     """
-    ids_raw = [packet_id.raw() for packet_id in packet_ids]
+    id_matcher = _compile_packet_id_matcher(packet_id.raw() for packet_id in packet_ids)
     tm_list = []
     concatenated_packets = bytearray()
     if not analysis_queue:
@@ -448,25 +671,44 @@ def parse_space_packets(
         # Can't even parse CCSDS header. Wait for more data to arrive.
         if current_idx + SPACE_PACKET_HEADER_SIZE >= len(concatenated_packets):
             break
-        current_packet_id = (
-            struct.unpack("!H", concatenated_packets[current_idx : current_idx + 2])[0]
-            & PACKET_ID_MASK
+        # Jump to the next packet ID candidate instead of advancing byte by byte
+        match = id_matcher.search(concatenated_packets, current_idx)
+        if match is None:
+            break
+        current_idx = match.start()
+        if current_idx + SPACE_PACKET_HEADER_SIZE >= len(concatenated_packets):
+            break
+        result, current_idx = __handle_packet_id_match(
+            concatenated_packets=concatenated_packets,
+            analysis_queue=analysis_queue,
+            current_idx=current_idx,
+            tm_list=tm_list,
         )
-        if current_packet_id in ids_raw:
-            result, current_idx = __handle_packet_id_match(
-                concatenated_packets=concatenated_packets,
-                analysis_queue=analysis_queue,
-                current_idx=current_idx,
-                tm_list=tm_list,
-            )
-            if result != 0:
-                break
-        else:
-            # Keep parsing until a packet ID is found
-            current_idx += 1
+        if result != 0:
+            break
     return tm_list
 
 
+def _compile_packet_id_matcher(ids_raw: Iterable[int]) -> Pattern[bytes]:
+    """Compile a regular expression which matches the first two bytes of space packets with
+    the given raw packet IDs. The version bits are ignored like in the rest of the parsing
+    code. Searching with this pattern allows jumping directly to the next packet header candidate
+    inside a stream."""
+    first_bytes_by_second_byte = dict()
+    for id_raw in ids_raw:
+        first_bytes = first_bytes_by_second_byte.setdefault(id_raw & 0xFF, set())
+        for version in range(8):
+            first_bytes.add((version << 5) | ((id_raw >> 8) & 0x1F))
+    if not first_bytes_by_second_byte:
+        # Never matches anything.
+        return re.compile(b"(?!)")
+    alternatives = []
+    for second_byte, first_bytes in sorted(first_bytes_by_second_byte.items()):
+        first_byte_class = b"".join(b"\\x%02x" % byte for byte in sorted(first_bytes))
+        alternatives.append(b"[%s]\\x%02x" % (first_byte_class, second_byte))
+    return re.compile(b"|".join(alternatives))
+
+
 def __handle_packet_id_match(
     concatenated_packets: bytearray,
     analysis_queue: Deque[bytearray],
@@ -488,3 +730,129 @@ def __handle_packet_id_match(
         )
         current_idx += total_packet_len
     return 0, current_idx
+
+
+class SpacePacketParser:
+    """Stateful space packet parser which can be fed with arbitrarily fragmented byte chunks,
+    for example from a serial or TCP link.
+
+    Unlike :py:func:`parse_space_packets`, the parser keeps one receive buffer and a read index
+    into it. Consumed data is only discarded from the front of the buffer and partial packets are
+    never copied back, so each received byte is only processed a bounded number of times,
+    independently of how the stream is fragmented.
+
+    Complete packets are returned as read-only :py:class:`memoryview` slices of the receive
+    buffer. The views stay valid after subsequent :py:meth:`feed` calls. If they are still alive
+    when new data arrives, the parser moves the unconsumed tail into a new buffer instead of
+    resizing the old one.
+
+    >>> from spacepackets.ccsds import PacketType
+    >>> sp_header = SpacePacketHeader(packet_type=PacketType.TM, apid=0x22, seq_count=0, data_len=1)
+    >>> raw = sp_header.pack() + bytes([1, 2])
+    >>> parser = SpacePacketParser([sp_header.packet_id])
+    >>> parser.feed(raw[:4])
+    []
+    >>> [bytes(packet).hex(sep=",") for packet in parser.feed(raw[4:])]
+    ['00,22,c0,00,00,01,01,02']
+    """
+
+    def __init__(
+        self,
+        packet_ids: Sequence[PacketId],
+        max_packet_len: Optional[int] = None,
+        check_crc: bool = False,
+    ):
+        """Create a new parser.
+
+        :param packet_ids: Valid packet IDs. Bytes which do not belong to a space packet starting
+            with one of these packet IDs are skipped.
+        :param max_packet_len: Optional maximum total packet length. Packet header candidates
+            with a larger length field are treated as garbage. This avoids waiting for a huge
+            amount of data after a false synchronization.
+        :param check_crc: If this is set, only candidates which end with a valid CRC16 checksum
+            as used by PUS packets are accepted. This drastically reduces false synchronizations
+            on corrupted streams, but should only be used if all packets are PUS packets.
+        """
+        self._id_matcher = _compile_packet_id_matcher(
+            packet_id.raw() for packet_id in packet_ids
+        )
+        self.max_packet_len = max_packet_len
+        self.check_crc = check_crc
+        self._buf = bytearray()
+        self._read_idx = 0
+
+    @property
+    def num_buffered(self) -> int:
+        """Number of received bytes which were not consumed by the parser yet."""
+        return len(self._buf) - self._read_idx
+
+    def reset(self):
+        """Drop all buffered data."""
+        self._buf = bytearray()
+        self._read_idx = 0
+
+    def feed(self, data: bytes) -> List[memoryview]:
+        """Feed a chunk of received data into the parser.
+
+        :param data: Received data
+        :return: List of all space packets which were completed by this chunk
+        """
+        self._append(data)
+        return self._parse()
+
+    def _append(self, data: bytes):
+        try:
+            if self._read_idx > 0:
+                # Deleting from the front of a bytearray is cheap, no re-allocation required.
+                del self._buf[: self._read_idx]
+                self._read_idx = 0
+            self._buf.extend(data)
+        except BufferError:
+            # Packet views returned previously are still alive, so the buffer can not be resized.
+            # Only the unconsumed tail needs to be moved to a new buffer.
+            new_buf = bytearray(self._buf[self._read_idx :])
+            new_buf.extend(data)
+            self._buf = new_buf
+            self._read_idx = 0
+
+    def _parse(self) -> List[memoryview]:
+        packets = []
+        buf = self._buf
+        buf_len = len(buf)
+        current_idx = self._read_idx
+        buf_view = None
+        while current_idx + SPACE_PACKET_HEADER_SIZE <= buf_len:
+            # Jump to the next packet ID candidate. The skipped bytes are discarded permanently.
+            match = self._id_matcher.search(buf, current_idx)
+            if match is None:
+                # Only the last byte might be the start of a packet ID.
+                current_idx = buf_len - 1
+                break
+            current_idx = match.start()
+            if current_idx + SPACE_PACKET_HEADER_SIZE > buf_len:
+                break
+            total_packet_len = get_total_space_packet_len_from_len_field(
+                (buf[current_idx + 4] << 8) | buf[current_idx + 5]
+            )
+            if (
+                self.max_packet_len is not None
+                and total_packet_len > self.max_packet_len
+            ):
+                current_idx += 1
+                continue
+            if current_idx + total_packet_len > buf_len:
+                # Wait for the rest of the packet.
+                break
+            if buf_view is None:
+                buf_view = memoryview(buf).toreadonly()
+            packet = buf_view[current_idx : current_idx + total_packet_len]
+            if self.check_crc and crc16_ccitt(packet) != 0:
+                packet.release()
+                current_idx += 1
+                continue
+            packets.append(packet)
+            current_idx += total_packet_len
+        self._read_idx = current_idx
+        if buf_view is not None:
+            buf_view.release()
+        return packets
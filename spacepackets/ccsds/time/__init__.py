@@ -1,3 +1,16 @@
 """This module contains the CCSDS specific time code implementations."""
 from .common import CcsdsTimeProvider, CcsdsTimeCodeId, SECONDS_PER_DAY, MS_PER_DAY
-from .cds import CdsShortTimestamp
+from .cds import (
+    CdsShortTimestamp,
+    CdsShortTime,
+    cds_short_to_datetime64,
+    cds_short_to_unix_ms,
+    cds_short_to_unix_seconds,
+)
+from .cuc import (
+    CucLayout,
+    CucTimestamp,
+    cuc_to_datetime64,
+    cuc_to_unix_seconds,
+)
+from .registry import TimeReaderRegistry
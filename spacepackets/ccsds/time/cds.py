@@ -4,12 +4,13 @@ import enum
 import math
 import struct
 import time
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, NamedTuple, Optional, Tuple, Union
 
 import deprecation
 
 from spacepackets.version import get_version
 from spacepackets.exceptions import BytesTooShortError
+from spacepackets.util import current_generation
 from spacepackets.ccsds.time.common import (
     CcsdsTimeProvider,
     convert_ccsds_days_to_unix_days,
@@ -19,6 +20,31 @@ from spacepackets.ccsds.time.common import (
     MS_PER_DAY,
 )
 
+if TYPE_CHECKING:
+    import numpy as np
+
+
+_CDS_SHORT_STRUCT = struct.Struct("!BHI")
+# Time code ID and length of days segment bits of the P-field.
+_CDS_SHORT_P_FIELD_MASK = 0b0111_0100
+_CDS_SHORT_P_FIELD = CcsdsTimeCodeId.CDS << 4
+
+
+def _cds_to_unix_seconds(ccsds_days: int, ms_of_day: int) -> float:
+    # The milliseconds of day are always added, also for days before the unix epoch.
+    return (
+        convert_ccsds_days_to_unix_days(ccsds_days) * SECONDS_PER_DAY
+        + ms_of_day / 1000.0
+    )
+
+
+def _unix_seconds_to_date_time(unix_seconds: float) -> datetime.datetime:
+    if unix_seconds < 0:
+        return datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc) + (
+            datetime.timedelta(seconds=unix_seconds)
+        )
+    return datetime.datetime.fromtimestamp(unix_seconds, tz=datetime.timezone.utc)
+
 
 class LenOfDaysSegment(enum.IntEnum):
     DAYS_16_BITS = 0
@@ -48,7 +74,9 @@ class CdsShortTimestamp(CcsdsTimeProvider):
     def __init__(
         self, ccsds_days: int, ms_of_day: int, init_dt_unix_stamp: bool = True
     ):
-        """Create a stamp from the contained values directly.
+        """Create a stamp from the contained values directly. The conversion to unix seconds
+        and to a :py:class:`datetime.datetime` is performed lazily on first access and cached,
+        so the ``init_dt_unix_stamp`` argument has no effect anymore.
 
         >>> zero_stamp = CdsShortTimestamp(ccsds_days=0, ms_of_day=0)
         >>> zero_stamp.ccsds_days
@@ -64,33 +92,15 @@ class CdsShortTimestamp(CcsdsTimeProvider):
         self.__p_field = bytes([CdsShortTimestamp.CDS_SHORT_ID << 4])
         # CCSDS recommends a 1958 Januar 1 epoch, which is different from the Unix epoch
         self._ccsds_days = ccsds_days
-        self._unix_seconds = 0
         self._ms_of_day = ms_of_day
-        if init_dt_unix_stamp:
-            self._setup()
-
-    def _setup(self):
-        self._calculate_unix_seconds()
-        self._calculate_date_time()
-
-    def _calculate_unix_seconds(self):
-        unix_days = convert_ccsds_days_to_unix_days(self._ccsds_days)
-        self._unix_seconds = unix_days * SECONDS_PER_DAY
-        seconds_of_day = self._ms_of_day / 1000.0
-        if self._unix_seconds < 0:
-            self._unix_seconds -= seconds_of_day
-        else:
-            self._unix_seconds += seconds_of_day
+        self._unix_seconds: Optional[float] = None
+        self._date_time: Optional[datetime.datetime] = None
+        self._invalidate_cache()
 
-    def _calculate_date_time(self):
-        if self._unix_seconds < 0:
-            self._date_time = datetime.datetime(
-                1970, 1, 1, tzinfo=datetime.timezone.utc
-            ) + datetime.timedelta(seconds=self._unix_seconds)
-        else:
-            self._date_time = datetime.datetime.fromtimestamp(
-                self._unix_seconds, tz=datetime.timezone.utc
-            )
+    def _invalidate_cache(self):
+        self._unix_seconds = None
+        self._date_time = None
+        self._generation = current_generation()
 
     @property
     def pfield(self) -> bytes:
@@ -109,12 +119,20 @@ class CdsShortTimestamp(CcsdsTimeProvider):
         return self._ms_of_day
 
     def pack(self) -> bytearray:
-        cds_packet = bytearray()
-        cds_packet.extend(self.__p_field)
-        cds_packet.extend(struct.pack("!H", self._ccsds_days))
-        cds_packet.extend(struct.pack("!I", self._ms_of_day))
+        cds_packet = bytearray(CdsShortTimestamp.TIMESTAMP_SIZE)
+        self.pack_into(cds_packet)
         return cds_packet
 
+    def pack_into(self, buf: bytearray, offset: int = 0) -> int:
+        if len(buf) - offset < CdsShortTimestamp.TIMESTAMP_SIZE:
+            raise BytesTooShortError(
+                CdsShortTimestamp.TIMESTAMP_SIZE, len(buf) - offset
+            )
+        _CDS_SHORT_STRUCT.pack_into(
+            buf, offset, self.__p_field[0], self._ccsds_days, self._ms_of_day
+        )
+        return CdsShortTimestamp.TIMESTAMP_SIZE
+
     @classmethod
     def from_unix_days(cls, unix_days: int, ms_of_day: int) -> CdsShortTimestamp:
         return cls(
@@ -142,7 +160,22 @@ class CdsShortTimestamp(CcsdsTimeProvider):
         :return:
         """
         (self._ccsds_days, self._ms_of_day) = CdsShortTimestamp.unpack_from_raw(data)
-        self._setup()
+        self._invalidate_cache()
+
+    def read_new(self, data: bytes) -> CdsShortTimestamp:
+        """Create a new timestamp from a raw CDS short timestamp without changing this instance.
+
+        >>> reader = CdsShortTimestamp.empty()
+        >>> reader.read_new(CdsShortTimestamp(1, 2).pack())
+        CdsShortTimestamp(ccsds_days=1, ms_of_day=2)
+        >>> reader.ccsds_days
+        0
+        """
+        stamp = self.__class__.__new__(self.__class__)
+        stamp.__p_field = self.__p_field
+        (stamp._ccsds_days, stamp._ms_of_day) = CdsShortTimestamp.unpack_from_raw(data)
+        stamp._invalidate_cache()
+        return stamp
 
     @staticmethod
     def unpack_from_raw(data: bytes) -> Tuple[int, int]:
@@ -158,8 +191,7 @@ class CdsShortTimestamp(CcsdsTimeProvider):
             raise ValueError(
                 f"invalid length of days field {len_of_day} for CDS short timestamp"
             )
-        ccsds_days = struct.unpack("!H", data[1:3])[0]
-        ms_of_day = struct.unpack("!I", data[3:7])[0]
+        _, ccsds_days, ms_of_day = _CDS_SHORT_STRUCT.unpack_from(data)
         return ccsds_days, ms_of_day
 
     def __repr__(self):
@@ -169,7 +201,7 @@ class CdsShortTimestamp(CcsdsTimeProvider):
         )
 
     def __str__(self):
-        return f"Date {self._date_time!r} with representation {self!r}"
+        return f"Date {self.as_date_time()!r} with representation {self!r}"
 
     def __eq__(self, other: CdsShortTimestamp):
         return (self.ccsds_days == other.ccsds_days) and (
@@ -196,7 +228,7 @@ class CdsShortTimestamp(CcsdsTimeProvider):
         self._ccsds_days += timedelta.days
         if self._ccsds_days > pow(2, 16) - 1:
             raise OverflowError("CCSDS days overflow")
-        self._setup()
+        self._invalidate_cache()
         return self
 
     @classmethod
@@ -220,7 +252,7 @@ class CdsShortTimestamp(CcsdsTimeProvider):
         instance._unix_seconds = dt.timestamp()
         full_unix_secs = int(math.floor(instance._unix_seconds))
         subsec_millis = int((instance._unix_seconds - full_unix_secs) * 1000)
-        unix_days = int(full_unix_secs / SECONDS_PER_DAY)
+        unix_days = full_unix_secs // SECONDS_PER_DAY
         secs_of_day = full_unix_secs % SECONDS_PER_DAY
         instance._ms_of_day = secs_of_day * 1000 + subsec_millis
         instance._ccsds_days = convert_unix_days_to_ccsds_days(unix_days)
@@ -236,7 +268,151 @@ class CdsShortTimestamp(CcsdsTimeProvider):
         )
 
     def as_unix_seconds(self) -> float:
+        if self._unix_seconds is None:
+            self._unix_seconds = _cds_to_unix_seconds(self._ccsds_days, self._ms_of_day)
         return self._unix_seconds
 
     def as_date_time(self) -> datetime.datetime:
+        if self._date_time is None:
+            self._date_time = _unix_seconds_to_date_time(self.as_unix_seconds())
         return self._date_time
+
+    def as_time_value(self) -> CdsShortTime:
+        """Return the immutable :py:class:`CdsShortTime` value of this timestamp."""
+        return CdsShortTime(self._ccsds_days, self._ms_of_day)
+
+
+class CdsShortTime(NamedTuple):
+    """Immutable and lightweight CDS short time value, which is a plain tuple of the CCSDS days
+    and the milliseconds of day.
+
+    Unpacking a value does not create any other objects, which makes it suitable to keep the
+    timestamps of many packets. The conversions to unix seconds and to a
+    :py:class:`datetime.datetime` are only performed on demand.
+
+    >>> value = CdsShortTime.unpack(bytes([0x40, 0x5f, 0x6e, 0x00, 0x00, 0x03, 0xe8]))
+    >>> value
+    CdsShortTime(ccsds_days=24430, ms_of_day=1000)
+    >>> value.as_date_time()
+    datetime.datetime(2024, 11, 20, 0, 0, 1, tzinfo=datetime.timezone.utc)
+    """
+
+    ccsds_days: int
+    ms_of_day: int
+
+    @classmethod
+    def unpack(cls, data: bytes, offset: int = 0) -> CdsShortTime:
+        """Unpack a raw CDS short timestamp including the P-field.
+
+        :raises BytesTooShortError: Data too short.
+        :raises ValueError: P-field does not describe a CDS short timestamp.
+        """
+        if len(data) - offset < CdsShortTimestamp.TIMESTAMP_SIZE:
+            raise BytesTooShortError(
+                CdsShortTimestamp.TIMESTAMP_SIZE, len(data) - offset
+            )
+        p_field, ccsds_days, ms_of_day = _CDS_SHORT_STRUCT.unpack_from(data, offset)
+        if p_field & _CDS_SHORT_P_FIELD_MASK != _CDS_SHORT_P_FIELD:
+            raise ValueError(f"invalid P-field {p_field:#04x} for CDS short timestamp")
+        return cls(ccsds_days, ms_of_day)
+
+    @property
+    def ms_since_epoch(self) -> int:
+        """Milliseconds since the CCSDS epoch, which can be used as a sort key."""
+        return self.ccsds_days * MS_PER_DAY + self.ms_of_day
+
+    def as_unix_seconds(self) -> float:
+        return _cds_to_unix_seconds(self.ccsds_days, self.ms_of_day)
+
+    def as_date_time(self) -> datetime.datetime:
+        return _unix_seconds_to_date_time(self.as_unix_seconds())
+
+    def to_timestamp(self) -> CdsShortTimestamp:
+        """Convert into a mutable :py:class:`CdsShortTimestamp`."""
+        return CdsShortTimestamp(self.ccsds_days, self.ms_of_day)
+
+
+def _unpack_cds_short_batch(
+    data: Union[bytes, np.ndarray], offsets: Optional[np.ndarray]
+) -> Tuple[np.ndarray, np.ndarray]:
+    import numpy as np
+
+    stamp_size = CdsShortTimestamp.TIMESTAMP_SIZE
+    if offsets is None:
+        if isinstance(data, np.ndarray):
+            raw = np.ascontiguousarray(data, dtype=np.uint8).reshape(-1)
+        else:
+            raw = np.frombuffer(data, dtype=np.uint8)
+        if len(raw) % stamp_size != 0:
+            raise ValueError(
+                f"buffer length {len(raw)} is not a multiple of the timestamp size "
+                f"{stamp_size}"
+            )
+        stamps = raw.reshape(-1, stamp_size)
+    else:
+        buf = np.frombuffer(data, dtype=np.uint8)
+        offsets = np.asarray(offsets, dtype=np.intp)
+        if len(offsets) > 0 and (
+            int(offsets.min()) < 0 or int(offsets.max()) + stamp_size > len(buf)
+        ):
+            raise ValueError("timestamp offset exceeds the buffer")
+        stamps = buf[offsets[:, np.newaxis] + np.arange(stamp_size)]
+    if np.any(stamps[:, 0] & _CDS_SHORT_P_FIELD_MASK != _CDS_SHORT_P_FIELD):
+        raise ValueError("invalid P-field for CDS short timestamp")
+    ccsds_days = (stamps[:, 1].astype(np.int64) << 8) | stamps[:, 2]
+    ms_of_day = (
+        (stamps[:, 3].astype(np.int64) << 24)
+        | (stamps[:, 4].astype(np.int64) << 16)
+        | (stamps[:, 5].astype(np.int64) << 8)
+        | stamps[:, 6]
+    )
+    return ccsds_days, ms_of_day
+
+
+def cds_short_to_unix_ms(
+    data: Union[bytes, np.ndarray], offsets: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Convert many raw CDS short timestamps including the P-field to milliseconds since the
+    unix epoch at once.
+
+    This requires the optional `NumPy <https://numpy.org/>`_ dependency.
+
+    :param data: Buffer or NumPy array which contains the raw timestamps back to back, or a
+        two-dimensional ``uint8`` array with one timestamp per row. If offsets are supplied,
+        this can be any buffer, for example a capture of PUS TM packets.
+    :param offsets: Optional offsets of the timestamps inside the buffer.
+    :raises ValueError: Invalid buffer length, offsets or P-fields.
+    :return: ``int64`` NumPy array.
+    """
+    ccsds_days, ms_of_day = _unpack_cds_short_batch(data, offsets)
+    return convert_ccsds_days_to_unix_days(ccsds_days) * MS_PER_DAY + ms_of_day
+
+
+def cds_short_to_unix_seconds(
+    data: Union[bytes, np.ndarray], offsets: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Convert many raw CDS short timestamps to unix seconds at once. The parameters are the
+    same as for :py:func:`cds_short_to_unix_ms`.
+
+    >>> stamps = CdsShortTimestamp(24430, 1500).pack() + CdsShortTimestamp(24431, 0).pack()
+    >>> cds_short_to_unix_seconds(stamps).tolist()
+    [1732060801.5, 1732147200.0]
+
+    :return: ``float64`` NumPy array.
+    """
+    return cds_short_to_unix_ms(data, offsets) / 1000.0
+
+
+def cds_short_to_datetime64(
+    data: Union[bytes, np.ndarray], offsets: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """Convert many raw CDS short timestamps to a ``datetime64[ms]`` NumPy array at once. The
+    parameters are the same as for :py:func:`cds_short_to_unix_ms`.
+
+    >>> stamps = CdsShortTimestamp(24430, 1500).pack() + CdsShortTimestamp(24431, 0).pack()
+    >>> cds_short_to_datetime64(stamps).astype(str).tolist()
+    ['2024-11-20T00:00:01.500', '2024-11-21T00:00:00.000']
+
+    :return: ``datetime64[ms]`` NumPy array.
+    """
+    return cds_short_to_unix_ms(data, offsets).astype("datetime64[ms]")
@@ -1,7 +1,10 @@
 from __future__ import annotations
+import copy
 import datetime
 import enum
 from abc import abstractmethod, ABC
+from typing import Optional
+from spacepackets.exceptions import BytesTooShortError
 from spacepackets.version import get_version
 
 import deprecation
@@ -52,6 +55,11 @@ def read_p_field(p_field: int) -> CcsdsTimeCodeId:
 
 
 class CcsdsTimeProvider(ABC):
+    #: Generation of the last change, see :py:class:`spacepackets.util.GenerationTracked`. Time
+    #: providers which do not track their changes keep None here, and the PUS TM classes compare
+    #: their packed timestamp instead.
+    _generation: Optional[int] = None
+
     @property
     @abstractmethod
     def pfield(self) -> bytes:
@@ -75,10 +83,33 @@ class CcsdsTimeProvider(ABC):
     def pack(self) -> bytearray:
         pass
 
+    def pack_into(self, buf: bytearray, offset: int = 0) -> int:
+        """Pack the timestamp directly into a writable buffer. The default implementation
+        copies the result of :py:meth:`pack` into the buffer.
+
+        :raises BytesTooShortError: Buffer too short.
+        :return: Number of bytes written.
+        """
+        packed = self.pack()
+        if len(buf) - offset < len(packed):
+            raise BytesTooShortError(len(packed), len(buf) - offset)
+        buf[offset : offset + len(packed)] = packed
+        return len(packed)
+
     @abstractmethod
     def read_from_raw(self, timestamp: bytes):
         pass
 
+    def read_new(self, timestamp: bytes) -> CcsdsTimeProvider:
+        """Create a new timestamp from a raw timestamp, using this instance as the time reader.
+        This instance is not changed, so it can be used to read multiple timestamps. The default
+        implementation copies this instance and updates the copy with :py:meth:`read_from_raw`,
+        so subclasses should override this if a timestamp can be created more efficiently.
+        """
+        stamp = copy.copy(self)
+        stamp.read_from_raw(timestamp)
+        return stamp
+
     @abstractmethod
     def as_unix_seconds(self) -> float:
         pass
@@ -0,0 +1,599 @@
+"""CCSDS Unsegmented Time Code (CUC) implementation, as specified in CCSDS 301.0-B-4 3.2."""
+from __future__ import annotations
+import datetime
+from typing import TYPE_CHECKING, Dict, Optional, Tuple, Union
+
+from spacepackets.exceptions import BytesTooShortError
+from spacepackets.util import current_generation, tracked_field
+from spacepackets.ccsds.time.common import (
+    CcsdsTimeProvider,
+    CcsdsTimeCodeId,
+    DAYS_CCSDS_TO_UNIX,
+    SECONDS_PER_DAY,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+#: CCSDS epoch 1958-01-01 00:00:00. Leap seconds are not taken into account by the conversions.
+CCSDS_EPOCH = datetime.datetime(1958, 1, 1, tzinfo=datetime.timezone.utc)
+_CCSDS_EPOCH_UNIX_SECONDS = DAYS_CCSDS_TO_UNIX * SECONDS_PER_DAY
+
+_EXTENSION_FLAG = 0x80
+_MAX_BASIC_COARSE_LEN = 4
+_MAX_BASIC_FINE_LEN = 3
+
+
+class CucLayout:
+    """Immutable layout of a CUC timestamp, which is fully described by its P-field.
+
+    All values required to decode a timestamp are computed once per layout, so a timestamp is
+    decoded with a single :py:meth:`int.from_bytes` call and a shift. Layouts read from a P-field
+    are cached, so :py:meth:`from_p_field` returns the same instance for the same P-field.
+
+    >>> layout = CucLayout(coarse_len=4, fine_len=2)
+    >>> layout.p_field.hex(), layout.len_packed
+    ('1e', 7)
+    >>> layout.unpack(bytes([0x1e, 0x00, 0x00, 0x01, 0x00, 0x80, 0x00]))
+    (256, 32768)
+    >>> CucLayout.from_p_field(bytes([0x1e])) is CucLayout.from_p_field(bytes([0x1e]))
+    True
+
+    :param coarse_len: Number of coarse time octets, which count seconds. Between 1 and 7.
+    :param fine_len: Number of fine time octets, which count binary fractions of a second.
+        Between 0 and 10.
+    :param time_code: :py:attr:`CcsdsTimeCodeId.CUC_CCSDS_EPOCH` or
+        :py:attr:`CcsdsTimeCodeId.CUC_AGENCY_EPOCH`.
+    :raises ValueError: Invalid number of octets or time code.
+    """
+
+    coarse_len: int
+    fine_len: int
+    time_code: CcsdsTimeCodeId
+    p_field: bytes
+    len_packed: int
+
+    __slots__ = (
+        "coarse_len",
+        "fine_len",
+        "time_code",
+        "p_field",
+        "len_packed",
+        "_p_field_len",
+        "_fine_bits",
+        "_fine_mask",
+    )
+
+    def __init__(
+        self,
+        coarse_len: int = 4,
+        fine_len: int = 2,
+        time_code: CcsdsTimeCodeId = CcsdsTimeCodeId.CUC_CCSDS_EPOCH,
+    ):
+        if not 1 <= coarse_len <= _MAX_BASIC_COARSE_LEN + 3:
+            raise ValueError(f"invalid number of coarse time octets {coarse_len}")
+        if not 0 <= fine_len <= _MAX_BASIC_FINE_LEN + 7:
+            raise ValueError(f"invalid number of fine time octets {fine_len}")
+        if time_code not in (
+            CcsdsTimeCodeId.CUC_CCSDS_EPOCH,
+            CcsdsTimeCodeId.CUC_AGENCY_EPOCH,
+        ):
+            raise ValueError(f"invalid CCSDS Time Code {time_code} for CUC timestamp")
+        basic_coarse = min(coarse_len, _MAX_BASIC_COARSE_LEN)
+        basic_fine = min(fine_len, _MAX_BASIC_FINE_LEN)
+        first = (time_code << 4) | ((basic_coarse - 1) << 2) | basic_fine
+        if coarse_len == basic_coarse and fine_len == basic_fine:
+            p_field = bytes([first])
+        else:
+            p_field = bytes(
+                [
+                    first | _EXTENSION_FLAG,
+                    ((coarse_len - basic_coarse) << 5) | ((fine_len - basic_fine) << 2),
+                ]
+            )
+        self._init(coarse_len, fine_len, time_code, p_field)
+
+    def _init(
+        self,
+        coarse_len: int,
+        fine_len: int,
+        time_code: CcsdsTimeCodeId,
+        p_field: bytes,
+    ):
+        set_field = object.__setattr__
+        set_field(self, "coarse_len", coarse_len)
+        set_field(self, "fine_len", fine_len)
+        set_field(self, "time_code", CcsdsTimeCodeId(time_code))
+        set_field(self, "p_field", p_field)
+        set_field(self, "_p_field_len", len(p_field))
+        set_field(self, "len_packed", len(p_field) + coarse_len + fine_len)
+        set_field(self, "_fine_bits", 8 * fine_len)
+        set_field(self, "_fine_mask", (1 << (8 * fine_len)) - 1)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{self.__class__.__name__} is immutable")
+
+    def __reduce__(self):
+        return CucLayout.from_p_field, (self.p_field,)
+
+    @classmethod
+    def from_p_field(cls, data: bytes, offset: int = 0) -> CucLayout:
+        """Retrieve the layout described by the P-field at the given offset.
+
+        :raises BytesTooShortError: Data too short for the P-field.
+        :raises ValueError: P-field does not describe a CUC timestamp.
+        """
+        if len(data) - offset < 1:
+            raise BytesTooShortError(1, len(data) - offset)
+        p_field_len = 2 if data[offset] & _EXTENSION_FLAG else 1
+        if len(data) - offset < p_field_len:
+            raise BytesTooShortError(p_field_len, len(data) - offset)
+        p_field = bytes(data[offset : offset + p_field_len])
+        layout = _CUC_LAYOUTS.get(p_field)
+        if layout is None:
+            layout = cls._parse_p_field(p_field)
+            _CUC_LAYOUTS[p_field] = layout
+        return layout
+
+    @classmethod
+    def _parse_p_field(cls, p_field: bytes) -> CucLayout:
+        time_code = (p_field[0] >> 4) & 0b111
+        if time_code not in (
+            CcsdsTimeCodeId.CUC_CCSDS_EPOCH,
+            CcsdsTimeCodeId.CUC_AGENCY_EPOCH,
+        ):
+            raise ValueError(
+                f"invalid CCSDS Time Code {time_code} in P-field {p_field.hex()}"
+            )
+        coarse_len = ((p_field[0] >> 2) & 0b11) + 1
+        fine_len = p_field[0] & 0b11
+        if len(p_field) == 2:
+            if p_field[1] & _EXTENSION_FLAG:
+                raise ValueError(
+                    f"P-field {p_field.hex()} with more than two octets not supported"
+                )
+            coarse_len += (p_field[1] >> 5) & 0b11
+            fine_len += (p_field[1] >> 2) & 0b111
+        # The P-field is kept as it was read, even if it encodes the octet counts differently
+        # than a layout created with the same octet counts, for example with an extension octet
+        # which does not add any octets.
+        layout = cls.__new__(cls)
+        layout._init(coarse_len, fine_len, CcsdsTimeCodeId(time_code), p_field)
+        return layout
+
+    def unpack(self, data: bytes, offset: int = 0) -> Tuple[int, int]:
+        """Unpack a raw CUC timestamp including the P-field.
+
+        :raises BytesTooShortError: Data too short.
+        :raises ValueError: P-field does not match the layout.
+        :return: Tuple of the coarse and the fine time.
+        """
+        end = offset + self.len_packed
+        if len(data) < end:
+            raise BytesTooShortError(self.len_packed, len(data) - offset)
+        value_start = offset + self._p_field_len
+        if data[offset:value_start] != self.p_field:
+            raise ValueError(
+                f"P-field {bytes(data[offset:value_start]).hex()} does not match the "
+                f"expected P-field {self.p_field.hex()}"
+            )
+        value = int.from_bytes(data[value_start:end], "big")
+        return value >> self._fine_bits, value & self._fine_mask
+
+    def pack_into(self, buf: bytearray, offset: int, coarse: int, fine: int) -> int:
+        """Pack a timestamp including the P-field into a buffer.
+
+        :raises BytesTooShortError: Buffer too short.
+        :raises ValueError: Coarse or fine time do not fit into the layout.
+        :return: Number of bytes written.
+        """
+        if len(buf) - offset < self.len_packed:
+            raise BytesTooShortError(self.len_packed, len(buf) - offset)
+        if not 0 <= fine <= self._fine_mask:
+            raise ValueError(f"fine time {fine} exceeds {self.fine_len} octets")
+        if not 0 <= coarse < (1 << (8 * self.coarse_len)):
+            raise ValueError(f"coarse time {coarse} exceeds {self.coarse_len} octets")
+        value_start = offset + self._p_field_len
+        buf[offset:value_start] = self.p_field
+        buf[value_start : offset + self.len_packed] = (
+            (coarse << self._fine_bits) | fine
+        ).to_bytes(self.coarse_len + self.fine_len, "big")
+        return self.len_packed
+
+    def fine_to_seconds(self, fine: int) -> float:
+        return fine / (1 << self._fine_bits)
+
+    def seconds_to_fine(self, seconds: float) -> int:
+        return min(int(seconds * (1 << self._fine_bits)), self._fine_mask)
+
+    def unpack_batch(
+        self, data: Union[bytes, np.ndarray], offsets: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Unpack many raw timestamps with this layout at once.
+
+        This requires the optional `NumPy <https://numpy.org/>`_ dependency.
+
+        :param data: Buffer or NumPy array which contains the raw timestamps back to back, or a
+            two-dimensional ``uint8`` array with one timestamp per row. If offsets are supplied,
+            this can be any buffer, for example a capture of PUS TM packets.
+        :param offsets: Optional offsets of the timestamps inside the buffer.
+        :raises ValueError: Invalid buffer length or offsets, or the P-field of any timestamp
+            does not match the P-field of the layout.
+        :return: Tuple of the coarse time as an ``int64`` array and the fraction of a second
+            described by the fine time as a ``float64`` array.
+        """
+        import numpy as np
+
+        stamps = _gather_stamps(data, offsets, self.len_packed)
+        p_len = self._p_field_len
+        mismatch = np.flatnonzero(
+            np.any(
+                stamps[:, :p_len] != np.frombuffer(self.p_field, dtype=np.uint8), axis=1
+            )
+        )
+        if len(mismatch) > 0:
+            raise ValueError(
+                f"P-field of timestamp {mismatch[0]} does not match the expected "
+                f"{self.p_field.hex()}"
+            )
+        coarse = np.zeros(len(stamps), dtype=np.int64)
+        for column in range(p_len, p_len + self.coarse_len):
+            coarse = (coarse << 8) | stamps[:, column]
+        fraction = np.zeros(len(stamps), dtype=np.float64)
+        scale = 1.0
+        for column in range(p_len + self.coarse_len, self.len_packed):
+            scale /= 256.0
+            fraction += stamps[:, column] * scale
+        return coarse, fraction
+
+    def __eq__(self, other: object):
+        if not isinstance(other, CucLayout):
+            return False
+        return self.p_field == other.p_field
+
+    def __hash__(self):
+        return hash(self.p_field)
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(coarse_len={self.coarse_len!r}, "
+            f"fine_len={self.fine_len!r}, time_code={self.time_code!r})"
+        )
+
+
+_CUC_LAYOUTS: Dict[bytes, CucLayout] = {}
+
+
+def _gather_stamps(
+    data: Union[bytes, np.ndarray], offsets: Optional[np.ndarray], stamp_size: int
+) -> np.ndarray:
+    import numpy as np
+
+    if offsets is None:
+        if isinstance(data, np.ndarray):
+            raw = np.ascontiguousarray(data, dtype=np.uint8).reshape(-1)
+        else:
+            raw = np.frombuffer(data, dtype=np.uint8)
+        if len(raw) % stamp_size != 0:
+            raise ValueError(
+                f"buffer length {len(raw)} is not a multiple of the timestamp size "
+                f"{stamp_size}"
+            )
+        return raw.reshape(-1, stamp_size)
+    buf = np.frombuffer(data, dtype=np.uint8)
+    offsets = np.asarray(offsets, dtype=np.intp)
+    if len(offsets) > 0 and (
+        int(offsets.min()) < 0 or int(offsets.max()) + stamp_size > len(buf)
+    ):
+        raise ValueError("timestamp offset exceeds the buffer")
+    return buf[offsets[:, np.newaxis] + np.arange(stamp_size)]
+
+
+def _check_epoch(epoch: Optional[datetime.datetime]) -> Optional[datetime.datetime]:
+    # A naive epoch would be interpreted as local time by datetime.timestamp, while
+    # as_date_time would return naive datetimes, so the conversions would disagree.
+    if epoch is not None and epoch.utcoffset() is None:
+        raise ValueError(f"agency epoch {epoch} is not timezone aware")
+    return epoch
+
+
+class CucTimestamp(CcsdsTimeProvider):
+    """CCSDS Unsegmented Time Code (CUC) timestamp including the P-field. The coarse time counts
+    seconds since the epoch and the fine time counts binary fractions of a second.
+
+    The timestamp can be used as a time reader for PUS telemetry. The time code and the number of
+    octets are read from the P-field of each unpacked timestamp.
+
+    >>> stamp = CucTimestamp(coarse=2_000_000_000, fine=0x8000)
+    >>> stamp.pack().hex(sep=',')
+    '1e,77,35,94,00,80,00'
+    >>> stamp.as_date_time()
+    datetime.datetime(2021, 5, 18, 3, 33, 20, 500000, tzinfo=datetime.timezone.utc)
+    >>> CucTimestamp.unpack(stamp.pack()) == stamp
+    True
+
+    :param coarse: Seconds since the epoch.
+    :param fine: Fraction of a second in units of 1 / 256 ** fine_len.
+    :param coarse_len: Number of coarse time octets.
+    :param fine_len: Number of fine time octets.
+    :param epoch: Agency defined epoch. If this is supplied, the agency epoch time code is used,
+        otherwise the CCSDS epoch 1958-01-01 is used. The epoch needs to be timezone aware.
+    :raises ValueError: Naive epoch.
+    """
+
+    # Changes are tracked for the packed bytes cache of the PUS TM classes.
+    coarse = tracked_field("_coarse")
+    fine = tracked_field("_fine")
+
+    def __init__(
+        self,
+        coarse: int,
+        fine: int = 0,
+        coarse_len: int = 4,
+        fine_len: int = 2,
+        epoch: Optional[datetime.datetime] = None,
+    ):
+        time_code = (
+            CcsdsTimeCodeId.CUC_CCSDS_EPOCH
+            if epoch is None
+            else CcsdsTimeCodeId.CUC_AGENCY_EPOCH
+        )
+        self._layout = CucLayout.from_p_field(
+            CucLayout(coarse_len, fine_len, time_code).p_field
+        )
+        self._epoch = _check_epoch(epoch)
+        self._coarse = coarse
+        self._fine = fine
+        self._generation = current_generation()
+
+    @classmethod
+    def with_layout(
+        cls,
+        layout: CucLayout,
+        coarse: int = 0,
+        fine: int = 0,
+        epoch: Optional[datetime.datetime] = None,
+    ) -> CucTimestamp:
+        """Create a timestamp with the given layout, for example one read from a P-field.
+
+        :raises ValueError: Agency epoch layout without an epoch or vice versa, or naive epoch.
+        """
+        if (layout.time_code == CcsdsTimeCodeId.CUC_AGENCY_EPOCH) != (
+            epoch is not None
+        ):
+            raise ValueError(
+                "the epoch must be supplied for agency epoch timestamps only"
+            )
+        instance = cls.__new__(cls)
+        instance._layout = layout
+        instance._epoch = _check_epoch(epoch)
+        instance._coarse = coarse
+        instance._fine = fine
+        instance._generation = current_generation()
+        return instance
+
+    @classmethod
+    def empty(cls, coarse_len: int = 4, fine_len: int = 2) -> CucTimestamp:
+        return cls(0, 0, coarse_len, fine_len)
+
+    @property
+    def epoch(self) -> Optional[datetime.datetime]:
+        return self._epoch
+
+    @epoch.setter
+    def epoch(self, epoch: Optional[datetime.datetime]):
+        """:raises ValueError: Naive epoch."""
+        self._epoch = _check_epoch(epoch)
+        self._generation = current_generation()
+
+    @property
+    def layout(self) -> CucLayout:
+        return self._layout
+
+    @property
+    def pfield(self) -> bytes:
+        return self._layout.p_field
+
+    @property
+    def len_packed(self) -> int:
+        return self._layout.len_packed
+
+    def pack(self) -> bytearray:
+        buf = bytearray(self._layout.len_packed)
+        self._layout.pack_into(buf, 0, self._coarse, self._fine)
+        return buf
+
+    def pack_into(self, buf: bytearray, offset: int = 0) -> int:
+        return self._layout.pack_into(buf, offset, self._coarse, self._fine)
+
+    @classmethod
+    def unpack(
+        cls, data: bytes, epoch: Optional[datetime.datetime] = None
+    ) -> CucTimestamp:
+        """Unpack a raw CUC timestamp including the P-field.
+
+        :param epoch: Agency defined epoch, which is required for agency epoch timestamps.
+        :raises BytesTooShortError: Data too short.
+        :raises ValueError: Invalid P-field.
+        """
+        layout = CucLayout.from_p_field(data)
+        coarse, fine = layout.unpack(data)
+        return cls.with_layout(layout, coarse, fine, epoch)
+
+    def read_from_raw(self, data: bytes):
+        """Update the instance from a raw CUC timestamp. The layout of the timestamp is taken
+        from the P-field, so it may differ from the current layout.
+
+        :raises BytesTooShortError: Data too short.
+        :raises ValueError: Invalid P-field.
+        """
+        layout = self._layout
+        if data[: layout._p_field_len] != layout.p_field:
+            layout = CucLayout.from_p_field(data)
+        self._coarse, self._fine = layout.unpack(data)
+        self._layout = layout
+        self._generation = current_generation()
+
+    def read_new(self, data: bytes) -> CucTimestamp:
+        """Create a new timestamp from a raw CUC timestamp without changing this instance. The
+        epoch of this instance is used for the new timestamp.
+
+        :raises BytesTooShortError: Data too short.
+        :raises ValueError: Invalid P-field.
+        """
+        layout = self._layout
+        if data[: layout._p_field_len] != layout.p_field:
+            layout = CucLayout.from_p_field(data)
+        stamp = self.__class__.__new__(self.__class__)
+        stamp._coarse, stamp._fine = layout.unpack(data)
+        stamp._layout = layout
+        stamp._epoch = self._epoch
+        stamp._generation = current_generation()
+        return stamp
+
+    def _epoch_unix_seconds(self) -> float:
+        if self._layout.time_code == CcsdsTimeCodeId.CUC_AGENCY_EPOCH:
+            if self.epoch is None:
+                raise ValueError("agency epoch timestamp without an epoch")
+            return self.epoch.timestamp()
+        return _CCSDS_EPOCH_UNIX_SECONDS
+
+    def as_unix_seconds(self) -> float:
+        return (
+            self._epoch_unix_seconds()
+            + self.coarse
+            + self._layout.fine_to_seconds(self.fine)
+        )
+
+    def as_date_time(self) -> datetime.datetime:
+        if self._layout.time_code == CcsdsTimeCodeId.CUC_AGENCY_EPOCH:
+            if self.epoch is None:
+                raise ValueError("agency epoch timestamp without an epoch")
+            epoch = self.epoch
+        else:
+            epoch = CCSDS_EPOCH
+        return epoch + datetime.timedelta(
+            seconds=self.coarse,
+            microseconds=self._layout.fine_to_seconds(self.fine) * 1e6,
+        )
+
+    @classmethod
+    def from_date_time(
+        cls,
+        dt: datetime.datetime,
+        coarse_len: int = 4,
+        fine_len: int = 2,
+        epoch: Optional[datetime.datetime] = None,
+    ) -> CucTimestamp:
+        instance = cls(0, 0, coarse_len, fine_len, epoch)
+        delta = dt - (CCSDS_EPOCH if epoch is None else epoch)
+        instance.coarse = delta.days * SECONDS_PER_DAY + delta.seconds
+        instance.fine = instance._layout.seconds_to_fine(delta.microseconds / 1e6)
+        return instance
+
+    @classmethod
+    def from_now(
+        cls,
+        coarse_len: int = 4,
+        fine_len: int = 2,
+        epoch: Optional[datetime.datetime] = None,
+    ) -> CucTimestamp:
+        return cls.from_date_time(
+            datetime.datetime.now(tz=datetime.timezone.utc), coarse_len, fine_len, epoch
+        )
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(coarse={self.coarse!r}, fine={self.fine!r}, "
+            f"coarse_len={self._layout.coarse_len!r}, "
+            f"fine_len={self._layout.fine_len!r}, epoch={self.epoch!r})"
+        )
+
+    def __str__(self):
+        return f"Date {self.as_date_time()!r} with representation {self!r}"
+
+    def __eq__(self, other: object):
+        if not isinstance(other, CucTimestamp):
+            return False
+        return (
+            self._layout == other._layout
+            and self.coarse == other.coarse
+            and self.fine == other.fine
+            and self.epoch == other.epoch
+        )
+
+
+def _cuc_batch(
+    data: Union[bytes, np.ndarray], offsets: Optional[np.ndarray]
+) -> Tuple[CucLayout, np.ndarray, np.ndarray]:
+    """Read the layout from the P-field of the first timestamp and unpack all timestamps with
+    it. :py:meth:`CucLayout.unpack_batch` checks the P-fields of all timestamps against the
+    layout, so timestamps with a different P-field raise a ValueError."""
+    import numpy as np
+
+    if isinstance(data, np.ndarray) and offsets is None:
+        first = np.ascontiguousarray(data, dtype=np.uint8).reshape(-1)[:2].tobytes()
+    else:
+        start = 0 if offsets is None or len(offsets) == 0 else int(offsets[0])
+        first = bytes(memoryview(data)[start : start + 2])
+    layout = CucLayout.from_p_field(first)
+    coarse, fraction = layout.unpack_batch(data, offsets)
+    return layout, coarse, fraction
+
+
+def cuc_to_unix_seconds(
+    data: Union[bytes, np.ndarray],
+    offsets: Optional[np.ndarray] = None,
+    epoch: Optional[datetime.datetime] = None,
+) -> np.ndarray:
+    """Convert many raw CUC timestamps including the P-field to unix seconds at once. All
+    timestamps must have the same P-field. The layout is read from the P-field of the first
+    timestamp, and the P-fields of all timestamps are checked against it.
+
+    This requires the optional `NumPy <https://numpy.org/>`_ dependency.
+
+    >>> stamps = CucTimestamp(2_000_000_000, 0x8000).pack() + CucTimestamp(2_000_000_001).pack()
+    >>> cuc_to_unix_seconds(stamps).tolist()
+    [1621308800.5, 1621308801.0]
+
+    :param data: Same as for :py:meth:`CucLayout.unpack_batch`.
+    :param offsets: Same as for :py:meth:`CucLayout.unpack_batch`.
+    :param epoch: Agency defined epoch, which is required for agency epoch timestamps.
+    :raises BytesTooShortError: No timestamps were passed.
+    :raises ValueError: Invalid buffer length or offsets, or timestamps with different
+        P-fields.
+    :return: ``float64`` NumPy array.
+    """
+    layout, coarse, fraction = _cuc_batch(data, offsets)
+    epoch_seconds = CucTimestamp.with_layout(layout, epoch=epoch)._epoch_unix_seconds()
+    return (coarse + epoch_seconds) + fraction
+
+
+def cuc_to_datetime64(
+    data: Union[bytes, np.ndarray],
+    offsets: Optional[np.ndarray] = None,
+    epoch: Optional[datetime.datetime] = None,
+) -> np.ndarray:
+    """Convert many raw CUC timestamps to a ``datetime64[ns]`` NumPy array at once. The
+    parameters, the P-field checks and the exceptions are the same as for
+    :py:func:`cuc_to_unix_seconds`.
+
+    >>> stamps = CucTimestamp(2_000_000_000, 0x8000).pack()
+    >>> cuc_to_datetime64(stamps).astype(str).tolist()
+    ['2021-05-18T03:33:20.500000000']
+
+    :return: ``datetime64[ns]`` NumPy array.
+    """
+    import numpy as np
+
+    layout, coarse, fraction = _cuc_batch(data, offsets)
+    epoch_seconds = CucTimestamp.with_layout(layout, epoch=epoch)._epoch_unix_seconds()
+    epoch_ns = int(round(epoch_seconds * 1e9))
+    unix_ns = (
+        coarse * 1_000_000_000 + epoch_ns + np.round(fraction * 1e9).astype(np.int64)
+    )
+    return unix_ns.astype("datetime64[ns]")
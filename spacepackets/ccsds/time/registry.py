@@ -0,0 +1,139 @@
+"""Registry which selects the time reader for a raw timestamp based on its P-field."""
+from __future__ import annotations
+from typing import Dict, Optional
+
+from spacepackets.exceptions import BytesTooShortError
+from spacepackets.ccsds.time.common import CcsdsTimeProvider, CcsdsTimeCodeId
+from spacepackets.ccsds.time.cds import CdsShortTimestamp
+from spacepackets.ccsds.time.cuc import CucLayout, CucTimestamp
+
+_EXTENSION_FLAG = 0x80
+_MISSING = object()
+
+
+class TimeReaderRegistry:
+    """Maps P-field values to time readers, so timestamps can be decoded without knowing the
+    time code in advance.
+
+    The registry can be passed as the time reader to :py:meth:`spacepackets.ecss.PusTelemetry.unpack`
+    and :py:class:`spacepackets.ecss.tm.LazyPusTelemetry`. The reader is then selected with a
+    dictionary lookup of the P-field in front of each timestamp. The reader chosen for the first
+    packet of an APID is cached and used for all later packets of that APID without looking at
+    their P-field. If the time code of an APID can change, for example in an archive which mixes
+    missions, the cache can be disabled with ``cache_apids``. Packets of APIDs without a
+    timestamp or without a P-field can be decoded by registering the reader for the APID with
+    :py:meth:`register_apid`.
+
+    CDS short timestamps are registered by default. Readers for CUC timestamps with the CCSDS
+    epoch are created on demand from the P-field if ``auto_cuc`` is set. Timestamps with an
+    agency defined epoch require a reader which is registered explicitly.
+
+    >>> from spacepackets.ecss import PusTelemetry
+    >>> from spacepackets.ccsds.time import CucTimestamp
+    >>> registry = TimeReaderRegistry()
+    >>> cds_tm = PusTelemetry(17, 2, CdsShortTimestamp(24430, 0), apid=0x22).pack()
+    >>> cuc_tm = PusTelemetry(17, 2, CucTimestamp(2_000_000_000), apid=0x23).pack()
+    >>> PusTelemetry.unpack(cds_tm, registry).time_provider
+    CdsShortTimestamp(ccsds_days=24430, ms_of_day=0)
+    >>> PusTelemetry.unpack(cuc_tm, registry).time_provider
+    CucTimestamp(coarse=2000000000, fine=0, coarse_len=4, fine_len=2, epoch=None)
+    >>> registry.register_apid(0x24, None)
+    >>> print(PusTelemetry.unpack(PusTelemetry(17, 2, None, apid=0x24).pack(), registry).time_provider)
+    None
+
+    :param auto_cuc: Create readers for unregistered CUC P-fields with the CCSDS epoch.
+    :param cache_apids: Cache the reader chosen for each APID.
+    """
+
+    def __init__(self, auto_cuc: bool = True, cache_apids: bool = True):
+        self.auto_cuc = auto_cuc
+        self.cache_apids = cache_apids
+        self._readers: Dict[int, CcsdsTimeProvider] = {}
+        # Readers registered explicitly for an APID. None is used for APIDs without timestamp.
+        self._apid_readers: Dict[int, Optional[CcsdsTimeProvider]] = {}
+        # Readers for the APIDs seen so far, including the explicitly registered ones.
+        self._apid_cache: Dict[int, Optional[CcsdsTimeProvider]] = {}
+        self.register(CdsShortTimestamp.empty())
+
+    def register(self, reader: CcsdsTimeProvider, p_field: Optional[bytes] = None):
+        """Register a time reader for a P-field. An existing reader for the same P-field is
+        replaced.
+
+        :param reader: Time reader. It is used as a template and is copied before a timestamp
+            is read by the PUS TM classes.
+        :param p_field: P-field with one or two octets. The P-field of the reader is used by
+            default.
+        :raises ValueError: Invalid P-field.
+        """
+        if p_field is None:
+            p_field = reader.pfield
+        if len(p_field) not in (1, 2) or (
+            bool(p_field[0] & _EXTENSION_FLAG) != (len(p_field) == 2)
+        ):
+            raise ValueError(f"invalid P-field {bytes(p_field).hex()}")
+        self._readers[int.from_bytes(p_field, "big")] = reader
+        self.clear_apid_cache()
+
+    def register_apid(self, apid: int, reader: Optional[CcsdsTimeProvider]):
+        """Register a time reader for all packets of an APID. The P-field of these packets is
+        not checked, so this also works for timestamps without a P-field.
+
+        :param apid: APID of the packets.
+        :param reader: Time reader, or None if the packets of the APID have no timestamp.
+        """
+        self._apid_readers[apid] = reader
+        self._apid_cache[apid] = reader
+
+    def clear_apid_cache(self):
+        """Forget the readers chosen for the APIDs seen so far. Readers registered with
+        :py:meth:`register_apid` are kept."""
+        self._apid_cache = dict(self._apid_readers)
+
+    def reader_for(
+        self, data: bytes, offset: int = 0, apid: Optional[int] = None
+    ) -> Optional[CcsdsTimeProvider]:
+        """Retrieve the time reader for the timestamp at the given offset.
+
+        The returned reader is shared and must be copied before a timestamp is read into it.
+
+        :param data: Raw data which contains the timestamp including its P-field.
+        :param offset: Offset of the P-field.
+        :param apid: APID of the packet. If a reader is registered or cached for the APID, it is
+            returned without reading the P-field.
+        :raises BytesTooShortError: Data too short for the P-field.
+        :raises ValueError: No reader for the P-field.
+        :return: Time reader, or None if the packets of the APID have no timestamp.
+        """
+        if apid is not None:
+            reader = self._apid_cache.get(apid, _MISSING)
+            if reader is not _MISSING:
+                return reader
+        if len(data) - offset < 1:
+            raise BytesTooShortError(1, len(data) - offset)
+        key = data[offset]
+        if key & _EXTENSION_FLAG:
+            if len(data) - offset < 2:
+                raise BytesTooShortError(2, len(data) - offset)
+            key = (key << 8) | data[offset + 1]
+        reader = self._readers.get(key)
+        if reader is None:
+            reader = self._create_reader(key, data, offset)
+        if apid is not None and self.cache_apids:
+            self._apid_cache[apid] = reader
+        return reader
+
+    def _create_reader(self, key: int, data: bytes, offset: int) -> CcsdsTimeProvider:
+        time_code = (data[offset] >> 4) & 0b111
+        if self.auto_cuc and time_code == CcsdsTimeCodeId.CUC_CCSDS_EPOCH:
+            reader = CucTimestamp.with_layout(CucLayout.from_p_field(data, offset))
+            self._readers[key] = reader
+            return reader
+        p_field_len = 2 if key > 0xFF else 1
+        raise ValueError(
+            f"no time reader registered for P-field "
+            f"{bytes(data[offset : offset + p_field_len]).hex()}"
+        )
+
+    def apid_readers(self) -> Dict[int, Optional[CcsdsTimeProvider]]:
+        """Time readers which were registered or chosen for the APIDs seen so far."""
+        return dict(self._apid_cache)
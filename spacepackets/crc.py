@@ -1,7 +1,351 @@
-"""This modules contains generic CRC support."""
+"""This modules contains generic CRC support.
+
+The CRC16-CCITT used by PUS packets can be calculated with different backends, which can be
+selected with :py:func:`set_crc16_backend`:
+
+ - :py:attr:`Crc16Backend.CRCMOD`: The default backend using :py:mod:`crcmod`. This is the
+   fastest backend if the C extension of :py:mod:`crcmod` is available.
+ - :py:attr:`Crc16Backend.PYTHON`: Table-driven pure Python implementation.
+ - :py:attr:`Crc16Backend.NUMPY`: Slice-by-N implementation using the optional
+   `NumPy <https://numpy.org/>`_ dependency, which can be installed with
+   ``pip install spacepackets[numpy]``. It is vectorized across packets of the same length, so
+   it is only useful for the batch functions :py:func:`crc16_ccitt_batch` and
+   :py:func:`verify_crc16_batch`. It is roughly ten times faster than the pure Python
+   implementation.
+
+All functions accept any object supporting the buffer protocol, for example :py:class:`bytes`,
+:py:class:`bytearray`, :py:class:`memoryview` or :py:class:`mmap.mmap`, so packets can be
+checksummed without copying them first.
+"""
+from __future__ import annotations
+
+import enum
+from collections import defaultdict
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
 from crcmod.predefined import mkPredefinedCrcFun
 
+if TYPE_CHECKING:
+    import numpy as np
+
 #: CRC calculator function as specified in the PUS standard B.1
 #: Generated with :py:func:`crcmod.predefined.mkPredefinedCrcFun` with the
 #: `crc-ccitt-false` as the CRC name.
 CRC16_CCITT_FUNC = mkPredefinedCrcFun(crc_name="crc-ccitt-false")
+
+#: Initial value of the CRC16-CCITT used by PUS packets.
+CRC16_CCITT_INIT = 0xFFFF
+CRC16_CCITT_POLY = 0x1021
+
+# Number of bytes processed per step by the NumPy backend.
+_NUMPY_SLICE_BY = 16
+
+
+class Crc16Backend(enum.IntEnum):
+    CRCMOD = 0
+    PYTHON = 1
+    NUMPY = 2
+
+
+def _gen_crc16_tables(poly: int, num_tables: int) -> List[List[int]]:
+    """Generate the lookup tables for a slice-by-N CRC16 calculation. The entry ``x`` of the
+    table with index ``k`` is the CRC of the byte ``x`` followed by ``k`` zero bytes, calculated
+    with an initial value of 0. The first table is the regular byte-wise lookup table.
+    """
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = (crc << 1) ^ poly if crc & 0x8000 else crc << 1
+        table.append(crc & 0xFFFF)
+    tables = [table]
+    for _ in range(num_tables - 1):
+        prev = tables[-1]
+        tables.append([((entry << 8) & 0xFF00) ^ table[entry >> 8] for entry in prev])
+    return tables
+
+
+_CRC16_TABLES = _gen_crc16_tables(CRC16_CCITT_POLY, _NUMPY_SLICE_BY)
+_CRC16_TABLE = _CRC16_TABLES[0]
+_numpy_tables: Optional[np.ndarray] = None
+
+
+def crc16_ccitt_python(data: bytes, crc: int = CRC16_CCITT_INIT) -> int:
+    """Table-driven pure Python implementation of the CRC16-CCITT.
+
+    :param data: Any object supporting the buffer protocol.
+    :param crc: Initial value, which can be used to continue a previous calculation.
+    """
+    if not isinstance(data, (bytes, bytearray)):
+        data = memoryview(data).cast("B")
+    table = _CRC16_TABLE
+    for byte in data:
+        crc = ((crc << 8) & 0xFF00) ^ table[(crc >> 8) ^ byte]
+    return crc
+
+
+def _get_numpy_tables() -> np.ndarray:
+    global _numpy_tables
+    if _numpy_tables is None:
+        import numpy as np
+
+        _numpy_tables = np.array(_CRC16_TABLES, dtype=np.uint16)
+    return _numpy_tables
+
+
+def _crc16_ccitt_numpy_rows(rows: np.ndarray, crc: int) -> np.ndarray:
+    """Calculate the CRC16-CCITT of all rows of a two-dimensional ``uint8`` array at once.
+
+    The bytes of each row are processed in blocks of N bytes. The contribution of all bytes
+    except the first two of each block does not depend on the CRC state, so it is looked up for
+    all blocks at once. Only the first two bytes of each block need to be processed
+    sequentially.
+    """
+    import numpy as np
+
+    tables = _get_numpy_tables()
+    slice_by = _NUMPY_SLICE_BY
+    num_rows, row_len = rows.shape
+    crcs = np.full(num_rows, crc, dtype=np.uint16)
+    head_len = row_len % slice_by
+    for idx in range(head_len):
+        crcs = (crcs << 8) ^ tables[0][(crcs >> 8) ^ rows[:, idx]]
+    num_blocks = (row_len - head_len) // slice_by
+    if num_blocks == 0:
+        return crcs
+    # Shape: (block, byte in block, row), so that every step accesses contiguous memory.
+    blocks = np.ascontiguousarray(
+        rows[:, head_len:].reshape(num_rows, num_blocks, slice_by).transpose(1, 2, 0)
+    )
+    independent = np.zeros((num_blocks, num_rows), dtype=np.uint16)
+    for idx in range(2, slice_by):
+        independent ^= tables[slice_by - 1 - idx][blocks[:, idx]]
+    first_table = tables[slice_by - 1]
+    second_table = tables[slice_by - 2]
+    for idx in range(num_blocks):
+        crcs = (
+            first_table[(crcs >> 8) ^ blocks[idx, 0]]
+            ^ second_table[(crcs & 0xFF) ^ blocks[idx, 1]]
+            ^ independent[idx]
+        )
+    return crcs
+
+
+def _crc16_ccitt_numpy(data: bytes, crc: int = CRC16_CCITT_INIT) -> int:
+    import numpy as np
+
+    rows = np.frombuffer(data, dtype=np.uint8).reshape(1, -1)
+    return int(_crc16_ccitt_numpy_rows(rows, crc)[0])
+
+
+_CRC16_FUNCS: Dict[Crc16Backend, Callable[[bytes, int], int]] = {
+    Crc16Backend.CRCMOD: CRC16_CCITT_FUNC,
+    Crc16Backend.PYTHON: crc16_ccitt_python,
+    Crc16Backend.NUMPY: _crc16_ccitt_numpy,
+}
+_crc16_backend = Crc16Backend.CRCMOD
+_crc16_func = CRC16_CCITT_FUNC
+
+
+def set_crc16_backend(backend: Crc16Backend):
+    """Set the backend used by :py:func:`crc16_ccitt`, :py:class:`Crc16Ccitt` and the batch
+    functions if no backend is passed explicitly.
+
+    :raises ImportError: NumPy backend selected but NumPy is not installed.
+    """
+    global _crc16_backend, _crc16_func
+    backend = Crc16Backend(backend)
+    if backend == Crc16Backend.NUMPY:
+        import numpy  # noqa: F401
+    _crc16_backend = backend
+    _crc16_func = _CRC16_FUNCS[backend]
+
+
+def get_crc16_backend() -> Crc16Backend:
+    return _crc16_backend
+
+
+def crc16_ccitt(data: bytes, crc: int = CRC16_CCITT_INIT) -> int:
+    """Calculate the CRC16-CCITT as specified in the PUS standard B.1 using the backend set
+    with :py:func:`set_crc16_backend`. Calculating the CRC over a packet including its
+    trailing CRC yields 0 if the CRC is valid.
+
+    >>> hex(crc16_ccitt(b"123456789"))
+    '0x29b1'
+    >>> hex(crc16_ccitt(memoryview(b"xx123456789")[2:]))
+    '0x29b1'
+
+    :param data: Any object supporting the buffer protocol.
+    :param crc: Initial value, which can be used to continue a previous calculation.
+    """
+    return _crc16_func(data, crc)
+
+
+def _apply_linear_map(images: List[int], value: int) -> int:
+    result = 0
+    bit = 0
+    while value:
+        if value & 1:
+            result ^= images[bit]
+        value >>= 1
+        bit += 1
+    return result
+
+
+def crc16_ccitt_advance_tables(num_bytes: int) -> Tuple[List[int], List[int]]:
+    """Generate lookup tables which advance a CRC16-CCITT register over the given number of zero
+    bytes. The advanced value of the register value ``crc`` is
+    ``high_table[crc >> 8] ^ low_table[crc & 0xFF]``.
+
+    Because the CRC is linear, this can be used to update the CRC of a message after some bytes
+    were changed without processing the unchanged bytes: The new CRC is the old CRC XORed with
+    the advanced CRC of the changed bits, calculated with an initial value of 0, and advanced
+    over the number of bytes following the changed bytes.
+
+    >>> msg = bytearray(b"123456789")
+    >>> old_crc = crc16_ccitt(msg)
+    >>> msg[2] = ord("x")
+    >>> delta_crc = crc16_ccitt(bytes([ord("3") ^ ord("x")]), 0)
+    >>> high_table, low_table = crc16_ccitt_advance_tables(len(msg) - 3)
+    >>> new_crc = old_crc ^ high_table[delta_crc >> 8] ^ low_table[delta_crc & 0xFF]
+    >>> new_crc == crc16_ccitt(msg)
+    True
+
+    :param num_bytes: Number of zero bytes.
+    :return: Tuple of the table for the high byte and the table for the low byte.
+    """
+    table = _CRC16_TABLE
+    # The register transformation for one zero byte, described by the images of all 16 bits.
+    step = [(((1 << bit) << 8) & 0xFFFF) ^ table[(1 << bit) >> 8] for bit in range(16)]
+    images = [1 << bit for bit in range(16)]
+    while num_bytes:
+        if num_bytes & 1:
+            images = [_apply_linear_map(step, image) for image in images]
+        step = [_apply_linear_map(step, image) for image in step]
+        num_bytes >>= 1
+    low_table = [0] * 256
+    high_table = [0] * 256
+    for value in range(1, 256):
+        lowest_bit = (value & -value).bit_length() - 1
+        low_table[value] = low_table[value & (value - 1)] ^ images[lowest_bit]
+        high_table[value] = high_table[value & (value - 1)] ^ images[lowest_bit + 8]
+    return high_table, low_table
+
+
+class Crc16Ccitt:
+    """Incremental CRC16-CCITT calculator. This can be used to checksum a packet consisting of
+    multiple parts, like a header, a payload and a trailer, without concatenating them.
+
+    >>> crc = Crc16Ccitt(b"1234")
+    >>> _ = crc.update(b"56789")
+    >>> hex(crc.value)
+    '0x29b1'
+    >>> crc.digest().hex()
+    '29b1'
+    """
+
+    def __init__(
+        self,
+        data: Optional[bytes] = None,
+        crc: int = CRC16_CCITT_INIT,
+        backend: Optional[Crc16Backend] = None,
+    ):
+        """Create a new calculator.
+
+        :param data: Optional initial data.
+        :param crc: Initial CRC value.
+        :param backend: Backend to use. The backend set with :py:func:`set_crc16_backend` is
+            used if this is not supplied.
+        """
+        self._crc_func = _crc16_func if backend is None else _CRC16_FUNCS[backend]
+        self._crc = crc
+        if data is not None:
+            self.update(data)
+
+    def update(self, data: bytes) -> Crc16Ccitt:
+        """Update the CRC with the given data.
+
+        :param data: Any object supporting the buffer protocol.
+        :return: The instance itself, so calls can be chained.
+        """
+        self._crc = self._crc_func(data, self._crc)
+        return self
+
+    @property
+    def value(self) -> int:
+        return self._crc
+
+    def digest(self) -> bytes:
+        """Current CRC value as two big endian bytes."""
+        return self._crc.to_bytes(2, "big")
+
+    def copy(self) -> Crc16Ccitt:
+        """Copy the calculator, which can be used to calculate the CRC of multiple packets
+        sharing a common prefix."""
+        crc_copy = Crc16Ccitt.__new__(Crc16Ccitt)
+        crc_copy._crc_func = self._crc_func
+        crc_copy._crc = self._crc
+        return crc_copy
+
+
+def crc16_ccitt_batch(
+    packets: Union[Sequence[bytes], np.ndarray],
+    crc: int = CRC16_CCITT_INIT,
+    backend: Optional[Crc16Backend] = None,
+) -> List[int]:
+    """Calculate the CRC16-CCITT of multiple packets in one call.
+
+    The NumPy backend groups the packets by length and processes all packets of one length
+    at once.
+
+    :param packets: Sequence of objects supporting the buffer protocol. A two-dimensional
+        ``uint8`` NumPy array with one packet per row can be passed as well.
+    :param crc: Initial CRC value.
+    :param backend: Backend to use. The backend set with :py:func:`set_crc16_backend` is
+        used if this is not supplied.
+    :return: List of CRC values in the same order as the packets.
+    """
+    if backend is None:
+        backend = _crc16_backend
+    if backend != Crc16Backend.NUMPY:
+        crc_func = _CRC16_FUNCS[backend]
+        return [crc_func(packet, crc) for packet in packets]
+    import numpy as np
+
+    if isinstance(packets, np.ndarray) and packets.ndim == 2:
+        return _crc16_ccitt_numpy_rows(
+            packets.astype(np.uint8, copy=False), crc
+        ).tolist()
+    indices_by_len: Dict[int, List[int]] = defaultdict(list)
+    views = [memoryview(packet).cast("B") for packet in packets]
+    for idx, view in enumerate(views):
+        indices_by_len[len(view)].append(idx)
+    crcs = [crc] * len(views)
+    for packet_len, indices in indices_by_len.items():
+        rows = np.frombuffer(
+            b"".join(views[idx] for idx in indices), dtype=np.uint8
+        ).reshape(len(indices), packet_len)
+        for idx, packet_crc in zip(
+            indices, _crc16_ccitt_numpy_rows(rows, crc).tolist()
+        ):
+            crcs[idx] = packet_crc
+    return crcs
+
+
+def verify_crc16_batch(
+    packets: Union[Sequence[bytes], np.ndarray],
+    backend: Optional[Crc16Backend] = None,
+) -> List[bool]:
+    """Verify the trailing CRC16-CCITT of multiple PUS packets in one call.
+
+    >>> from spacepackets.ecss import PusTelecommand
+    >>> ping_tc = PusTelecommand(service=17, subservice=1).pack()
+    >>> corrupted_tc = ping_tc[:-1] + bytes([ping_tc[-1] ^ 0xFF])
+    >>> verify_crc16_batch([ping_tc, corrupted_tc])
+    [True, False]
+
+    :param packets: See :py:func:`crc16_ccitt_batch`.
+    :param backend: See :py:func:`crc16_ccitt_batch`.
+    :return: List of booleans which are True for all packets with a valid CRC.
+    """
+    return [crc == 0 for crc in crc16_ccitt_batch(packets, CRC16_CCITT_INIT, backend)]
@@ -1,8 +1,10 @@
-from crcmod.predefined import mkPredefinedCrcFun
+from spacepackets.crc import crc16_ccitt
 
-from .tc import PusVersion, PusTelecommand, PusTcDataFieldHeader
-from .tm import PusTelemetry, PusTmSecondaryHeader
+from .tc import PusVersion, PusTelecommand, PusTcDataFieldHeader, PusTcTemplate
+from .tm import PusTelemetry, PusTmSecondaryHeader, LazyPusTelemetry
 from .fields import (
+    FieldCodec,
+    FieldDef,
     PacketFieldEnum,
     PacketFieldBase,
     PacketFieldU8,
@@ -16,6 +18,7 @@ from .fields import (
 from .defs import PusService
 from .req_id import RequestId
 from .pus_verificator import PusVerificator
+from .dispatch import PusTmDispatcher
 
 
 def check_pus_crc(tc_packet: bytes) -> bool:
@@ -25,6 +28,4 @@ def check_pus_crc(tc_packet: bytes) -> bool:
 
     :return: True if the CRC is valid, False otherwise.
     """
-    crc_func = mkPredefinedCrcFun(crc_name="crc-ccitt-false")
-    crc = crc_func(tc_packet)
-    return crc == 0
+    return crc16_ccitt(tc_packet) == 0
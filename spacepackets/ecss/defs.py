@@ -1,4 +1,5 @@
 import enum
+from typing import NamedTuple
 
 
 class PusService(enum.IntEnum):
@@ -14,3 +15,11 @@ class PusService(enum.IntEnum):
     S17_TEST = 17
     S20_PARAMETER = 20
     S23_FILE_MGMT = 23
+
+
+class PackCacheInfo(NamedTuple):
+    """Statistics of the packed bytes cache of PUS packets, similar to the cache info of
+    :py:func:`functools.lru_cache`."""
+
+    hits: int
+    misses: int
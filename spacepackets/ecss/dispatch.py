@@ -0,0 +1,304 @@
+"""Dispatching of raw PUS telemetry packets to handlers registered for APID, service and
+subservice combinations."""
+from __future__ import annotations
+
+import time
+from array import array
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from spacepackets.ccsds.spacepacket import SPACE_PACKET_HEADER_SIZE
+from spacepackets.ccsds.time import CcsdsTimeProvider, TimeReaderRegistry
+from spacepackets.ecss.tm import LazyPusTelemetry
+
+#: Wildcard which matches all APIDs, services or subservices.
+ANY = None
+
+# Offsets of the service and subservice inside a PUS C TM.
+_SERVICE_OFFSET = SPACE_PACKET_HEADER_SIZE + 1
+_SUBSERVICE_OFFSET = SPACE_PACKET_HEADER_SIZE + 2
+# TM packets with a secondary header have the packet type bit cleared and the secondary header
+# flag set.
+_TYPE_AND_SEC_HEADER_MASK = 0x18
+_TM_WITH_SEC_HEADER = 0x08
+# Stand-ins for all services, subservices and APIDs which are not named by any route pattern.
+# They are outside the range of the header fields, so no pattern matches them explicitly.
+_OTHER_SERVICE = 0x100
+_OTHER_APID = 0x800
+
+
+class RoutePattern(NamedTuple):
+    apid: Optional[int]
+    service: Optional[int]
+    subservice: Optional[int]
+
+    @property
+    def specificity(self) -> int:
+        """Rank of the pattern. A fixed APID ranks higher than a fixed service, which ranks
+        higher than a fixed subservice."""
+        return (
+            (self.apid is not None) << 2
+            | (self.service is not None) << 1
+            | (self.subservice is not None)
+        )
+
+    def matches(self, apid: int, service: int, subservice: int) -> bool:
+        return (
+            (self.apid is None or self.apid == apid)
+            and (self.service is None or self.service == service)
+            and (self.subservice is None or self.subservice == subservice)
+        )
+
+
+class RouteStats(NamedTuple):
+    pattern: RoutePattern
+    #: Number of packets passed to the handler.
+    count: int
+    #: Total time spent in the handler, in nanoseconds.
+    total_ns: int
+    #: Longest time spent in the handler for a single packet, in nanoseconds.
+    max_ns: int
+
+    @property
+    def mean_ns(self) -> float:
+        return self.total_ns / self.count if self.count else 0.0
+
+
+class _Route(NamedTuple):
+    route_id: int
+    pattern: RoutePattern
+    handler: Callable[[Any], Any]
+    raw: bool
+
+
+class _Resolved(NamedTuple):
+    routes: Tuple[_Route, ...]
+    #: At least one of the routes receives a lazily decoded packet.
+    needs_lazy: bool
+
+
+_NO_ROUTES = _Resolved((), False)
+
+
+class PusTmDispatcher:
+    """Dispatcher for raw PUS telemetry packets.
+
+    Handlers are registered for an APID, a service and a subservice, each of which can be
+    the :py:data:`ANY` wildcard. A packet is classified by reading these three fields from the
+    raw header bytes, before any object is created. If the patterns of several routes match, only
+    the routes with the most specific pattern receive the packet, where a fixed APID ranks
+    higher than a fixed service, which ranks higher than a fixed subservice. Multiple handlers
+    registered for the same pattern are called in registration order. Packets which are not
+    claimed by any route are dropped without being decoded.
+
+    The routes are resolved in advance whenever routes are registered or removed. The lookup
+    table holds the routes per APID for every service and subservice combination named by the
+    patterns, where all values which are not named by any pattern share one entry. Dispatching a
+    packet requires one lookup for the service and subservice and one for the APID, and the size
+    of the table only depends on the registered patterns, not on the received packets.
+
+    Handlers receive a :py:class:`spacepackets.ecss.tm.LazyPusTelemetry` by default, or the raw
+    packet if the route was registered as a raw route. The lazily decoded packet is created
+    before any handler is called, so a packet which can not be decoded is counted as invalid
+    and is not passed to any handler, including the raw routes.
+
+    >>> from spacepackets.ccsds import CdsShortTimestamp
+    >>> from spacepackets.ecss import PusTelemetry
+    >>> received = []
+    >>> dispatcher = PusTmDispatcher(CdsShortTimestamp.empty())
+    >>> route_id = dispatcher.register(received.append, service=17)
+    >>> dispatcher.dispatch(PusTelemetry(17, 2, CdsShortTimestamp.empty(), apid=0x22).pack())
+    True
+    >>> dispatcher.dispatch(PusTelemetry(3, 25, CdsShortTimestamp.empty(), apid=0x22).pack())
+    False
+    >>> received[0].service, dispatcher.num_dropped
+    (17, 1)
+
+    :param time_reader: Time reader or time reader registry which is passed to the lazily
+        decoded packets.
+    :param measure_latency: Measure the time spent in each handler.
+    :param timer: Timer which returns nanoseconds.
+    """
+
+    def __init__(
+        self,
+        time_reader: Optional[Union[CcsdsTimeProvider, TimeReaderRegistry]],
+        measure_latency: bool = True,
+        timer: Callable[[], int] = time.perf_counter_ns,
+    ):
+        self.time_reader = time_reader
+        self.measure_latency = measure_latency
+        self.timer = timer
+        self._routes: Dict[int, _Route] = {}
+        # Patterns, counters and latencies of all routes ever registered, indexed by route ID.
+        self._patterns: List[RoutePattern] = []
+        # Services and subservices named by at least one pattern.
+        self._services: FrozenSet[int] = frozenset()
+        self._subservices: FrozenSet[int] = frozenset()
+        # Resolved routes per APID, keyed by service << 9 | subservice. The None APID key holds
+        # the routes for all APIDs which are not named by a matching pattern.
+        self._table: Dict[int, Dict[Optional[int], _Resolved]] = {}
+        self._counts = array("Q")
+        self._total_ns = array("Q")
+        self._max_ns = array("Q")
+        #: Number of packets which were not claimed by any route.
+        self.num_dropped = 0
+        #: Number of packets which are too short or not PUS TMs with a secondary header.
+        self.num_invalid = 0
+        self._build_table()
+
+    def register(
+        self,
+        handler: Callable[[Any], Any],
+        apid: Optional[int] = ANY,
+        service: Optional[int] = ANY,
+        subservice: Optional[int] = ANY,
+        raw: bool = False,
+    ) -> int:
+        """Register a handler.
+
+        :param handler: Callable which receives the packet.
+        :param apid: APID or :py:data:`ANY`.
+        :param service: Service or :py:data:`ANY`.
+        :param subservice: Subservice or :py:data:`ANY`.
+        :param raw: Pass the raw packet as a :py:class:`memoryview` to the handler instead of
+            a :py:class:`spacepackets.ecss.tm.LazyPusTelemetry`.
+        :return: Route ID which can be used to remove the route and to query its statistics.
+        """
+        route_id = len(self._patterns)
+        pattern = RoutePattern(apid, service, subservice)
+        self._routes[route_id] = _Route(route_id, pattern, handler, raw)
+        self._patterns.append(pattern)
+        self._counts.append(0)
+        self._total_ns.append(0)
+        self._max_ns.append(0)
+        self._build_table()
+        return route_id
+
+    def unregister(self, route_id: int):
+        """Remove a route. Its statistics are kept.
+
+        :raises KeyError: Unknown route ID.
+        """
+        del self._routes[route_id]
+        self._build_table()
+
+    def _build_table(self):
+        patterns = [route.pattern for route in self._routes.values()]
+        services = {pattern.service for pattern in patterns} - {ANY}
+        subservices = {pattern.subservice for pattern in patterns} - {ANY}
+        table = {}
+        for service in (*services, _OTHER_SERVICE):
+            for subservice in (*subservices, _OTHER_SERVICE):
+                apids = {
+                    pattern.apid
+                    for pattern in patterns
+                    if pattern.apid is not ANY
+                    and pattern.matches(pattern.apid, service, subservice)
+                }
+                by_apid = {
+                    apid: self._resolve(apid, service, subservice) for apid in apids
+                }
+                by_apid[None] = self._resolve(_OTHER_APID, service, subservice)
+                table[(service << 9) | subservice] = by_apid
+        self._services = frozenset(services)
+        self._subservices = frozenset(subservices)
+        self._table = table
+
+    def _resolve(self, apid: int, service: int, subservice: int) -> _Resolved:
+        matching = [
+            route
+            for route in self._routes.values()
+            if route.pattern.matches(apid, service, subservice)
+        ]
+        if not matching:
+            return _NO_ROUTES
+        best = max(route.pattern.specificity for route in matching)
+        routes = tuple(route for route in matching if route.pattern.specificity == best)
+        return _Resolved(routes, not all(route.raw for route in routes))
+
+    def dispatch(self, packet: bytes) -> bool:
+        """Dispatch a single raw packet.
+
+        :param packet: Bytes-like object which contains one packet.
+        :return: True if the packet was passed to at least one handler.
+        """
+        if len(packet) <= _SUBSERVICE_OFFSET or (
+            packet[0] & _TYPE_AND_SEC_HEADER_MASK != _TM_WITH_SEC_HEADER
+        ):
+            self.num_invalid += 1
+            return False
+        apid = ((packet[0] & 0x07) << 8) | packet[1]
+        service = packet[_SERVICE_OFFSET]
+        subservice = packet[_SUBSERVICE_OFFSET]
+        by_apid = self._table.get((service << 9) | subservice)
+        if by_apid is None:
+            # At least one of the fields is not named by any pattern.
+            if service not in self._services:
+                service = _OTHER_SERVICE
+            if subservice not in self._subservices:
+                subservice = _OTHER_SERVICE
+            by_apid = self._table[(service << 9) | subservice]
+        resolved = by_apid.get(apid)
+        if resolved is None:
+            resolved = by_apid[None]
+        if not resolved.routes:
+            self.num_dropped += 1
+            return False
+        lazy_tm = None
+        if resolved.needs_lazy:
+            try:
+                lazy_tm = LazyPusTelemetry(packet, self.time_reader)
+            except ValueError:
+                self.num_invalid += 1
+                return False
+        for route in resolved.routes:
+            arg = memoryview(packet) if route.raw else lazy_tm
+            route_id = route.route_id
+            if self.measure_latency:
+                start = self.timer()
+                route.handler(arg)
+                elapsed = self.timer() - start
+                self._total_ns[route_id] += elapsed
+                if elapsed > self._max_ns[route_id]:
+                    self._max_ns[route_id] = elapsed
+            else:
+                route.handler(arg)
+            self._counts[route_id] += 1
+        return True
+
+    def dispatch_many(self, packets: Iterable[bytes]) -> int:
+        """Dispatch multiple raw packets.
+
+        :return: Number of packets which were passed to at least one handler.
+        """
+        dispatch = self.dispatch
+        return sum(1 for packet in packets if dispatch(packet))
+
+    def stats(self, route_id: int) -> RouteStats:
+        """Statistics of a route.
+
+        :raises KeyError: Unknown route ID.
+        """
+        if not 0 <= route_id < len(self._patterns):
+            raise KeyError(route_id)
+        return RouteStats(
+            self._patterns[route_id],
+            self._counts[route_id],
+            self._total_ns[route_id],
+            self._max_ns[route_id],
+        )
+
+    def all_stats(self) -> List[Tuple[int, RouteStats]]:
+        """Statistics of all registered routes, sorted by route ID."""
+        return [(route_id, self.stats(route_id)) for route_id in sorted(self._routes)]
@@ -1,7 +1,9 @@
 from __future__ import annotations
 import enum
 import struct
+from collections import namedtuple
 from dataclasses import dataclass
+from typing import Any, List, NamedTuple, Optional, Sequence, Tuple
 
 from spacepackets import BytesTooShortError
 from spacepackets.util import IntByteConversion
@@ -145,3 +147,310 @@ class PacketFieldU16(PacketFieldEnum):
 class PacketFieldU32(PacketFieldEnum):
     def __init__(self, val: int):
         super().__init__(pfc=32, val=val)
+
+
+# Number of bits of the integer PFCs. The PFC values of signed integers are a subset of the
+# unsigned ones.
+_INT_PFC_BITS = {
+    PfcUnsigned.FOUR_BIT: 4,
+    PfcUnsigned.FIVE_BIT: 5,
+    PfcUnsigned.SIX_BIT: 6,
+    PfcUnsigned.SEVEN_BIT: 7,
+    PfcUnsigned.ONE_BYTE: 8,
+    PfcUnsigned.NINE_BIT: 9,
+    PfcUnsigned.TEN_BIT: 10,
+    PfcUnsigned.ELEVEN_BIT: 11,
+    PfcUnsigned.TWELVE_BIT: 12,
+    PfcUnsigned.THIRTEEN_BIT: 13,
+    PfcUnsigned.FOURTEEN_BIT: 14,
+    PfcUnsigned.FIFTEEN_BIT: 15,
+    PfcUnsigned.TWO_BYTES: 16,
+    PfcUnsigned.THREE_BYTES: 24,
+    PfcUnsigned.FOUR_BYTES: 32,
+    PfcUnsigned.SIX_BYTES: 48,
+    PfcUnsigned.EIGHT_BYTES: 64,
+}
+_UNSIGNED_ONLY_PFC_BITS = {
+    PfcUnsigned.ONE_BIT: 1,
+    PfcUnsigned.TWO_BIT: 2,
+    PfcUnsigned.THREE_BIT: 3,
+}
+_REAL_FORMATS = {
+    PfcReal.FLOAT_SIMPLE_PRECISION_IEEE: ("f", 32),
+    PfcReal.DOUBLE_PRECISION_IEEE: ("d", 64),
+}
+_INT_FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+
+class FieldDef(NamedTuple):
+    """Definition of a single parameter inside a parameter block."""
+
+    name: str
+    ptc: int
+    pfc: int
+
+
+class _FieldLayout(NamedTuple):
+    bits: int
+    # Struct format for fields which are not integers, None for integers.
+    fmt: Optional[str]
+    signed: bool
+    boolean: bool
+
+
+def _field_layout(field: FieldDef) -> _FieldLayout:
+    ptc, pfc = field.ptc, field.pfc
+    if ptc == Ptc.BOOLEAN and pfc == 0:
+        return _FieldLayout(1, None, False, True)
+    if ptc == Ptc.ENUMERATED and 1 <= pfc <= 64:
+        return _FieldLayout(pfc, None, False, False)
+    if ptc == Ptc.UNSIGNED:
+        bits = _INT_PFC_BITS.get(pfc, _UNSIGNED_ONLY_PFC_BITS.get(pfc))
+        if bits is not None:
+            return _FieldLayout(bits, None, False, False)
+    elif ptc == Ptc.SIGNED:
+        if pfc in _INT_PFC_BITS:
+            return _FieldLayout(_INT_PFC_BITS[pfc], None, True, False)
+    elif ptc == Ptc.REAL:
+        if pfc in _REAL_FORMATS:
+            fmt, bits = _REAL_FORMATS[pfc]
+            return _FieldLayout(bits, fmt, False, False)
+    elif ptc in (Ptc.OCTET_STRING, Ptc.CHARACTER_STRING):
+        if pfc > 0:
+            return _FieldLayout(pfc * 8, f"{pfc}s", False, False)
+    raise ValueError(f"unsupported PTC {ptc} and PFC {pfc} for field {field.name}")
+
+
+class _BitField(NamedTuple):
+    shift: int
+    mask: int
+    signed: bool
+    boolean: bool
+
+
+# Kinds of the items of the compiled struct.
+_PLAIN = 0
+_BYTES_INT = 1
+_BIT_GROUP = 2
+
+
+class _Slot(NamedTuple):
+    kind: int
+    # Width of integers which are unpacked as bytes, 0 otherwise.
+    width: int
+    signed: bool
+    # Fields packed into a group of bits, starting with the most significant bits.
+    bit_fields: Tuple[_BitField, ...]
+
+
+_PLAIN_SLOT = _Slot(_PLAIN, 0, False, ())
+
+
+class FieldCodec:
+    """Codec for a block of consecutive parameters described by their PTC and PFC, which is
+    compiled into a single :py:class:`struct.Struct` on construction.
+
+    Supported are booleans, enumerated, unsigned and signed integers, IEEE floating point numbers
+    and fixed-length octet and character strings, where the PFC of strings is the number of
+    octets. Parameters which are not byte-aligned are combined into groups of bits which end on a
+    byte boundary. Each group is read as one integer and split with precomputed shifts and masks,
+    with the first parameter in the most significant bits. Integers with 3 or 6 bytes are read as
+    bytes and converted. Blocks which only consist of byte-aligned 1, 2, 4 and 8 byte integers,
+    floating point numbers and strings are decoded by the struct alone.
+
+    >>> codec = FieldCodec([
+    ...     FieldDef("valid", Ptc.BOOLEAN, 0),
+    ...     FieldDef("mode", Ptc.UNSIGNED, PfcUnsigned.SEVEN_BIT),
+    ...     FieldDef("temp", Ptc.SIGNED, PfcSigned.TWO_BYTES),
+    ... ])
+    >>> codec.size
+    3
+    >>> codec.unpack_from(bytes([0x85, 0xff, 0xfe]))
+    FieldRecord(valid=True, mode=5, temp=-2)
+    >>> codec.pack([True, 5, -2]).hex()
+    '85fffe'
+
+    :param fields: Ordered field definitions. Any named tuple with a name, a PTC and a PFC can be
+        used, for example :py:class:`spacepackets.ecss.pus_3_hk.HkParam`.
+    :param record_name: Name of the named tuple type of the decoded records.
+    :raises ValueError: Unsupported PTC or PFC, a PFC which is not byte-aligned for a type
+        other than integers or booleans, a block which does not end on a byte boundary or invalid
+        field names.
+    """
+
+    def __init__(self, fields: Sequence[FieldDef], record_name: str = "FieldRecord"):
+        self.fields = tuple(fields)
+        fmt = ["!"]
+        slots: List[_Slot] = []
+        group: List[_FieldLayout] = []
+        group_bits = 0
+        for field in self.fields:
+            layout = _field_layout(field)
+            if not group and layout.bits % 8 == 0:
+                num_bytes = layout.bits // 8
+                if layout.fmt is not None:
+                    fmt.append(layout.fmt)
+                    slots.append(_PLAIN_SLOT)
+                    continue
+                if num_bytes in _INT_FORMATS:
+                    char = _INT_FORMATS[num_bytes]
+                    fmt.append(char.lower() if layout.signed else char)
+                    slots.append(_PLAIN_SLOT)
+                    continue
+                fmt.append(f"{num_bytes}s")
+                slots.append(_Slot(_BYTES_INT, num_bytes, layout.signed, ()))
+                continue
+            if layout.fmt is not None:
+                raise ValueError(
+                    f"field {field.name} does not start on a byte boundary"
+                )
+            group.append(layout)
+            group_bits += layout.bits
+            if group_bits % 8 == 0:
+                fmt_char, slot = self._compile_group(group, group_bits)
+                fmt.append(fmt_char)
+                slots.append(slot)
+                group = []
+                group_bits = 0
+        if group:
+            raise ValueError("fields do not end on a byte boundary")
+        self.layout = struct.Struct("".join(fmt))
+        self.record_type = namedtuple(
+            record_name, [field.name for field in self.fields]
+        )
+        # No conversion is required if the struct decodes all fields directly.
+        self._slots: Optional[Tuple[_Slot, ...]] = (
+            None if all(slot.kind == _PLAIN for slot in slots) else tuple(slots)
+        )
+
+    @staticmethod
+    def _compile_group(group: List[_FieldLayout], group_bits: int) -> Tuple[str, _Slot]:
+        bit_fields = []
+        shift = group_bits
+        for layout in group:
+            shift -= layout.bits
+            bit_fields.append(
+                _BitField(shift, (1 << layout.bits) - 1, layout.signed, layout.boolean)
+            )
+        num_bytes = group_bits // 8
+        if num_bytes in _INT_FORMATS:
+            return _INT_FORMATS[num_bytes], _Slot(
+                _BIT_GROUP, 0, False, tuple(bit_fields)
+            )
+        return f"{num_bytes}s", _Slot(_BIT_GROUP, num_bytes, False, tuple(bit_fields))
+
+    @property
+    def size(self) -> int:
+        """Size of the parameter block in bytes."""
+        return self.layout.size
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return self.record_type._fields
+
+    def unpack_from(self, data: bytes, offset: int = 0) -> Any:
+        """Decode a parameter block into a record.
+
+        :param data: Any object supporting the buffer protocol.
+        :param offset: Offset of the parameter block.
+        :raises BytesTooShortError: Data too short for the parameter block.
+        """
+        if len(data) - offset < self.layout.size:
+            raise BytesTooShortError(self.layout.size, len(data) - offset)
+        raw = self.layout.unpack_from(data, offset)
+        if self._slots is None:
+            return self.record_type._make(raw)
+        values = []
+        append = values.append
+        for slot, value in zip(self._slots, raw):
+            kind = slot.kind
+            if kind == _PLAIN:
+                append(value)
+            elif kind == _BYTES_INT:
+                append(int.from_bytes(value, "big", signed=slot.signed))
+            else:
+                if slot.width:
+                    value = int.from_bytes(value, "big")
+                for bit_field in slot.bit_fields:
+                    field_value = (value >> bit_field.shift) & bit_field.mask
+                    if bit_field.boolean:
+                        field_value = bool(field_value)
+                    elif bit_field.signed and field_value > bit_field.mask >> 1:
+                        field_value -= bit_field.mask + 1
+                    append(field_value)
+        return self.record_type._make(values)
+
+    def pack_into(self, buf: bytearray, offset: int, values: Sequence[Any]) -> int:
+        """Encode a parameter block into a buffer.
+
+        :param buf: Writable buffer.
+        :param offset: Offset of the parameter block.
+        :param values: Values in the order of the fields, for example a record.
+        :raises BytesTooShortError: Buffer too short.
+        :raises ValueError: Wrong number of values or a value which does not fit into its field.
+        :return: Number of bytes written.
+        """
+        if len(values) != len(self.fields):
+            raise ValueError(
+                f"expected {len(self.fields)} values, got {len(values)} values"
+            )
+        if len(buf) - offset < self.layout.size:
+            raise BytesTooShortError(self.layout.size, len(buf) - offset)
+        raw = values if self._slots is None else self._to_raw(values)
+        try:
+            self.layout.pack_into(buf, offset, *raw)
+        except struct.error as e:
+            raise ValueError(f"invalid field value: {e}") from e
+        return self.layout.size
+
+    def _to_raw(self, values: Sequence[Any]) -> List[Any]:
+        raw: List[Any] = []
+        idx = 0
+        for slot in self._slots:
+            kind = slot.kind
+            if kind == _PLAIN:
+                raw.append(values[idx])
+                idx += 1
+            elif kind == _BYTES_INT:
+                try:
+                    raw.append(
+                        values[idx].to_bytes(slot.width, "big", signed=slot.signed)
+                    )
+                except OverflowError as e:
+                    raise ValueError(
+                        f"value {values[idx]} of field {self.fields[idx].name} out of range"
+                    ) from e
+                idx += 1
+            else:
+                group_value = 0
+                for bit_field in slot.bit_fields:
+                    value = values[idx]
+                    if bit_field.boolean:
+                        value = 1 if value else 0
+                    elif bit_field.signed:
+                        if (
+                            not -(bit_field.mask >> 1) - 1
+                            <= value
+                            <= bit_field.mask >> 1
+                        ):
+                            raise ValueError(
+                                f"value {value} of field {self.fields[idx].name} out of range"
+                            )
+                    elif not 0 <= value <= bit_field.mask:
+                        raise ValueError(
+                            f"value {value} of field {self.fields[idx].name} out of range"
+                        )
+                    group_value |= (value & bit_field.mask) << bit_field.shift
+                    idx += 1
+                raw.append(
+                    group_value.to_bytes(slot.width, "big")
+                    if slot.width
+                    else group_value
+                )
+        return raw
+
+    def pack(self, values: Sequence[Any]) -> bytearray:
+        """Encode a parameter block. See :py:meth:`pack_into` for details."""
+        buf = bytearray(self.layout.size)
+        self.pack_into(buf, 0, values)
+        return buf
@@ -1,6 +1,580 @@
+"""Definitions for the PUS Service 15 On-board Storage and Retrieval service and a time-indexed
+telemetry packet store which implements the retrieval by time range and delete up to semantics.
+"""
+from __future__ import annotations
+
+import bisect
 import enum
+import logging
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple, Union
+
+from spacepackets.ccsds.archive import _array_to_be_bytes, _load_array
+from spacepackets.ccsds.spacepacket import SPACE_PACKET_HEADER_SIZE
+from spacepackets.ccsds.time import CdsShortTimestamp
+from spacepackets.ecss.conf import FETCH_GLOBAL_APID
+from spacepackets.ecss.defs import PusService
+from spacepackets.ecss.tc import PusTelecommand
+from spacepackets.ecss.tm import PusTmSecondaryHeader
+from spacepackets.exceptions import BytesTooShortError
 
 
 class Subservice(enum.IntEnum):
     RETRIEVAL_BY_TIME_RANGE = 9
     DELETE_UP_TO = 11
+
+
+#: Milliseconds per day, used to convert CDS short timestamps to sortable time keys.
+MS_PER_DAY = 86_400_000
+# Offset of the time stamp inside a PUS TM.
+_TIME_STAMP_OFFSET = SPACE_PACKET_HEADER_SIZE + PusTmSecondaryHeader.MIN_LEN
+_STAMP_LEN = CdsShortTimestamp.TIMESTAMP_SIZE
+_STATE_STRUCT = struct.Struct("!Q")
+_SEGMENT_INDEX_MAGIC = b"TMSI"
+_SEGMENT_INDEX_VERSION = 1
+# Magic, version, indexed segment length, number of packets
+_SEGMENT_INDEX_HEADER = struct.Struct("!4sBxxxQI")
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def cds_time_key(stamp: CdsShortTimestamp) -> int:
+    """Convert a CDS short timestamp into milliseconds since the CCSDS epoch."""
+    return stamp.ccsds_days * MS_PER_DAY + stamp.ms_of_day
+
+
+def _unpack_store_id_and_stamps(
+    app_data: bytes, store_id_len: int, num_stamps: int
+) -> Tuple[bytes, List[CdsShortTimestamp]]:
+    expected_len = store_id_len + num_stamps * _STAMP_LEN
+    if len(app_data) < expected_len:
+        raise BytesTooShortError(expected_len, len(app_data))
+    stamps = []
+    for idx in range(num_stamps):
+        offset = store_id_len + idx * _STAMP_LEN
+        stamps.append(CdsShortTimestamp.unpack(app_data[offset : offset + _STAMP_LEN]))
+    return bytes(app_data[:store_id_len]), stamps
+
+
+class RetrievalByTimeRange(NamedTuple):
+    """Application data of a retrieval by time range TC. The packet store ID has a fixed,
+    mission-specific length and is followed by the packed start and end time stamps."""
+
+    store_id: bytes
+    start: CdsShortTimestamp
+    end: CdsShortTimestamp
+
+    def pack_app_data(self) -> bytes:
+        return self.store_id + self.start.pack() + self.end.pack()
+
+    @classmethod
+    def unpack_app_data(
+        cls, app_data: bytes, store_id_len: int
+    ) -> RetrievalByTimeRange:
+        """
+        :raises BytesTooShortError: Application data too short.
+        :raises ValueError: Invalid time stamps.
+        """
+        store_id, (start, end) = _unpack_store_id_and_stamps(app_data, store_id_len, 2)
+        return cls(store_id, start, end)
+
+
+class DeleteUpTo(NamedTuple):
+    """Application data of a delete up to TC. The packet store ID has a fixed,
+    mission-specific length and is followed by the packed time stamp."""
+
+    store_id: bytes
+    time: CdsShortTimestamp
+
+    def pack_app_data(self) -> bytes:
+        return self.store_id + self.time.pack()
+
+    @classmethod
+    def unpack_app_data(cls, app_data: bytes, store_id_len: int) -> DeleteUpTo:
+        """
+        :raises BytesTooShortError: Application data too short.
+        :raises ValueError: Invalid time stamp.
+        """
+        store_id, (time,) = _unpack_store_id_and_stamps(app_data, store_id_len, 1)
+        return cls(store_id, time)
+
+
+def create_retrieval_by_time_range_tc(
+    store_id: bytes,
+    start: CdsShortTimestamp,
+    end: CdsShortTimestamp,
+    apid: int = FETCH_GLOBAL_APID,
+    seq_count: int = 0,
+) -> PusTelecommand:
+    """Create a TC which requests all packets of a packet store with a time stamp inside
+    the given time range."""
+    return PusTelecommand(
+        service=PusService.S15_TM_STORAGE,
+        subservice=Subservice.RETRIEVAL_BY_TIME_RANGE,
+        app_data=RetrievalByTimeRange(store_id, start, end).pack_app_data(),
+        apid=apid,
+        seq_count=seq_count,
+    )
+
+
+def create_delete_up_to_tc(
+    store_id: bytes,
+    time: CdsShortTimestamp,
+    apid: int = FETCH_GLOBAL_APID,
+    seq_count: int = 0,
+) -> PusTelecommand:
+    """Create a TC which deletes all packets of a packet store with a time stamp before the
+    given time."""
+    return PusTelecommand(
+        service=PusService.S15_TM_STORAGE,
+        subservice=Subservice.DELETE_UP_TO,
+        app_data=DeleteUpTo(store_id, time).pack_app_data(),
+        apid=apid,
+        seq_count=seq_count,
+    )
+
+
+class TmPacketStore:
+    """Telemetry packet store which keeps raw PUS TM packets in append-only segment files inside
+    a directory, similar to an on-board packet store.
+
+    All packets are indexed by the CDS short timestamp of their secondary header. The index
+    consists of flat arrays sorted by time, so a time range is located with two binary searches.
+    Packets appended out of order are sorted lazily before the next query. Packets are returned
+    as read-only :py:class:`memoryview` slices of memory-mapped segment files, so no data is
+    copied. These views need to be released before the store is closed.
+
+    A new segment file is started once the current one exceeds the segment size. The time keys
+    and offsets of each segment are persisted in an index file with the :py:attr:`INDEX_SUFFIX`
+    next to the segment, so re-opening the store only scans packets which were appended after
+    the index file was written. Deleting up to a given time removes all segment files which only
+    contain older packets, and hides the older packets of the remaining segments. The deletion
+    time is persisted, so the hidden packets are not restored when the store is re-opened.
+
+    An incomplete packet at the end of a segment, for example after a crash, is logged and
+    skipped. The segment is truncated to its last complete packet if ``truncate_torn_tail`` is
+    set, otherwise the packets appended afterwards are stored in a new segment.
+
+    >>> import tempfile
+    >>> from spacepackets.ecss import PusTelemetry
+    >>> with tempfile.TemporaryDirectory() as directory:
+    ...     with TmPacketStore(directory) as store:
+    ...         for ms in (3000, 1000, 2000):
+    ...             tm = PusTelemetry(3, 25, CdsShortTimestamp(100, ms), apid=0x22)
+    ...             store.append(tm.pack())
+    ...         store.delete_up_to(CdsShortTimestamp(100, 1500))
+    ...         [len(p) for p in store.packets_in_time_range(CdsShortTimestamp(100, 0),
+    ...                                                      CdsShortTimestamp(100, 2000))]
+    1
+    [22]
+
+    :param directory: Directory of the segment files. It is created if it does not exist.
+    :param store_id: Packet store ID which is checked by :py:meth:`handle_tc`.
+    :param segment_size: Size in bytes after which a new segment file is started.
+    :param truncate_torn_tail: Truncate segments which end with an incomplete packet.
+    """
+
+    SEGMENT_SUFFIX = ".seg"
+    INDEX_SUFFIX = ".idx"
+    STATE_FILE_NAME = "deleted_up_to"
+
+    def __init__(
+        self,
+        directory: Union[str, os.PathLike],
+        store_id: bytes = bytes(),
+        segment_size: int = 64 * 1024 * 1024,
+        truncate_torn_tail: bool = False,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.store_id = store_id
+        self.segment_size = segment_size
+        self.truncate_torn_tail = truncate_torn_tail
+        # Index sorted by time key, except for packets appended out of order while _sorted is
+        # False. The entries before _first are deleted.
+        self._keys = array("Q")
+        self._segments = array("L")
+        self._offsets = array("Q")
+        self._first = 0
+        self._sorted = True
+        self._deleted_up_to = 0
+        self._segment_max_keys: Dict[int, int] = {}
+        # All mappings of a segment. The last one is the current mapping, the others are
+        # mappings of a smaller segment which might still be referenced by packet views.
+        self._maps: Dict[int, List[Tuple[mmap.mmap, memoryview]]] = {}
+        # Segments which are deleted once no packet views reference them anymore.
+        self._removed_segments: List[int] = []
+        self._active_segment = 0
+        self._active_file = None
+        self._active_size = 0
+        # Time keys and offsets of the active segment, which are persisted in its index file.
+        self._active_keys = array("Q")
+        self._active_offsets = array("Q")
+        self._active_indexed_size = 0
+        self._dirty = False
+        state_path = self.directory / self.STATE_FILE_NAME
+        if state_path.exists():
+            self._deleted_up_to = _STATE_STRUCT.unpack(state_path.read_bytes())[0]
+        self._load_segments()
+        self._open_active_segment()
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.directory / f"{segment:08d}{self.SEGMENT_SUFFIX}"
+
+    def _index_path(self, segment: int) -> Path:
+        return self.directory / f"{segment:08d}{self.INDEX_SUFFIX}"
+
+    def _load_segments(self):
+        segments = sorted(
+            int(path.stem) for path in self.directory.glob(f"*{self.SEGMENT_SUFFIX}")
+        )
+        for segment in segments:
+            keys, offsets, size, torn = self._load_segment(segment)
+            self._keys.extend(keys)
+            self._segments.extend(array("L", [segment]) * len(keys))
+            self._offsets.extend(offsets)
+            if keys:
+                self._segment_max_keys[segment] = max(keys)
+            if torn:
+                # Appending to the torn segment would make the incomplete packet unreadable.
+                self._active_segment = segment + 1
+                self._active_size = 0
+                self._active_keys, self._active_offsets = array("Q"), array("Q")
+            else:
+                self._active_segment = segment
+                self._active_size = size
+                self._active_keys, self._active_offsets = keys, offsets
+            self._active_indexed_size = self._active_size
+        self._sorted = False
+        self._sort()
+        self._first = bisect.bisect_left(self._keys, self._deleted_up_to)
+        self._remove_old_segments()
+
+    def _load_segment(self, segment: int) -> Tuple[array, array, int, bool]:
+        """Load the index of a segment and index the packets which were appended after the
+        index was stored.
+
+        :return: Time keys, offsets, length of the complete packets and whether the segment
+            ends with an incomplete packet which was not truncated.
+        """
+        path = self._segment_path(segment)
+        keys = array("Q")
+        offsets = array("Q")
+        size = path.stat().st_size
+        start = self._load_segment_index(segment, size, keys, offsets)
+        if start == size:
+            return keys, offsets, size, False
+        with open(path, "rb") as file:
+            file.seek(start)
+            data = file.read()
+        offset = 0
+        while offset + SPACE_PACKET_HEADER_SIZE <= len(data):
+            packet_len = (
+                SPACE_PACKET_HEADER_SIZE
+                + ((data[offset + 4] << 8) | data[offset + 5])
+                + 1
+            )
+            if offset + packet_len > len(data):
+                break
+            keys.append(self._time_key(data, offset))
+            offsets.append(start + offset)
+            offset += packet_len
+        end = start + offset
+        self._store_segment_index(segment, end, keys, offsets)
+        if end == size:
+            return keys, offsets, end, False
+        if self.truncate_torn_tail:
+            _LOGGER.warning(
+                "truncating incomplete packet with %d bytes at the end of %s",
+                size - end,
+                path,
+            )
+            os.truncate(path, end)
+            return keys, offsets, end, False
+        _LOGGER.warning(
+            "skipping incomplete packet with %d bytes at the end of %s",
+            size - end,
+            path,
+        )
+        return keys, offsets, end, True
+
+    def _load_segment_index(
+        self, segment: int, size: int, keys: array, offsets: array
+    ) -> int:
+        """Load the index file of a segment.
+
+        :return: Length of the indexed part of the segment, 0 if the index file does not exist
+            or is invalid.
+        """
+        index_path = self._index_path(segment)
+        if not index_path.exists():
+            return 0
+        raw = index_path.read_bytes()
+        if len(raw) < _SEGMENT_INDEX_HEADER.size:
+            return 0
+        magic, version, indexed_len, num_packets = _SEGMENT_INDEX_HEADER.unpack_from(
+            raw
+        )
+        if (
+            magic != _SEGMENT_INDEX_MAGIC
+            or version != _SEGMENT_INDEX_VERSION
+            or indexed_len > size
+        ):
+            return 0
+        try:
+            current_idx = _load_array(
+                keys, raw, _SEGMENT_INDEX_HEADER.size, num_packets
+            )
+            _load_array(offsets, raw, current_idx, num_packets)
+        except ValueError:
+            del keys[:]
+            del offsets[:]
+            return 0
+        return indexed_len
+
+    def _store_segment_index(
+        self, segment: int, indexed_len: int, keys: array, offsets: array
+    ):
+        with open(self._index_path(segment), "wb") as index_file:
+            index_file.write(
+                _SEGMENT_INDEX_HEADER.pack(
+                    _SEGMENT_INDEX_MAGIC, _SEGMENT_INDEX_VERSION, indexed_len, len(keys)
+                )
+            )
+            index_file.write(_array_to_be_bytes(keys))
+            index_file.write(_array_to_be_bytes(offsets))
+
+    def _store_active_index(self):
+        if self._active_size != self._active_indexed_size:
+            self._store_segment_index(
+                self._active_segment,
+                self._active_size,
+                self._active_keys,
+                self._active_offsets,
+            )
+            self._active_indexed_size = self._active_size
+
+    def _open_active_segment(self):
+        self._active_file = open(self._segment_path(self._active_segment), "ab")
+
+    @staticmethod
+    def _time_key(data: bytes, offset: int) -> int:
+        ccsds_days, ms_of_day = CdsShortTimestamp.unpack_from_raw(
+            data[offset + _TIME_STAMP_OFFSET : offset + _TIME_STAMP_OFFSET + _STAMP_LEN]
+        )
+        return ccsds_days * MS_PER_DAY + ms_of_day
+
+    def _sort(self):
+        """Sort the entries after _first by their time key. The sort is stable, so packets
+        with the same time key keep the order in which they were appended."""
+        if self._sorted:
+            return
+        first = self._first
+        keys = self._keys
+        order = sorted(range(first, len(keys)), key=keys.__getitem__)
+        self._keys[first:] = array("Q", [keys[idx] for idx in order])
+        self._segments[first:] = array("L", [self._segments[idx] for idx in order])
+        self._offsets[first:] = array("Q", [self._offsets[idx] for idx in order])
+        self._sorted = True
+
+    def __len__(self):
+        return len(self._keys) - self._first
+
+    def __enter__(self) -> TmPacketStore:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            self.close()
+        except BufferError:
+            # Do not mask the original exception. Packet views might still be referenced by
+            # its traceback.
+            if exc_type is None:
+                raise
+
+    def flush(self):
+        """Flush appended packets to the segment file."""
+        if self._dirty:
+            self._active_file.flush()
+            self._dirty = False
+
+    def close(self):
+        """Close the store and store the index of the active segment.
+
+        :raises BufferError: Packet views returned by this store are still alive.
+        """
+        self._active_file.close()
+        self._store_active_index()
+        for segment in list(self._maps):
+            self._close_maps(segment)
+        self._delete_removed_segments()
+
+    def append(self, packet: bytes):
+        """Append a raw PUS TM packet with a CDS short timestamp.
+
+        :raises BytesTooShortError: Packet too short.
+        :raises ValueError: Invalid packet length or time stamp.
+        """
+        if len(packet) < SPACE_PACKET_HEADER_SIZE:
+            raise BytesTooShortError(SPACE_PACKET_HEADER_SIZE, len(packet))
+        packet_len = SPACE_PACKET_HEADER_SIZE + ((packet[4] << 8) | packet[5]) + 1
+        if packet_len != len(packet):
+            raise ValueError(
+                f"packet length {len(packet)} does not match length field {packet_len}"
+            )
+        key = self._time_key(packet, 0)
+        if self._active_size > 0 and self._active_size + packet_len > self.segment_size:
+            self._active_file.close()
+            self._dirty = False
+            self._store_active_index()
+            self._active_segment += 1
+            self._active_size = 0
+            self._active_indexed_size = 0
+            self._active_keys = array("Q")
+            self._active_offsets = array("Q")
+            self._open_active_segment()
+        self._active_file.write(packet)
+        self._dirty = True
+        keys = self._keys
+        if self._sorted and len(keys) > self._first and key < keys[-1]:
+            self._sorted = False
+        keys.append(key)
+        self._segments.append(self._active_segment)
+        self._offsets.append(self._active_size)
+        self._active_keys.append(key)
+        self._active_offsets.append(self._active_size)
+        if key > self._segment_max_keys.get(self._active_segment, -1):
+            self._segment_max_keys[self._active_segment] = key
+        self._active_size += packet_len
+
+    def _segment_view(self, segment: int, min_len: int) -> memoryview:
+        maps = self._maps.get(segment)
+        if maps and len(maps[-1][1]) >= min_len:
+            return maps[-1][1]
+        if segment == self._active_segment:
+            self.flush()
+        with open(self._segment_path(segment), "rb") as file:
+            mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mapping)
+        # Previous mappings of the grown segment are kept until they can be closed, because
+        # packet views might still reference them.
+        self._maps.setdefault(segment, []).append((mapping, view))
+        return view
+
+    def _close_maps(self, segment: int):
+        """Close all mappings of a segment.
+
+        :raises BufferError: Packet views of the segment are still alive.
+        """
+        maps = self._maps[segment]
+        while maps:
+            mapping, view = maps[-1]
+            view.release()
+            mapping.close()
+            maps.pop()
+        del self._maps[segment]
+
+    def _packet_at(self, idx: int) -> memoryview:
+        offset = self._offsets[idx]
+        view = self._segment_view(
+            self._segments[idx], offset + SPACE_PACKET_HEADER_SIZE
+        )
+        packet_len = (
+            SPACE_PACKET_HEADER_SIZE + ((view[offset + 4] << 8) | view[offset + 5]) + 1
+        )
+        if offset + packet_len > len(view):
+            view = self._segment_view(self._segments[idx], offset + packet_len)
+        return view[offset : offset + packet_len]
+
+    def packets_in_time_range(
+        self, start: CdsShortTimestamp, end: CdsShortTimestamp
+    ) -> List[memoryview]:
+        """Retrieve all packets with a time stamp inside the given range, sorted by time.
+        Packets with the same time stamp are returned in the order they were appended.
+
+        :param start: Start of the range, inclusive.
+        :param end: End of the range, inclusive.
+        """
+        self._sort()
+        first = bisect.bisect_left(self._keys, cds_time_key(start), self._first)
+        last = bisect.bisect_right(self._keys, cds_time_key(end), first)
+        return [self._packet_at(idx) for idx in range(first, last)]
+
+    def delete_up_to(self, time: CdsShortTimestamp) -> int:
+        """Delete all packets with a time stamp before the given time.
+
+        Segment files which are still referenced by packet views are deleted once these views
+        were released, at the latest when the store is closed.
+
+        :return: Number of deleted packets.
+        """
+        key = cds_time_key(time)
+        if key <= self._deleted_up_to:
+            return 0
+        self._sort()
+        end = bisect.bisect_left(self._keys, key, self._first)
+        num_deleted = end - self._first
+        self._first = end
+        self._deleted_up_to = key
+        (self.directory / self.STATE_FILE_NAME).write_bytes(_STATE_STRUCT.pack(key))
+        self._remove_old_segments()
+        if self._first > len(self._keys) // 2:
+            del self._keys[: self._first]
+            del self._segments[: self._first]
+            del self._offsets[: self._first]
+            self._first = 0
+        return num_deleted
+
+    def _remove_old_segments(self):
+        for segment, max_key in list(self._segment_max_keys.items()):
+            if max_key < self._deleted_up_to and segment != self._active_segment:
+                del self._segment_max_keys[segment]
+                self._removed_segments.append(segment)
+        self._delete_removed_segments()
+
+    def _delete_removed_segments(self):
+        remaining = []
+        for segment in self._removed_segments:
+            if segment in self._maps:
+                try:
+                    # The mappings are closed first, because mapped files can not be deleted
+                    # on all platforms.
+                    self._close_maps(segment)
+                except BufferError:
+                    remaining.append(segment)
+                    continue
+            self._segment_path(segment).unlink()
+            index_path = self._index_path(segment)
+            if index_path.exists():
+                index_path.unlink()
+        self._removed_segments = remaining
+
+    def handle_tc(self, tc: PusTelecommand) -> List[memoryview]:
+        """Execute a retrieval by time range or delete up to TC addressed to this store.
+
+        :return: Retrieved packets. This list is empty for delete up to TCs.
+        :raises ValueError: Unsupported TC or different packet store ID.
+        """
+        store_id_len = len(self.store_id)
+        if tc.service != PusService.S15_TM_STORAGE:
+            raise ValueError(f"TC with service {tc.service} is not a storage TC")
+        if tc.subservice == Subservice.RETRIEVAL_BY_TIME_RANGE:
+            retrieval = RetrievalByTimeRange.unpack_app_data(tc.app_data, store_id_len)
+            self._check_store_id(retrieval.store_id)
+            return self.packets_in_time_range(retrieval.start, retrieval.end)
+        if tc.subservice == Subservice.DELETE_UP_TO:
+            delete = DeleteUpTo.unpack_app_data(tc.app_data, store_id_len)
+            self._check_store_id(delete.store_id)
+            self.delete_up_to(delete.time)
+            return []
+        raise ValueError(f"unsupported storage subservice {tc.subservice}")
+
+    def _check_store_id(self, store_id: bytes):
+        if store_id != self.store_id:
+            raise ValueError(
+                f"packet store ID {store_id!r} does not match {self.store_id!r}"
+            )
@@ -61,6 +61,12 @@ class Service17Tm(AbstractPusTm):
     def pack(self) -> bytearray:
         return self.pus_tm.pack()
 
+    def pack_into(self, buf: bytearray, offset: int = 0) -> int:
+        return self.pus_tm.pack_into(buf, offset)
+
+    def packed_len(self) -> int:
+        return self.pus_tm.packed_len()
+
     @classmethod
     def __empty(cls, time_provider: Optional[CcsdsTimeProvider]) -> Service17Tm:
         return cls(subservice=0, time_provider=time_provider)
@@ -3,16 +3,19 @@
 from __future__ import annotations
 
 import enum
+from array import array
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Sequence
 
 from spacepackets.ccsds import SpacePacketHeader
+from spacepackets.ccsds.spacepacket import SPACE_PACKET_HEADER_SIZE
 from spacepackets.ccsds.time import CcsdsTimeProvider
 from spacepackets.ecss import PusTelecommand
-from spacepackets.ecss.conf import FETCH_GLOBAL_APID
+from spacepackets.ecss.conf import FETCH_GLOBAL_APID, PusVersion
 from spacepackets.ecss.defs import PusService
 from spacepackets.ecss.fields import PacketFieldEnum
-from spacepackets.ecss.tm import PusTelemetry, AbstractPusTm
+from spacepackets.crc import crc16_ccitt
+from spacepackets.ecss.tm import PusTelemetry, AbstractPusTm, PusTmSecondaryHeader
 from .exceptions import TmSrcDataTooShortError
 
 from .req_id import RequestId
@@ -152,6 +155,12 @@ class Service1Tm(AbstractPusTm):
     def pack(self) -> bytearray:
         return self.pus_tm.pack()
 
+    def pack_into(self, buf: bytearray, offset: int = 0) -> int:
+        return self.pus_tm.pack_into(buf, offset)
+
+    def packed_len(self) -> int:
+        return self.pus_tm.packed_len()
+
     @classmethod
     def __empty(cls, time_provider: Optional[CcsdsTimeProvider]) -> Service1Tm:
         return cls(subservice=Subservice.INVALID, time_provider=time_provider)
@@ -288,6 +297,194 @@ class Service1Tm(AbstractPusTm):
         )
 
 
+# Type code of the 32 bit columns of Service1Batch. The size of the C types behind the type codes
+# depends on the platform, for example "L" has 64 bits on most 64 bit Unix platforms while "I"
+# has 16 bits on some embedded platforms.
+_U32_TYPECODE = "I" if array("I").itemsize == 4 else "L"
+if array(_U32_TYPECODE).itemsize != 4:
+    raise ImportError("no 32 bit unsigned array type code available on this platform")
+
+
+class Service1Batch:
+    """Compact column representation of many decoded service 1 verification reports.
+
+    No :py:class:`Service1Tm` instances are created. Each report is described by one entry in
+    each of the :py:class:`array.array` columns. The subservice column contains 8 bit values,
+    the failure data offsets 64 bit values and all other columns 32 bit values, independent of
+    the platform. The columns can be passed to
+    :py:meth:`spacepackets.ecss.pus_verificator.PusVerificator.add_tm_batch` directly, or be
+    converted to NumPy arrays without copying with :py:func:`numpy.frombuffer`.
+
+    Packets which are not valid service 1 reports are skipped and only counted in
+    :py:attr:`num_invalid`. This includes packets with an invalid CRC if the CRC is checked.
+
+    >>> from spacepackets.ccsds import CdsShortTimestamp
+    >>> from spacepackets.ecss import PusTelecommand
+    >>> tc = PusTelecommand(service=17, subservice=1, apid=0x22, seq_count=17)
+    >>> stamp = CdsShortTimestamp.empty()
+    >>> reports = [
+    ...     create_acceptance_success_tm(tc, stamp).pack(),
+    ...     create_step_success_tm(tc, StepId.with_byte_size(1, 4), stamp).pack(),
+    ... ]
+    >>> batch = Service1Batch.from_packets(reports, UnpackParams(stamp))
+    >>> batch.subservice.tolist(), batch.step_id.tolist()
+    ([1, 5], [0, 4])
+    >>> hex(batch.req_id[0])
+    '0x1822c011'
+    """
+
+    #: Columns of the batch
+    COLUMNS = (
+        "packet_index",
+        "subservice",
+        "req_id",
+        "step_id",
+        "error_code",
+        "failure_data_offset",
+        "failure_data_len",
+    )
+
+    def __init__(self):
+        #: Index of the report packet in the passed sequence or buffer.
+        self.packet_index = array(_U32_TYPECODE)
+        self.subservice = array("B")
+        #: Request ID of the verified TC as returned by :py:meth:`RequestId.as_u32`.
+        self.req_id = array(_U32_TYPECODE)
+        #: Step ID, only valid for step reports. It is set to 0 otherwise.
+        self.step_id = array(_U32_TYPECODE)
+        #: Error code, only valid for failure reports. It is set to 0 otherwise.
+        self.error_code = array(_U32_TYPECODE)
+        #: Offset of the failure data. This is the offset inside the packet for
+        #: :py:meth:`from_packets` and the offset inside the buffer for :py:meth:`from_buffer`.
+        self.failure_data_offset = array("Q")
+        self.failure_data_len = array(_U32_TYPECODE)
+        self.num_invalid = 0
+
+    def __len__(self):
+        return len(self.subservice)
+
+    @classmethod
+    def from_packets(
+        cls,
+        packets: Sequence[bytes],
+        params: UnpackParams,
+        check_crc: bool = True,
+    ) -> Service1Batch:
+        """Decode a sequence of raw service 1 packets.
+
+        :param packets: Sequence of objects supporting the buffer protocol, each containing one
+            packet.
+        :param params: Unpack parameters. Only the length of the time reader is used.
+        :param check_crc: Check the CRC16 of each packet.
+        :raises ValueError: Step ID or error code length larger than 4 bytes.
+        """
+        batch = cls()
+        decoder = _Service1BatchDecoder(batch, params, check_crc)
+        for packet_idx, packet in enumerate(packets):
+            raw = memoryview(packet).cast("B")
+            if decoder.decode(raw, 0, len(raw), packet_idx) == 0:
+                batch.num_invalid += 1
+        return batch
+
+    @classmethod
+    def from_buffer(
+        cls, data: bytes, params: UnpackParams, check_crc: bool = True
+    ) -> Service1Batch:
+        """Decode a buffer of raw service 1 packets stored back to back. The packets are
+        delimited using the length fields of the space packet headers, and a trailing
+        incomplete packet is ignored.
+
+        :param data: Any object supporting the buffer protocol.
+        :param params: Unpack parameters. Only the length of the time reader is used.
+        :param check_crc: Check the CRC16 of each packet.
+        :raises ValueError: Step ID or error code length larger than 4 bytes.
+        """
+        batch = cls()
+        decoder = _Service1BatchDecoder(batch, params, check_crc)
+        raw = memoryview(data).cast("B")
+        current_idx = 0
+        packet_idx = 0
+        while current_idx + SPACE_PACKET_HEADER_SIZE <= len(raw):
+            packet_len = (raw[current_idx + 4] << 8 | raw[current_idx + 5]) + 7
+            if current_idx + packet_len > len(raw):
+                break
+            if decoder.decode(raw, current_idx, packet_len, packet_idx) == 0:
+                batch.num_invalid += 1
+            current_idx += packet_len
+            packet_idx += 1
+        return batch
+
+
+class _Service1BatchDecoder:
+    def __init__(self, batch: Service1Batch, params: UnpackParams, check_crc: bool):
+        self.batch = batch
+        self.check_crc = check_crc
+        if params.bytes_step_id > 4 or params.bytes_err_code > 4:
+            raise ValueError(
+                "step IDs and error codes with more than 4 bytes are not supported"
+            )
+        self.bytes_step_id = params.bytes_step_id
+        self.bytes_err_code = params.bytes_err_code
+        stamp_len = params.time_reader.len_packed if params.time_reader else 0
+        self.src_data_offset = (
+            SPACE_PACKET_HEADER_SIZE + PusTmSecondaryHeader.MIN_LEN + stamp_len
+        )
+
+    def decode(
+        self, raw: memoryview, offset: int, buf_len: int, packet_idx: int
+    ) -> int:
+        """Decode the packet at the given offset and append it to the batch.
+
+        :return: 1 if the packet was appended, 0 otherwise.
+        """
+        if buf_len < self.src_data_offset + 6:
+            return 0
+        packet_len = (raw[offset + 4] << 8 | raw[offset + 5]) + 7
+        if (
+            packet_len > buf_len
+            or packet_len < self.src_data_offset + 6
+            or raw[offset + 6] >> 4 != PusVersion.PUS_C
+            or raw[offset + 7] != PusService.S1_VERIFICATION
+        ):
+            return 0
+        subservice = raw[offset + 8]
+        if subservice < 1 or subservice > 8:
+            return 0
+        if self.check_crc and crc16_ccitt(raw[offset : offset + packet_len]) != 0:
+            return 0
+        current_idx = offset + self.src_data_offset
+        src_end = offset + packet_len - 2
+        req_id = int.from_bytes(raw[current_idx : current_idx + 4], "big")
+        current_idx += 4
+        step_id = 0
+        if subservice == Subservice.TM_STEP_SUCCESS or (
+            subservice == Subservice.TM_STEP_FAILURE
+        ):
+            step_id_end = current_idx + self.bytes_step_id
+            if step_id_end > src_end:
+                return 0
+            step_id = int.from_bytes(raw[current_idx:step_id_end], "big")
+            current_idx = step_id_end
+        error_code = 0
+        if subservice % 2 == 0:
+            err_code_end = current_idx + self.bytes_err_code
+            if err_code_end > src_end:
+                return 0
+            error_code = int.from_bytes(raw[current_idx:err_code_end], "big")
+            current_idx = err_code_end
+        else:
+            current_idx = src_end
+        batch = self.batch
+        batch.packet_index.append(packet_idx)
+        batch.subservice.append(subservice)
+        batch.req_id.append(req_id)
+        batch.step_id.append(step_id)
+        batch.error_code.append(error_code)
+        batch.failure_data_offset.append(current_idx)
+        batch.failure_data_len.append(src_end - current_idx)
+        return 1
+
+
 def create_acceptance_success_tm(
     pus_tc: PusTelecommand, time_provider: Optional[CcsdsTimeProvider]
 ) -> Service1Tm:
@@ -1,4 +1,38 @@
+"""Definitions and decoders for the PUS Service 3 Housekeeping service.
+
+Housekeeping (HK) report structures are declared as a structure ID (SID) together with an
+ordered list of :py:class:`HkParam` definitions. Each :py:class:`HkStructure` is compiled once
+into a :py:class:`spacepackets.ecss.fields.FieldCodec`, which decodes all parameters of a report
+with a single :py:class:`struct.Struct` call. The :py:class:`HkReportDecoder` dispatches raw HK
+reports to the structure with the matching SID.
+
+Batch decoding into per-parameter columns requires the optional
+`NumPy <https://numpy.org/>`_ dependency, which can be installed with
+``pip install spacepackets[numpy]``.
+"""
+from __future__ import annotations
+
 import enum
+import struct
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from spacepackets.exceptions import BytesTooShortError
+from spacepackets.ecss.fields import FieldCodec, Ptc, _field_layout
+from spacepackets.ecss.defs import PusService
+from spacepackets.ecss.tm import AbstractPusTm
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class Subservice(enum.IntEnum):
@@ -21,3 +55,290 @@ class Subservice(enum.IntEnum):
 
     TC_MODIFY_PARAMETER_REPORT_COLLECTION_INTERVAL = 31
     TC_MODIFY_DIAGNOSTICS_REPORT_COLLECTION_INTERVAL = 32
+
+
+class HkParam(NamedTuple):
+    """Definition of a single housekeeping parameter. All parameters supported by
+    :py:class:`spacepackets.ecss.fields.FieldCodec` can be used, including booleans and integers
+    which are not byte-aligned. The PFC of octet and character strings is the number of octets.
+    """
+
+    name: str
+    ptc: int
+    pfc: int
+
+
+class HkReport(NamedTuple):
+    """Decoded housekeeping report. The parameters are a named tuple generated for the
+    structure of the report."""
+
+    sid: int
+    params: Any
+
+
+def _column_dtype(param: HkParam) -> Tuple[Any, int]:
+    """NumPy type of a byte-aligned parameter, together with the width of integers which have
+    no NumPy type and are read as octets, or 0 for all other parameters."""
+    layout = _field_layout(param)
+    if param.ptc == Ptc.REAL:
+        return f">f{layout.bits // 8}", 0
+    if param.ptc == Ptc.OCTET_STRING:
+        return ("u1", (param.pfc,)), 0
+    if param.ptc == Ptc.CHARACTER_STRING:
+        return f"S{param.pfc}", 0
+    num_bytes = layout.bits // 8
+    if num_bytes in (1, 2, 4, 8):
+        return f">{'i' if layout.signed else 'u'}{num_bytes}", 0
+    return ("u1", (num_bytes,)), num_bytes
+
+
+class HkStructure:
+    """Housekeeping report structure which is compiled into a
+    :py:class:`spacepackets.ecss.fields.FieldCodec` on construction.
+
+    The decoded records are instances of a named tuple type generated for the structure, so the
+    parameter names need to be valid Python identifiers.
+
+    >>> from spacepackets.ecss.fields import Ptc, PfcUnsigned, PfcReal
+    >>> hk = HkStructure(1, [
+    ...     HkParam("mode", Ptc.UNSIGNED, PfcUnsigned.ONE_BYTE),
+    ...     HkParam("temp", Ptc.REAL, PfcReal.FLOAT_SIMPLE_PRECISION_IEEE),
+    ... ])
+    >>> hk.size
+    5
+    >>> hk.unpack(bytes([2, 0x41, 0xc8, 0x00, 0x00]))
+    HkRecord1(mode=2, temp=25.0)
+
+    :param sid: Structure ID.
+    :param params: Ordered parameter definitions.
+    :raises ValueError: Unsupported PTC or PFC, or invalid parameter names.
+    """
+
+    def __init__(self, sid: int, params: Sequence[HkParam]):
+        self.sid = sid
+        self.params = tuple(params)
+        self.codec = FieldCodec(self.params, f"HkRecord{sid}")
+        self._dtype_descr: Optional[List[Tuple[str, Any]]] = None
+        self._odd_ints: Tuple[Tuple[int, int, bool], ...] = ()
+        if all(_field_layout(param).bits % 8 == 0 for param in self.params):
+            # Byte-aligned structures are reinterpreted with a structured NumPy type.
+            dtypes = [_column_dtype(param) for param in self.params]
+            self._dtype_descr = [
+                (param.name, dtype) for param, (dtype, _) in zip(self.params, dtypes)
+            ]
+            self._odd_ints = tuple(
+                (idx, width, _field_layout(self.params[idx]).signed)
+                for idx, (_, width) in enumerate(dtypes)
+                if width
+            )
+
+    @property
+    def layout(self) -> struct.Struct:
+        return self.codec.layout
+
+    @property
+    def record_type(self) -> Any:
+        return self.codec.record_type
+
+    @property
+    def size(self) -> int:
+        """Size of the parameters in bytes, excluding the SID."""
+        return self.codec.size
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return self.codec.names
+
+    def unpack(self, data: bytes, offset: int = 0) -> Any:
+        """Decode the parameters into a record.
+
+        :param data: Any object supporting the buffer protocol.
+        :param offset: Offset of the first parameter.
+        :raises BytesTooShortError: Data too short for the structure.
+        """
+        return self.codec.unpack_from(data, offset)
+
+    def unpack_columns(
+        self, blocks: Iterable[bytes], offset: int = 0
+    ) -> Dict[str, np.ndarray]:
+        """Decode many parameter blocks into one NumPy column per parameter.
+
+        If all parameters are byte-aligned, the parameters of all blocks are copied into one
+        contiguous buffer, which is then reinterpreted with a structured NumPy type. Otherwise,
+        the blocks are decoded into records first. The returned columns use the native byte
+        order. Octet strings are returned as two-dimensional ``uint8`` arrays, the three and six
+        byte integers and the integers which are not byte-aligned as 64 bit integers and booleans
+        as ``bool`` arrays.
+
+        >>> from spacepackets.ecss.fields import Ptc, PfcSigned
+        >>> hk = HkStructure(2, [
+        ...     HkParam("x", Ptc.SIGNED, PfcSigned.TWO_BYTES),
+        ...     HkParam("y", Ptc.SIGNED, PfcSigned.THREE_BYTES),
+        ... ])
+        >>> columns = hk.unpack_columns([bytes([0, 1, 0, 0, 2]), bytes([0xff, 0xff] * 2 + [0xfe])])
+        >>> columns["x"].tolist(), columns["y"].tolist()
+        ([1, -1], [2, -2])
+
+        :param blocks: Bytes-like objects. Each one contains the parameters of one report at the
+            given offset. Trailing bytes are ignored.
+        :param offset: Offset of the parameters inside each block.
+        :raises BytesTooShortError: One of the blocks is too short for the structure.
+        """
+        import numpy as np
+
+        if self._dtype_descr is None:
+            return self._records_to_columns(
+                [self.codec.unpack_from(block, offset) for block in blocks]
+            )
+        size = self.codec.size
+        end = offset + size
+        parts = [block[offset:end] for block in blocks]
+        joined = b"".join(parts)
+        if len(joined) != len(parts) * size:
+            # Slow path to find the block which is too short.
+            for part in parts:
+                if len(part) < size:
+                    raise BytesTooShortError(end, offset + len(part))
+        rows = np.frombuffer(joined, dtype=np.dtype(self._dtype_descr))
+        return self._rows_to_columns(rows)
+
+    def _rows_to_columns(self, rows: np.ndarray) -> Dict[str, np.ndarray]:
+        import numpy as np
+
+        columns = {}
+        for name, _ in self._dtype_descr:
+            field = rows[name]
+            columns[name] = field.astype(field.dtype.newbyteorder("="))
+        for idx, width, signed in self._odd_ints:
+            name = self.params[idx].name
+            octets = columns[name].astype(np.uint64)
+            values = np.zeros(len(rows), dtype=np.uint64)
+            for octet_idx in range(width):
+                values = (values << np.uint64(8)) | octets[:, octet_idx]
+            if signed:
+                values = values.astype(np.int64)
+                values[values >= 1 << (width * 8 - 1)] -= 1 << (width * 8)
+            columns[name] = values
+        return columns
+
+    def _records_to_columns(self, records: List[Any]) -> Dict[str, np.ndarray]:
+        import numpy as np
+
+        columns = {}
+        for idx, param in enumerate(self.params):
+            values = [record[idx] for record in records]
+            layout = _field_layout(param)
+            if param.ptc == Ptc.OCTET_STRING:
+                column = np.frombuffer(b"".join(values), dtype=np.uint8)
+                columns[param.name] = column.reshape(-1, param.pfc).copy()
+            elif param.ptc == Ptc.CHARACTER_STRING:
+                columns[param.name] = np.array(values, dtype=f"S{param.pfc}")
+            elif param.ptc == Ptc.REAL:
+                columns[param.name] = np.array(values, dtype=f"f{layout.bits // 8}")
+            elif layout.boolean:
+                columns[param.name] = np.array(values, dtype=bool)
+            else:
+                columns[param.name] = np.array(
+                    values, dtype=np.int64 if layout.signed else np.uint64
+                )
+        return columns
+
+
+class HkReportDecoder:
+    """Decoder for raw housekeeping reports which dispatches on the SID at the start of the
+    source data.
+
+    >>> from spacepackets.ecss.fields import Ptc, PfcUnsigned
+    >>> decoder = HkReportDecoder(
+    ...     [HkStructure(5, [HkParam("counter", Ptc.UNSIGNED, PfcUnsigned.TWO_BYTES)])],
+    ...     sid_len=2,
+    ... )
+    >>> decoder.unpack(bytes([0, 5, 0x01, 0x00]))
+    HkReport(sid=5, params=HkRecord5(counter=256))
+
+    :param structures: Initial structures.
+    :param sid_len: Length of the SID in bytes.
+    """
+
+    def __init__(self, structures: Iterable[HkStructure] = (), sid_len: int = 4):
+        if sid_len not in (1, 2, 4, 8):
+            raise ValueError(f"invalid SID length {sid_len}")
+        self.sid_len = sid_len
+        self._sid_struct = struct.Struct({1: "!B", 2: "!H", 4: "!I", 8: "!Q"}[sid_len])
+        self._structures: Dict[int, HkStructure] = {}
+        for structure in structures:
+            self.add_structure(structure)
+
+    def add_structure(self, structure: HkStructure):
+        """Add a structure, replacing any structure with the same SID."""
+        self._structures[structure.sid] = structure
+
+    def get_structure(self, sid: int) -> Optional[HkStructure]:
+        return self._structures.get(sid)
+
+    def sid_of(self, source_data: bytes) -> int:
+        """Read the SID at the start of the source data.
+
+        :raises BytesTooShortError: Source data shorter than the SID.
+        """
+        if len(source_data) < self.sid_len:
+            raise BytesTooShortError(self.sid_len, len(source_data))
+        return self._sid_struct.unpack_from(source_data)[0]
+
+    def _structure_for(self, sid: int) -> HkStructure:
+        structure = self._structures.get(sid)
+        if structure is None:
+            raise ValueError(f"unknown HK structure with SID {sid}")
+        return structure
+
+    def unpack(self, source_data: bytes) -> HkReport:
+        """Decode the source data of a HK report.
+
+        :raises BytesTooShortError: Source data too short.
+        :raises ValueError: Unknown SID.
+        """
+        sid = self.sid_of(source_data)
+        return HkReport(sid, self._structure_for(sid).unpack(source_data, self.sid_len))
+
+    def unpack_tm(self, tm: AbstractPusTm) -> HkReport:
+        """Decode a HK or diagnostics report telemetry packet.
+
+        :raises ValueError: Not a service 3 report or unknown SID.
+        :raises BytesTooShortError: Source data too short.
+        """
+        if tm.service != PusService.S3_HOUSEKEEPING or tm.subservice not in (
+            Subservice.TM_HK_REPORT,
+            Subservice.TM_DIAGNOSTICS_REPORT,
+        ):
+            raise ValueError(
+                f"packet with service {tm.service} and subservice {tm.subservice} is not "
+                "a HK report"
+            )
+        return self.unpack(tm.source_data)
+
+    def unpack_batch(
+        self, source_datas: Iterable[bytes]
+    ) -> Dict[int, Dict[str, np.ndarray]]:
+        """Decode the source data of many HK reports into NumPy columns, grouped by SID.
+
+        The order of the reports inside each group is preserved.
+
+        :raises BytesTooShortError: Source data too short.
+        :raises ValueError: Unknown SID.
+        """
+        groups: Dict[int, List[bytes]] = {}
+        sid_len = self.sid_len
+        unpack_sid = self._sid_struct.unpack_from
+        for source_data in source_datas:
+            if len(source_data) < sid_len:
+                raise BytesTooShortError(sid_len, len(source_data))
+            sid = unpack_sid(source_data)[0]
+            group = groups.get(sid)
+            if group is None:
+                self._structure_for(sid)
+                group = groups[sid] = []
+            group.append(source_data)
+        return {
+            sid: self._structures[sid].unpack_columns(group, self.sid_len)
+            for sid, group in groups.items()
+        }
@@ -1,4 +1,21 @@
+"""Definitions, decoders and an aggregator for the PUS Service 5 Event Reporting service.
+
+Event reports contain an event ID followed by mission-specific auxiliary data. The severity is
+determined by the subservice. The :py:class:`EventAggregator` keeps sliding window counts per
+event ID and severity, suppresses repeated reports of event storms and reports the crossing of
+configurable thresholds.
+"""
+from __future__ import annotations
+
 import enum
+import struct
+import time
+from array import array
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from spacepackets.exceptions import BytesTooShortError
+from spacepackets.ecss.defs import PusService
+from spacepackets.ecss.tm import AbstractPusTm
 
 
 class Subservice(enum.IntEnum):
@@ -8,3 +25,323 @@ class Subservice(enum.IntEnum):
     TM_HIGH_SEVERITY_EVENT = 4
     TC_ENABLE_EVENT_REPORTING = 5
     TC_DISABLE_EVENT_REPORTING = 6
+
+
+class Severity(enum.IntEnum):
+    INFO = 0
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+
+    @classmethod
+    def from_subservice(cls, subservice: int) -> Severity:
+        """Severity of an event report with the given subservice.
+
+        :raises ValueError: Subservice is not an event report subservice.
+        """
+        if subservice not in _REPORT_SUBSERVICES:
+            raise ValueError(f"subservice {subservice} is not an event report")
+        return cls(subservice - Subservice.TM_INFO_EVENT)
+
+    @property
+    def subservice(self) -> Subservice:
+        return Subservice(self + Subservice.TM_INFO_EVENT)
+
+
+_REPORT_SUBSERVICES = frozenset(
+    (
+        Subservice.TM_INFO_EVENT,
+        Subservice.TM_LOW_SEVERITY_EVENT,
+        Subservice.TM_MEDIUM_SEVERITY_EVENT,
+        Subservice.TM_HIGH_SEVERITY_EVENT,
+    )
+)
+
+
+class EventReport(NamedTuple):
+    severity: Severity
+    event_id: int
+    aux_data: bytes
+
+
+class EventReportDecoder:
+    """Decoder for the source data of event reports.
+
+    >>> decoder = EventReportDecoder(event_id_len=2)
+    >>> decoder.unpack(Subservice.TM_LOW_SEVERITY_EVENT, bytes([0x01, 0x02, 0xff]))
+    EventReport(severity=<Severity.LOW: 1>, event_id=258, aux_data=b'\\xff')
+
+    :param event_id_len: Length of the event ID in bytes.
+    """
+
+    def __init__(self, event_id_len: int = 2):
+        if event_id_len not in (1, 2, 4, 8):
+            raise ValueError(f"invalid event ID length {event_id_len}")
+        self.event_id_len = event_id_len
+        self._event_id_struct = struct.Struct(
+            {1: "!B", 2: "!H", 4: "!I", 8: "!Q"}[event_id_len]
+        )
+
+    def unpack(self, subservice: int, source_data: bytes) -> EventReport:
+        """Decode the source data of an event report.
+
+        :param subservice: Subservice of the report, which determines the severity.
+        :param source_data: Source data of the report.
+        :raises ValueError: Subservice is not an event report subservice.
+        :raises BytesTooShortError: Source data shorter than the event ID.
+        """
+        severity = Severity.from_subservice(subservice)
+        if len(source_data) < self.event_id_len:
+            raise BytesTooShortError(self.event_id_len, len(source_data))
+        return EventReport(
+            severity,
+            self._event_id_struct.unpack_from(source_data)[0],
+            bytes(source_data[self.event_id_len :]),
+        )
+
+    def unpack_tm(self, tm: AbstractPusTm) -> EventReport:
+        """Decode an event report telemetry packet.
+
+        :raises ValueError: Not a service 5 event report.
+        :raises BytesTooShortError: Source data shorter than the event ID.
+        """
+        if tm.service != PusService.S5_EVENT:
+            raise ValueError(f"packet with service {tm.service} is not an event report")
+        return self.unpack(tm.subservice, tm.source_data)
+
+
+class EventThresholds:
+    """Count limits for the :py:class:`EventAggregator`. A threshold is crossed when the number
+    of events with the same event ID and severity inside the sliding window exceeds the limit.
+
+    The limit of a specific event ID takes precedence over the limit of a severity, which takes
+    precedence over the default limit. Subclasses can override :py:meth:`limit` to implement
+    other policies. The limit is only queried once for each combination of event ID and
+    severity, when the combination is seen for the first time.
+
+    :param default: Limit for all events, or None for no limit.
+    :param per_severity: Limits per severity.
+    :param per_event_id: Limits per event ID.
+    """
+
+    def __init__(
+        self,
+        default: Optional[int] = None,
+        per_severity: Optional[Dict[Severity, int]] = None,
+        per_event_id: Optional[Dict[int, int]] = None,
+    ):
+        self.default = default
+        self.per_severity = per_severity if per_severity is not None else {}
+        self.per_event_id = per_event_id if per_event_id is not None else {}
+
+    def limit(self, event_id: int, severity: Severity) -> Optional[int]:
+        """Count limit for the given event ID and severity, or None for no limit."""
+        limit = self.per_event_id.get(event_id)
+        if limit is None:
+            limit = self.per_severity.get(severity, self.default)
+        return limit
+
+
+class EventResult(NamedTuple):
+    #: False if the event is a repetition of the previously forwarded event with the same
+    #: event ID, severity and auxiliary data inside the deduplication interval.
+    forwarded: bool
+    #: Number of events with the same event ID and severity inside the sliding window.
+    count: int
+    #: Number of suppressed repetitions since the previously forwarded event. This is only
+    #: set for forwarded events.
+    suppressed: int
+    #: True if this event made the count exceed the threshold limit.
+    threshold_crossed: bool
+
+
+class EventStats(NamedTuple):
+    event_id: int
+    severity: Severity
+    #: Number of events inside the sliding window.
+    count: int
+    #: Total number of events.
+    total: int
+    #: Total number of suppressed repetitions.
+    suppressed: int
+
+
+class EventAggregator:
+    """Streaming aggregator for event reports.
+
+    The sliding window is divided into a fixed number of buckets, and every combination of
+    event ID and severity is assigned a slot in flat :py:class:`array.array` counters when it is
+    seen for the first time. Adding an event only requires a dictionary lookup and a few array
+    updates, and expired buckets of a slot are only cleared when the slot is accessed.
+
+    Repetitions of an event with the same auxiliary data inside the deduplication interval
+    are counted, but they are not forwarded, which allows handling event storms without
+    processing every single report.
+
+    >>> aggregator = EventAggregator(window=10.0, dedup_interval=1.0,
+    ...                              thresholds=EventThresholds(default=2))
+    >>> report = EventReport(Severity.HIGH, 12, bytes())
+    >>> aggregator.add(report, now=0.0)
+    EventResult(forwarded=True, count=1, suppressed=0, threshold_crossed=False)
+    >>> aggregator.add(report, now=0.5)
+    EventResult(forwarded=False, count=2, suppressed=0, threshold_crossed=False)
+    >>> aggregator.add(report, now=1.5)
+    EventResult(forwarded=True, count=3, suppressed=1, threshold_crossed=True)
+    >>> aggregator.count(12, Severity.HIGH, now=12.0)
+    0
+
+    :param window: Length of the sliding window in seconds.
+    :param num_buckets: Number of buckets of the sliding window. More buckets give a more
+        accurate window at the cost of more memory per slot.
+    :param dedup_interval: Repetitions inside this interval in seconds after a forwarded event
+        are suppressed. Deduplication is disabled for 0.
+    :param thresholds: Optional count limits.
+    :param clock: Clock which is used if no time is passed explicitly.
+    """
+
+    def __init__(
+        self,
+        window: float = 60.0,
+        num_buckets: int = 60,
+        dedup_interval: float = 0.0,
+        thresholds: Optional[EventThresholds] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if window <= 0 or num_buckets <= 0:
+            raise ValueError("window and number of buckets must be positive")
+        self.window = window
+        self.num_buckets = num_buckets
+        self.dedup_interval = dedup_interval
+        self.thresholds = thresholds
+        self.clock = clock
+        self._bucket_width = window / num_buckets
+        self._slots: Dict[Tuple[int, int], int] = {}
+        self._keys: List[Tuple[int, Severity]] = []
+        # Bucket counts of all slots, num_buckets entries per slot.
+        self._buckets = array("L")
+        self._window_counts = array("L")
+        self._last_bucket = array("q")
+        self._totals = array("Q")
+        self._suppressed = array("Q")
+        self._pending_suppressed = array("L")
+        # Limit per slot, -1 for no limit.
+        self._limits = array("q")
+        self._last_forwarded = array("d")
+        self._last_aux_data: List[Optional[bytes]] = []
+
+    def __len__(self):
+        """Number of distinct combinations of event ID and severity."""
+        return len(self._keys)
+
+    def _add_slot(self, key: Tuple[int, int], severity: Severity) -> int:
+        slot = len(self._keys)
+        self._slots[key] = slot
+        self._keys.append((key[0], Severity(severity)))
+        self._buckets.frombytes(bytes(self.num_buckets * self._buckets.itemsize))
+        self._window_counts.append(0)
+        self._last_bucket.append(0)
+        self._totals.append(0)
+        self._suppressed.append(0)
+        self._pending_suppressed.append(0)
+        limit = None
+        if self.thresholds is not None:
+            limit = self.thresholds.limit(key[0], Severity(severity))
+        self._limits.append(-1 if limit is None else limit)
+        self._last_forwarded.append(0.0)
+        self._last_aux_data.append(None)
+        return slot
+
+    def _expire(self, slot: int, bucket: int):
+        last_bucket = self._last_bucket[slot]
+        if bucket <= last_bucket:
+            return
+        base = slot * self.num_buckets
+        if bucket - last_bucket >= self.num_buckets:
+            for idx in range(base, base + self.num_buckets):
+                self._buckets[idx] = 0
+            self._window_counts[slot] = 0
+        else:
+            for expired in range(last_bucket + 1, bucket + 1):
+                idx = base + expired % self.num_buckets
+                self._window_counts[slot] -= self._buckets[idx]
+                self._buckets[idx] = 0
+        self._last_bucket[slot] = bucket
+
+    def add(self, report: EventReport, now: Optional[float] = None) -> EventResult:
+        """Add an event report.
+
+        :param report: Decoded event report.
+        :param now: Time of the event in seconds. The clock is used if this is not supplied.
+            Events which are older than the newest event of the same slot are counted in the
+            bucket of the newest event.
+        """
+        if now is None:
+            now = self.clock()
+        key = (report.event_id, report.severity)
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._add_slot(key, report.severity)
+            self._last_bucket[slot] = int(now // self._bucket_width)
+        else:
+            self._expire(slot, int(now // self._bucket_width))
+        idx = slot * self.num_buckets + self._last_bucket[slot] % self.num_buckets
+        self._buckets[idx] += 1
+        count = self._window_counts[slot] + 1
+        self._window_counts[slot] = count
+        self._totals[slot] += 1
+        threshold_crossed = count - 1 == self._limits[slot]
+        if (
+            self._last_aux_data[slot] == report.aux_data
+            and now - self._last_forwarded[slot] < self.dedup_interval
+        ):
+            self._pending_suppressed[slot] += 1
+            self._suppressed[slot] += 1
+            return EventResult(False, count, 0, threshold_crossed)
+        suppressed = self._pending_suppressed[slot]
+        self._pending_suppressed[slot] = 0
+        self._last_forwarded[slot] = now
+        self._last_aux_data[slot] = report.aux_data
+        return EventResult(True, count, suppressed, threshold_crossed)
+
+    def add_many(
+        self, reports: Iterable[EventReport], now: Optional[float] = None
+    ) -> List[EventReport]:
+        """Add many event reports which occurred at the same time.
+
+        :return: Forwarded event reports. Suppressed repetitions are omitted.
+        """
+        if now is None:
+            now = self.clock()
+        add = self.add
+        return [report for report in reports if add(report, now).forwarded]
+
+    def count(
+        self, event_id: int, severity: Severity, now: Optional[float] = None
+    ) -> int:
+        """Number of events with the given event ID and severity inside the sliding window."""
+        slot = self._slots.get((event_id, severity))
+        if slot is None:
+            return 0
+        if now is None:
+            now = self.clock()
+        self._expire(slot, int(now // self._bucket_width))
+        return self._window_counts[slot]
+
+    def stats(self, now: Optional[float] = None) -> List[EventStats]:
+        """Statistics of all combinations of event ID and severity seen so far."""
+        if now is None:
+            now = self.clock()
+        bucket = int(now // self._bucket_width)
+        result = []
+        for slot, (event_id, severity) in enumerate(self._keys):
+            self._expire(slot, bucket)
+            result.append(
+                EventStats(
+                    event_id,
+                    severity,
+                    self._window_counts[slot],
+                    self._totals[slot],
+                    self._suppressed[slot],
+                )
+            )
+        return result
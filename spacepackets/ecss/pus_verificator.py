@@ -1,9 +1,27 @@
 import enum
+import heapq
+import time
+from collections.abc import Mapping as _MappingBase
 from dataclasses import dataclass, field
-from typing import Dict, Optional, List
+from typing import (
+    Callable,
+    Dict,
+    Iterator,
+    Mapping,
+    Optional,
+    List,
+    NamedTuple,
+    Tuple,
+    Union,
+)
 
 from spacepackets.ecss import PusTelecommand
-from spacepackets.ecss.pus_1_verification import RequestId, Service1Tm, Subservice
+from spacepackets.ecss.pus_1_verification import (
+    RequestId,
+    Service1Batch,
+    Service1Tm,
+    Subservice,
+)
 
 
 class StatusField(enum.IntEnum):
@@ -22,7 +40,73 @@ class VerificationStatus:
     completed: StatusField = StatusField.UNSET
 
 
-VerifDictT = Dict[RequestId, VerificationStatus]
+VerifDictT = Mapping[RequestId, VerificationStatus]
+
+
+class VerifStep(enum.IntEnum):
+    ACCEPTANCE = 0
+    START = 1
+    COMPLETION = 2
+
+
+@dataclass
+class VerifTimeout:
+    """A telecommand for which the verification timed out.
+
+    :param req_id: Request ID of the telecommand.
+    :param step: First verification step for which no report was received.
+    :param status: Verification status at the time of the timeout.
+    """
+
+    req_id: RequestId
+    step: VerifStep
+    status: VerificationStatus
+
+
+class VerifCounters(NamedTuple):
+    #: Telecommands which are tracked and not completed yet.
+    pending: int
+    #: Telecommands for which a completion success was received.
+    succeeded: int
+    #: Telecommands for which any failure report was received.
+    failed: int
+    #: Telecommands which timed out before they were completed.
+    timed_out: int
+
+
+class _VerifEntry:
+    __slots__ = ("status", "deadline", "generation", "completed")
+
+    def __init__(self, deadline: float, generation: int):
+        self.status = VerificationStatus()
+        self.deadline = deadline
+        self.generation = generation
+        self.completed = False
+
+
+class _VerifDictView(_MappingBase):
+    """Read-only live view of the tracked telecommands, keyed by :py:class:`RequestId`."""
+
+    __slots__ = ("_entries",)
+
+    def __init__(self, entries: Dict[int, _VerifEntry]):
+        self._entries = entries
+
+    def __getitem__(self, req_id: Union[RequestId, int]) -> VerificationStatus:
+        if isinstance(req_id, RequestId):
+            req_id = req_id.as_u32()
+        return self._entries[req_id].status
+
+    def __contains__(self, req_id) -> bool:
+        if isinstance(req_id, RequestId):
+            req_id = req_id.as_u32()
+        return req_id in self._entries
+
+    def __iter__(self) -> Iterator[RequestId]:
+        return (RequestId.from_u32(req_id) for req_id in self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
 
 
 @dataclass
@@ -51,40 +135,134 @@ class PusVerificator:
      2. Pass all received PUS Service 1 packets to the :py:meth:`add_tm` function.
      3. Check the :py:class:`TmCheckResult` returned by the :py:meth:`add_tm` for verification
         information
+
+    The telecommands are tracked using the 32-bit integer representation of their request ID.
+    For long running applications, entries for which all verification reports were received can
+    be removed automatically by setting ``auto_remove_completed``. This is disabled by default,
+    because completed entries were always kept before and applications may still look up their
+    status with :py:attr:`verif_dict` or :py:meth:`get_status`. Otherwise, completed entries are
+    only freed by :py:meth:`remove_completed_entries` or :py:meth:`remove_entry`. If a timeout
+    is specified, telecommands which are not completed within the timeout are removed when
+    calling :py:meth:`check_timeouts`, which also reports the missing verification step. This
+    keeps the memory usage bounded, even if verification reports are lost.
     """
 
-    def __init__(self):
-        self._verif_dict: VerifDictT = dict()
-        pass
+    def __init__(
+        self,
+        auto_remove_completed: bool = False,
+        timeout: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Create a new verificator.
+
+        :param auto_remove_completed: Remove entries as soon as all verification reports for
+            a telecommand were received. Disabled by default to keep completed entries available
+            for status lookups, which was the previous behaviour.
+        :param timeout: Timeout in seconds after which a telecommand which was not completed
+            is reported as timed out by :py:meth:`check_timeouts`.
+        :param clock: Clock used for the timeouts.
+        """
+        self._verif_dict: Dict[int, _VerifEntry] = dict()
+        self._verif_view = _VerifDictView(self._verif_dict)
+        self.auto_remove_completed = auto_remove_completed
+        self.timeout = timeout
+        self._clock = clock
+        # Heap of (deadline, generation, request ID) tuples. Every added telecommand gets a new
+        # generation, so entries of removed or replaced telecommands are skipped when they are
+        # popped. The heap is compacted once more than half of its entries are stale.
+        self._timeout_heap: List[Tuple[float, int, int]] = []
+        self._generation = 0
+        self._num_stale = 0
+        self._num_pending = 0
+        self._num_succeeded = 0
+        self._num_failed = 0
+        self._num_timed_out = 0
 
     def add_tc(self, tc: PusTelecommand) -> bool:
-        req_id = RequestId.from_sp_header(tc.sp_header)
+        req_id = RequestId.from_sp_header(tc.sp_header).as_u32()
         if req_id in self._verif_dict:
             return False
-        self._verif_dict.update({req_id: VerificationStatus()})
+        self._generation += 1
+        deadline = float("inf")
+        if self.timeout is not None:
+            deadline = self._clock() + self.timeout
+            heapq.heappush(self._timeout_heap, (deadline, self._generation, req_id))
+        self._verif_dict[req_id] = _VerifEntry(deadline, self._generation)
+        self._num_pending += 1
         return True
 
     def add_tm(self, pus_1_tm: Service1Tm) -> Optional[TmCheckResult]:
-        req_id = pus_1_tm.tc_req_id
-        if req_id not in self._verif_dict:
+        step_id = None
+        if pus_1_tm.step_id is not None:
+            step_id = pus_1_tm.step_id.val
+        return self._add_report(
+            pus_1_tm.tc_req_id.as_u32(), pus_1_tm.subservice, step_id
+        )
+
+    def add_tm_batch(self, batch: Service1Batch) -> int:
+        """Add all verification reports of a batch decoded with
+        :py:class:`spacepackets.ecss.pus_1_verification.Service1Batch`. The updated status can
+        be retrieved with :py:meth:`get_status` and the :py:attr:`counters`.
+
+        :return: Number of reports which belonged to a tracked telecommand.
+        """
+        num_matched = 0
+        for req_id, subservice, step_id in zip(
+            batch.req_id, batch.subservice, batch.step_id
+        ):
+            if self._add_report(req_id, subservice, step_id) is not None:
+                num_matched += 1
+        return num_matched
+
+    def _add_report(
+        self, req_id: int, subservice: int, step_id: Optional[int]
+    ) -> Optional[TmCheckResult]:
+        entry = self._verif_dict.get(req_id)
+        if entry is None:
             return None
-        verif_status = self._verif_dict.get(req_id)
-        if pus_1_tm.subservice <= 0 or pus_1_tm.subservice > 8:
+        verif_status = entry.status
+        if subservice <= 0 or subservice > 8:
             raise ValueError(
-                f"PUS 1 TM with invalid subservice {pus_1_tm.subservice} was passed"
+                f"PUS 1 TM with invalid subservice {subservice} was passed"
             )
         res = TmCheckResult(status=VerificationStatus(), completed=False)
         res.status = verif_status
 
-        return self._check_subservice(pus_1_tm, res, verif_status)
+        self._check_subservice(subservice, step_id, res, verif_status)
+        if res.completed and not entry.completed:
+            entry.completed = True
+            self._num_pending -= 1
+            if subservice == Subservice.TM_COMPLETION_SUCCESS:
+                self._num_succeeded += 1
+            else:
+                self._num_failed += 1
+        if self.auto_remove_completed and verif_status.all_verifs_recvd:
+            del self._verif_dict[req_id]
+            self._entry_removed(entry)
+        return res
+
+    def _entry_removed(self, entry: _VerifEntry):
+        """Account for the heap entry of a telecommand which was removed before its timeout."""
+        if entry.deadline == float("inf"):
+            return
+        self._num_stale += 1
+        if self._num_stale > len(self._timeout_heap) // 2:
+            entries = self._verif_dict
+            self._timeout_heap = [
+                item
+                for item in self._timeout_heap
+                if item[2] in entries and entries[item[2]].generation == item[1]
+            ]
+            heapq.heapify(self._timeout_heap)
+            self._num_stale = 0
 
     def _check_subservice(  # noqa: C901
         self,
-        pus_1_tm: Service1Tm,
+        subservice: int,
+        step_id: Optional[int],
         res: TmCheckResult,
         verif_status: VerificationStatus,
     ) -> TmCheckResult:
-        subservice = pus_1_tm.subservice
         if subservice % 2 == 0:
             # For failures, verification handling is completed
             res.completed = True
@@ -105,9 +283,9 @@ class PusVerificator:
             # Do not overwrite a failed step status
             if verif_status.step == StatusField.UNSET:
                 verif_status.step = StatusField.SUCCESS
-            verif_status.step_list.append(pus_1_tm.step_id.val)
+            verif_status.step_list.append(step_id)
         elif subservice == Subservice.TM_STEP_FAILURE:
-            self._handle_step_failure(verif_status, res, pus_1_tm)
+            self._handle_step_failure(verif_status, res, step_id)
         elif subservice == Subservice.TM_COMPLETION_SUCCESS:
             self._check_all_replies_recvd_after_step(verif_status)
             verif_status.completed = StatusField.SUCCESS
@@ -119,15 +297,76 @@ class PusVerificator:
         return res
 
     @property
-    def verif_dict(self):
-        return self._verif_dict
+    def verif_dict(self) -> VerifDictT:
+        """Read-only live mapping of all tracked telecommands to their verification status.
+        It reflects all later changes. The request ID objects are created while iterating.
+        """
+        return self._verif_view
+
+    def get_status(self, req_id: Union[RequestId, int]) -> Optional[VerificationStatus]:
+        """Verification status of a telecommand, or None if it is not tracked.
+
+        :param req_id: Request ID or its integer representation.
+        """
+        if isinstance(req_id, RequestId):
+            req_id = req_id.as_u32()
+        entry = self._verif_dict.get(req_id)
+        if entry is None:
+            return None
+        return entry.status
+
+    @property
+    def counters(self) -> VerifCounters:
+        return VerifCounters(
+            pending=self._num_pending,
+            succeeded=self._num_succeeded,
+            failed=self._num_failed,
+            timed_out=self._num_timed_out,
+        )
+
+    def __len__(self):
+        return len(self._verif_dict)
+
+    def check_timeouts(self, now: Optional[float] = None) -> List[VerifTimeout]:
+        """Remove all telecommands which were added more than the timeout ago. Entries which
+        are not completed yet are reported as timed out.
+
+        :param now: Current time. The time of the clock is used if this is not supplied.
+        :return: List of timed out telecommands.
+        """
+        if now is None:
+            now = self._clock()
+        timeouts = []
+        heap = self._timeout_heap
+        while heap and heap[0][0] <= now:
+            _, generation, req_id = heapq.heappop(heap)
+            entry = self._verif_dict.get(req_id)
+            # The entry might have been removed or replaced by a new telecommand with the same
+            # request ID in the meantime.
+            if entry is None or entry.generation != generation:
+                self._num_stale -= 1
+                continue
+            del self._verif_dict[req_id]
+            if entry.completed:
+                continue
+            self._num_pending -= 1
+            self._num_timed_out += 1
+            status = entry.status
+            if status.accepted == StatusField.UNSET:
+                step = VerifStep.ACCEPTANCE
+            elif status.started == StatusField.UNSET:
+                step = VerifStep.START
+            else:
+                step = VerifStep.COMPLETION
+            timeouts.append(VerifTimeout(RequestId.from_u32(req_id), step, status))
+        return timeouts
 
     def _handle_step_failure(
-        self, verif_status: VerificationStatus, res: TmCheckResult, pus_1_tm: Service1Tm
+        self, verif_status: VerificationStatus, res: TmCheckResult, step_id: int
     ):
         self._check_all_replies_recvd_after_step(verif_status)
         verif_status.step = StatusField.FAILURE
-        verif_status.step_list.append(pus_1_tm.step_id.val)
+        verif_status.step_list.append(step_id)
         res.completed = True
 
     @staticmethod
@@ -139,14 +378,26 @@ class PusVerificator:
             verif_stat.all_verifs_recvd = True
 
     def remove_completed_entries(self):
-        self._verif_dict = {
-            key: val
-            for key, val in self._verif_dict.items()
-            if not val.all_verifs_recvd
-        }
+        completed = [
+            req_id
+            for req_id, entry in self._verif_dict.items()
+            if entry.status.all_verifs_recvd
+        ]
+        for req_id in completed:
+            self._entry_removed(self._verif_dict.pop(req_id))
 
-    def remove_entry(self, req_id: RequestId) -> bool:
-        if req_id in self._verif_dict:
-            del self._verif_dict[req_id]
-            return True
-        return False
+    def remove_entry(self, req_id: Union[RequestId, int]) -> bool:
+        """Remove a telecommand.
+
+        :param req_id: Request ID or its integer representation.
+        :return: True if the entry was removed, False if it was not tracked.
+        """
+        if isinstance(req_id, RequestId):
+            req_id = req_id.as_u32()
+        entry = self._verif_dict.pop(req_id, None)
+        if entry is None:
+            return False
+        if not entry.completed:
+            self._num_pending -= 1
+        self._entry_removed(entry)
+        return True
@@ -23,6 +23,8 @@ tc_psc=PacketSeqCtrl(seq_flags=<SequenceFlags.UNSEGMENTED: 3>, seq_count=17), cc
     '10,22,c0,11'
     """
 
+    __slots__ = ("tc_packet_id", "tc_psc", "ccsds_version")
+
     def __init__(
         self, tc_packet_id: PacketId, tc_psc: PacketSeqCtrl, ccsds_version: int = 0b000
     ):
@@ -46,6 +48,16 @@ tc_psc=PacketSeqCtrl(seq_flags=<SequenceFlags.UNSEGMENTED: 3>, seq_count=17), cc
             tc_psc=PacketSeqCtrl.from_raw(psc_raw),
         )
 
+    @classmethod
+    def from_u32(cls, raw: int) -> RequestId:
+        """Create a request ID from its 32-bit integer representation as returned by
+        :py:meth:`as_u32`."""
+        return cls(
+            ccsds_version=(raw >> 29) & 0b111,
+            tc_packet_id=PacketId.from_raw((raw >> 16) & 0xFFFF),
+            tc_psc=PacketSeqCtrl.from_raw(raw & 0xFFFF),
+        )
+
     @classmethod
     def from_pus_tc(cls, pus_tc: PusTelecommand):
         return cls.from_sp_header(pus_tc.sp_header)
@@ -6,11 +6,12 @@ from __future__ import annotations
 from spacepackets import BytesTooShortError
 from spacepackets.version import get_version
 import struct
-from typing import Tuple, Optional
+from typing import Dict, List, Mapping, Tuple, Optional
 
 import deprecation
-from spacepackets.crc import CRC16_CCITT_FUNC
-from crcmod.predefined import PredefinedCrc
+from spacepackets.crc import Crc16Ccitt, crc16_ccitt, crc16_ccitt_advance_tables
+from spacepackets.ecss.defs import PackCacheInfo
+from spacepackets.util import GenerationTracked, advance_generation, tracked_field
 
 from spacepackets.ccsds.spacepacket import (
     SpacePacketHeader,
@@ -21,6 +22,7 @@ from spacepackets.ccsds.spacepacket import (
     PacketId,
     PacketSeqCtrl,
     SequenceFlags,
+    check_pack_buf_len,
 )
 from spacepackets.ecss.conf import (
     get_default_tc_apid,
@@ -29,9 +31,20 @@ from spacepackets.ecss.conf import (
 )
 
 
-class PusTcDataFieldHeader:
+_TC_SEC_HEADER_STRUCT = struct.Struct("!BBBH")
+
+
+class PusTcDataFieldHeader(GenerationTracked):
+    __slots__ = ("_service", "_subservice", "_source_id", "_pus_version", "_ack_flags")
+
     PUS_C_SEC_HEADER_LEN = 5
 
+    service = tracked_field("_service")
+    subservice = tracked_field("_subservice")
+    source_id = tracked_field("_source_id")
+    pus_version = tracked_field("_pus_version")
+    ack_flags = tracked_field("_ack_flags")
+
     def __init__(
         self,
         service: int,
@@ -46,20 +59,38 @@ class PusTcDataFieldHeader:
         :param source_id:
         :param ack_flags:
         """
-        self.service = service
-        self.subservice = subservice
-        self.source_id = source_id
-        self.pus_version = PusVersion.PUS_C
-        self.ack_flags = ack_flags
+        self._service = service
+        self._subservice = subservice
+        self._source_id = source_id
+        self._pus_version = PusVersion.PUS_C
+        self._ack_flags = ack_flags
+        self._generation = 0
 
     def pack(self) -> bytearray:
-        header_raw = bytearray()
-        header_raw.append(self.pus_version << 4 | self.ack_flags)
-        header_raw.append(self.service)
-        header_raw.append(self.subservice)
-        header_raw.extend(struct.pack("!H", self.source_id))
+        header_raw = bytearray(self.PUS_C_SEC_HEADER_LEN)
+        self.pack_into(header_raw)
         return header_raw
 
+    def pack_into(self, buf: bytearray, offset: int = 0) -> int:
+        """Pack the data field header directly into a writable buffer.
+
+        :raises BytesTooShortError: Buffer too short.
+        :return: Number of bytes written.
+        """
+        check_pack_buf_len(buf, offset, self.PUS_C_SEC_HEADER_LEN)
+        _TC_SEC_HEADER_STRUCT.pack_into(
+            buf,
+            offset,
+            self._pus_version << 4 | self._ack_flags,
+            self._service,
+            self._subservice,
+            self._source_id,
+        )
+        return self.PUS_C_SEC_HEADER_LEN
+
+    def packed_len(self) -> int:
+        return self.PUS_C_SEC_HEADER_LEN
+
     @classmethod
     def unpack(cls, data: bytes) -> PusTcDataFieldHeader:
         """Unpack a TC data field header.
@@ -71,20 +102,22 @@ class PusTcDataFieldHeader:
         min_expected_len = cls.get_header_size()
         if len(data) < min_expected_len:
             raise BytesTooShortError(min_expected_len, len(data))
-        version_and_ack_byte = data[0]
-        pus_version = (version_and_ack_byte & 0xF0) >> 4
-        if pus_version != PusVersion.PUS_C:
+        (
+            version_and_ack_byte,
+            service,
+            subservice,
+            source_id,
+        ) = _TC_SEC_HEADER_STRUCT.unpack_from(data)
+        if version_and_ack_byte >> 4 != PusVersion.PUS_C:
             raise ValueError("This implementation only supports PUS C")
-        ack_flags = version_and_ack_byte & 0x0F
-        service = data[1]
-        subservice = data[2]
-        source_id = struct.unpack("!H", data[3:5])[0]
-        return cls(
-            service=service,
-            subservice=subservice,
-            ack_flags=ack_flags,
-            source_id=source_id,
-        )
+        sec_header = cls.__new__(cls)
+        sec_header._service = service
+        sec_header._subservice = subservice
+        sec_header._source_id = source_id
+        sec_header._pus_version = PusVersion.PUS_C
+        sec_header._ack_flags = version_and_ack_byte & 0x0F
+        sec_header._generation = 0
+        return sec_header
 
     def __repr__(self):
         return (
@@ -165,6 +198,16 @@ class PusTelecommand(AbstractSpacePacket):
         self._app_data = app_data
         self._valid = True
         self._crc16: Optional[bytes] = None
+        self._init_pack_cache()
+
+    def _init_pack_cache(self):
+        self._pack_cache: Optional[bytes] = None
+        # Components which were packed into the cache. Replacing a component invalidates the
+        # packed bytes, changes of the components themselves are detected with their generation.
+        self._pack_cache_parts: tuple = ()
+        self._pack_cache_generation = 0
+        self._pack_cache_hits = 0
+        self._pack_cache_misses = 0
 
     @classmethod
     def from_sp_header(
@@ -249,28 +292,107 @@ class PusTelecommand(AbstractSpacePacket):
 
     def calc_crc(self):
         """Can be called to calculate the CRC16. Also sets the internal CRC16 field."""
-        crc = PredefinedCrc(crc_name="crc-ccitt-false")
-        crc.update(self.sp_header.pack())
+        crc = Crc16Ccitt(self.sp_header.pack())
         crc.update(self.pus_tc_sec_header.pack())
         crc.update(self.app_data)
-        self._crc16 = struct.pack("!H", crc.crcValue)
+        self._crc16 = crc.digest()
 
     def pack(self, recalc_crc: bool = True) -> bytearray:
         """Serializes the TC data fields into a bytearray.
 
+        The packed representation is cached, so packing an unchanged TC repeatedly only copies the
+        cached bytes. The headers track their changes with generation numbers, so the cache is
+        also invalidated if fields of the headers are changed directly. Application data in a
+        mutable buffer like a :py:class:`bytearray` can change without notice and is always
+        packed again. :py:meth:`pack_cache_info` can be used to retrieve the cache statistics.
+
         :param recalc_crc: Can be set to False if the CRC was previous calculated and no fields were
             changed. This is set to True by default to ensure the CRC is always valid by default,
             even if the user changes arbitrary fields after TC creation.
         """
-        packed_data = bytearray()
-        packed_data.extend(self.sp_header.pack())
-        packed_data.extend(self.pus_tc_sec_header.pack())
-        packed_data += self.app_data
-        if self._crc16 is None or recalc_crc:
-            self._crc16 = struct.pack("!H", CRC16_CCITT_FUNC(packed_data))
-        packed_data.extend(self._crc16)
+        if recalc_crc:
+            return bytearray(self._cached_pack())
+        packed_data = bytearray(self.packed_len())
+        self._pack_into(packed_data, 0, recalc_crc=False)
         return packed_data
 
+    def pack_into(
+        self, buf: bytearray, offset: int = 0, recalc_crc: bool = True
+    ) -> int:
+        """Serializes the TC directly into a writable buffer, for example a :py:class:`bytearray`,
+        a :py:class:`memoryview` or a :py:class:`mmap.mmap`.
+
+        :param buf: Writable buffer.
+        :param offset: Offset at which the TC is written.
+        :param recalc_crc: See :py:meth:`pack`.
+        :raises BytesTooShortError: Buffer too short.
+        :return: Number of bytes written.
+        """
+        if recalc_crc:
+            packed = self._cached_pack()
+            check_pack_buf_len(buf, offset, len(packed))
+            buf[offset : offset + len(packed)] = packed
+            return len(packed)
+        return self._pack_into(buf, offset, recalc_crc=False)
+
+    def _pack_into(self, buf: bytearray, offset: int, recalc_crc: bool) -> int:
+        packed_len = self.packed_len()
+        check_pack_buf_len(buf, offset, packed_len)
+        current_idx = offset + self.sp_header.pack_into(buf, offset)
+        current_idx += self.pus_tc_sec_header.pack_into(buf, current_idx)
+        buf[current_idx : current_idx + len(self._app_data)] = self._app_data
+        current_idx += len(self._app_data)
+        if self._crc16 is None or recalc_crc:
+            with memoryview(buf) as buf_view:
+                self._crc16 = struct.pack(
+                    "!H", crc16_ccitt(buf_view[offset:current_idx])
+                )
+        buf[current_idx : current_idx + 2] = self._crc16
+        return packed_len
+
+    def _cached_pack(self) -> bytes:
+        sp_header = self.sp_header
+        sec_header = self.pus_tc_sec_header
+        app_data = self._app_data
+        parts = self._pack_cache_parts
+        if (
+            self._pack_cache is not None
+            and parts[0] is sp_header
+            and parts[1] is sec_header
+            and parts[2] is app_data
+            and isinstance(app_data, bytes)
+            and max(
+                sp_header._generation,
+                sp_header._packet_id._generation,
+                sp_header._psc._generation,
+                sec_header._generation,
+            )
+            <= self._pack_cache_generation
+        ):
+            self._pack_cache_hits += 1
+            return self._pack_cache
+        self._pack_cache_misses += 1
+        generation = advance_generation()
+        packed_data = bytearray(self.packed_len())
+        self._pack_into(packed_data, 0, recalc_crc=True)
+        self._pack_cache = bytes(packed_data)
+        self._pack_cache_parts = (sp_header, sec_header, app_data)
+        self._pack_cache_generation = generation
+        return self._pack_cache
+
+    def pack_cache_info(self) -> PackCacheInfo:
+        """Hits and misses of the packed bytes cache used by :py:meth:`pack`."""
+        return PackCacheInfo(self._pack_cache_hits, self._pack_cache_misses)
+
+    def packed_len(self) -> int:
+        """Length of the TC when packed, which is determined without packing it."""
+        return (
+            SPACE_PACKET_HEADER_SIZE
+            + self.pus_tc_sec_header.packed_len()
+            + len(self._app_data)
+            + 2
+        )
+
     @classmethod
     def unpack(cls, data: bytes) -> PusTelecommand:
         """Create an instance from a raw bytestream.
@@ -279,7 +401,10 @@ class PusTelecommand(AbstractSpacePacket):
         :raises ValueError: Unsupported PUS version.
         :raises InvalidTcCrc16: Invalid CRC16.
         """
-        tc_unpacked = cls.empty()
+        # All fields are set from the raw packet, so the constructor is skipped.
+        tc_unpacked = cls.__new__(cls)
+        tc_unpacked._valid = True
+        tc_unpacked._init_pack_cache()
         tc_unpacked.sp_header = SpacePacketHeader.unpack(data=data)
         tc_unpacked.pus_tc_sec_header = PusTcDataFieldHeader.unpack(
             data=data[SPACE_PACKET_HEADER_SIZE:]
@@ -292,7 +417,7 @@ class PusTelecommand(AbstractSpacePacket):
             raise BytesTooShortError(expected_packet_len, len(data))
         tc_unpacked._app_data = data[header_len : expected_packet_len - 2]
         tc_unpacked._crc16 = data[expected_packet_len - 2 : expected_packet_len]
-        if CRC16_CCITT_FUNC(data[:expected_packet_len]) != 0:
+        if crc16_ccitt(memoryview(data)[:expected_packet_len]) != 0:
             raise InvalidTcCrc16(tc_unpacked)
         return tc_unpacked
 
@@ -379,12 +504,126 @@ class PusTelecommand(AbstractSpacePacket):
         self.sp_header.apid = apid
 
 
+class PusTcTemplate:
+    """Template which creates PUS telecommands differing only in the sequence count, the source
+    ID or fixed-size fields of the application data.
+
+    The template TC is packed once. New packets are created by patching the changed fields in a
+    copy of the template. The CRC16 is updated using the linearity of the CRC, so only the
+    patched bytes need to be processed instead of the whole packet.
+
+    >>> template_tc = PusTelecommand(service=17, subservice=1, apid=0x01, app_data=bytes(4))
+    >>> template = PusTcTemplate(template_tc)
+    >>> tc_raw = template.create(seq_count=22, app_data_patches={2: bytes([0xab, 0xcd])})
+    >>> tc = PusTelecommand.unpack(tc_raw)
+    >>> tc.seq_count
+    22
+    >>> tc.app_data.hex(sep=",")
+    '00,00,ab,cd'
+    """
+
+    def __init__(self, tc: PusTelecommand):
+        """Create a template from a telecommand. Later changes to the telecommand do not
+        affect the template.
+
+        :param tc: Template telecommand.
+        """
+        self._raw = bytes(tc.pack())
+        self._crc = (self._raw[-2] << 8) | self._raw[-1]
+        self._app_data_offset = (
+            SPACE_PACKET_HEADER_SIZE + PusTcDataFieldHeader.PUS_C_SEC_HEADER_LEN
+        )
+        self._app_data_len = len(self._raw) - self._app_data_offset - 2
+        # Change of the CRC16 caused by changing the byte at a given offset, indexed by the XOR
+        # of the old and the new byte value. Generated on first use for each offset.
+        self._crc_delta_tables: Dict[int, List[int]] = {}
+
+    @property
+    def raw(self) -> bytes:
+        """The packed template telecommand."""
+        return self._raw
+
+    @property
+    def app_data_len(self) -> int:
+        return self._app_data_len
+
+    def create(
+        self,
+        seq_count: Optional[int] = None,
+        source_id: Optional[int] = None,
+        app_data_patches: Optional[Mapping[int, bytes]] = None,
+    ) -> bytearray:
+        """Create a new raw telecommand from the template.
+
+        :param seq_count: New sequence count. The template value is kept if this is None.
+        :param source_id: New source ID. The template value is kept if this is None.
+        :param app_data_patches: Mapping from offsets inside the application data to the bytes
+            which are written at these offsets.
+        :raises ValueError: Sequence count or source ID out of range or application data patch
+            exceeding the application data.
+        :return: The raw telecommand with a valid CRC16.
+        """
+        packet = bytearray(self._raw)
+        crc = self._crc
+        if seq_count is not None:
+            if seq_count > pow(2, 14) - 1 or seq_count < 0:
+                raise ValueError(
+                    f"Sequence count larger than allowed {pow(2, 14) - 1} or negative"
+                )
+            crc ^= self._patch(
+                packet,
+                2,
+                bytes([(packet[2] & 0xC0) | (seq_count >> 8), seq_count & 0xFF]),
+            )
+        if source_id is not None:
+            if source_id > pow(2, 16) - 1 or source_id < 0:
+                raise ValueError(f"Invalid source ID {source_id}")
+            crc ^= self._patch(
+                packet,
+                SPACE_PACKET_HEADER_SIZE + 3,
+                bytes([source_id >> 8, source_id & 0xFF]),
+            )
+        if app_data_patches is not None:
+            for offset, data in app_data_patches.items():
+                if offset < 0 or offset + len(data) > self._app_data_len:
+                    raise ValueError(
+                        f"patch with length {len(data)} at offset {offset} exceeds"
+                        f" application data length {self._app_data_len}"
+                    )
+                crc ^= self._patch(packet, self._app_data_offset + offset, data)
+        packet[-2] = crc >> 8
+        packet[-1] = crc & 0xFF
+        return packet
+
+    def _patch(self, packet: bytearray, offset: int, data: bytes) -> int:
+        """Write the data into the packet and return the change of the CRC16."""
+        crc_delta = 0
+        for idx, byte in enumerate(data, offset):
+            byte_delta = packet[idx] ^ byte
+            if byte_delta:
+                table = self._crc_delta_tables.get(idx)
+                if table is None:
+                    table = self._gen_crc_delta_table(idx)
+                crc_delta ^= table[byte_delta]
+        packet[offset : offset + len(data)] = data
+        return crc_delta
+
+    def _gen_crc_delta_table(self, offset: int) -> List[int]:
+        high_table, low_table = crc16_ccitt_advance_tables(len(self._raw) - 3 - offset)
+        table = []
+        for byte_delta in range(256):
+            crc = crc16_ccitt(bytes([byte_delta]), 0)
+            table.append(high_table[crc >> 8] ^ low_table[crc & 0xFF])
+        self._crc_delta_tables[offset] = table
+        return table
+
+
 def generate_packet_crc(tc_packet: bytearray) -> bytes:
     """Removes current Packet Error Control, calculates new
     CRC16 checksum and adds it as correct Packet Error Control Code.
     Reference: ECSS-E70-41A p. 207-212
     """
-    crc = CRC16_CCITT_FUNC(tc_packet[0 : len(tc_packet) - 2])
+    crc = crc16_ccitt(memoryview(tc_packet)[0 : len(tc_packet) - 2])
     tc_packet[len(tc_packet) - 2] = (crc & 0xFF00) >> 8
     tc_packet[len(tc_packet) - 1] = crc & 0xFF
     return tc_packet
@@ -394,6 +633,6 @@ def generate_crc(data: bytearray) -> bytes:
     """Takes the application data, appends the CRC16 checksum and returns resulting bytearray"""
     data_with_crc = bytearray()
     data_with_crc += data
-    crc = CRC16_CCITT_FUNC(data)
+    crc = crc16_ccitt(data)
     data_with_crc.extend(struct.pack("!H", crc))
     return data_with_crc
@@ -5,16 +5,20 @@ from __future__ import annotations
 
 from abc import abstractmethod
 import struct
-from typing import Optional
+from typing import Optional, Union
 
 import deprecation
-from crcmod.predefined import PredefinedCrc
 
 from .exceptions import TmSrcDataTooShortError  # noqa  # re-export
 from spacepackets.version import get_version
-from spacepackets.ccsds.time.common import read_p_field
 from spacepackets.exceptions import BytesTooShortError
-from spacepackets.util import PrintFormats, get_printable_data_string
+from spacepackets.util import (
+    GenerationTracked,
+    PrintFormats,
+    get_printable_data_string,
+    advance_generation,
+    tracked_field,
+)
 from spacepackets.ccsds.spacepacket import (
     SpacePacketHeader,
     SPACE_PACKET_HEADER_SIZE,
@@ -23,14 +27,21 @@ from spacepackets.ccsds.spacepacket import (
     SpacePacket,
     AbstractSpacePacket,
     SequenceFlags,
+    check_pack_buf_len,
+)
+from spacepackets.ccsds.time import (
+    CdsShortTimestamp,
+    CdsShortTime,
+    CcsdsTimeProvider,
+    TimeReaderRegistry,
 )
-from spacepackets.ccsds.time import CdsShortTimestamp, CcsdsTimeProvider
 from spacepackets.ecss.conf import (
     PusVersion,
     get_default_tm_apid,
     FETCH_GLOBAL_APID,
 )
-from spacepackets.crc import CRC16_CCITT_FUNC
+from spacepackets.crc import Crc16Ccitt, crc16_ccitt
+from spacepackets.ecss.defs import PackCacheInfo
 
 
 class AbstractPusTm(AbstractSpacePacket):
@@ -78,12 +89,33 @@ class AbstractPusTm(AbstractSpacePacket):
         pass
 
 
-class PusTmSecondaryHeader:
+_TM_SEC_HEADER_STRUCT = struct.Struct("!BBBHH")
+
+
+class PusTmSecondaryHeader(GenerationTracked):
     """Unpacks the PUS telemetry packet secondary header.
     Currently only supports CDS short timestamps and PUS C"""
 
+    __slots__ = (
+        "_pus_version",
+        "_spacecraft_time_ref",
+        "_service",
+        "_subservice",
+        "_message_counter",
+        "_dest_id",
+        "_time_provider",
+    )
+
     MIN_LEN = 7
 
+    pus_version = tracked_field("_pus_version")
+    spacecraft_time_ref = tracked_field("_spacecraft_time_ref")
+    service = tracked_field("_service")
+    subservice = tracked_field("_subservice")
+    message_counter = tracked_field("_message_counter")
+    dest_id = tracked_field("_dest_id")
+    time_provider = tracked_field("_time_provider")
+
     def __init__(
         self,
         service: int,
@@ -102,91 +134,113 @@ class PusTmSecondaryHeader:
         :param dest_id: Destination ID if PUS C is used
         :param spacecraft_time_ref: Space time reference if PUS C is used
         """
-        self.pus_version = PusVersion.PUS_C
-        self.spacecraft_time_ref = spacecraft_time_ref
+        self._pus_version = PusVersion.PUS_C
+        self._spacecraft_time_ref = spacecraft_time_ref
         if service > pow(2, 8) - 1 or service < 0:
             raise ValueError(f"Invalid Service {service}")
         if subservice > pow(2, 8) - 1 or subservice < 0:
             raise ValueError(f"Invalid Subservice {subservice}")
-        self.service = service
-        self.subservice = subservice
+        self._service = service
+        self._subservice = subservice
         if message_counter > pow(2, 16) - 1 or message_counter < 0:
             raise ValueError(
                 f"Invalid message count value, larger than {pow(2, 16) - 1} or negative"
             )
-        self.message_counter = message_counter
-        self.dest_id = dest_id
-        self.time_provider = time_provider
-
-    @classmethod
-    def __empty(cls) -> PusTmSecondaryHeader:
-        return PusTmSecondaryHeader(
-            service=0,
-            subservice=0,
-            time_provider=CdsShortTimestamp.from_now(),
-            message_counter=0,
-        )
+        self._message_counter = message_counter
+        self._dest_id = dest_id
+        self._time_provider = time_provider
+        self._generation = 0
 
     def pack(self) -> bytearray:
-        secondary_header = bytearray()
-        secondary_header.append(self.pus_version << 4 | self.spacecraft_time_ref)
-        secondary_header.append(self.service)
-        secondary_header.append(self.subservice)
-        secondary_header.extend(struct.pack("!H", self.message_counter))
-        secondary_header.extend(struct.pack("!H", self.dest_id))
-        if self.time_provider:
-            secondary_header.extend(self.time_provider.pack())
+        secondary_header = bytearray(self.header_size)
+        self.pack_into(secondary_header)
         return secondary_header
 
+    def pack_into(self, buf: bytearray, offset: int = 0) -> int:
+        """Pack the secondary header directly into a writable buffer.
+
+        :raises BytesTooShortError: Buffer too short.
+        :return: Number of bytes written.
+        """
+        header_size = self.header_size
+        check_pack_buf_len(buf, offset, header_size)
+        _TM_SEC_HEADER_STRUCT.pack_into(
+            buf,
+            offset,
+            self._pus_version << 4 | self._spacecraft_time_ref,
+            self._service,
+            self._subservice,
+            self._message_counter,
+            self._dest_id,
+        )
+        if self._time_provider:
+            stamp_len = self._time_provider.pack_into(buf, offset + self.MIN_LEN)
+            if stamp_len != header_size - self.MIN_LEN:
+                raise ValueError(
+                    f"packed timestamp length {stamp_len} does not match expected length"
+                    f" {header_size - self.MIN_LEN}"
+                )
+        return header_size
+
+    def packed_len(self) -> int:
+        return self.header_size
+
     @classmethod
     def unpack(
-        cls, data: bytes, time_reader: Optional[CcsdsTimeProvider]
+        cls,
+        data: bytes,
+        time_reader: Optional[Union[CcsdsTimeProvider, TimeReaderRegistry]],
     ) -> PusTmSecondaryHeader:
         """Unpack the PUS TM secondary header from the raw packet starting at the header index.
 
         :param data: Raw data. Please note that the passed buffer should start where the actual
             header start is.
         :param time_reader: Generic time reader which knows the time stamp size and how to interpret
-            the raw timestamp
+            the raw timestamp. The timestamp is read into a new instance with
+            :py:meth:`spacepackets.ccsds.time.CcsdsTimeProvider.read_new`, so the same
+            reader can be used to unpack multiple headers. If a
+            :py:class:`spacepackets.ccsds.time.TimeReaderRegistry` is passed, the reader is
+            selected by the P-field of the timestamp.
         :raises ValueError: bytearray too short or PUS version missmatch.
         :return:
         """
         if len(data) < cls.MIN_LEN:
             raise BytesTooShortError(cls.MIN_LEN, len(data))
-        secondary_header = cls.__empty()
-        current_idx = 0
-        secondary_header.pus_version = (data[current_idx] & 0xF0) >> 4
-        if secondary_header.pus_version != PusVersion.PUS_C:
+        (
+            version_and_time_ref,
+            service,
+            subservice,
+            message_counter,
+            dest_id,
+        ) = _TM_SEC_HEADER_STRUCT.unpack_from(data)
+        pus_version = version_and_time_ref >> 4
+        if pus_version != PusVersion.PUS_C:
             raise ValueError(
-                f"PUS version field value {secondary_header.pus_version} "
+                f"PUS version field value {pus_version} "
                 f"found where PUS C {PusVersion.PUS_C} was expected"
             )
-        secondary_header.spacecraft_time_ref = data[current_idx] & 0x0F
-        if secondary_header.header_size > len(data):
-            raise BytesTooShortError(secondary_header.header_size, len(data))
-        current_idx += 1
-        secondary_header.service = data[current_idx]
-        current_idx += 1
-        secondary_header.subservice = data[current_idx]
-        current_idx += 1
-        secondary_header.message_counter = struct.unpack(
-            "!H", data[current_idx : current_idx + 2]
-        )[0]
-        current_idx += 2
-        secondary_header.dest_id = struct.unpack(
-            "!H", data[current_idx : current_idx + 2]
-        )[0]
-        current_idx += 2
-        # If other time formats are supported in the future, this information can be used
-        #  to unpack the correct time code
-        time_code_id = read_p_field(data[current_idx])
-        if time_code_id:
-            pass
+        # All fields of the raw header are in range, so the validating constructor is skipped.
+        secondary_header = cls.__new__(cls)
+        secondary_header._pus_version = pus_version
+        secondary_header._spacecraft_time_ref = version_and_time_ref & 0x0F
+        secondary_header._service = service
+        secondary_header._subservice = subservice
+        secondary_header._message_counter = message_counter
+        secondary_header._dest_id = dest_id
+        secondary_header._generation = 0
+        current_idx = cls.MIN_LEN
+        if isinstance(time_reader, TimeReaderRegistry):
+            time_reader = time_reader.reader_for(data, current_idx)
         if time_reader:
-            time_reader.read_from_raw(
+            if cls.MIN_LEN + time_reader.len_packed > len(data):
+                raise BytesTooShortError(
+                    cls.MIN_LEN + time_reader.len_packed, len(data)
+                )
+            # Read a new timestamp so unpacked headers do not share the same time instance.
+            time_reader = time_reader.read_new(
                 data[current_idx : current_idx + time_reader.len_packed]
             )
-        secondary_header.time_provider = time_reader
+        secondary_header._time_provider = time_reader
         return secondary_header
 
     def __repr__(self):
@@ -204,11 +258,15 @@ class PusTmSecondaryHeader:
     @property
     def header_size(self) -> int:
         base_len = 7
-        if self.time_provider:
-            base_len += self.time_provider.len_packed
+        if self._time_provider:
+            base_len += self._time_provider.len_packed
         return base_len
 
 
+# Offset of the timestamp P-field inside a PUS TM.
+_TIMESTAMP_OFFSET = SPACE_PACKET_HEADER_SIZE + PusTmSecondaryHeader.MIN_LEN
+
+
 class InvalidTmCrc16(Exception):
     def __init__(self, tm: PusTelemetry):
         self.tm = tm
@@ -278,6 +336,17 @@ class PusTelemetry(AbstractPusTm):
             time_provider=time_provider,
         )
         self._crc16: Optional[bytes] = None
+        self._init_pack_cache()
+
+    def _init_pack_cache(self):
+        self._pack_cache: Optional[bytes] = None
+        # Components which were packed into the cache. Replacing a component invalidates the
+        # packed bytes, changes of the components themselves are detected with their generation.
+        self._pack_cache_parts: tuple = ()
+        self._pack_cache_generation = 0
+        self._pack_cache_stamp: Optional[bytes] = None
+        self._pack_cache_hits = 0
+        self._pack_cache_misses = 0
 
     @classmethod
     def empty(cls) -> PusTelemetry:
@@ -288,49 +357,157 @@ class PusTelemetry(AbstractPusTm):
     def pack(self, recalc_crc: bool = True) -> bytearray:
         """Serializes the packet into a raw bytearray.
 
+        The packed representation is cached, so packing an unchanged TM repeatedly only copies the
+        cached bytes. The headers and the timestamps of this package track their changes with
+        generation numbers, so the cache is also invalidated if fields of the headers or the
+        timestamp are changed directly. Other time providers are validated by comparing their
+        packed timestamp. Source data in a mutable buffer like a :py:class:`bytearray` can
+        change without notice and is always packed again. :py:meth:`pack_cache_info` can be used
+        to retrieve the cache statistics.
+
         :param recalc_crc: Can be set to False if the CRC was previous calculated and no fields were
             changed. This is set to True by default to ensure the CRC is always valid by default,
             even if the user changes arbitrary fields after TM creation.
         """
-        tm_packet_raw = bytearray(self.space_packet_header.pack())
-        tm_packet_raw.extend(self.pus_tm_sec_header.pack())
-        tm_packet_raw.extend(self._source_data)
+        if recalc_crc:
+            return bytearray(self._cached_pack())
+        tm_packet_raw = bytearray(self.packed_len())
+        self._pack_into(tm_packet_raw, 0, recalc_crc=False)
+        return tm_packet_raw
+
+    def pack_into(
+        self, buf: bytearray, offset: int = 0, recalc_crc: bool = True
+    ) -> int:
+        """Serializes the packet directly into a writable buffer, for example a
+        :py:class:`bytearray`, a :py:class:`memoryview` or a :py:class:`mmap.mmap`.
+
+        :param buf: Writable buffer.
+        :param offset: Offset at which the packet is written.
+        :param recalc_crc: See :py:meth:`pack`.
+        :raises BytesTooShortError: Buffer too short.
+        :return: Number of bytes written.
+        """
+        if recalc_crc:
+            packed = self._cached_pack()
+            check_pack_buf_len(buf, offset, len(packed))
+            buf[offset : offset + len(packed)] = packed
+            return len(packed)
+        return self._pack_into(buf, offset, recalc_crc=False)
+
+    def _pack_into(self, buf: bytearray, offset: int, recalc_crc: bool) -> int:
+        packed_len = self.packed_len()
+        check_pack_buf_len(buf, offset, packed_len)
+        current_idx = offset + self.space_packet_header.pack_into(buf, offset)
+        current_idx += self.pus_tm_sec_header.pack_into(buf, current_idx)
+        buf[current_idx : current_idx + len(self._source_data)] = self._source_data
+        current_idx += len(self._source_data)
         if self._crc16 is None or recalc_crc:
             # CRC16-CCITT checksum
-            self._crc16 = struct.pack("!H", CRC16_CCITT_FUNC(tm_packet_raw))
-        tm_packet_raw.extend(self._crc16)
-        return tm_packet_raw
+            with memoryview(buf) as buf_view:
+                self._crc16 = struct.pack(
+                    "!H", crc16_ccitt(buf_view[offset:current_idx])
+                )
+        buf[current_idx : current_idx + 2] = self._crc16
+        return packed_len
+
+    def _cached_pack(self) -> bytes:
+        sp_header = self.space_packet_header
+        sec_header = self.pus_tm_sec_header
+        source_data = self._source_data
+        time_provider = sec_header._time_provider
+        parts = self._pack_cache_parts
+        if (
+            self._pack_cache is not None
+            and parts[0] is sp_header
+            and parts[1] is sec_header
+            and parts[2] is source_data
+            and isinstance(source_data, bytes)
+            and max(
+                sp_header._generation,
+                sp_header._packet_id._generation,
+                sp_header._psc._generation,
+                sec_header._generation,
+                self._stamp_generation(time_provider),
+            )
+            <= self._pack_cache_generation
+        ):
+            self._pack_cache_hits += 1
+            return self._pack_cache
+        self._pack_cache_misses += 1
+        generation = advance_generation()
+        tm_packet_raw = bytearray(self.packed_len())
+        self._pack_into(tm_packet_raw, 0, recalc_crc=True)
+        self._pack_cache = bytes(tm_packet_raw)
+        self._pack_cache_parts = (sp_header, sec_header, source_data)
+        self._pack_cache_generation = generation
+        if time_provider and time_provider._generation is None:
+            self._pack_cache_stamp = bytes(time_provider.pack())
+        return self._pack_cache
+
+    def _stamp_generation(self, time_provider: Optional[CcsdsTimeProvider]) -> int:
+        if not time_provider:
+            return 0
+        if time_provider._generation is not None:
+            return time_provider._generation
+        # The time provider does not track its changes, so the packed timestamp is compared.
+        if time_provider.pack() == self._pack_cache_stamp:
+            return 0
+        return self._pack_cache_generation + 1
+
+    def pack_cache_info(self) -> PackCacheInfo:
+        """Hits and misses of the packed bytes cache used by :py:meth:`pack`."""
+        return PackCacheInfo(self._pack_cache_hits, self._pack_cache_misses)
+
+    def packed_len(self) -> int:
+        """Length of the packet when packed, which is determined without packing it."""
+        return (
+            SPACE_PACKET_HEADER_SIZE
+            + self.pus_tm_sec_header.header_size
+            + len(self._source_data)
+            + 2
+        )
 
     def calc_crc(self):
         """Can be called to calculate the CRC16"""
-        crc = PredefinedCrc(crc_name="crc-ccitt-false")
-        crc.update(self.space_packet_header.pack())
+        crc = Crc16Ccitt(self.space_packet_header.pack())
         crc.update(self.pus_tm_sec_header.pack())
         crc.update(self._source_data)
-        self._crc16 = struct.pack("!H", crc.crcValue)
+        self._crc16 = crc.digest()
 
     @classmethod
     def unpack(
-        cls, data: bytes, time_reader: Optional[CcsdsTimeProvider]
+        cls,
+        data: bytes,
+        time_reader: Optional[Union[CcsdsTimeProvider, TimeReaderRegistry]],
     ) -> PusTelemetry:
         """Attempts to construct a generic PusTelemetry class given a raw bytearray.
 
         :param data: Raw bytes containing the PUS telemetry packet.
         :param time_reader: Time provider to read the timestamp. If the timestamp field is empty,
-            you can supply None here.
+            you can supply None here. If a :py:class:`spacepackets.ccsds.time.TimeReaderRegistry`
+            is passed, the reader is selected by the P-field of the timestamp and cached for the
+            APID of the packet.
         :raises BytesTooShortError: Passed bytestream too short.
-        :raises ValueError: Unsupported PUS version.
+        :raises ValueError: Unsupported PUS version or no time reader for the P-field.
         :raises InvalidTmCrc16: Invalid CRC16.
         """
         if data is None:
             raise ValueError("byte stream invalid")
-        pus_tm = cls.empty()
+        # All fields are set from the raw packet, so the constructor is skipped.
+        pus_tm = cls.__new__(cls)
+        pus_tm._init_pack_cache()
         pus_tm.space_packet_header = SpacePacketHeader.unpack(data=data)
         expected_packet_len = get_total_space_packet_len_from_len_field(
             pus_tm.space_packet_header.data_len
         )
         if expected_packet_len > len(data):
             raise BytesTooShortError(expected_packet_len, len(data))
+        if isinstance(time_reader, TimeReaderRegistry):
+            time_reader = time_reader.reader_for(
+                data[:expected_packet_len],
+                _TIMESTAMP_OFFSET,
+                pus_tm.space_packet_header.apid,
+            )
         pus_tm.pus_tm_sec_header = PusTmSecondaryHeader.unpack(
             data=data[SPACE_PACKET_HEADER_SIZE:],
             time_reader=time_reader,
@@ -347,7 +524,7 @@ class PusTelemetry(AbstractPusTm):
         ]
         pus_tm._crc16 = data[expected_packet_len - 2 : expected_packet_len]
         # CRC16-CCITT checksum
-        if CRC16_CCITT_FUNC(data[:expected_packet_len]) != 0:
+        if crc16_ccitt(memoryview(data)[:expected_packet_len]) != 0:
             raise InvalidTmCrc16(pus_tm)
         return pus_tm
 
@@ -561,3 +738,209 @@ class PusTelemetry(AbstractPusTm):
         return get_printable_data_string(
             print_format=print_format, data=self._source_data
         )
+
+
+class LazyPusTelemetry(AbstractPusTm):
+    """PUS telemetry packet which keeps the raw packet and only decodes fields on first access.
+
+    The constructor only validates the packet length and the PUS version. Fields which are
+    required for routing like the APID, the service and the subservice are read directly from
+    the raw bytes. The space packet header, the secondary header including the timestamp and the
+    source data are decoded once on first access and cached. The CRC is not checked on
+    construction. It can be checked on demand with :py:meth:`check_crc` or
+    :py:attr:`crc_valid`, and it is only calculated once.
+
+    Timestamps are read into new instances, so one time reader instance can be shared between
+    multiple lazy packets.
+
+    >>> ping_tm = PusTelemetry(service=17, subservice=2, seq_count=5, apid=0x01, time_provider=CdsShortTimestamp.empty()) # noqa
+    >>> lazy_tm = LazyPusTelemetry(ping_tm.pack(), CdsShortTimestamp.empty())
+    >>> lazy_tm.service, lazy_tm.subservice, lazy_tm.apid
+    (17, 2, 1)
+    >>> lazy_tm.crc_valid
+    True
+    >>> lazy_tm.to_pus_tm() == ping_tm
+    True
+    """
+
+    def __init__(
+        self,
+        data: bytes,
+        time_reader: Optional[Union[CcsdsTimeProvider, TimeReaderRegistry]],
+    ):
+        """Create a lazily decoded PUS telemetry packet. The raw data is not copied.
+
+        :param data: Raw data starting with the PUS telemetry packet. Any object supporting the
+            buffer protocol can be passed. Trailing data after the packet is ignored.
+        :param time_reader: Time provider to read the timestamp. If the timestamp field is empty,
+            you can supply None here. If a :py:class:`spacepackets.ccsds.time.TimeReaderRegistry`
+            is passed, the reader is selected by the P-field of the timestamp and cached for the
+            APID of the packet.
+        :raises BytesTooShortError: Passed bytestream too short.
+        :raises ValueError: Unsupported PUS version, packet length field too small or no time
+            reader for the P-field.
+        """
+        raw = memoryview(data)
+        if raw.format != "B" or raw.ndim != 1:
+            raw = raw.cast("B")
+        if len(raw) < SPACE_PACKET_HEADER_SIZE:
+            raise BytesTooShortError(SPACE_PACKET_HEADER_SIZE, len(raw))
+        packet_len = get_total_space_packet_len_from_len_field((raw[4] << 8) | raw[5])
+        if packet_len > len(raw):
+            raise BytesTooShortError(packet_len, len(raw))
+        if isinstance(time_reader, TimeReaderRegistry):
+            time_reader = time_reader.reader_for(
+                raw[:packet_len], _TIMESTAMP_OFFSET, ((raw[0] & 0b111) << 8) | raw[1]
+            )
+        self._time_reader = time_reader
+        stamp_len = time_reader.len_packed if time_reader else 0
+        self._sec_header_len = PusTmSecondaryHeader.MIN_LEN + stamp_len
+        if packet_len < SPACE_PACKET_HEADER_SIZE + self._sec_header_len + 2:
+            raise ValueError("passed packet too short")
+        pus_version = raw[SPACE_PACKET_HEADER_SIZE] >> 4
+        if pus_version != PusVersion.PUS_C:
+            raise ValueError(
+                f"PUS version field value {pus_version} "
+                f"found where PUS C {PusVersion.PUS_C} was expected"
+            )
+        self._raw = raw[:packet_len].toreadonly()
+        self._sp_header: Optional[SpacePacketHeader] = None
+        self._sec_header: Optional[PusTmSecondaryHeader] = None
+        self._source_data: Optional[bytes] = None
+        self._crc_valid: Optional[bool] = None
+
+    @property
+    def raw(self) -> memoryview:
+        """The raw PUS telemetry packet."""
+        return self._raw
+
+    @property
+    def apid(self) -> int:
+        return ((self._raw[0] & 0b111) << 8) | self._raw[1]
+
+    @property
+    def seq_count(self) -> int:
+        return ((self._raw[2] & 0x3F) << 8) | self._raw[3]
+
+    @property
+    def service(self) -> int:
+        return self._raw[7]
+
+    @property
+    def subservice(self) -> int:
+        return self._raw[8]
+
+    @property
+    def message_counter(self) -> int:
+        return (self._raw[9] << 8) | self._raw[10]
+
+    @property
+    def dest_id(self) -> int:
+        return (self._raw[11] << 8) | self._raw[12]
+
+    @property
+    def cds_time(self) -> CdsShortTime:
+        """CDS short timestamp read directly from the raw packet as an immutable
+        :py:class:`spacepackets.ccsds.time.CdsShortTime`, independently of the time reader.
+
+        :raises BytesTooShortError: Packet too short for a CDS short timestamp.
+        :raises ValueError: The timestamp is not a CDS short timestamp.
+        """
+        return CdsShortTime.unpack(
+            self._raw[: len(self._raw) - 2],
+            SPACE_PACKET_HEADER_SIZE + PusTmSecondaryHeader.MIN_LEN,
+        )
+
+    @property
+    def packet_len(self) -> int:
+        return len(self._raw)
+
+    @property
+    def sp_header(self) -> SpacePacketHeader:
+        if self._sp_header is None:
+            self._sp_header = SpacePacketHeader.unpack(self._raw)
+        return self._sp_header
+
+    @property
+    def pus_tm_sec_header(self) -> PusTmSecondaryHeader:
+        if self._sec_header is None:
+            self._sec_header = self._unpack_sec_header()
+        return self._sec_header
+
+    def _unpack_sec_header(self) -> PusTmSecondaryHeader:
+        return PusTmSecondaryHeader.unpack(
+            data=self._raw[SPACE_PACKET_HEADER_SIZE:],
+            time_reader=self._time_reader,
+        )
+
+    @property
+    def time_provider(self) -> Optional[CcsdsTimeProvider]:
+        return self.pus_tm_sec_header.time_provider
+
+    @property
+    def source_data(self) -> bytes:
+        if self._source_data is None:
+            self._source_data = bytes(
+                self._raw[SPACE_PACKET_HEADER_SIZE + self._sec_header_len : -2]
+            )
+        return self._source_data
+
+    @property
+    def tm_data(self) -> bytes:
+        return self.source_data
+
+    @property
+    def crc16(self) -> bytes:
+        return bytes(self._raw[-2:])
+
+    @property
+    def crc_valid(self) -> bool:
+        """Check the CRC16 of the packet. It is only calculated on the first access."""
+        if self._crc_valid is None:
+            self._crc_valid = crc16_ccitt(self._raw) == 0
+        return self._crc_valid
+
+    def check_crc(self):
+        """:raises InvalidTmCrc16: Invalid CRC16."""
+        if not self.crc_valid:
+            raise InvalidTmCrc16(self)
+
+    def to_pus_tm(self) -> PusTelemetry:
+        """Fully decode the packet into a regular :py:class:`PusTelemetry` instance.
+
+        :raises InvalidTmCrc16: Invalid CRC16.
+        """
+        self.check_crc()
+        # Decode new header instances so the returned packet does not share state with the
+        # cached headers of this instance.
+        pus_tm = PusTelemetry.from_composite_fields(
+            SpacePacketHeader.unpack(self._raw),
+            self._unpack_sec_header(),
+            self.source_data,
+        )
+        pus_tm._crc16 = self.crc16
+        return pus_tm
+
+    def pack(self) -> bytearray:
+        return bytearray(self._raw)
+
+    def pack_into(self, buf: bytearray, offset: int = 0) -> int:
+        check_pack_buf_len(buf, offset, len(self._raw))
+        buf[offset : offset + len(self._raw)] = self._raw
+        return len(self._raw)
+
+    def packed_len(self) -> int:
+        return len(self._raw)
+
+    def __str__(self):
+        return (
+            f"PUS TM[{self.service},{self.subservice}], APID {self.apid:#05x}, MSG Counter "
+            f"{self.message_counter}, Size {self.packet_len}"
+        )
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(apid={self.apid!r}, service={self.service!r},"
+            f" subservice={self.subservice!r}, seq_count={self.seq_count!r},"
+            f" packet_len={self.packet_len!r})"
+        )
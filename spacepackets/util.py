@@ -1,7 +1,70 @@
 from __future__ import annotations
 import enum
 import struct
-from typing import Tuple, Union
+from operator import attrgetter
+from typing import Optional, Tuple, Union
+
+
+# Current generation, see current_generation and advance_generation.
+_generation = 1
+
+
+def current_generation() -> int:
+    """Generation which is stored by changed objects, see :py:class:`GenerationTracked`."""
+    return _generation
+
+
+def advance_generation() -> int:
+    """Return the current generation and start a new one.
+
+    This is called before a cached representation is created. All objects which change after
+    the call store a newer generation, while objects which changed before store the returned
+    generation or an older one. The generation is only advanced when a cache is filled, so all
+    objects which change in between share the same integer object.
+    """
+    global _generation
+    generation = _generation
+    _generation += 1
+    return generation
+
+
+class GenerationTracked:
+    """Base class for mutable packet components which store the generation of their last change
+    in ``_generation``.
+
+    The public fields of these components are properties created with :py:func:`tracked_field`.
+    Their setters store the current generation, while the constructors and the unpack methods
+    write the underlying slots directly, so creating and unpacking components has no overhead.
+    A cached packed representation is still valid if no component has a generation newer than
+    the generation returned by :py:func:`advance_generation` when the cache was filled, which
+    makes the validation independent of the number of fields.
+    """
+
+    __slots__ = ("_generation",)
+
+
+def tracked_field(slot: str, doc: Optional[str] = None) -> property:
+    """Create a property for a field which is stored in the given slot or attribute, for example
+    of a :py:class:`GenerationTracked` class. Setting the property stores the current generation
+    in ``_generation``.
+
+    >>> class Counter(GenerationTracked):
+    ...     __slots__ = ("_value",)
+    ...     value = tracked_field("_value")
+    ...     def __init__(self, value: int):
+    ...         self._value = value
+    ...         self._generation = 0
+    >>> counter = Counter(1)
+    >>> counter.value = 2
+    >>> counter.value, counter._generation == current_generation()
+    (2, True)
+    """
+
+    def setter(self, value):
+        setattr(self, slot, value)
+        self._generation = _generation
+
+    return property(attrgetter(slot), setter, doc=doc)
 
 
 class PrintFormats(enum.IntEnum):
@@ -82,7 +145,8 @@ class IntByteConversion:
     @staticmethod
     def to_signed(byte_num: int, val: int) -> bytes:
         """Convert number of bytes in a field to the struct API signed format specifier,
-        assuming network endianness. Raises value error if number is not inside [1, 2, 4, 8]"""
+        assuming network endianness. Raises value error if number is not inside [1, 2, 4, 8]
+        """
         if byte_num not in [0, 1, 2, 4, 8]:
             raise ValueError("Invalid byte number, must be one of [0, 1, 2, 4, 8]")
         if byte_num == 0:
@@ -96,7 +160,8 @@ class IntByteConversion:
     @staticmethod
     def to_unsigned(byte_num: int, val: int) -> bytes:
         """Convert number of bytes in a field to the struct API unsigned format specifier,
-        assuming network endianness. Raises value error if number is not inside [1, 2, 4, 8]"""
+        assuming network endianness. Raises value error if number is not inside [1, 2, 4, 8]
+        """
         if byte_num not in [0, 1, 2, 4, 8]:
             raise ValueError("Invalid byte number, must be one of [1, 2, 4, 8]")
         if byte_num == 0:
@@ -0,0 +1,101 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from spacepackets.ccsds import CdsShortTimestamp
+from spacepackets.ccsds.aio import SpacePacketStreamReader
+from spacepackets.ecss.tm import PusTelemetry
+
+
+class TestSpacePacketStreamReader(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        self.tm_packets = [
+            PusTelemetry(
+                service=17,
+                subservice=2,
+                seq_count=idx,
+                source_data=bytes(idx),
+                time_provider=CdsShortTimestamp.empty(),
+            )
+            for idx in range(5)
+        ]
+        self.tm_raw = [tm.pack() for tm in self.tm_packets]
+
+    def _stream(self, data: bytes, eof: bool = True) -> asyncio.StreamReader:
+        stream = asyncio.StreamReader()
+        stream.feed_data(data)
+        if eof:
+            stream.feed_eof()
+        return stream
+
+    async def test_read_packets(self):
+        reader = SpacePacketStreamReader(self._stream(b"".join(self.tm_raw)))
+        packets = [packet async for packet in reader]
+        self.assertEqual(packets, self.tm_raw)
+
+    async def test_read_packet_split(self):
+        stream = self._stream(self.tm_raw[0][:3], eof=False)
+        reader = SpacePacketStreamReader(stream)
+        read_task = asyncio.ensure_future(reader.read_packet())
+        await asyncio.sleep(0)
+        self.assertFalse(read_task.done())
+        stream.feed_data(self.tm_raw[0][3:])
+        self.assertEqual(await read_task, self.tm_raw[0])
+
+    async def test_resync(self):
+        stream = self._stream(bytes(7) + self.tm_raw[1] + bytes(2) + self.tm_raw[2])
+        reader = SpacePacketStreamReader(
+            stream, packet_ids=(self.tm_packets[0].packet_id,)
+        )
+        packets = [packet async for packet in reader]
+        self.assertEqual(packets, self.tm_raw[1:3])
+
+    async def test_resync_large_gap(self):
+        garbage = bytes(10_000) + bytes([0x08])
+        stream = self._stream(garbage + self.tm_raw[1] + self.tm_raw[2], eof=False)
+        reader = SpacePacketStreamReader(
+            stream, packet_ids=(self.tm_packets[0].packet_id,)
+        )
+        self.assertEqual(await reader.read_packet(), self.tm_raw[1])
+        self.assertEqual(await reader.read_packet(), self.tm_raw[2])
+        # Garbage without any packet ID at the end of the stream.
+        stream.feed_data(bytes(3))
+        stream.feed_eof()
+        with self.assertRaises(asyncio.IncompleteReadError):
+            await reader.read_packet()
+
+    async def test_truncated_stream(self):
+        reader = SpacePacketStreamReader(self._stream(self.tm_raw[0][:10]))
+        with self.assertRaises(asyncio.IncompleteReadError):
+            await reader.__anext__()
+
+    async def test_queued_decoding(self):
+        reader = SpacePacketStreamReader(
+            self._stream(b"".join(self.tm_raw)),
+            decoder=lambda raw: PusTelemetry.unpack(raw, CdsShortTimestamp.empty()),
+            max_queued=2,
+        )
+        packets = [packet async for packet in reader]
+        self.assertEqual(packets, self.tm_packets)
+        with self.assertRaises(StopAsyncIteration):
+            await reader.__anext__()
+        await reader.close()
+
+    async def test_queue_backpressure(self):
+        stream = self._stream(b"".join(self.tm_raw))
+        reader = SpacePacketStreamReader(stream, max_queued=1)
+        self.assertEqual(await reader.__anext__(), self.tm_raw[0])
+        for _ in range(5):
+            await asyncio.sleep(0)
+        # The reading task is blocked by the full queue and did not consume the whole stream.
+        self.assertFalse(stream.at_eof())
+        await reader.close()
+
+    async def test_queued_truncated_stream(self):
+        reader = SpacePacketStreamReader(
+            self._stream(self.tm_raw[0] + self.tm_raw[1][:10]), max_queued=4
+        )
+        self.assertEqual(await reader.__anext__(), self.tm_raw[0])
+        with self.assertRaises(asyncio.IncompleteReadError):
+            await reader.__anext__()
+        with self.assertRaises(StopAsyncIteration):
+            await reader.__anext__()
@@ -0,0 +1,162 @@
+import tempfile
+import zlib
+from pathlib import Path
+from unittest import TestCase
+from unittest.mock import patch
+
+from spacepackets.ccsds import PacketType, SpacePacketHeader
+from spacepackets.ccsds.archive import SpacePacketArchive
+
+
+def create_packet(apid: int, seq_count: int, data_len: int = 3) -> bytes:
+    sp_header = SpacePacketHeader(
+        packet_type=PacketType.TM, apid=apid, seq_count=seq_count, data_len=data_len
+    )
+    return sp_header.pack() + bytes([seq_count & 0xFF] * (data_len + 1))
+
+
+class TestArchive(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.archive_path = Path(self.tmp_dir.name) / "tm.bin"
+        self.packets = []
+        for seq_count in range(10):
+            self.packets.append(create_packet(0x65, seq_count))
+            self.packets.append(create_packet(0x02, seq_count * 2, seq_count))
+        self.archive_path.write_bytes(b"".join(self.packets))
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def test_basic(self):
+        with SpacePacketArchive(self.archive_path) as archive:
+            self.assertEqual(len(archive), 20)
+            self.assertEqual(archive.apids, [0x02, 0x65])
+            self.assertEqual(archive.num_packets(0x65), 10)
+            self.assertEqual(archive.num_packets(0x03), 0)
+            packet = archive.packet(0x65, 3)
+            self.assertEqual(packet, self.packets[6])
+            self.assertTrue(packet.readonly)
+            packet.release()
+            packet = archive.packet(0x02, 9)
+            self.assertEqual(packet, self.packets[19])
+            packet.release()
+            with self.assertRaises(IndexError):
+                archive.packet(0x02, 10)
+            with self.assertRaises(KeyError):
+                archive.packet(0x03, 0)
+            packets = list(archive.packets(0x02))
+            self.assertEqual(packets, self.packets[1::2])
+            for packet in packets:
+                packet.release()
+        self.assertTrue(archive.index_path.exists())
+
+    def test_seq_range(self):
+        with SpacePacketArchive(self.archive_path) as archive:
+            packets = archive.packets_in_seq_range(0x02, 4, 10)
+            self.assertEqual(
+                packets,
+                [self.packets[5], self.packets[7], self.packets[9], self.packets[11]],
+            )
+            packets.clear()
+            self.assertEqual(archive.packets_in_seq_range(0x03, 0, 10), [])
+
+    def test_seq_range_wrapped(self):
+        packets = [
+            create_packet(0x65, seq_count) for seq_count in (0x3FFE, 0x3FFF, 0, 1)
+        ]
+        self.archive_path.write_bytes(b"".join(packets))
+        with SpacePacketArchive(self.archive_path) as archive:
+            found = archive.packets_in_seq_range(0x65, 0x3FFF, 0)
+            self.assertEqual(found, packets[1:3])
+            found.clear()
+
+    def test_index_is_reused_and_updated(self):
+        with SpacePacketArchive(self.archive_path) as archive:
+            self.assertEqual(len(archive), 20)
+        index_raw = archive.index_path.read_bytes()
+        with SpacePacketArchive(self.archive_path) as archive:
+            self.assertEqual(len(archive), 20)
+            self.assertEqual(archive.num_packets(0x65), 10)
+        self.assertEqual(archive.index_path.read_bytes(), index_raw)
+        # Append a packet and a partial packet
+        new_packet = create_packet(0x7FF, 5)
+        with open(self.archive_path, "ab") as archive_file:
+            archive_file.write(new_packet + new_packet[:4])
+        with SpacePacketArchive(self.archive_path) as archive:
+            self.assertEqual(len(archive), 21)
+            packet = archive.packet(0x7FF, 0)
+            self.assertEqual(packet, new_packet)
+            packet.release()
+            self.assertEqual(archive.packet(0x65, 9), self.packets[18])
+
+    def test_invalid_index_is_rebuilt(self):
+        index_path = Path(self.tmp_dir.name) / "index.bin"
+        index_path.write_bytes(bytes(32))
+        with SpacePacketArchive(self.archive_path, index_path) as archive:
+            self.assertEqual(len(archive), 20)
+        with SpacePacketArchive(self.archive_path, index_path) as archive:
+            self.assertEqual(len(archive), 20)
+            self.assertEqual(
+                archive.packets_in_seq_range(0x65, 9, 9), [self.packets[18]]
+            )
+
+    def test_replaced_archive_is_reindexed(self):
+        with SpacePacketArchive(self.archive_path) as archive:
+            self.assertEqual(archive.num_packets(0x65), 10)
+        # Archive of the same length with other packets, for example after a restore.
+        packets = [create_packet(0x33, idx) for idx in range(10)]
+        packets += [create_packet(0x02, idx * 2, idx) for idx in range(10)]
+        self.archive_path.write_bytes(b"".join(packets))
+        with SpacePacketArchive(self.archive_path) as archive:
+            self.assertEqual(archive.apids, [0x02, 0x33])
+            self.assertEqual(archive.num_packets(0x65), 0)
+
+    def test_index_check_is_bounded(self):
+        packets = [create_packet(0x65, idx & 0x3FFF, 100) for idx in range(1000)]
+        self.archive_path.write_bytes(b"".join(packets))
+        with SpacePacketArchive(self.archive_path):
+            pass
+        checked_lens = []
+        zlib_crc32 = zlib.crc32
+
+        def crc32(data, value=0):
+            checked_lens.append(len(data))
+            return zlib_crc32(data, value)
+
+        with patch("spacepackets.ccsds.archive.zlib.crc32", crc32):
+            with SpacePacketArchive(self.archive_path) as archive:
+                self.assertEqual(len(archive), 1000)
+        # The first block and the last packet are checked instead of the whole archive.
+        self.assertEqual(checked_lens, [4096, len(packets[-1])])
+
+    def test_modified_last_packet_is_reindexed(self):
+        with SpacePacketArchive(self.archive_path) as archive:
+            self.assertEqual(archive.num_packets(0x02), 10)
+        packets = self.packets[:-1] + [create_packet(0x03, 18, 9)]
+        self.archive_path.write_bytes(b"".join(packets))
+        with SpacePacketArchive(self.archive_path) as archive:
+            self.assertEqual(archive.num_packets(0x02), 9)
+            self.assertEqual(archive.num_packets(0x03), 1)
+
+    def test_file_closed_on_error(self):
+        opened = []
+
+        def open_and_track(*args, **kwargs):
+            opened.append(open(*args, **kwargs))
+            return opened[-1]
+
+        with patch("spacepackets.ccsds.archive.open", open_and_track, create=True):
+            with patch.object(
+                SpacePacketArchive, "_build_index", side_effect=RuntimeError
+            ):
+                with self.assertRaises(RuntimeError):
+                    SpacePacketArchive(self.archive_path)
+        self.assertTrue(opened[0].closed)
+
+    def test_empty_archive(self):
+        self.archive_path.write_bytes(bytes())
+        with SpacePacketArchive(self.archive_path, persist_index=False) as archive:
+            self.assertEqual(len(archive), 0)
+            self.assertEqual(archive.apids, [])
+        self.assertFalse(archive.index_path.exists())
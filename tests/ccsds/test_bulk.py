@@ -0,0 +1,70 @@
+from unittest import TestCase, skipIf
+
+from spacepackets.ccsds import (
+    PacketType,
+    SequenceFlags,
+    SpacePacketHeader,
+)
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@skipIf(np is None, "NumPy is not installed")
+class TestBulkDecoding(TestCase):
+    def setUp(self) -> None:
+        self.headers = [
+            SpacePacketHeader(
+                packet_type=PacketType.TC if idx % 2 else PacketType.TM,
+                apid=idx * 0x101 % 0x7FF,
+                seq_count=(idx * 1000) % 0x3FFF,
+                data_len=idx * 3,
+                sec_header_flag=bool(idx % 3),
+                seq_flags=SequenceFlags(idx % 4),
+            )
+            for idx in range(20)
+        ]
+        self.capture = bytearray()
+        self.offsets = []
+        for sp_header in self.headers:
+            self.offsets.append(len(self.capture))
+            self.capture.extend(sp_header.pack())
+            self.capture.extend(bytes(sp_header.data_len + 1))
+
+    def test_find_offsets(self):
+        from spacepackets.ccsds.bulk import find_space_packet_offsets
+
+        offsets = find_space_packet_offsets(self.capture)
+        self.assertEqual(offsets.tolist(), self.offsets)
+
+    def test_find_offsets_incomplete_tail(self):
+        from spacepackets.ccsds.bulk import find_space_packet_offsets
+
+        offsets = find_space_packet_offsets(self.capture[:-1])
+        self.assertEqual(offsets.tolist(), self.offsets[:-1])
+        self.assertEqual(len(find_space_packet_offsets(bytes(3))), 0)
+
+    def test_decode_headers(self):
+        from spacepackets.ccsds.bulk import decode_sp_headers
+
+        decoded = decode_sp_headers(self.capture)
+        self.assertEqual(len(decoded), len(self.headers))
+        for row, sp_header, offset in zip(decoded, self.headers, self.offsets):
+            self.assertEqual(row["offset"], offset)
+            self.assertEqual(row["version"], sp_header.ccsds_version)
+            self.assertEqual(row["packet_type"], sp_header.packet_type)
+            self.assertEqual(row["sec_header_flag"], sp_header.sec_header_flag)
+            self.assertEqual(row["apid"], sp_header.apid)
+            self.assertEqual(row["seq_flags"], sp_header.seq_flags)
+            self.assertEqual(row["seq_count"], sp_header.seq_count)
+            self.assertEqual(row["data_len"], sp_header.data_len)
+
+    def test_decode_headers_with_offsets(self):
+        from spacepackets.ccsds.bulk import decode_sp_headers
+
+        decoded = decode_sp_headers(self.capture, self.offsets[2:4])
+        self.assertEqual(decoded["apid"].tolist(), [0x202, 0x303])
+        with self.assertRaises(ValueError):
+            decode_sp_headers(self.capture, [len(self.capture) - 2])
@@ -0,0 +1,229 @@
+import copy
+import datetime
+import pickle
+from unittest import TestCase, skipIf
+
+from spacepackets import BytesTooShortError
+from spacepackets.ccsds.time import (
+    CcsdsTimeCodeId,
+    CucLayout,
+    CucTimestamp,
+    cuc_to_datetime64,
+    cuc_to_unix_seconds,
+)
+from spacepackets.ecss import PusTelemetry
+from spacepackets.ecss.tm import LazyPusTelemetry
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+AGENCY_EPOCH = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+class TestCucLayout(TestCase):
+    def test_basic_p_field(self):
+        layout = CucLayout(coarse_len=4, fine_len=2)
+        self.assertEqual(layout.p_field, bytes([0x1E]))
+        self.assertEqual(layout.len_packed, 7)
+        layout = CucLayout(1, 0, CcsdsTimeCodeId.CUC_AGENCY_EPOCH)
+        self.assertEqual(layout.p_field, bytes([0x20]))
+        self.assertEqual(CucLayout.from_p_field(bytes([0x20])), layout)
+
+    def test_extended_p_field(self):
+        layout = CucLayout(coarse_len=6, fine_len=5)
+        self.assertEqual(layout.p_field, bytes([0x9F, (2 << 5) | (2 << 2)]))
+        self.assertEqual(layout.len_packed, 13)
+        parsed = CucLayout.from_p_field(layout.p_field + bytes(11))
+        self.assertEqual((parsed.coarse_len, parsed.fine_len), (6, 5))
+        # Extension octet which does not add any octets.
+        parsed = CucLayout.from_p_field(bytes([0x96, 0x00]))
+        self.assertEqual((parsed.coarse_len, parsed.fine_len), (2, 2))
+        self.assertEqual(parsed.len_packed, 6)
+
+    def test_immutable(self):
+        layout = CucLayout.from_p_field(bytes([0x96, 0x00]))
+        with self.assertRaises(AttributeError):
+            layout.len_packed = 5
+        with self.assertRaises(AttributeError):
+            layout.new_field = 0
+        self.assertIs(copy.deepcopy(layout), layout)
+        self.assertIs(pickle.loads(pickle.dumps(layout)), layout)
+        self.assertEqual(layout.len_packed, 6)
+        self.assertEqual(CucLayout(2, 2).len_packed, 5)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            CucLayout(coarse_len=8)
+        with self.assertRaises(ValueError):
+            CucLayout(fine_len=11)
+        with self.assertRaises(ValueError):
+            CucLayout(time_code=CcsdsTimeCodeId.CDS)
+        with self.assertRaises(ValueError):
+            CucLayout.from_p_field(bytes([0x40]))
+        with self.assertRaises(ValueError):
+            CucLayout.from_p_field(bytes([0x9F, 0x80]))
+        with self.assertRaises(BytesTooShortError):
+            CucLayout.from_p_field(bytes([0x9F]))
+
+    def test_unpack(self):
+        layout = CucLayout(4, 2)
+        raw = bytes([0xFF, 0x1E, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06])
+        self.assertEqual(layout.unpack(raw, 1), (0x01020304, 0x0506))
+        with self.assertRaises(BytesTooShortError):
+            layout.unpack(raw[:7], 1)
+        with self.assertRaises(ValueError):
+            layout.unpack(raw)
+
+    def test_pack_out_of_range(self):
+        layout = CucLayout(1, 1)
+        buf = bytearray(3)
+        self.assertEqual(layout.pack_into(buf, 0, 0xFF, 0xFF), 3)
+        with self.assertRaises(ValueError):
+            layout.pack_into(buf, 0, 0x100, 0)
+        with self.assertRaises(ValueError):
+            layout.pack_into(buf, 0, 0, 0x100)
+        with self.assertRaises(BytesTooShortError):
+            layout.pack_into(buf, 1, 0, 0)
+
+
+class TestCucTimestamp(TestCase):
+    def test_pack_unpack(self):
+        stamp = CucTimestamp(coarse=0x01020304, fine=0x0506)
+        self.assertEqual(stamp.pack(), bytes([0x1E, 1, 2, 3, 4, 5, 6]))
+        self.assertEqual(stamp.len_packed, 7)
+        self.assertEqual(stamp.ccsds_time_code(), CcsdsTimeCodeId.CUC_CCSDS_EPOCH)
+        self.assertEqual(CucTimestamp.unpack(stamp.pack()), stamp)
+        buf = bytearray(9)
+        self.assertEqual(stamp.pack_into(buf, 2), 7)
+        self.assertEqual(buf[2:], stamp.pack())
+
+    def test_read_from_raw_changes_layout(self):
+        stamp = CucTimestamp.empty()
+        stamp.read_from_raw(CucTimestamp(5, 1, coarse_len=2, fine_len=1).pack())
+        self.assertEqual((stamp.coarse, stamp.fine), (5, 1))
+        self.assertEqual(stamp.len_packed, 4)
+        self.assertEqual(stamp.layout.p_field, bytes([0x15]))
+
+    def test_read_new(self):
+        reader = CucTimestamp.empty()
+        stamp = reader.read_new(CucTimestamp(5, 1, coarse_len=2, fine_len=1).pack())
+        self.assertEqual((stamp.coarse, stamp.fine), (5, 1))
+        self.assertEqual(stamp.layout.p_field, bytes([0x15]))
+        self.assertEqual(reader, CucTimestamp.empty())
+        agency_reader = CucTimestamp(0, epoch=AGENCY_EPOCH)
+        stamp = agency_reader.read_new(CucTimestamp(60, epoch=AGENCY_EPOCH).pack())
+        self.assertEqual(
+            stamp.as_date_time(), AGENCY_EPOCH + datetime.timedelta(seconds=60)
+        )
+
+    def test_conversions(self):
+        dt = datetime.datetime(2024, 11, 20, 12, 30, 15, 250000, datetime.timezone.utc)
+        stamp = CucTimestamp.from_date_time(dt)
+        self.assertEqual(stamp.fine, 0x4000)
+        self.assertEqual(stamp.as_date_time(), dt)
+        self.assertEqual(stamp.as_unix_seconds(), dt.timestamp())
+
+    def test_agency_epoch(self):
+        stamp = CucTimestamp(60, 0x80, fine_len=1, epoch=AGENCY_EPOCH)
+        self.assertEqual(stamp.pfield, bytes([0x2D]))
+        self.assertEqual(
+            stamp.as_date_time(), AGENCY_EPOCH + datetime.timedelta(seconds=60.5)
+        )
+        unpacked = CucTimestamp.unpack(stamp.pack(), epoch=AGENCY_EPOCH)
+        self.assertEqual(unpacked, stamp)
+        with self.assertRaises(ValueError):
+            CucTimestamp.unpack(stamp.pack())
+        reader = CucTimestamp.empty()
+        reader.read_from_raw(stamp.pack())
+        with self.assertRaises(ValueError):
+            reader.as_unix_seconds()
+
+    def test_naive_epoch(self):
+        naive_epoch = datetime.datetime(2000, 1, 1)
+        with self.assertRaises(ValueError):
+            CucTimestamp(60, epoch=naive_epoch)
+        layout = CucTimestamp(60, epoch=AGENCY_EPOCH).layout
+        with self.assertRaises(ValueError):
+            CucTimestamp.with_layout(layout, 60, epoch=naive_epoch)
+        stamp = CucTimestamp(60, epoch=AGENCY_EPOCH)
+        with self.assertRaises(ValueError):
+            stamp.epoch = naive_epoch
+        self.assertEqual(stamp.as_unix_seconds(), stamp.as_date_time().timestamp())
+
+    def test_pus_tm_pack_cache(self):
+        self.assertIs(CucTimestamp.__setattr__, object.__setattr__)
+        stamp = CucTimestamp(1, 0)
+        tm = PusTelemetry(3, 25, stamp, apid=0x22)
+        tm.pack()
+        stamp.coarse = 2
+        self.assertEqual(PusTelemetry.unpack(tm.pack(), stamp).time_provider.coarse, 2)
+        stamp.read_from_raw(CucTimestamp(3, 0).pack())
+        self.assertEqual(tm.pack()[13:20], CucTimestamp(3, 0).pack())
+        self.assertEqual(tm.pack_cache_info().misses, 3)
+
+    def test_pus_tm_time_reader(self):
+        stamp = CucTimestamp(2_000_000_000, 0x8000)
+        packed = PusTelemetry(3, 25, stamp, apid=0x22, source_data=bytes(4)).pack()
+        tm = PusTelemetry.unpack(packed, CucTimestamp.empty())
+        self.assertEqual(tm.time_provider, stamp)
+        self.assertEqual(tm.source_data, bytes(4))
+        lazy = LazyPusTelemetry(packed, CucTimestamp.empty())
+        self.assertEqual(lazy.time_provider, stamp)
+
+
+@skipIf(np is None, "NumPy is not installed")
+class TestCucBatchConversion(TestCase):
+    def setUp(self) -> None:
+        self.stamps = [CucTimestamp(2_000_000_000 + idx, idx << 12) for idx in range(8)]
+        self.raw = b"".join(stamp.pack() for stamp in self.stamps)
+
+    def test_unix_seconds(self):
+        self.assertEqual(
+            cuc_to_unix_seconds(self.raw).tolist(),
+            [stamp.as_unix_seconds() for stamp in self.stamps],
+        )
+        rows = np.frombuffer(self.raw, dtype=np.uint8).reshape(-1, 7)
+        self.assertEqual(
+            cuc_to_unix_seconds(rows).tolist(), cuc_to_unix_seconds(self.raw).tolist()
+        )
+
+    def test_datetime64(self):
+        expected = [
+            np.datetime64(stamp.as_date_time().replace(tzinfo=None), "ns")
+            for stamp in self.stamps
+        ]
+        self.assertTrue(np.array_equal(cuc_to_datetime64(self.raw), expected))
+
+    def test_offsets(self):
+        packets = [
+            PusTelemetry(3, 25, stamp, apid=0x22, source_data=bytes(idx)).pack()
+            for idx, stamp in enumerate(self.stamps)
+        ]
+        offsets, pos = [], 0
+        for packet in packets:
+            offsets.append(pos + 13)
+            pos += len(packet)
+        coarse, fraction = CucLayout(4, 2).unpack_batch(b"".join(packets), offsets)
+        self.assertEqual(coarse.tolist(), [stamp.coarse for stamp in self.stamps])
+        self.assertEqual(fraction.tolist(), [idx / 16 for idx in range(8)])
+
+    def test_agency_epoch(self):
+        raw = CucTimestamp(10, epoch=AGENCY_EPOCH).pack()
+        self.assertEqual(
+            cuc_to_unix_seconds(raw, epoch=AGENCY_EPOCH).tolist(),
+            [AGENCY_EPOCH.timestamp() + 10],
+        )
+        with self.assertRaises(ValueError):
+            cuc_to_unix_seconds(raw)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            cuc_to_unix_seconds(self.raw[:-1])
+        mixed = self.raw + CucTimestamp(1, coarse_len=2, fine_len=4).pack()[:7]
+        with self.assertRaisesRegex(ValueError, "timestamp 8"):
+            cuc_to_unix_seconds(mixed)
+        with self.assertRaises(BytesTooShortError):
+            cuc_to_unix_seconds(bytes())
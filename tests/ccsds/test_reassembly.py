@@ -0,0 +1,122 @@
+from unittest import TestCase
+
+from spacepackets.ccsds import PacketType, SequenceFlags, SpacePacketHeader
+from spacepackets.ccsds.reassembly import ReassemblyCounters, SegmentReassembler
+
+
+def create_segment(
+    seq_flags: SequenceFlags, seq_count: int, data: bytes, apid: int = 0x65
+) -> bytes:
+    sp_header = SpacePacketHeader(
+        packet_type=PacketType.TM,
+        apid=apid,
+        seq_count=seq_count,
+        seq_flags=seq_flags,
+        data_len=len(data) - 1,
+    )
+    return sp_header.pack() + data
+
+
+class TestReassembly(TestCase):
+    def setUp(self) -> None:
+        self.current_time = 0.0
+        self.reassembler = SegmentReassembler(
+            initial_capacity=4, timeout=10.0, clock=lambda: self.current_time
+        )
+
+    def test_packets(self):
+        chunks = [bytes([idx] * (idx + 1)) for idx in range(20)]
+        packets = [create_segment(SequenceFlags.FIRST_SEGMENT, 0x3FFE, chunks[0])]
+        for idx, chunk in enumerate(chunks[1:-1]):
+            packets.append(
+                create_segment(
+                    SequenceFlags.CONTINUATION_SEGMENT, (0x3FFF + idx) % 0x4000, chunk
+                )
+            )
+        packets.append(create_segment(SequenceFlags.LAST_SEGMENT, 17, chunks[-1]))
+        for packet in packets[:-1]:
+            self.assertIsNone(self.reassembler.add_packet(packet))
+        self.assertEqual(self.reassembler.num_pending, 1)
+        self.assertGreater(self.reassembler.allocated_size, 0)
+        payload = self.reassembler.add_packet(packets[-1])
+        self.assertIsInstance(payload, memoryview)
+        self.assertEqual(payload, b"".join(chunks))
+        self.assertEqual(self.reassembler.num_pending, 0)
+        self.assertEqual(self.reassembler.allocated_size, 0)
+        self.assertEqual(self.reassembler.counters, ReassemblyCounters(1, 0, 0))
+
+    def test_unsegmented(self):
+        packet = create_segment(SequenceFlags.UNSEGMENTED, 0, bytes([1, 2, 3]))
+        self.assertEqual(self.reassembler.add_packet(packet), bytes([1, 2, 3]))
+
+    def test_interleaved_apids(self):
+        r = self.reassembler
+        self.assertIsNone(r.add_segment(1, SequenceFlags.FIRST_SEGMENT, 0, b"a"))
+        self.assertIsNone(r.add_segment(2, SequenceFlags.FIRST_SEGMENT, 5, b"x"))
+        self.assertEqual(r.add_segment(1, SequenceFlags.LAST_SEGMENT, 1, b"b"), b"ab")
+        self.assertEqual(r.add_segment(2, SequenceFlags.LAST_SEGMENT, 6, b"y"), b"xy")
+
+    def test_missing_segment(self):
+        r = self.reassembler
+        r.add_segment(1, SequenceFlags.FIRST_SEGMENT, 0, b"a")
+        self.assertIsNone(r.add_segment(1, SequenceFlags.LAST_SEGMENT, 2, b"c"))
+        self.assertEqual(r.num_pending, 0)
+        self.assertIsNone(r.add_segment(1, SequenceFlags.CONTINUATION_SEGMENT, 3, b"d"))
+        self.assertEqual(r.counters, ReassemblyCounters(0, 1, 2))
+
+    def test_new_first_segment_drops_group(self):
+        r = self.reassembler
+        r.add_segment(1, SequenceFlags.FIRST_SEGMENT, 0, b"a")
+        r.add_segment(1, SequenceFlags.FIRST_SEGMENT, 1, b"b")
+        self.assertEqual(r.add_segment(1, SequenceFlags.LAST_SEGMENT, 2, b"c"), b"bc")
+        self.assertEqual(r.counters.dropped_groups, 1)
+
+    def test_timeout(self):
+        r = self.reassembler
+        r.add_segment(1, SequenceFlags.FIRST_SEGMENT, 0, b"a")
+        self.current_time = 5.0
+        r.add_segment(2, SequenceFlags.FIRST_SEGMENT, 0, b"a")
+        self.current_time = 12.0
+        self.assertEqual(r.check_timeouts(), [1])
+        self.assertEqual(r.num_pending, 1)
+        self.assertEqual(r.check_timeouts(16.0), [2])
+        self.assertEqual(r.counters.dropped_groups, 2)
+        self.assertEqual(SegmentReassembler().check_timeouts(), [])
+
+    def test_timeout_on_add(self):
+        r = self.reassembler
+        r.add_segment(1, SequenceFlags.FIRST_SEGMENT, 0, b"a")
+        self.current_time = 5.0
+        r.add_segment(2, SequenceFlags.FIRST_SEGMENT, 0, b"x")
+        self.current_time = 12.0
+        # Adding a segment for another APID drops the timed out group.
+        self.assertEqual(r.add_segment(2, SequenceFlags.LAST_SEGMENT, 1, b"y"), b"xy")
+        self.assertEqual(r.num_pending, 0)
+        self.assertEqual(r.allocated_size, 0)
+        self.assertIsNone(r.add_segment(1, SequenceFlags.LAST_SEGMENT, 1, b"b"))
+        self.assertEqual(r.counters, ReassemblyCounters(1, 1, 1))
+
+    def test_size_limits(self):
+        r = SegmentReassembler(max_payload_size=8, initial_capacity=4)
+        r.add_segment(1, SequenceFlags.FIRST_SEGMENT, 0, bytes(4))
+        self.assertIsNone(r.add_segment(1, SequenceFlags.LAST_SEGMENT, 1, bytes(5)))
+        self.assertEqual(r.counters.dropped_groups, 1)
+        self.assertEqual(r.allocated_size, 0)
+        # An oversized first segment is dropped before a buffer is allocated.
+        self.assertIsNone(r.add_segment(1, SequenceFlags.FIRST_SEGMENT, 0, bytes(9)))
+        self.assertEqual(r.counters.dropped_segments, 1)
+        self.assertEqual((r.num_pending, r.allocated_size), (0, 0))
+        r = SegmentReassembler(max_payload_size=3, initial_capacity=4)
+        r.add_segment(1, SequenceFlags.FIRST_SEGMENT, 0, bytes(2))
+        self.assertEqual(r.allocated_size, 3)
+        r = SegmentReassembler(max_total_size=10, initial_capacity=4)
+        r.add_segment(1, SequenceFlags.FIRST_SEGMENT, 0, bytes(4))
+        r.add_segment(2, SequenceFlags.FIRST_SEGMENT, 0, bytes(4))
+        self.assertIsNone(r.add_segment(3, SequenceFlags.FIRST_SEGMENT, 0, bytes(4)))
+        self.assertEqual(r.counters.dropped_segments, 1)
+        self.assertIsNone(r.add_segment(1, SequenceFlags.CONTINUATION_SEGMENT, 1, b"a"))
+        self.assertEqual(r.counters.dropped_groups, 1)
+        self.assertEqual(r.allocated_size, 4)
+        r.reset()
+        self.assertEqual(r.num_pending, 0)
+        self.assertEqual(r.allocated_size, 0)
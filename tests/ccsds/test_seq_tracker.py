@@ -0,0 +1,91 @@
+from unittest import TestCase
+
+from spacepackets.ccsds import PacketType, SpacePacketHeader, SpacePacketView
+from spacepackets.ccsds.seq_tracker import (
+    SeqCountCounters,
+    SeqCountEvent,
+    SeqCountEventType,
+    SeqCountTracker,
+)
+
+
+class TestSeqCountTracker(TestCase):
+    def setUp(self) -> None:
+        self.tracker = SeqCountTracker()
+
+    def test_in_order(self):
+        for seq_count in range(100):
+            self.assertIsNone(self.tracker.add(0x65, seq_count))
+        self.assertEqual(self.tracker.last_seq_count(0x65), 99)
+        self.assertIsNone(self.tracker.last_seq_count(0x66))
+        self.assertEqual(self.tracker.counters(0x65), SeqCountCounters(100, 0, 0, 0, 0))
+
+    def test_wrap_around(self):
+        self.assertIsNone(self.tracker.add(0x01, 0x3FFE))
+        self.assertIsNone(self.tracker.add(0x01, 0x3FFF))
+        self.assertIsNone(self.tracker.add(0x01, 0))
+        event = self.tracker.add(0x01, 0x3FFF)
+        self.assertEqual(
+            event, SeqCountEvent(SeqCountEventType.REORDERED, 0x01, 1, 0x3FFF)
+        )
+        self.assertEqual(event.num_missing, 0)
+        self.assertEqual(self.tracker.last_seq_count(0x01), 0)
+
+    def test_gap(self):
+        self.tracker.add(0x7FF, 0x3FFD)
+        event = self.tracker.add(0x7FF, 2)
+        self.assertEqual(event.event_type, SeqCountEventType.GAP)
+        self.assertEqual(event.expected, 0x3FFE)
+        self.assertEqual(event.num_missing, 4)
+        self.assertIsNone(self.tracker.add(0x7FF, 3))
+        counters = self.tracker.counters(0x7FF)
+        self.assertEqual(counters.gaps, 1)
+        self.assertEqual(counters.missing, 4)
+
+    def test_duplicate_and_reorder(self):
+        self.tracker.add(0x02, 5)
+        self.tracker.add(0x02, 7)
+        event = self.tracker.add(0x02, 7)
+        self.assertEqual(event.event_type, SeqCountEventType.DUPLICATE)
+        event = self.tracker.add(0x02, 6)
+        self.assertEqual(event.event_type, SeqCountEventType.REORDERED)
+        self.assertIsNone(self.tracker.add(0x02, 8))
+        self.assertEqual(self.tracker.counters(0x02), SeqCountCounters(5, 1, 1, 1, 1))
+
+    def test_apids_are_independent(self):
+        self.tracker.add(0x01, 0)
+        self.tracker.add(0x02, 10)
+        self.assertIsNone(self.tracker.add(0x01, 1))
+        self.assertIsNone(self.tracker.add(0x02, 11))
+        self.assertEqual(self.tracker.total_counters().received, 4)
+
+    def test_reorder_window(self):
+        tracker = SeqCountTracker(reorder_window=2)
+        tracker.add(0x01, 10)
+        self.assertEqual(tracker.add(0x01, 9).event_type, SeqCountEventType.REORDERED)
+        self.assertEqual(tracker.add(0x01, 8).event_type, SeqCountEventType.GAP)
+        with self.assertRaises(ValueError):
+            SeqCountTracker(reorder_window=0)
+
+    def test_packets_and_raw(self):
+        sp_header = SpacePacketHeader(
+            packet_type=PacketType.TM, apid=0x65, seq_count=0x3FFF, data_len=0
+        )
+        self.assertIsNone(self.tracker.add_packet(sp_header))
+        sp_header.seq_count = 0
+        raw = sp_header.pack() + bytes(1)
+        self.assertIsNone(self.tracker.add_packet(SpacePacketView(raw)))
+        event = self.tracker.add_raw(bytes(2) + raw, 2)
+        self.assertEqual(event.event_type, SeqCountEventType.DUPLICATE)
+        self.assertEqual(event.apid, 0x65)
+
+    def test_reset(self):
+        self.tracker.add(0x01, 0)
+        self.tracker.add(0x01, 5)
+        self.tracker.add(0x02, 0)
+        self.tracker.reset(0x01)
+        self.assertIsNone(self.tracker.last_seq_count(0x01))
+        self.assertEqual(self.tracker.counters(0x01), SeqCountCounters(0, 0, 0, 0, 0))
+        self.assertEqual(self.tracker.counters(0x02).received, 1)
+        self.tracker.reset()
+        self.assertEqual(self.tracker.total_counters().received, 0)
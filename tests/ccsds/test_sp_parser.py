@@ -1,8 +1,13 @@
 from unittest import TestCase
 from collections import deque
 
-from spacepackets.ccsds import CdsShortTimestamp
-from spacepackets.ccsds.spacepacket import parse_space_packets
+from spacepackets.ccsds import (
+    CdsShortTimestamp,
+    PacketId,
+    PacketType,
+    SpacePacketHeader,
+)
+from spacepackets.ccsds.spacepacket import parse_space_packets, SpacePacketParser
 from spacepackets.ecss.tm import PusTelemetry
 
 
@@ -84,3 +89,106 @@ class TestSpParser(TestCase):
         self.assertEqual(len(self.packet_deque), 1)
         self.assertEqual(self.packet_deque.pop(), tm_packet_first_half)
         self.assertEqual(sp_list[0], self.tm_packet_raw)
+
+
+class TestSpacePacketParser(TestCase):
+    def setUp(self) -> None:
+        self.tm_packet = PusTelemetry(
+            service=17, subservice=2, time_provider=CdsShortTimestamp.empty()
+        )
+        self.tm_packet_raw = self.tm_packet.pack()
+        self.parser = SpacePacketParser((self.tm_packet.packet_id,))
+
+    def test_basic(self):
+        sp_list = self.parser.feed(self.tm_packet_raw + self.tm_packet_raw)
+        self.assertEqual(len(sp_list), 2)
+        self.assertIsInstance(sp_list[0], memoryview)
+        self.assertTrue(sp_list[0].readonly)
+        self.assertEqual(sp_list[0], self.tm_packet_raw)
+        self.assertEqual(sp_list[1], self.tm_packet_raw)
+        self.assertEqual(self.parser.num_buffered, 0)
+
+    def test_byte_by_byte(self):
+        sp_list = []
+        for byte in self.tm_packet_raw * 3:
+            sp_list.extend(self.parser.feed(bytes([byte])))
+        self.assertEqual(len(sp_list), 3)
+        for packet in sp_list:
+            self.assertEqual(packet, self.tm_packet_raw)
+        self.assertEqual(self.parser.num_buffered, 0)
+
+    def test_garbage_is_skipped(self):
+        other_larger_packet = PusTelemetry(
+            service=8,
+            subservice=128,
+            source_data=bytearray(64),
+            time_provider=CdsShortTimestamp.empty(),
+        )
+        other_larger_packet_raw = other_larger_packet.pack()
+        sp_list = self.parser.feed(bytes(8) + self.tm_packet_raw + bytes(3))
+        self.assertEqual(len(sp_list), 1)
+        sp_list.extend(self.parser.feed(other_larger_packet_raw[:20]))
+        self.assertEqual(len(sp_list), 1)
+        sp_list.extend(self.parser.feed(other_larger_packet_raw[20:]))
+        self.assertEqual(len(sp_list), 2)
+        self.assertEqual(sp_list[0], self.tm_packet_raw)
+        self.assertEqual(sp_list[1], other_larger_packet_raw)
+
+    def test_views_stay_valid(self):
+        first_half = self.tm_packet_raw[:10]
+        sp_list = self.parser.feed(self.tm_packet_raw + first_half)
+        self.assertEqual(len(sp_list), 1)
+        self.assertEqual(self.parser.num_buffered, len(first_half))
+        # The returned view is still alive while more data is fed.
+        sp_list.extend(self.parser.feed(self.tm_packet_raw[10:]))
+        self.assertEqual(len(sp_list), 2)
+        self.assertEqual(sp_list[0], self.tm_packet_raw)
+        self.assertEqual(sp_list[1], self.tm_packet_raw)
+
+    def test_reset(self):
+        self.parser.feed(self.tm_packet_raw[:10])
+        self.assertEqual(self.parser.num_buffered, 10)
+        self.parser.reset()
+        self.assertEqual(self.parser.num_buffered, 0)
+        self.assertEqual(self.parser.feed(self.tm_packet_raw[10:]), [])
+
+    def test_false_sync_rejected_by_crc(self):
+        # Fake header with a matching packet ID and a huge length field, followed by valid data
+        fake_header = bytearray(self.tm_packet_raw[:6])
+        fake_header[4:6] = bytes([0x00, 0x20])
+        sp_list = self.parser.feed(fake_header + self.tm_packet_raw * 3)
+        # Without a CRC check, the fake packet swallows valid packet data
+        self.assertEqual(len(sp_list), 2)
+        self.assertNotEqual(sp_list[0], self.tm_packet_raw)
+        self.assertEqual(sp_list[1], self.tm_packet_raw)
+        crc_parser = SpacePacketParser((self.tm_packet.packet_id,), check_crc=True)
+        sp_list = crc_parser.feed(fake_header + self.tm_packet_raw * 3)
+        self.assertEqual(len(sp_list), 3)
+        for packet in sp_list:
+            self.assertEqual(packet, self.tm_packet_raw)
+
+    def test_false_sync_rejected_by_len(self):
+        fake_header = bytearray(self.tm_packet_raw[:6])
+        fake_header[4:6] = bytes([0xFF, 0xFF])
+        parser = SpacePacketParser(
+            (self.tm_packet.packet_id,), max_packet_len=len(self.tm_packet_raw)
+        )
+        sp_list = parser.feed(fake_header + self.tm_packet_raw)
+        self.assertEqual(len(sp_list), 1)
+        self.assertEqual(sp_list[0], self.tm_packet_raw)
+
+    def test_multiple_packet_ids(self):
+        tc_id = PacketId(ptype=PacketType.TC, sec_header_flag=True, apid=0x7FF)
+        sp_header = SpacePacketHeader(
+            packet_type=PacketType.TC,
+            sec_header_flag=True,
+            apid=0x7FF,
+            seq_count=0,
+            data_len=0,
+        )
+        tc_raw = sp_header.pack() + bytes([0x42])
+        parser = SpacePacketParser((self.tm_packet.packet_id, tc_id))
+        sp_list = parser.feed(bytes(5) + tc_raw + bytes(2) + self.tm_packet_raw)
+        self.assertEqual(len(sp_list), 2)
+        self.assertEqual(sp_list[0], tc_raw)
+        self.assertEqual(sp_list[1], self.tm_packet_raw)
@@ -1,6 +1,13 @@
+import copy
+import pickle
 from unittest import TestCase
 
-from spacepackets import SequenceFlags, PacketType, SpacePacketHeader
+from spacepackets import (
+    SequenceFlags,
+    PacketType,
+    SpacePacketHeader,
+    BytesTooShortError,
+)
 from spacepackets.ccsds import PacketSeqCtrl, PacketId
 from spacepackets.ccsds.spacepacket import (
     get_space_packet_id_bytes,
@@ -8,6 +15,7 @@ from spacepackets.ccsds.spacepacket import (
     get_sp_packet_id_raw,
     SpacePacket,
     get_apid_from_raw_space_packet,
+    SpacePacketView,
 )
 
 
@@ -261,3 +269,63 @@ class TestSpacePacket(TestCase):
             sp_header=self.sp_header, sec_header=None, user_data=bytes([0, 1, 2])
         )
         self.assertEqual(sp, other_sp)
+
+    def test_sp_view(self):
+        raw = self.sp_header.pack() + bytes(range(0x17))
+        view = SpacePacketView(raw)
+        self.assertEqual(view.apid, 0x02)
+        self.assertEqual(view.seq_count, 0x34)
+        self.assertEqual(view.seq_flags, SequenceFlags.FIRST_SEGMENT)
+        self.assertEqual(view.packet_type, PacketType.TC)
+        self.assertTrue(view.sec_header_flag)
+        self.assertEqual(view.ccsds_version, 0b000)
+        self.assertEqual(view.data_len, 0x16)
+        self.assertEqual(view.packet_len, self.sp_header.packet_len)
+        self.assertEqual(view.packet_id.raw(), self.sp_header.packet_id.raw())
+        self.assertEqual(view.psc.raw(), self.sp_header.psc.raw())
+        self.assertEqual(view.sp_header, self.sp_header)
+        self.assertEqual(view.user_data, bytes(range(0x17)))
+        self.assertEqual(view.pack(), raw)
+
+    def test_sp_view_is_zero_copy(self):
+        raw = bytearray(bytes(4) + self.sp_header.pack() + bytes(0x17) + bytes(4))
+        view = SpacePacketView(raw, 4)
+        self.assertEqual(view.packet_len, 0x17 + 6)
+        self.assertTrue(view.user_data.readonly)
+        raw[10] = 0xFF
+        self.assertEqual(view.user_data[0], 0xFF)
+
+    def test_sp_view_too_short(self):
+        raw = self.sp_header.pack() + bytes(0x16)
+        with self.assertRaises(BytesTooShortError):
+            SpacePacketView(raw[:5])
+        with self.assertRaises(BytesTooShortError):
+            SpacePacketView(raw)
+
+    def test_pack_into(self):
+        buf = bytearray(10)
+        self.assertEqual(self.sp_header.packed_len(), 6)
+        self.assertEqual(self.sp_header.pack_into(buf, 2), 6)
+        self.assertEqual(buf[2:8], self.sp_header.pack())
+        self.assertEqual(buf[:2], bytes(2))
+        with self.assertRaises(BytesTooShortError):
+            self.sp_header.pack_into(buf, 5)
+
+    def test_sp_pack_into(self):
+        sp = SpacePacket(self.sp_header, bytes(3), bytes(0x14))
+        buf = bytearray(sp.packed_len() + 3)
+        self.assertEqual(sp.pack_into(memoryview(buf), 3), len(sp.pack()))
+        self.assertEqual(buf[3:], sp.pack())
+        view = SpacePacketView(buf, 3)
+        target = bytearray(view.packed_len())
+        self.assertEqual(view.pack_into(target), len(target))
+        self.assertEqual(target, sp.pack())
+
+    def test_slots(self):
+        for obj in (self.sp_header, self.sp_header.packet_id, self.sp_header.psc):
+            self.assertFalse(hasattr(obj, "__dict__"))
+            with self.assertRaises(AttributeError):
+                obj.invalid_attribute = 0
+        header_copy = copy.deepcopy(self.sp_header)
+        self.assertEqual(header_copy, self.sp_header)
+        self.assertEqual(pickle.loads(pickle.dumps(self.sp_header)), self.sp_header)
@@ -1,8 +1,15 @@
 import datetime
 import struct
-from unittest import TestCase
+from unittest import TestCase, skipIf
+
+from spacepackets import BytesTooShortError
+from spacepackets.ccsds import PacketType, SpacePacketHeader
 from spacepackets.ccsds.time import (
     CdsShortTimestamp,
+    CdsShortTime,
+    cds_short_to_datetime64,
+    cds_short_to_unix_ms,
+    cds_short_to_unix_seconds,
     SECONDS_PER_DAY,
     MS_PER_DAY,
 )
@@ -11,6 +18,11 @@ from spacepackets.ccsds.time.common import (
     convert_unix_days_to_ccsds_days,
 )
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 class TestTime(TestCase):
     def test_basic(self):
@@ -89,9 +101,122 @@ class TestTime(TestCase):
         self.assertEqual(new_stamp, stamp)
         self.assertEqual(new_stamp.as_unix_seconds(), new_stamp.as_unix_seconds())
 
+    def test_pre_epoch(self):
+        stamp = CdsShortTimestamp(ccsds_days=100, ms_of_day=1000)
+        self.assertEqual(stamp.as_unix_seconds(), -370051199.0)
+        self.assertEqual(
+            stamp.as_date_time(),
+            datetime.datetime(1958, 4, 11, 0, 0, 1, tzinfo=datetime.timezone.utc),
+        )
+        self.assertEqual(CdsShortTimestamp.from_date_time(stamp.as_date_time()), stamp)
+
     def test_read_from_raw(self):
         stamp = CdsShortTimestamp(30000, 1000)
         stamp_raw = stamp.pack()
         empty_stamp = CdsShortTimestamp.empty()
         empty_stamp.read_from_raw(stamp_raw)
         self.assertEqual(empty_stamp, stamp)
+
+    def test_lazy_conversion_cache_invalidated(self):
+        stamp = CdsShortTimestamp(30000, 1000)
+        unix_seconds = stamp.as_unix_seconds()
+        date_time = stamp.as_date_time()
+        self.assertIs(stamp.as_date_time(), date_time)
+        stamp.read_from_raw(CdsShortTimestamp(30001, 1000).pack())
+        self.assertEqual(stamp.as_unix_seconds(), unix_seconds + SECONDS_PER_DAY)
+        self.assertEqual(stamp.as_date_time(), date_time + datetime.timedelta(days=1))
+        stamp += datetime.timedelta(seconds=1)
+        self.assertEqual(stamp.as_unix_seconds(), unix_seconds + SECONDS_PER_DAY + 1)
+
+    def test_time_value(self):
+        stamp = CdsShortTimestamp(30000, 1000)
+        value = CdsShortTime.unpack(bytes(2) + stamp.pack(), 2)
+        self.assertEqual(value, (30000, 1000))
+        self.assertEqual(value, stamp.as_time_value())
+        self.assertEqual(value.to_timestamp(), stamp)
+        self.assertEqual(value.as_unix_seconds(), stamp.as_unix_seconds())
+        self.assertEqual(value.as_date_time(), stamp.as_date_time())
+        self.assertEqual(value.ms_since_epoch, 30000 * MS_PER_DAY + 1000)
+        with self.assertRaises(AttributeError):
+            value.ccsds_days = 2
+
+    def test_time_value_invalid(self):
+        raw = CdsShortTimestamp(30000, 1000).pack()
+        with self.assertRaises(BytesTooShortError):
+            CdsShortTime.unpack(raw[:6])
+        raw[0] = 0x20
+        with self.assertRaises(ValueError):
+            CdsShortTime.unpack(raw)
+        # 24 bit days segment
+        raw[0] = 0x44
+        with self.assertRaises(ValueError):
+            CdsShortTime.unpack(raw)
+
+
+@skipIf(np is None, "NumPy is not installed")
+class TestCdsBatchConversion(TestCase):
+    def setUp(self) -> None:
+        self.stamps = [
+            CdsShortTimestamp(30000, 0),
+            CdsShortTimestamp(30000, 1234),
+            CdsShortTimestamp(24430, MS_PER_DAY - 1),
+        ]
+        self.raw = b"".join(stamp.pack() for stamp in self.stamps)
+
+    def test_unix_seconds(self):
+        seconds = cds_short_to_unix_seconds(self.raw)
+        self.assertEqual(seconds.dtype, np.float64)
+        self.assertEqual(
+            seconds.tolist(), [stamp.as_unix_seconds() for stamp in self.stamps]
+        )
+
+    def test_pre_epoch(self):
+        stamp = CdsShortTimestamp(ccsds_days=100, ms_of_day=1000)
+        self.assertEqual(cds_short_to_unix_ms(stamp.pack()).tolist(), [-370051199000])
+        self.assertEqual(
+            cds_short_to_unix_seconds(stamp.pack()).tolist(),
+            [stamp.as_unix_seconds()],
+        )
+
+    def test_datetime64(self):
+        date_times = cds_short_to_datetime64(self.raw)
+        self.assertEqual(date_times.dtype, np.dtype("datetime64[ms]"))
+        expected = [stamp.as_date_time().replace(tzinfo=None) for stamp in self.stamps]
+        self.assertEqual(date_times.astype(datetime.datetime).tolist(), expected)
+
+    def test_unix_ms(self):
+        unix_ms = cds_short_to_unix_ms(self.raw)
+        self.assertEqual(
+            unix_ms.tolist(),
+            [
+                convert_ccsds_days_to_unix_days(stamp.ccsds_days) * MS_PER_DAY
+                + stamp.ms_of_day
+                for stamp in self.stamps
+            ],
+        )
+
+    def test_array_input(self):
+        rows = np.frombuffer(self.raw, dtype=np.uint8).reshape(-1, 7)
+        self.assertEqual(
+            cds_short_to_unix_ms(rows).tolist(), cds_short_to_unix_ms(self.raw).tolist()
+        )
+        self.assertEqual(len(cds_short_to_unix_ms(bytes())), 0)
+
+    def test_offsets(self):
+        sp_header = SpacePacketHeader(PacketType.TM, apid=0x22, seq_count=0, data_len=6)
+        capture = b"".join(sp_header.pack() + stamp.pack() for stamp in self.stamps)
+        offsets = np.arange(len(self.stamps)) * 13 + 6
+        self.assertEqual(
+            cds_short_to_unix_ms(capture, offsets).tolist(),
+            cds_short_to_unix_ms(self.raw).tolist(),
+        )
+        with self.assertRaises(ValueError):
+            cds_short_to_unix_ms(capture, np.array([len(capture) - 6]))
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            cds_short_to_unix_ms(self.raw[:-1])
+        raw = bytearray(self.raw)
+        raw[7] = 0x20
+        with self.assertRaises(ValueError):
+            cds_short_to_unix_ms(raw)
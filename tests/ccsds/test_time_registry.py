@@ -0,0 +1,130 @@
+import datetime
+from unittest import TestCase
+
+from spacepackets import BytesTooShortError
+from spacepackets.ccsds.time import (
+    CdsShortTimestamp,
+    CucTimestamp,
+    TimeReaderRegistry,
+)
+from spacepackets.ecss import PusTelemetry
+from spacepackets.ecss.dispatch import PusTmDispatcher
+from spacepackets.ecss.tm import LazyPusTelemetry, PusTmSecondaryHeader
+
+AGENCY_EPOCH = datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def create_tm(apid: int, stamp) -> bytes:
+    return PusTelemetry(3, 25, stamp, apid=apid, source_data=bytes([1, 2])).pack()
+
+
+class TestTimeReaderRegistry(TestCase):
+    def setUp(self) -> None:
+        self.registry = TimeReaderRegistry()
+
+    def test_lookup(self):
+        cds = self.registry.reader_for(CdsShortTimestamp(1, 2).pack())
+        self.assertIsInstance(cds, CdsShortTimestamp)
+        cuc = self.registry.reader_for(CucTimestamp(1, coarse_len=6).pack())
+        self.assertIsInstance(cuc, CucTimestamp)
+        self.assertEqual((cuc.layout.coarse_len, cuc.layout.fine_len), (6, 2))
+        self.assertIs(
+            self.registry.reader_for(CucTimestamp(5, coarse_len=6).pack()), cuc
+        )
+
+    def test_unknown(self):
+        agency_stamp = CucTimestamp(1, epoch=AGENCY_EPOCH).pack()
+        with self.assertRaises(ValueError):
+            self.registry.reader_for(agency_stamp)
+        with self.assertRaises(ValueError):
+            TimeReaderRegistry(auto_cuc=False).reader_for(CucTimestamp(1).pack())
+        with self.assertRaises(BytesTooShortError):
+            self.registry.reader_for(bytes([0x9E]))
+        with self.assertRaises(ValueError):
+            self.registry.register(CdsShortTimestamp.empty(), bytes([0x80]))
+        self.registry.register(CucTimestamp(0, epoch=AGENCY_EPOCH))
+        self.assertEqual(self.registry.reader_for(agency_stamp).epoch, AGENCY_EPOCH)
+
+    def test_apid_cache(self):
+        cds_tm = create_tm(0x22, CdsShortTimestamp(1, 2))
+        cuc_tm = create_tm(0x22, CucTimestamp(1))
+        self.registry.reader_for(cds_tm, 13, 0x22)
+        self.assertIsInstance(self.registry.apid_readers()[0x22], CdsShortTimestamp)
+        # The cached reader is returned without looking at the P-field.
+        self.assertIsInstance(
+            self.registry.reader_for(bytes(), 13, 0x22), CdsShortTimestamp
+        )
+        self.registry.register(CdsShortTimestamp.empty())
+        self.assertEqual(self.registry.apid_readers(), {})
+        # The P-field of the APID changed, for example in an archive of another mission.
+        registry = TimeReaderRegistry(cache_apids=False)
+        self.assertIsInstance(registry.reader_for(cds_tm, 13, 0x22), CdsShortTimestamp)
+        self.assertIsInstance(registry.reader_for(cuc_tm, 13, 0x22), CucTimestamp)
+        self.assertEqual(registry.apid_readers(), {})
+
+    def test_apid_without_timestamp(self):
+        packet = PusTelemetry(17, 2, None, apid=0x30, source_data=bytes([1, 2])).pack()
+        with self.assertRaises(ValueError):
+            PusTelemetry.unpack(packet, self.registry)
+        self.registry.register_apid(0x30, None)
+        tm = PusTelemetry.unpack(packet, self.registry)
+        self.assertIsNone(tm.time_provider)
+        self.assertEqual(tm.source_data, bytes([1, 2]))
+        lazy = LazyPusTelemetry(packet, self.registry)
+        self.assertEqual(lazy.source_data, bytes([1, 2]))
+        self.assertEqual(lazy.to_pus_tm().pack(), packet)
+        # Explicitly registered APIDs are kept when the cache is cleared.
+        self.registry.register(CdsShortTimestamp.empty())
+        self.assertEqual(self.registry.apid_readers(), {0x30: None})
+        # Other APIDs still use the P-field.
+        self.assertIsInstance(
+            self.registry.reader_for(
+                create_tm(0x31, CdsShortTimestamp(1, 2)), 13, 0x31
+            ),
+            CdsShortTimestamp,
+        )
+
+
+class TestTmWithRegistry(TestCase):
+    def setUp(self) -> None:
+        self.registry = TimeReaderRegistry()
+        self.stamps = [
+            CdsShortTimestamp(24430, 1000),
+            CucTimestamp(2_000_000_000, 0x8000),
+            CucTimestamp(7, 1, coarse_len=2, fine_len=1),
+        ]
+        self.packets = [
+            create_tm(0x20 + idx, stamp) for idx, stamp in enumerate(self.stamps)
+        ]
+
+    def test_mixed_stream(self):
+        for _ in range(2):
+            for stamp, packet in zip(self.stamps, self.packets):
+                tm = PusTelemetry.unpack(packet, self.registry)
+                self.assertEqual(tm.time_provider, stamp)
+                self.assertEqual(tm.source_data, bytes([1, 2]))
+        self.assertEqual(sorted(self.registry.apid_readers()), [0x20, 0x21, 0x22])
+
+    def test_lazy(self):
+        for stamp, packet in zip(self.stamps, self.packets):
+            lazy = LazyPusTelemetry(packet, self.registry)
+            self.assertEqual(lazy.source_data, bytes([1, 2]))
+            self.assertEqual(lazy.time_provider, stamp)
+            self.assertEqual(lazy.to_pus_tm().pack(), packet)
+
+    def test_sec_header(self):
+        sec_header = PusTmSecondaryHeader.unpack(self.packets[2][6:], self.registry)
+        self.assertEqual(sec_header.time_provider, self.stamps[2])
+        self.assertEqual(sec_header.header_size, 7 + 4)
+
+    def test_dispatcher(self):
+        received = []
+        dispatcher = PusTmDispatcher(self.registry)
+        dispatcher.register(received.append)
+        self.assertEqual(dispatcher.dispatch_many(self.packets), 3)
+        self.assertEqual([tm.time_provider for tm in received], self.stamps)
+        # Unregistered agency epoch timestamp.
+        self.assertFalse(
+            dispatcher.dispatch(create_tm(0x2F, CucTimestamp(1, epoch=AGENCY_EPOCH)))
+        )
+        self.assertEqual(dispatcher.num_invalid, 1)
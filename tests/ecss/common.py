@@ -1,6 +1,7 @@
 from unittest.mock import MagicMock, PropertyMock
 
 from spacepackets.ccsds import CdsShortTimestamp, CcsdsTimeCodeId
+from spacepackets.ccsds.time import CcsdsTimeProvider
 
 TEST_STAMP = bytes([CcsdsTimeCodeId.CDS << 4, 1, 2, 3, 4, 5, 6])
 
@@ -12,4 +13,16 @@ def generic_time_provider_mock(raw_retval: bytes):
     if len(raw_retval) != 7:
         raise ValueError("invalid raw returnvalue")
     time_stamp_provider.pack.return_value = raw_retval
+    # Use the default implementation which copies the result of pack into the buffer.
+    time_stamp_provider.pack_into.side_effect = (
+        lambda buf, offset=0: CcsdsTimeProvider.pack_into(
+            time_stamp_provider, buf, offset
+        )
+    )
+    # Use the default implementation which copies the mock and reads the timestamp into it.
+    time_stamp_provider.read_new.side_effect = (
+        lambda timestamp: CcsdsTimeProvider.read_new(time_stamp_provider, timestamp)
+    )
+    # The mock does not track changes, so the packed timestamp is compared.
+    time_stamp_provider._generation = None
     return time_stamp_provider
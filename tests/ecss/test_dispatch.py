@@ -0,0 +1,156 @@
+from unittest import TestCase
+
+from spacepackets.ccsds import CdsShortTimestamp
+from spacepackets.ecss import PusTelecommand, PusTelemetry
+from spacepackets.ecss.dispatch import ANY, PusTmDispatcher, RoutePattern
+from spacepackets.ecss.tm import LazyPusTelemetry
+
+
+def create_tm(apid: int, service: int, subservice: int) -> bytes:
+    return PusTelemetry(
+        service=service,
+        subservice=subservice,
+        time_provider=CdsShortTimestamp.empty(),
+        apid=apid,
+        source_data=bytes([1, 2, 3]),
+    ).pack()
+
+
+class FakeTimer:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self) -> int:
+        self.now += 10
+        return self.now
+
+
+class TestPusTmDispatcher(TestCase):
+    def setUp(self) -> None:
+        self.received = []
+        self.dispatcher = PusTmDispatcher(CdsShortTimestamp.empty(), timer=FakeTimer())
+
+    def handler(self, name: str):
+        return lambda packet: self.received.append((name, packet))
+
+    def test_specificity(self):
+        self.dispatcher.register(self.handler("any"))
+        self.dispatcher.register(self.handler("service"), service=3)
+        self.dispatcher.register(self.handler("subservice"), service=3, subservice=25)
+        self.dispatcher.register(self.handler("apid"), apid=0x22)
+        self.dispatcher.register(
+            self.handler("exact"), apid=0x22, service=3, subservice=25
+        )
+        cases = [
+            ((0x22, 3, 25), "exact"),
+            ((0x22, 3, 26), "apid"),
+            ((0x23, 3, 25), "subservice"),
+            ((0x23, 3, 26), "service"),
+            ((0x23, 5, 1), "any"),
+        ]
+        for fields, expected in cases:
+            self.received.clear()
+            self.assertTrue(self.dispatcher.dispatch(create_tm(*fields)))
+            self.assertEqual([name for name, _ in self.received], [expected])
+
+    def test_pattern(self):
+        self.assertEqual(RoutePattern(ANY, ANY, ANY).specificity, 0)
+        self.assertGreater(
+            RoutePattern(0x22, ANY, ANY).specificity,
+            RoutePattern(ANY, 3, 25).specificity,
+        )
+        self.assertTrue(RoutePattern(ANY, 3, ANY).matches(0x22, 3, 1))
+        self.assertFalse(RoutePattern(ANY, 3, ANY).matches(0x22, 4, 1))
+
+    def test_lazy_and_raw(self):
+        self.dispatcher.register(self.handler("lazy"), service=17)
+        self.dispatcher.register(self.handler("raw"), service=17, raw=True)
+        packet = create_tm(0x22, 17, 2)
+        self.dispatcher.dispatch(packet)
+        (_, lazy_tm), (_, raw) = self.received
+        self.assertIsInstance(lazy_tm, LazyPusTelemetry)
+        self.assertEqual(lazy_tm.source_data, bytes([1, 2, 3]))
+        self.assertEqual(lazy_tm.apid, 0x22)
+        self.assertIsInstance(raw, memoryview)
+        self.assertEqual(raw, packet)
+
+    def test_dropped_and_invalid(self):
+        self.dispatcher.register(self.handler("service"), service=17)
+        self.assertFalse(self.dispatcher.dispatch(create_tm(0x22, 3, 25)))
+        self.assertFalse(self.dispatcher.dispatch(create_tm(0x22, 5, 1)))
+        self.assertEqual(self.dispatcher.num_dropped, 2)
+        self.assertFalse(self.dispatcher.dispatch(bytes(4)))
+        self.assertFalse(
+            self.dispatcher.dispatch(PusTelecommand(service=17, subservice=1).pack())
+        )
+        # Matching header, but the packet is truncated.
+        self.assertFalse(self.dispatcher.dispatch(create_tm(0x22, 17, 2)[:12]))
+        self.assertEqual(self.dispatcher.num_invalid, 3)
+        self.assertEqual(self.received, [])
+
+    def test_invalid_packet_not_passed_to_raw_route(self):
+        raw_id = self.dispatcher.register(self.handler("raw"), service=17, raw=True)
+        self.dispatcher.register(self.handler("lazy"), service=17)
+        packet = PusTelemetry(17, 2, None, apid=0x22).pack()
+        self.assertFalse(self.dispatcher.dispatch(packet))
+        self.assertEqual(self.dispatcher.num_invalid, 1)
+        self.assertEqual(self.received, [])
+        self.assertEqual(self.dispatcher.stats(raw_id).count, 0)
+
+    def test_table_is_bounded(self):
+        self.dispatcher.register(self.handler("service"), service=17)
+        self.dispatcher.register(self.handler("apid"), apid=0x22, subservice=2)
+        table = self.dispatcher._table
+        # Services 17 and other, subservices 2 and other
+        self.assertEqual(len(table), 4)
+        for apid in range(0x800):
+            for subservice in range(3):
+                self.dispatcher.dispatch(create_tm(apid, 3, subservice))
+        self.assertIs(self.dispatcher._table, table)
+        self.assertEqual(sum(len(by_apid) for by_apid in table.values()), 6)
+        self.assertEqual(self.dispatcher.num_dropped, 0x800 * 3 - 1)
+        self.assertTrue(self.dispatcher.dispatch(create_tm(0x22, 17, 2)))
+        self.assertEqual(self.received[-1][0], "apid")
+        self.assertTrue(self.dispatcher.dispatch(create_tm(0x23, 17, 2)))
+        self.assertEqual(self.received[-1][0], "service")
+
+    def test_register_after_dispatch(self):
+        self.dispatcher.register(self.handler("any"))
+        self.dispatcher.dispatch(create_tm(0x22, 3, 25))
+        route_id = self.dispatcher.register(self.handler("hk"), service=3)
+        self.dispatcher.dispatch(create_tm(0x22, 3, 25))
+        self.dispatcher.unregister(route_id)
+        self.dispatcher.dispatch(create_tm(0x22, 3, 25))
+        self.assertEqual([name for name, _ in self.received], ["any", "hk", "any"])
+        with self.assertRaises(KeyError):
+            self.dispatcher.unregister(route_id)
+
+    def test_stats(self):
+        any_id = self.dispatcher.register(self.handler("any"))
+        hk_id = self.dispatcher.register(self.handler("hk"), service=3)
+        packets = [
+            create_tm(0x22, 3, 25),
+            create_tm(0x22, 3, 26),
+            create_tm(0x22, 1, 1),
+        ]
+        self.assertEqual(self.dispatcher.dispatch_many(packets), 3)
+        stats = self.dispatcher.stats(hk_id)
+        self.assertEqual(stats.pattern, RoutePattern(ANY, 3, ANY))
+        self.assertEqual(stats.count, 2)
+        self.assertEqual(stats.total_ns, 20)
+        self.assertEqual(stats.max_ns, 10)
+        self.assertEqual(stats.mean_ns, 10.0)
+        self.assertEqual(
+            [route_id for route_id, _ in self.dispatcher.all_stats()], [any_id, hk_id]
+        )
+        self.dispatcher.unregister(hk_id)
+        self.assertEqual(self.dispatcher.stats(hk_id).count, 2)
+        with self.assertRaises(KeyError):
+            self.dispatcher.stats(5)
+
+    def test_no_latency(self):
+        dispatcher = PusTmDispatcher(None, measure_latency=False)
+        route_id = dispatcher.register(self.handler("any"), raw=True)
+        dispatcher.dispatch(create_tm(0x22, 3, 25))
+        stats = dispatcher.stats(route_id)
+        self.assertEqual((stats.count, stats.total_ns, stats.mean_ns), (1, 0, 0.0))
@@ -0,0 +1,136 @@
+import math
+from unittest import TestCase
+
+from spacepackets import BytesTooShortError
+from spacepackets.ecss.fields import (
+    FieldCodec,
+    FieldDef,
+    PfcReal,
+    PfcSigned,
+    PfcUnsigned,
+    Ptc,
+)
+from spacepackets.ecss.pus_3_hk import HkParam
+
+
+class TestFieldCodec(TestCase):
+    def test_byte_aligned(self):
+        codec = FieldCodec(
+            [
+                FieldDef("a", Ptc.UNSIGNED, PfcUnsigned.TWO_BYTES),
+                FieldDef("b", Ptc.SIGNED, PfcSigned.ONE_BYTE),
+                FieldDef("c", Ptc.ENUMERATED, 32),
+                FieldDef("d", Ptc.REAL, PfcReal.DOUBLE_PRECISION_IEEE),
+                FieldDef("e", Ptc.OCTET_STRING, 3),
+                FieldDef("f", Ptc.CHARACTER_STRING, 2),
+            ],
+            record_name="Block",
+        )
+        self.assertEqual(codec.layout.format, "!HbId3s2s")
+        self.assertEqual(codec.size, 2 + 1 + 4 + 8 + 3 + 2)
+        self.assertEqual(codec.names, ("a", "b", "c", "d", "e", "f"))
+        values = (0x1234, -5, 0xDEADBEEF, math.pi, b"\x01\x02\x03", b"ok")
+        packed = codec.pack(values)
+        self.assertEqual(packed[:7].hex(), "1234fbdeadbeef")
+        record = codec.unpack_from(bytes(2) + packed, 2)
+        self.assertEqual(type(record).__name__, "Block")
+        self.assertEqual(record, values)
+        self.assertEqual(record.d, math.pi)
+
+    def test_odd_widths(self):
+        codec = FieldCodec(
+            [
+                FieldDef("u24", Ptc.UNSIGNED, PfcUnsigned.THREE_BYTES),
+                FieldDef("s48", Ptc.SIGNED, PfcSigned.SIX_BYTES),
+            ]
+        )
+        self.assertEqual(codec.size, 9)
+        packed = codec.pack([0x010203, -2])
+        self.assertEqual(packed.hex(), "010203fffffffffffe")
+        self.assertEqual(codec.unpack_from(packed), (0x010203, -2))
+        with self.assertRaises(ValueError):
+            codec.pack([1 << 24, 0])
+
+    def test_bit_fields(self):
+        codec = FieldCodec(
+            [
+                FieldDef("flag", Ptc.BOOLEAN, 0),
+                FieldDef("u3", Ptc.UNSIGNED, PfcUnsigned.THREE_BIT),
+                FieldDef("s12", Ptc.SIGNED, PfcSigned.TWELVE_BIT),
+                FieldDef("u8", Ptc.UNSIGNED, PfcUnsigned.ONE_BYTE),
+                FieldDef("e4", Ptc.ENUMERATED, 4),
+                FieldDef("u12", Ptc.UNSIGNED, PfcUnsigned.TWELVE_BIT),
+                FieldDef("s9", Ptc.SIGNED, PfcSigned.NINE_BIT),
+                FieldDef("u7", Ptc.UNSIGNED, PfcUnsigned.SEVEN_BIT),
+            ]
+        )
+        # A 16 bit group, one byte and two more 16 bit groups.
+        self.assertEqual(codec.layout.format, "!HBHH")
+        values = (True, 5, -1000, 0xAB, 0x9, 0xFED, -256, 0x55)
+        packed = codec.pack(values)
+        # flag | u3 | s12, most significant bits first.
+        expected_first = (1 << 15) | (5 << 12) | (-1000 & 0xFFF)
+        self.assertEqual(int.from_bytes(packed[:2], "big"), expected_first)
+        self.assertEqual(packed[2], 0xAB)
+        self.assertEqual(packed[3:5].hex(), "9fed")
+        self.assertEqual(
+            int.from_bytes(packed[5:], "big"), ((-256 & 0x1FF) << 7) | 0x55
+        )
+        record = codec.unpack_from(packed)
+        self.assertEqual(record, values)
+        self.assertIs(record.flag, True)
+
+    def test_large_bit_group(self):
+        codec = FieldCodec(
+            [
+                FieldDef("head", Ptc.ENUMERATED, 4),
+                FieldDef("value", Ptc.UNSIGNED, PfcUnsigned.EIGHT_BYTES),
+                FieldDef("tail", Ptc.ENUMERATED, 4),
+            ]
+        )
+        self.assertEqual(codec.size, 9)
+        values = (0xA, 0x0123456789ABCDEF, 0x5)
+        self.assertEqual(codec.pack(values).hex(), "a0123456789abcdef5")
+        self.assertEqual(codec.unpack_from(codec.pack(values)), values)
+
+    def test_hk_params(self):
+        codec = FieldCodec([HkParam("x", Ptc.UNSIGNED, PfcUnsigned.FOUR_BYTES)])
+        self.assertEqual(codec.unpack_from(bytes([0, 0, 1, 0])).x, 256)
+
+    def test_invalid_definitions(self):
+        with self.assertRaises(ValueError):
+            FieldCodec([FieldDef("x", Ptc.UNSIGNED, PfcUnsigned.FOUR_BIT)])
+        with self.assertRaises(ValueError):
+            FieldCodec(
+                [
+                    FieldDef("x", Ptc.BOOLEAN, 0),
+                    FieldDef("y", Ptc.REAL, PfcReal.FLOAT_SIMPLE_PRECISION_IEEE),
+                ]
+            )
+        with self.assertRaises(ValueError):
+            FieldCodec([FieldDef("x", Ptc.SIGNED, PfcUnsigned.ONE_BIT)])
+        with self.assertRaises(ValueError):
+            FieldCodec(
+                [FieldDef("x", Ptc.REAL, PfcReal.FLOAT_PRECISION_MIL_STD_4_OCTETS)]
+            )
+        with self.assertRaises(ValueError):
+            FieldCodec([FieldDef("x", Ptc.ABSOLUTE_TIME, 1)])
+
+    def test_invalid_values(self):
+        codec = FieldCodec(
+            [
+                FieldDef("u4", Ptc.UNSIGNED, PfcUnsigned.FOUR_BIT),
+                FieldDef("s4", Ptc.SIGNED, PfcSigned.FOUR_BIT),
+                FieldDef("u8", Ptc.UNSIGNED, PfcUnsigned.ONE_BYTE),
+            ]
+        )
+        self.assertEqual(codec.pack([15, -8, 255]).hex(), "f8ff")
+        for values in ([16, 0, 0], [0, 8, 0], [0, -9, 0], [-1, 0, 0], [0, 0, 256]):
+            with self.assertRaises(ValueError):
+                codec.pack(values)
+        with self.assertRaises(ValueError):
+            codec.pack([0, 0])
+        with self.assertRaises(BytesTooShortError):
+            codec.pack_into(bytearray(2), 1, [0, 0, 0])
+        with self.assertRaises(BytesTooShortError):
+            codec.unpack_from(bytes(1))
@@ -2,9 +2,16 @@ from unittest import TestCase
 
 import crcmod
 
-from spacepackets import SpacePacketHeader, PacketType
-from spacepackets.ecss import PusTelecommand, PusTcDataFieldHeader, check_pus_crc
+from spacepackets import SpacePacketHeader, PacketType, BytesTooShortError
+from spacepackets.ccsds import PacketId, PacketSeqCtrl, SequenceFlags
+from spacepackets.ecss import (
+    PusTelecommand,
+    PusTcDataFieldHeader,
+    PusTcTemplate,
+    check_pus_crc,
+)
 from spacepackets.ecss.conf import get_default_tc_apid, set_default_tc_apid, PusVersion
+from spacepackets.ecss.defs import PackCacheInfo
 from spacepackets.ecss.tc import generate_crc, generate_packet_crc, InvalidTcCrc16
 
 
@@ -191,3 +198,111 @@ class TestTelecommand(TestCase):
         self.assertTrue(pus_17_telecommand.seq_count == 25)
         self.assertTrue(pus_17_telecommand.service == 17)
         self.assertEqual(pus_17_telecommand.subservice, 1)
+
+    def test_pack_into(self):
+        tc = PusTelecommand(
+            service=17, subservice=1, seq_count=0x34, apid=0x02, app_data=bytes(4)
+        )
+        self.assertEqual(tc.packed_len(), len(tc.pack()))
+        buf = bytearray(tc.packed_len() + 4)
+        self.assertEqual(tc.pack_into(buf, 4), tc.packed_len())
+        self.assertEqual(buf[:4], bytes(4))
+        self.assertEqual(buf[4:], tc.pack())
+        self.assertTrue(check_pus_crc(buf[4:]))
+        with self.assertRaises(BytesTooShortError):
+            tc.pack_into(buf, 5)
+
+    def test_pack_cache(self):
+        tc = PusTelecommand(service=17, subservice=1, seq_count=1, apid=0x02)
+        raw = tc.pack()
+        self.assertEqual(tc.pack(), raw)
+        self.assertEqual(tc.pack_cache_info(), PackCacheInfo(hits=1, misses=1))
+        # Returned buffers are copies of the cache.
+        raw[0] = 0
+        self.assertEqual(tc.pack()[0], 0x18)
+        tc.seq_count = 2
+        self.assertEqual(tc.pack(), PusTelecommand.unpack(tc.pack()).pack())
+        self.assertEqual(tc.pack()[3], 2)
+        tc.sp_header.apid = 0x03
+        self.assertEqual(tc.pack()[1], 0x03)
+        tc.pus_tc_sec_header.subservice = 2
+        self.assertEqual(tc.pack()[8], 2)
+        self.assertEqual(tc.pack_cache_info().misses, 4)
+        self.assertTrue(check_pus_crc(tc.pack()))
+
+    def test_pack_cache_replaced_components(self):
+        tc = PusTelecommand(service=17, subservice=1, seq_count=1, apid=0x02)
+        tc.pack()
+        tc.sp_header.psc = PacketSeqCtrl(SequenceFlags.UNSEGMENTED, 3)
+        self.assertEqual(tc.pack()[3], 3)
+        tc.sp_header = SpacePacketHeader(
+            PacketType.TC, apid=0x04, seq_count=1, data_len=6, sec_header_flag=True
+        )
+        self.assertEqual(tc.pack()[1], 0x04)
+        tc.pus_tc_sec_header = PusTcDataFieldHeader(service=17, subservice=3)
+        self.assertEqual(tc.pack()[8], 3)
+        self.assertEqual(tc.pack_cache_info(), PackCacheInfo(hits=0, misses=4))
+        self.assertTrue(check_pus_crc(tc.pack()))
+
+    def test_no_attribute_hooks(self):
+        # Unpacking writes many fields, so the changes are only tracked in property setters.
+        for cls in (
+            PacketId,
+            PacketSeqCtrl,
+            SpacePacketHeader,
+            PusTcDataFieldHeader,
+            PusTelecommand,
+        ):
+            self.assertIs(cls.__setattr__, object.__setattr__)
+
+    def test_pack_cache_mutable_app_data(self):
+        app_data = bytearray([1, 2, 3])
+        tc = PusTelecommand(service=17, subservice=1, app_data=app_data)
+        tc.pack()
+        app_data[0] = 4
+        raw = tc.pack()
+        self.assertEqual(raw[11], 4)
+        self.assertTrue(check_pus_crc(raw))
+        self.assertEqual(tc.pack_cache_info(), PackCacheInfo(hits=0, misses=2))
+
+    def test_template(self):
+        template_tc = PusTelecommand(
+            service=8, subservice=128, apid=0x05, source_id=3, app_data=bytes(20)
+        )
+        template = PusTcTemplate(template_tc)
+        self.assertEqual(template.raw, template_tc.pack())
+        self.assertEqual(template.app_data_len, 20)
+        self.assertEqual(template.create(), template_tc.pack())
+        for seq_count in (0, 1, 0x155, 0x3FFF):
+            app_data = bytearray(20)
+            app_data[4:7] = bytes([seq_count & 0xFF, 2, 3])
+            app_data[18:20] = bytes([0xFF, 0xEE])
+            expected = PusTelecommand(
+                service=8,
+                subservice=128,
+                apid=0x05,
+                seq_count=seq_count,
+                source_id=seq_count,
+                app_data=app_data,
+            ).pack()
+            tc_raw = template.create(
+                seq_count=seq_count,
+                source_id=seq_count,
+                app_data_patches={
+                    4: bytes([seq_count & 0xFF, 2, 3]),
+                    18: bytes([0xFF, 0xEE]),
+                },
+            )
+            self.assertEqual(tc_raw, expected)
+            self.assertTrue(check_pus_crc(tc_raw))
+        # The template itself is not modified.
+        self.assertEqual(template.raw, template_tc.pack())
+
+    def test_template_invalid_params(self):
+        template = PusTcTemplate(PusTelecommand(17, 1, app_data=bytes(4)))
+        with self.assertRaises(ValueError):
+            template.create(seq_count=pow(2, 14))
+        with self.assertRaises(ValueError):
+            template.create(source_id=-1)
+        with self.assertRaises(ValueError):
+            template.create(app_data_patches={3: bytes(2)})
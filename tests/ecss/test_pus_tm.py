@@ -12,8 +12,10 @@ from spacepackets.ccsds.spacepacket import (
     SequenceFlags,
     SpacePacketHeader,
 )
+from spacepackets import BytesTooShortError
 from spacepackets.ecss import check_pus_crc
 from spacepackets.ecss.conf import set_default_tm_apid
+from spacepackets.ecss.defs import PackCacheInfo
 from spacepackets.util import PrintFormats, get_printable_data_string
 from spacepackets.ecss.tm import (
     PusTelemetry,
@@ -21,6 +23,7 @@ from spacepackets.ecss.tm import (
     PusVersion,
     PusTmSecondaryHeader,
     InvalidTmCrc16,
+    LazyPusTelemetry,
 )
 from spacepackets.ecss.pus_1_verification import (
     RequestId,
@@ -316,3 +319,172 @@ class TestTelemetry(TestCase):
         self.assertEqual(unpack_req_id.tc_psc.raw(), tc_psc.raw())
         with self.assertRaises(ValueError):
             RequestId.unpack(bytes([0, 1, 2]))
+
+    def test_pack_into(self):
+        self.assertEqual(self.ping_reply.packed_len(), len(self.ping_reply_raw))
+        buf = bytearray(self.ping_reply.packed_len() + 2)
+        written = self.ping_reply.pack_into(memoryview(buf), 2)
+        self.assertEqual(written, len(self.ping_reply_raw))
+        self.assertEqual(buf[2:], self.ping_reply_raw)
+        with self.assertRaises(BytesTooShortError):
+            self.ping_reply.pack_into(buf, 3)
+
+    def test_sec_header_stamp_len_mismatch(self):
+        sec_header = PusTmSecondaryHeader(17, 2, self.time_stamp_provider, 0)
+        self.time_stamp_provider.pack.return_value = bytes(6)
+        with self.assertRaises(ValueError):
+            sec_header.pack_into(bytearray(sec_header.header_size))
+
+    def test_sec_header_slots(self):
+        sec_header = self.ping_reply.pus_tm_sec_header
+        self.assertFalse(hasattr(sec_header, "__dict__"))
+        with self.assertRaises(AttributeError):
+            sec_header.invalid_attribute = 0
+        req_id = RequestId.empty()
+        self.assertFalse(hasattr(req_id, "__dict__"))
+
+    def test_no_attribute_hooks(self):
+        for cls in (PusTmSecondaryHeader, PusTelemetry):
+            self.assertIs(cls.__setattr__, object.__setattr__)
+
+    def test_pack_cache_replaced_components(self):
+        self.ping_reply.tm_data = bytes(2)
+        self.ping_reply.pack()
+        self.ping_reply.pus_tm_sec_header.time_provider = CdsShortTimestamp(1, 2)
+        self.assertEqual(self.ping_reply.pack()[14:16], bytes([0, 1]))
+        self.ping_reply.space_packet_header.psc = PacketSeqCtrl(
+            SequenceFlags.UNSEGMENTED, 3
+        )
+        self.assertEqual(self.ping_reply.pack()[3], 3)
+        self.ping_reply.pus_tm_sec_header = PusTmSecondaryHeader(
+            17, 3, CdsShortTimestamp(1, 2), 0
+        )
+        raw = self.ping_reply.pack()
+        self.assertEqual(raw[8], 3)
+        self.assertTrue(check_pus_crc(raw))
+        self.assertEqual(self.ping_reply.pack(), raw)
+        self.assertEqual(self.ping_reply.pack_cache_info(), PackCacheInfo(1, 5))
+
+    def test_pack_cache(self):
+        # Mutable source data can change without notice and is always packed again.
+        self.assertEqual(self.ping_reply.pack(), self.ping_reply_raw)
+        self.assertEqual(self.ping_reply.pack_cache_info(), PackCacheInfo(0, 2))
+        self.ping_reply.tm_data = bytes()
+        self.assertEqual(self.ping_reply.pack(), self.ping_reply_raw)
+        self.assertEqual(self.ping_reply.pack(), self.ping_reply_raw)
+        self.assertEqual(self.ping_reply.pack_cache_info(), PackCacheInfo(1, 3))
+        self.ping_reply.tm_data = bytes([1, 2])
+        raw = self.ping_reply.pack()
+        self.assertEqual(raw[20:22], bytes([1, 2]))
+        self.assertTrue(check_pus_crc(raw))
+        self.ping_reply.pus_tm_sec_header.message_counter = 5
+        self.assertEqual(self.ping_reply.pack()[10], 5)
+        self.assertEqual(self.ping_reply.pack_cache_info(), PackCacheInfo(1, 5))
+
+    def test_pack_cache_time_change(self):
+        stamp = CdsShortTimestamp(ccsds_days=1, ms_of_day=2)
+        tm = PusTelemetry(service=17, subservice=2, time_provider=stamp)
+        first = tm.pack()
+        stamp.read_from_raw(CdsShortTimestamp(ccsds_days=3, ms_of_day=4).pack())
+        second = tm.pack()
+        self.assertNotEqual(first, second)
+        self.assertEqual(PusTelemetry.unpack(second, stamp).time_provider, stamp)
+        self.assertEqual(tm.pack_cache_info().misses, 2)
+
+    def test_pack_cache_untracked_time_provider(self):
+        tm = PusTelemetry(17, 2, self.time_stamp_provider, source_data=bytes(2))
+        first = tm.pack()
+        self.assertEqual(tm.pack(), first)
+        self.assertEqual(tm.pack_cache_info(), PackCacheInfo(1, 1))
+        self.time_stamp_provider.pack.return_value = bytes(7)
+        self.assertEqual(tm.pack()[12:19], bytes(7))
+        self.assertEqual(tm.pack_cache_info(), PackCacheInfo(1, 2))
+
+    def test_unpack_does_not_share_time_reader(self):
+        time_reader = CdsShortTimestamp.empty()
+        raw_tms = [
+            PusTelemetry(
+                service=17,
+                subservice=2,
+                time_provider=CdsShortTimestamp(ccsds_days=days, ms_of_day=5),
+            ).pack()
+            for days in (1, 2)
+        ]
+        first, second = (PusTelemetry.unpack(raw, time_reader) for raw in raw_tms)
+        self.assertEqual(first.time_provider.ccsds_days, 1)
+        self.assertEqual(second.time_provider.ccsds_days, 2)
+        self.assertEqual(time_reader.ccsds_days, 0)
+
+
+class TestLazyTelemetry(TestCase):
+    def setUp(self) -> None:
+        self.stamp = CdsShortTimestamp(ccsds_days=0x1234, ms_of_day=0x5678)
+        self.tm = PusTelemetry(
+            service=3,
+            subservice=25,
+            apid=0x123,
+            seq_count=0x234,
+            message_counter=0x42,
+            source_data=bytes([1, 2, 3, 4]),
+            time_provider=self.stamp,
+        )
+        self.tm_raw = self.tm.pack()
+
+    def test_lazy_fields(self):
+        lazy_tm = LazyPusTelemetry(self.tm_raw + bytes(4), CdsShortTimestamp.empty())
+        self.assertEqual(lazy_tm.service, 3)
+        self.assertEqual(lazy_tm.subservice, 25)
+        self.assertEqual(lazy_tm.apid, 0x123)
+        self.assertEqual(lazy_tm.seq_count, 0x234)
+        self.assertEqual(lazy_tm.message_counter, 0x42)
+        self.assertEqual(lazy_tm.packet_len, len(self.tm_raw))
+        self.assertEqual(lazy_tm.pack(), self.tm_raw)
+        self.assertEqual(lazy_tm.sp_header, self.tm.sp_header)
+        self.assertEqual(lazy_tm.source_data, bytes([1, 2, 3, 4]))
+        self.assertEqual(lazy_tm.time_provider, self.stamp)
+        self.assertIs(lazy_tm.sp_header, lazy_tm.sp_header)
+        self.assertEqual(lazy_tm.crc16, self.tm.crc16)
+        self.assertTrue(lazy_tm.crc_valid)
+
+    def test_shared_time_reader(self):
+        other_raw = PusTelemetry(
+            service=3,
+            subservice=25,
+            time_provider=CdsShortTimestamp(ccsds_days=1, ms_of_day=2),
+        ).pack()
+        time_reader = CdsShortTimestamp.empty()
+        first = LazyPusTelemetry(self.tm_raw, time_reader)
+        second = LazyPusTelemetry(other_raw, time_reader)
+        self.assertEqual(first.time_provider, self.stamp)
+        self.assertEqual(second.time_provider.ccsds_days, 1)
+        self.assertEqual(first.time_provider, self.stamp)
+
+    def test_cds_time(self):
+        lazy_tm = LazyPusTelemetry(self.tm_raw, None)
+        self.assertEqual(lazy_tm.cds_time, self.stamp.as_time_value())
+
+    def test_deferred_crc_check(self):
+        self.tm_raw[-1] ^= 0xFF
+        lazy_tm = LazyPusTelemetry(self.tm_raw, CdsShortTimestamp.empty())
+        self.assertEqual(lazy_tm.service, 3)
+        self.assertFalse(lazy_tm.crc_valid)
+        with self.assertRaises(InvalidTmCrc16):
+            lazy_tm.check_crc()
+        with self.assertRaises(InvalidTmCrc16):
+            lazy_tm.to_pus_tm()
+
+    def test_to_pus_tm(self):
+        lazy_tm = LazyPusTelemetry(self.tm_raw, CdsShortTimestamp.empty())
+        pus_tm = lazy_tm.to_pus_tm()
+        self.assertEqual(pus_tm, self.tm)
+        self.assertEqual(pus_tm.pack(), self.tm_raw)
+        self.assertIsNot(pus_tm.sp_header, lazy_tm.sp_header)
+
+    def test_invalid_input(self):
+        with self.assertRaises(BytesTooShortError):
+            LazyPusTelemetry(self.tm_raw[:5], None)
+        with self.assertRaises(BytesTooShortError):
+            LazyPusTelemetry(self.tm_raw[:-1], CdsShortTimestamp.empty())
+        self.tm_raw[6] = 0x10
+        with self.assertRaises(ValueError):
+            LazyPusTelemetry(self.tm_raw, CdsShortTimestamp.empty())
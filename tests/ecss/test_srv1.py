@@ -3,7 +3,7 @@ from unittest import TestCase
 
 from spacepackets import SpacePacketHeader, PacketType
 from spacepackets.ccsds import CdsShortTimestamp
-from spacepackets.ecss import PusTelecommand, PacketFieldEnum, RequestId
+from spacepackets.ecss import PusTelecommand, PusTelemetry, PacketFieldEnum, RequestId
 from spacepackets.ecss.pus_1_verification import (
     Service1Tm,
     create_start_success_tm,
@@ -20,7 +20,9 @@ from spacepackets.ecss.pus_1_verification import (
     create_completion_failure_tm,
     ErrorCode,
     StepId,
+    Service1Batch,
 )
+from spacepackets.ecss.pus_verificator import PusVerificator, StatusField
 from tests.ecss.common import generic_time_provider_mock, TEST_STAMP
 
 
@@ -241,3 +243,93 @@ class Service1TmTest(TestCase):
             )
         if step_id is not None:
             self.assertEqual(srv_1_tm_unpacked.step_id.pack(), step_id.pack())
+
+
+class Service1BatchTest(TestCase):
+    def setUp(self) -> None:
+        self.stamp = CdsShortTimestamp.empty()
+        self.tc = PusTelecommand(service=17, subservice=1, apid=0x22, seq_count=5)
+        self.req_id = RequestId.from_pus_tc(self.tc).as_u32()
+        notice = FailureNotice(ErrorCode.with_byte_size(2, 0x1234), bytes([1, 2, 3]))
+        self.reports = [
+            create_acceptance_success_tm(self.tc, self.stamp).pack(),
+            create_start_failure_tm(self.tc, notice, self.stamp).pack(),
+            create_step_success_tm(
+                self.tc, StepId.with_byte_size(2, 0x0102), self.stamp
+            ).pack(),
+            create_step_failure_tm(
+                self.tc, StepId.with_byte_size(2, 3), notice, self.stamp
+            ).pack(),
+            create_completion_success_tm(self.tc, self.stamp).pack(),
+        ]
+        self.params = UnpackParams(self.stamp, bytes_step_id=2, bytes_err_code=2)
+
+    def _check_batch(self, batch):
+        self.assertEqual(len(batch), 5)
+        self.assertEqual(batch.num_invalid, 0)
+        self.assertEqual(batch.packet_index.tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(batch.subservice.tolist(), [1, 4, 5, 6, 7])
+        self.assertEqual(batch.req_id.tolist(), [self.req_id] * 5)
+        self.assertEqual(batch.step_id.tolist(), [0, 0, 0x0102, 3, 0])
+        self.assertEqual(batch.error_code.tolist(), [0, 0x1234, 0, 0x1234, 0])
+        self.assertEqual(batch.failure_data_len.tolist(), [0, 3, 0, 3, 0])
+
+    def test_from_packets(self):
+        batch = Service1Batch.from_packets(self.reports, self.params)
+        self._check_batch(batch)
+        for idx in (1, 3):
+            offset = batch.failure_data_offset[idx]
+            self.assertEqual(self.reports[idx][offset : offset + 3], bytes([1, 2, 3]))
+            unpacked = Service1Tm.unpack(self.reports[idx], self.params)
+            self.assertEqual(unpacked.error_code.val, batch.error_code[idx])
+
+    def test_column_types(self):
+        batch = Service1Batch.from_packets(self.reports, self.params)
+        for column in Service1Batch.COLUMNS:
+            itemsize = getattr(batch, column).itemsize
+            if column == "subservice":
+                self.assertEqual(itemsize, 1)
+            elif column == "failure_data_offset":
+                self.assertEqual(itemsize, 8)
+            else:
+                self.assertEqual(itemsize, 4)
+        with self.assertRaises(ValueError):
+            Service1Batch.from_packets(self.reports, UnpackParams(None, 8, 1))
+
+    def test_from_buffer(self):
+        buf = b"".join(self.reports) + bytes(3)
+        batch = Service1Batch.from_buffer(buf, self.params)
+        self._check_batch(batch)
+        offset = batch.failure_data_offset[3]
+        self.assertEqual(buf[offset : offset + 3], bytes([1, 2, 3]))
+
+    def test_invalid_packets(self):
+        corrupted = bytearray(self.reports[0])
+        corrupted[-1] ^= 0xFF
+        ping_reply = PusTelemetry(
+            service=17, subservice=2, time_provider=self.stamp
+        ).pack()
+        batch = Service1Batch.from_packets(
+            [corrupted, ping_reply, self.reports[4], bytes(3)], self.params
+        )
+        self.assertEqual(batch.num_invalid, 3)
+        self.assertEqual(batch.packet_index.tolist(), [2])
+        batch = Service1Batch.from_packets([corrupted], self.params, check_crc=False)
+        self.assertEqual(len(batch), 1)
+
+    def test_verificator_batch(self):
+        verificator = PusVerificator()
+        verificator.add_tc(self.tc)
+        other_tc = PusTelecommand(service=17, subservice=1, seq_count=6)
+        verificator.add_tc(other_tc)
+        batch = Service1Batch.from_packets(
+            [self.reports[0], self.reports[2], self.reports[4]], self.params
+        )
+        self.assertEqual(verificator.add_tm_batch(batch), 3)
+        status = verificator.get_status(self.req_id)
+        self.assertTrue(status.all_verifs_recvd is False)
+        self.assertEqual(status.accepted, StatusField.SUCCESS)
+        self.assertEqual(status.step_list, [0x0102])
+        self.assertEqual(status.completed, StatusField.SUCCESS)
+        self.assertEqual(verificator.counters.succeeded, 1)
+        self.assertEqual(verificator.counters.pending, 1)
@@ -0,0 +1,249 @@
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from spacepackets import BytesTooShortError
+from spacepackets.ccsds import CdsShortTimestamp
+from spacepackets.ecss import PusTelecommand, PusTelemetry
+from spacepackets.ecss.pus_15_tm_storage import (
+    DeleteUpTo,
+    RetrievalByTimeRange,
+    Subservice,
+    TmPacketStore,
+    cds_time_key,
+    create_delete_up_to_tc,
+    create_retrieval_by_time_range_tc,
+)
+
+
+def create_tm(ms_of_day: int, seq_count: int = 0, ccsds_days: int = 100) -> bytes:
+    return PusTelemetry(
+        service=3,
+        subservice=25,
+        time_provider=CdsShortTimestamp(ccsds_days, ms_of_day),
+        seq_count=seq_count,
+        source_data=bytes([seq_count & 0xFF] * 4),
+        apid=0x22,
+    ).pack()
+
+
+def stamp(ms_of_day: int, ccsds_days: int = 100) -> CdsShortTimestamp:
+    return CdsShortTimestamp(ccsds_days, ms_of_day)
+
+
+class TestService15Tcs(TestCase):
+    def test_time_key(self):
+        self.assertEqual(cds_time_key(stamp(5, ccsds_days=2)), 2 * 86_400_000 + 5)
+
+    def test_retrieval_tc(self):
+        tc = create_retrieval_by_time_range_tc(
+            b"TM01", stamp(1000), stamp(2000), apid=0x05, seq_count=3
+        )
+        self.assertEqual(tc.service, 15)
+        self.assertEqual(tc.subservice, Subservice.RETRIEVAL_BY_TIME_RANGE)
+        self.assertEqual(tc.apid, 0x05)
+        self.assertEqual(tc.seq_count, 3)
+        tc = PusTelecommand.unpack(tc.pack())
+        retrieval = RetrievalByTimeRange.unpack_app_data(tc.app_data, 4)
+        self.assertEqual(
+            retrieval, RetrievalByTimeRange(b"TM01", stamp(1000), stamp(2000))
+        )
+
+    def test_delete_tc(self):
+        tc = create_delete_up_to_tc(b"TM01", stamp(1000))
+        self.assertEqual(tc.subservice, Subservice.DELETE_UP_TO)
+        self.assertEqual(len(tc.app_data), 4 + 7)
+        delete = DeleteUpTo.unpack_app_data(tc.app_data, 4)
+        self.assertEqual(delete, DeleteUpTo(b"TM01", stamp(1000)))
+
+    def test_app_data_too_short(self):
+        with self.assertRaises(BytesTooShortError):
+            DeleteUpTo.unpack_app_data(bytes(10), 4)
+        with self.assertRaises(ValueError):
+            DeleteUpTo.unpack_app_data(bytes(11), 4)
+
+
+class TestTmPacketStore(TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "store"
+        # Appended out of order on purpose.
+        self.times = [1000, 3000, 2000, 2000, 5000, 4000]
+        self.packets = [create_tm(ms, idx) for idx, ms in enumerate(self.times)]
+
+    def tearDown(self) -> None:
+        self.tmp_dir.cleanup()
+
+    def fill(self, store: TmPacketStore):
+        for packet in self.packets:
+            store.append(packet)
+
+    def test_time_range(self):
+        with TmPacketStore(self.path) as store:
+            self.fill(store)
+            self.assertEqual(len(store), 6)
+            packets = store.packets_in_time_range(stamp(2000), stamp(4000))
+            self.assertEqual(
+                packets,
+                [self.packets[2], self.packets[3], self.packets[1], self.packets[5]],
+            )
+            self.assertTrue(packets[0].readonly)
+            self.assertEqual(store.packets_in_time_range(stamp(5001), stamp(6000)), [])
+            for packet in packets:
+                packet.release()
+
+    def test_append_after_retrieval(self):
+        with TmPacketStore(self.path) as store:
+            store.append(self.packets[0])
+            self.assertEqual(
+                store.packets_in_time_range(stamp(0), stamp(10000)), [self.packets[0]]
+            )
+            store.append(self.packets[1])
+            self.assertEqual(
+                store.packets_in_time_range(stamp(0), stamp(10000)),
+                [self.packets[0], self.packets[1]],
+            )
+
+    def test_segments(self):
+        segment_size = 2 * len(self.packets[0])
+        with TmPacketStore(self.path, segment_size=segment_size) as store:
+            self.fill(store)
+            self.assertEqual(len(list(self.path.glob("*.seg"))), 3)
+            self.assertEqual(
+                store.packets_in_time_range(stamp(0), stamp(10000)),
+                [self.packets[idx] for idx in (0, 2, 3, 1, 5, 4)],
+            )
+            # The first two segments only contain packets older than 3500 ms.
+            self.assertEqual(store.delete_up_to(stamp(3500)), 4)
+            self.assertEqual(len(list(self.path.glob("*.seg"))), 1)
+            self.assertEqual(len(store), 2)
+            self.assertEqual(
+                store.packets_in_time_range(stamp(0), stamp(10000)),
+                [self.packets[5], self.packets[4]],
+            )
+
+    def test_delete_up_to(self):
+        with TmPacketStore(self.path) as store:
+            self.fill(store)
+            self.assertEqual(store.delete_up_to(stamp(2000)), 1)
+            self.assertEqual(store.delete_up_to(stamp(1500)), 0)
+            self.assertEqual(store.delete_up_to(stamp(2001)), 2)
+            self.assertEqual(len(store), 3)
+            self.assertEqual(
+                store.packets_in_time_range(stamp(0), stamp(3000)), [self.packets[1]]
+            )
+            store.append(self.packets[2])
+            self.assertEqual(len(store), 4)
+
+    def test_reopen(self):
+        with TmPacketStore(self.path, segment_size=100) as store:
+            self.fill(store)
+            store.delete_up_to(stamp(2500))
+        with TmPacketStore(self.path, segment_size=100) as store:
+            self.assertEqual(len(store), 3)
+            self.assertEqual(
+                store.packets_in_time_range(stamp(0), stamp(10000)),
+                [self.packets[1], self.packets[5], self.packets[4]],
+            )
+            store.append(self.packets[0])
+            self.assertEqual(len(store), 4)
+
+    def test_reopen_incomplete_packet(self):
+        with TmPacketStore(self.path) as store:
+            self.fill(store)
+        segment = next(self.path.glob("*.seg"))
+        with open(segment, "ab") as file:
+            file.write(self.packets[0][:10])
+        with self.assertLogs("spacepackets", "WARNING"):
+            store = TmPacketStore(self.path)
+        with store:
+            self.assertEqual(len(store), 6)
+            store.append(self.packets[0])
+            self.assertEqual(
+                store.packets_in_time_range(stamp(1000), stamp(1000)),
+                [self.packets[0], self.packets[0]],
+            )
+        # The incomplete packet is kept and the new packet was stored in a new segment.
+        self.assertEqual(segment.stat().st_size, len(b"".join(self.packets)) + 10)
+        self.assertEqual(len(list(self.path.glob("*.seg"))), 2)
+
+    def test_truncate_torn_tail(self):
+        with TmPacketStore(self.path) as store:
+            self.fill(store)
+        segment = next(self.path.glob("*.seg"))
+        with open(segment, "ab") as file:
+            file.write(self.packets[0][:10])
+        with self.assertLogs("spacepackets", "WARNING"):
+            store = TmPacketStore(self.path, truncate_torn_tail=True)
+        with store:
+            store.append(self.packets[0])
+            self.assertEqual(len(store), 7)
+        self.assertEqual(segment.read_bytes(), b"".join(self.packets) + self.packets[0])
+
+    def test_segment_index(self):
+        with TmPacketStore(self.path, segment_size=100) as store:
+            self.fill(store)
+        self.assertEqual(
+            len(list(self.path.glob("*.idx"))), len(list(self.path.glob("*.seg")))
+        )
+        # The indexed packets are not read again, so changing their timestamp has no effect.
+        first_segment = self.path / "00000000.seg"
+        raw = bytearray(first_segment.read_bytes())
+        raw[: len(self.packets[0])] = create_tm(9000, 0)
+        first_segment.write_bytes(raw)
+        with TmPacketStore(self.path, segment_size=100) as store:
+            self.assertEqual(
+                len(store.packets_in_time_range(stamp(1000), stamp(1000))), 1
+            )
+            store.append(self.packets[0])
+        with TmPacketStore(self.path, segment_size=100) as store:
+            self.assertEqual(len(store), 7)
+            self.assertEqual(
+                len(store.packets_in_time_range(stamp(1000), stamp(1000))), 2
+            )
+        # Invalid index files are ignored.
+        for index_path in self.path.glob("*.idx"):
+            index_path.write_bytes(bytes(8))
+        with TmPacketStore(self.path, segment_size=100) as store:
+            self.assertEqual(len(store), 7)
+            self.assertEqual(
+                len(store.packets_in_time_range(stamp(9000), stamp(9000))), 1
+            )
+
+    def test_delete_segment_with_live_view(self):
+        segment_size = 2 * len(self.packets[0])
+        with TmPacketStore(self.path, segment_size=segment_size) as store:
+            self.fill(store)
+            (packet,) = store.packets_in_time_range(stamp(1000), stamp(1000))
+            store.delete_up_to(stamp(3500))
+            # The mapping of the first segment is still used by the packet view.
+            self.assertTrue((self.path / "00000000.seg").exists())
+            self.assertFalse((self.path / "00000001.seg").exists())
+            self.assertEqual(packet, self.packets[0])
+            packet.release()
+        self.assertFalse((self.path / "00000000.seg").exists())
+        self.assertFalse((self.path / "00000000.idx").exists())
+
+    def test_invalid_packets(self):
+        with TmPacketStore(self.path) as store:
+            with self.assertRaises(BytesTooShortError):
+                store.append(bytes(3))
+            with self.assertRaises(ValueError):
+                store.append(self.packets[0] + bytes(1))
+            self.assertEqual(len(store), 0)
+
+    def test_handle_tc(self):
+        with TmPacketStore(self.path, store_id=b"TM01") as store:
+            self.fill(store)
+            tc = create_retrieval_by_time_range_tc(b"TM01", stamp(4000), stamp(5000))
+            self.assertEqual(store.handle_tc(tc), [self.packets[5], self.packets[4]])
+            self.assertEqual(
+                store.handle_tc(create_delete_up_to_tc(b"TM01", stamp(5000))), []
+            )
+            self.assertEqual(len(store), 1)
+            with self.assertRaises(ValueError):
+                store.handle_tc(create_delete_up_to_tc(b"TM02", stamp(5000)))
+            with self.assertRaises(ValueError):
+                store.handle_tc(PusTelecommand(service=17, subservice=1))
+            with self.assertRaises(ValueError):
+                store.handle_tc(PusTelecommand(service=15, subservice=1))
@@ -0,0 +1,202 @@
+import struct
+from unittest import TestCase, skipIf
+
+from spacepackets import BytesTooShortError
+from spacepackets.ecss import PusTelemetry, PusTelecommand
+from spacepackets.ecss.fields import Ptc, PfcReal, PfcSigned, PfcUnsigned
+from spacepackets.ecss.pus_3_hk import (
+    HkParam,
+    HkReport,
+    HkReportDecoder,
+    HkStructure,
+    Subservice,
+)
+from tests.ecss.common import generic_time_provider_mock, TEST_STAMP
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+PARAMS = [
+    HkParam("mode", Ptc.ENUMERATED, 8),
+    HkParam("counter", Ptc.UNSIGNED, PfcUnsigned.FOUR_BYTES),
+    HkParam("offset", Ptc.SIGNED, PfcSigned.TWO_BYTES),
+    HkParam("ticks", Ptc.UNSIGNED, PfcUnsigned.SIX_BYTES),
+    HkParam("delta", Ptc.SIGNED, PfcSigned.THREE_BYTES),
+    HkParam("temp", Ptc.REAL, PfcReal.DOUBLE_PRECISION_IEEE),
+    HkParam("raw", Ptc.OCTET_STRING, 3),
+    HkParam("label", Ptc.CHARACTER_STRING, 4),
+]
+
+
+def pack_params(mode, counter, offset, ticks, delta, temp, raw, label) -> bytes:
+    return (
+        struct.pack("!BIh", mode, counter, offset)
+        + ticks.to_bytes(6, "big")
+        + delta.to_bytes(3, "big", signed=True)
+        + struct.pack("!d", temp)
+        + raw
+        + label
+    )
+
+
+class TestHkStructure(TestCase):
+    def setUp(self) -> None:
+        self.structure = HkStructure(1, PARAMS)
+        self.values = [
+            (1, 0xDEADBEEF, -2, 0x0102030405, -5, 21.5, bytes([1, 2, 3]), b"abcd"),
+            (2, 1, 300, 0xFFFFFFFFFFFF, 0x7FFFFF, -1.0, bytes(3), b"wxyz"),
+        ]
+
+    def test_size(self):
+        self.assertEqual(self.structure.size, 1 + 4 + 2 + 6 + 3 + 8 + 3 + 4)
+        self.assertEqual(self.structure.names, tuple(param.name for param in PARAMS))
+
+    def test_unpack(self):
+        for values in self.values:
+            record = self.structure.unpack(pack_params(*values))
+            self.assertEqual(tuple(record), values)
+        record = self.structure.unpack(pack_params(*self.values[0]))
+        self.assertEqual(record.counter, 0xDEADBEEF)
+        self.assertEqual(record.delta, -5)
+
+    def test_unpack_with_offset(self):
+        raw = bytes(3) + pack_params(*self.values[1])
+        self.assertEqual(tuple(self.structure.unpack(raw, 3)), self.values[1])
+
+    def test_unpack_too_short(self):
+        raw = pack_params(*self.values[0])
+        with self.assertRaises(BytesTooShortError):
+            self.structure.unpack(raw[:-1])
+
+    def test_unsupported_params(self):
+        for param in [
+            HkParam("a", Ptc.UNSIGNED, PfcUnsigned.TWELVE_BIT),
+            HkParam("a", Ptc.ENUMERATED, 12),
+            HkParam("a", Ptc.REAL, PfcReal.FLOAT_PRECISION_MIL_STD_4_OCTETS),
+            HkParam("a", Ptc.OCTET_STRING, 0),
+            HkParam("a", Ptc.ABSOLUTE_TIME, 0),
+        ]:
+            with self.assertRaises(ValueError):
+                HkStructure(1, [param])
+
+    def test_invalid_name(self):
+        with self.assertRaises(ValueError):
+            HkStructure(1, [HkParam("not valid", Ptc.UNSIGNED, PfcUnsigned.ONE_BYTE)])
+
+    @skipIf(np is None, "NumPy is not installed")
+    def test_unpack_columns(self):
+        blocks = [bytes(2) + pack_params(*values) for values in self.values]
+        columns = self.structure.unpack_columns(blocks, 2)
+        self.assertEqual(list(columns), list(self.structure.names))
+        for idx, param in enumerate(PARAMS):
+            column = columns[param.name]
+            self.assertEqual(len(column), 2)
+            self.assertTrue(column.dtype.isnative)
+            expected = [values[idx] for values in self.values]
+            if param.ptc == Ptc.OCTET_STRING:
+                self.assertEqual([bytes(row) for row in column], expected)
+            else:
+                self.assertEqual(column.tolist(), expected)
+
+    @skipIf(np is None, "NumPy is not installed")
+    def test_bit_fields(self):
+        structure = HkStructure(
+            3,
+            [
+                HkParam("valid", Ptc.BOOLEAN, 0),
+                HkParam("mode", Ptc.UNSIGNED, PfcUnsigned.THREE_BIT),
+                HkParam("bias", Ptc.SIGNED, PfcSigned.TWELVE_BIT),
+                HkParam("temp", Ptc.REAL, PfcReal.FLOAT_SIMPLE_PRECISION_IEEE),
+                HkParam("raw", Ptc.OCTET_STRING, 2),
+            ],
+        )
+        values = [(True, 5, -3, 0.5, bytes([1, 2])), (False, 0, 2047, -2.0, bytes(2))]
+        blocks = [structure.codec.pack(record) for record in values]
+        self.assertEqual(tuple(structure.unpack(blocks[0])), values[0])
+        columns = structure.unpack_columns(blocks)
+        self.assertEqual(columns["valid"].tolist(), [True, False])
+        self.assertEqual(columns["mode"].tolist(), [5, 0])
+        self.assertEqual(columns["bias"].tolist(), [-3, 2047])
+        self.assertEqual(columns["temp"].tolist(), [0.5, -2.0])
+        self.assertEqual(columns["raw"].tolist(), [[1, 2], [0, 0]])
+
+    @skipIf(np is None, "NumPy is not installed")
+    def test_unpack_columns_too_short(self):
+        with self.assertRaises(BytesTooShortError):
+            self.structure.unpack_columns([bytes(self.structure.size - 1)])
+
+
+class TestHkReportDecoder(TestCase):
+    def setUp(self) -> None:
+        self.first = HkStructure(1, [HkParam("x", Ptc.UNSIGNED, PfcUnsigned.TWO_BYTES)])
+        self.second = HkStructure(
+            0x10002,
+            [
+                HkParam("y", Ptc.SIGNED, PfcSigned.ONE_BYTE),
+                HkParam("z", Ptc.REAL, PfcReal.FLOAT_SIMPLE_PRECISION_IEEE),
+            ],
+        )
+        self.decoder = HkReportDecoder([self.first, self.second])
+
+    def test_unpack(self):
+        report = self.decoder.unpack(struct.pack("!IH", 1, 42))
+        self.assertEqual(report, HkReport(1, self.first.record_type(42)))
+        report = self.decoder.unpack(struct.pack("!Ibf", 0x10002, -1, 0.5))
+        self.assertEqual(report.sid, 0x10002)
+        self.assertEqual(report.params.y, -1)
+        self.assertEqual(report.params.z, 0.5)
+
+    def test_unknown_sid(self):
+        with self.assertRaises(ValueError):
+            self.decoder.unpack(struct.pack("!IH", 3, 42))
+        self.assertIsNone(self.decoder.get_structure(3))
+
+    def test_sid_too_short(self):
+        with self.assertRaises(BytesTooShortError):
+            self.decoder.unpack(bytes(3))
+
+    def test_sid_len(self):
+        decoder = HkReportDecoder([self.first], sid_len=1)
+        self.assertEqual(decoder.unpack(bytes([1, 0, 7])).params.x, 7)
+        with self.assertRaises(ValueError):
+            HkReportDecoder(sid_len=3)
+
+    def test_unpack_tm(self):
+        tm = PusTelemetry(
+            service=3,
+            subservice=Subservice.TM_HK_REPORT,
+            time_provider=generic_time_provider_mock(TEST_STAMP),
+            source_data=struct.pack("!IH", 1, 5),
+        )
+        self.assertEqual(self.decoder.unpack_tm(tm).params.x, 5)
+        tm.pus_tm_sec_header.subservice = Subservice.TM_HK_DEFINITIONS_REPORT
+        with self.assertRaises(ValueError):
+            self.decoder.unpack_tm(tm)
+
+    def test_unpack_tm_wrong_service(self):
+        tc = PusTelecommand(service=17, subservice=1)
+        tm = PusTelemetry(
+            service=17,
+            subservice=2,
+            time_provider=generic_time_provider_mock(TEST_STAMP),
+            source_data=tc.pack(),
+        )
+        with self.assertRaises(ValueError):
+            self.decoder.unpack_tm(tm)
+
+    @skipIf(np is None, "NumPy is not installed")
+    def test_unpack_batch(self):
+        reports = [
+            struct.pack("!IH", 1, 1),
+            struct.pack("!Ibf", 0x10002, 4, 1.5),
+            struct.pack("!IH", 1, 2),
+        ]
+        columns = self.decoder.unpack_batch(reports)
+        self.assertEqual(sorted(columns), [1, 0x10002])
+        self.assertEqual(columns[1]["x"].tolist(), [1, 2])
+        self.assertEqual(columns[0x10002]["y"].tolist(), [4])
+        self.assertEqual(columns[0x10002]["z"].tolist(), [1.5])
+        with self.assertRaises(ValueError):
+            self.decoder.unpack_batch([struct.pack("!IH", 3, 1)])
@@ -0,0 +1,169 @@
+import struct
+from unittest import TestCase
+
+from spacepackets import BytesTooShortError
+from spacepackets.ecss import PusTelemetry
+from spacepackets.ecss.pus_5_event import (
+    EventAggregator,
+    EventReport,
+    EventReportDecoder,
+    EventStats,
+    EventThresholds,
+    Severity,
+    Subservice,
+)
+from tests.ecss.common import generic_time_provider_mock, TEST_STAMP
+
+
+class TestEventReportDecoder(TestCase):
+    def setUp(self) -> None:
+        self.decoder = EventReportDecoder(event_id_len=4)
+
+    def test_severity(self):
+        self.assertEqual(
+            Severity.from_subservice(Subservice.TM_HIGH_SEVERITY_EVENT), Severity.HIGH
+        )
+        self.assertEqual(Severity.INFO.subservice, Subservice.TM_INFO_EVENT)
+        with self.assertRaises(ValueError):
+            Severity.from_subservice(Subservice.TC_ENABLE_EVENT_REPORTING)
+
+    def test_unpack(self):
+        report = self.decoder.unpack(
+            Subservice.TM_MEDIUM_SEVERITY_EVENT, struct.pack("!I", 0x10203) + bytes(3)
+        )
+        self.assertEqual(report, EventReport(Severity.MEDIUM, 0x10203, bytes(3)))
+
+    def test_unpack_no_aux_data(self):
+        report = self.decoder.unpack(Subservice.TM_INFO_EVENT, struct.pack("!I", 7))
+        self.assertEqual(report.aux_data, bytes())
+
+    def test_unpack_too_short(self):
+        with self.assertRaises(BytesTooShortError):
+            self.decoder.unpack(Subservice.TM_INFO_EVENT, bytes(3))
+
+    def test_invalid_event_id_len(self):
+        with self.assertRaises(ValueError):
+            EventReportDecoder(event_id_len=3)
+
+    def test_unpack_tm(self):
+        tm = PusTelemetry(
+            service=5,
+            subservice=Subservice.TM_LOW_SEVERITY_EVENT,
+            time_provider=generic_time_provider_mock(TEST_STAMP),
+            source_data=struct.pack("!I", 12) + bytes([1, 2]),
+        )
+        report = self.decoder.unpack_tm(tm)
+        self.assertEqual(report, EventReport(Severity.LOW, 12, bytes([1, 2])))
+        tm = PusTelemetry(
+            service=3,
+            subservice=25,
+            time_provider=generic_time_provider_mock(TEST_STAMP),
+            source_data=bytes(4),
+        )
+        with self.assertRaises(ValueError):
+            self.decoder.unpack_tm(tm)
+
+
+class TestEventAggregator(TestCase):
+    def setUp(self) -> None:
+        self.now = 0.0
+        self.aggregator = EventAggregator(
+            window=10.0, num_buckets=10, clock=lambda: self.now
+        )
+        self.report = EventReport(Severity.HIGH, 5, bytes([1]))
+
+    def test_sliding_window(self):
+        for now in range(5):
+            self.assertEqual(
+                self.aggregator.add(self.report, float(now)).count, now + 1
+            )
+        self.assertEqual(self.aggregator.count(5, Severity.HIGH, 9.5), 5)
+        self.assertEqual(self.aggregator.count(5, Severity.HIGH, 10.5), 4)
+        self.assertEqual(self.aggregator.count(5, Severity.HIGH, 13.5), 1)
+        self.assertEqual(self.aggregator.count(5, Severity.HIGH, 14.5), 0)
+        self.assertEqual(self.aggregator.add(self.report, 15.0).count, 1)
+
+    def test_window_expires_completely(self):
+        self.aggregator.add(self.report, 1.0)
+        self.aggregator.add(self.report, 2.0)
+        self.assertEqual(self.aggregator.add(self.report, 100.0).count, 1)
+
+    def test_separate_slots(self):
+        self.aggregator.add(self.report, 0.0)
+        self.aggregator.add(self.report._replace(severity=Severity.LOW), 0.0)
+        self.aggregator.add(self.report._replace(event_id=6), 0.0)
+        self.aggregator.add(self.report, 0.0)
+        self.assertEqual(len(self.aggregator), 3)
+        self.assertEqual(self.aggregator.count(5, Severity.HIGH, 0.0), 2)
+        self.assertEqual(self.aggregator.count(5, Severity.LOW, 0.0), 1)
+        self.assertEqual(self.aggregator.count(7, Severity.LOW, 0.0), 0)
+
+    def test_clock(self):
+        self.now = 3.0
+        self.aggregator.add(self.report)
+        self.now = 20.0
+        self.assertEqual(self.aggregator.count(5, Severity.HIGH), 0)
+
+    def test_dedup(self):
+        aggregator = EventAggregator(window=10.0, dedup_interval=2.0)
+        results = [aggregator.add(self.report, now) for now in (0.0, 0.5, 1.0, 2.5)]
+        self.assertEqual(
+            [result.forwarded for result in results], [True, False, False, True]
+        )
+        self.assertEqual(results[3].suppressed, 2)
+        self.assertEqual(results[3].count, 4)
+        # Other auxiliary data is always forwarded.
+        result = aggregator.add(self.report._replace(aux_data=bytes([2])), 2.6)
+        self.assertTrue(result.forwarded)
+        self.assertEqual(result.suppressed, 0)
+
+    def test_no_dedup_by_default(self):
+        self.assertTrue(self.aggregator.add(self.report, 0.0).forwarded)
+        self.assertTrue(self.aggregator.add(self.report, 0.0).forwarded)
+
+    def test_add_many(self):
+        aggregator = EventAggregator(window=10.0, dedup_interval=1.0)
+        other = self.report._replace(event_id=6)
+        forwarded = aggregator.add_many([self.report, other, self.report, other], 0.0)
+        self.assertEqual(forwarded, [self.report, other])
+
+    def test_thresholds(self):
+        thresholds = EventThresholds(
+            default=3, per_severity={Severity.HIGH: 1}, per_event_id={6: 2}
+        )
+        self.assertEqual(thresholds.limit(5, Severity.LOW), 3)
+        self.assertEqual(thresholds.limit(5, Severity.HIGH), 1)
+        self.assertEqual(thresholds.limit(6, Severity.HIGH), 2)
+        aggregator = EventAggregator(window=10.0, thresholds=thresholds)
+        crossed = [aggregator.add(self.report, 0.0).threshold_crossed for _ in range(3)]
+        self.assertEqual(crossed, [False, True, False])
+        other = self.report._replace(event_id=6)
+        crossed = [aggregator.add(other, 0.0).threshold_crossed for _ in range(4)]
+        self.assertEqual(crossed, [False, False, True, False])
+        # The threshold can be crossed again after the window slided.
+        self.assertFalse(aggregator.add(self.report, 20.0).threshold_crossed)
+        self.assertTrue(aggregator.add(self.report, 20.0).threshold_crossed)
+
+    def test_custom_thresholds(self):
+        class OnlyHigh(EventThresholds):
+            def limit(self, event_id, severity):
+                return 0 if severity == Severity.HIGH else None
+
+        aggregator = EventAggregator(thresholds=OnlyHigh())
+        self.assertTrue(aggregator.add(self.report, 0.0).threshold_crossed)
+        low = self.report._replace(severity=Severity.LOW)
+        self.assertFalse(aggregator.add(low, 0.0).threshold_crossed)
+
+    def test_stats(self):
+        aggregator = EventAggregator(window=10.0, dedup_interval=1.0)
+        aggregator.add(self.report, 0.0)
+        aggregator.add(self.report, 0.1)
+        aggregator.add(self.report, 11.0)
+        self.assertEqual(
+            aggregator.stats(11.0),
+            [EventStats(5, Severity.HIGH, count=1, total=3, suppressed=1)],
+        )
+
+    def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            EventAggregator(window=0.0)
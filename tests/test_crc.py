@@ -0,0 +1,116 @@
+import random
+from unittest import TestCase, skipIf
+
+from spacepackets.crc import (
+    CRC16_CCITT_FUNC,
+    Crc16Backend,
+    Crc16Ccitt,
+    crc16_ccitt,
+    crc16_ccitt_advance_tables,
+    crc16_ccitt_batch,
+    crc16_ccitt_python,
+    get_crc16_backend,
+    set_crc16_backend,
+    verify_crc16_batch,
+)
+from spacepackets.ecss import PusTelecommand, PusTelemetry
+from spacepackets.ccsds import CdsShortTimestamp
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _random_bytes(rng: random.Random, length: int) -> bytes:
+    return bytes(rng.getrandbits(8) for _ in range(length))
+
+
+class TestCrc(TestCase):
+    def setUp(self) -> None:
+        rng = random.Random(0)
+        self.buffers = [_random_bytes(rng, length) for length in range(0, 70)]
+        self.buffers.append(_random_bytes(rng, 1000))
+
+    def tearDown(self) -> None:
+        set_crc16_backend(Crc16Backend.CRCMOD)
+
+    def test_python_backend(self):
+        for buf in self.buffers:
+            self.assertEqual(crc16_ccitt_python(buf), CRC16_CCITT_FUNC(buf))
+            self.assertEqual(
+                crc16_ccitt_python(memoryview(buf), 0x1234),
+                CRC16_CCITT_FUNC(buf, 0x1234),
+            )
+
+    def test_memoryview_input(self):
+        buf = bytearray(b"xx123456789yy")
+        self.assertEqual(crc16_ccitt(memoryview(buf)[2:11]), 0x29B1)
+
+    def test_select_backend(self):
+        self.assertEqual(get_crc16_backend(), Crc16Backend.CRCMOD)
+        set_crc16_backend(Crc16Backend.PYTHON)
+        self.assertEqual(get_crc16_backend(), Crc16Backend.PYTHON)
+        self.assertEqual(crc16_ccitt(b"123456789"), 0x29B1)
+        tc = PusTelecommand(service=17, subservice=1, app_data=bytes(12))
+        self.assertEqual(PusTelecommand.unpack(tc.pack()), tc)
+
+    def test_advance_tables(self):
+        for num_bytes in (0, 1, 7, 300, 70000):
+            high_table, low_table = crc16_ccitt_advance_tables(num_bytes)
+            for crc in (0x0001, 0x8000, 0x1234, 0xFFFF):
+                self.assertEqual(
+                    high_table[crc >> 8] ^ low_table[crc & 0xFF],
+                    CRC16_CCITT_FUNC(bytes(num_bytes), crc),
+                )
+
+    def test_incremental(self):
+        buf = self.buffers[-1]
+        crc = Crc16Ccitt(buf[:10])
+        crc_copy = crc.copy()
+        crc.update(buf[10:500]).update(memoryview(buf)[500:])
+        self.assertEqual(crc.value, CRC16_CCITT_FUNC(buf))
+        self.assertEqual(crc.digest(), CRC16_CCITT_FUNC(buf).to_bytes(2, "big"))
+        self.assertEqual(crc_copy.value, CRC16_CCITT_FUNC(buf[:10]))
+        python_crc = Crc16Ccitt(buf, backend=Crc16Backend.PYTHON)
+        self.assertEqual(python_crc.value, crc.value)
+
+    def test_batch(self):
+        expected = [CRC16_CCITT_FUNC(buf) for buf in self.buffers]
+        self.assertEqual(crc16_ccitt_batch(self.buffers), expected)
+        self.assertEqual(
+            crc16_ccitt_batch(self.buffers, backend=Crc16Backend.PYTHON), expected
+        )
+
+    def test_verify_batch(self):
+        packets = [
+            PusTelemetry(
+                service=3,
+                subservice=25,
+                seq_count=idx,
+                source_data=bytes(idx),
+                time_provider=CdsShortTimestamp.empty(),
+            ).pack()
+            for idx in range(8)
+        ]
+        packets[3][-1] ^= 0x01
+        expected = [idx != 3 for idx in range(8)]
+        for backend in (Crc16Backend.CRCMOD, Crc16Backend.PYTHON):
+            self.assertEqual(verify_crc16_batch(packets, backend), expected)
+
+    @skipIf(np is None, "NumPy is not installed")
+    def test_numpy_backend(self):
+        expected = [CRC16_CCITT_FUNC(buf) for buf in self.buffers]
+        self.assertEqual(
+            crc16_ccitt_batch(self.buffers, backend=Crc16Backend.NUMPY), expected
+        )
+        self.assertEqual(
+            crc16_ccitt_batch(
+                np.frombuffer(self.buffers[40] * 5, dtype=np.uint8).reshape(5, 40),
+                backend=Crc16Backend.NUMPY,
+            ),
+            [CRC16_CCITT_FUNC(self.buffers[40])] * 5,
+        )
+        set_crc16_backend(Crc16Backend.NUMPY)
+        self.assertEqual(crc16_ccitt(self.buffers[-1]), expected[-1])
+        self.assertEqual(Crc16Ccitt(self.buffers[-1]).value, expected[-1])
@@ -20,7 +20,9 @@ from spacepackets.ecss.pus_1_verification import (
 from spacepackets.ecss.pus_verificator import (
     PusVerificator,
     StatusField,
+    VerifCounters,
     VerificationStatus,
+    VerifStep,
 )
 
 
@@ -198,6 +200,102 @@ class TestPusVerificator(TestCase):
             StatusField.UNSET,
         )
 
+    def test_counters(self):
+        self._regular_success_seq(
+            SuccessSet(PusTelecommand(service=17, subservice=1, seq_count=0))
+        )
+        notice = FailureNotice(ErrorCode.with_byte_size(1, 8), data=bytes([0, 1]))
+        fail_set = FailureSet(
+            PusTelecommand(service=17, subservice=1, seq_count=1), notice
+        )
+        self.pus_verificator.add_tc(fail_set.pus_tc)
+        self.assertEqual(self.pus_verificator.counters, VerifCounters(1, 1, 0, 0))
+        self.pus_verificator.add_tm(fail_set.acc_fail_tm)
+        self.assertEqual(self.pus_verificator.counters, VerifCounters(0, 1, 1, 0))
+        self.assertEqual(len(self.pus_verificator), 2)
+
+    def test_get_status(self):
+        suc_set = SuccessSet(PusTelecommand(service=17, subservice=1))
+        self.assertIsNone(self.pus_verificator.get_status(suc_set.req_id))
+        self.pus_verificator.add_tc(suc_set.pus_tc)
+        self.pus_verificator.add_tm(suc_set.acc_suc_tm)
+        status = self.pus_verificator.get_status(suc_set.req_id)
+        self.assertEqual(status.accepted, StatusField.SUCCESS)
+        self.assertIs(self.pus_verificator.get_status(suc_set.req_id.as_u32()), status)
+        self.assertTrue(self.pus_verificator.remove_entry(suc_set.req_id.as_u32()))
+        self.assertEqual(self.pus_verificator.counters.pending, 0)
+
+    def test_auto_remove_completed(self):
+        self.pus_verificator = PusVerificator(auto_remove_completed=True)
+        suc_set = SuccessSet(PusTelecommand(service=17, subservice=1))
+        self._regular_success_seq(suc_set)
+        self.assertEqual(len(self.pus_verificator), 0)
+        self.assertEqual(self.pus_verificator.counters, VerifCounters(0, 1, 0, 0))
+        # The request ID can be reused after the TC was removed.
+        self.assertTrue(self.pus_verificator.add_tc(suc_set.pus_tc))
+
+    def test_timeouts(self):
+        now = 0.0
+        self.pus_verificator = PusVerificator(timeout=10.0, clock=lambda: now)
+        sets = [
+            SuccessSet(PusTelecommand(service=17, subservice=1, seq_count=idx))
+            for idx in range(4)
+        ]
+        for suc_set in sets:
+            self.pus_verificator.add_tc(suc_set.pus_tc)
+        self.pus_verificator.add_tm(sets[1].acc_suc_tm)
+        self.pus_verificator.add_tm(sets[2].acc_suc_tm)
+        self.pus_verificator.add_tm(sets[2].sta_suc_tm)
+        self.pus_verificator.add_tm(sets[3].acc_suc_tm)
+        self.pus_verificator.add_tm(sets[3].fin_suc_tm)
+        self.assertEqual(self.pus_verificator.check_timeouts(), [])
+        now = 5.0
+        late_set = SuccessSet(PusTelecommand(service=17, subservice=1, seq_count=4))
+        self.pus_verificator.add_tc(late_set.pus_tc)
+        timeouts = self.pus_verificator.check_timeouts(now=10.0)
+        self.assertEqual(
+            [(timeout.req_id, timeout.step) for timeout in timeouts],
+            [
+                (sets[0].req_id, VerifStep.ACCEPTANCE),
+                (sets[1].req_id, VerifStep.START),
+                (sets[2].req_id, VerifStep.COMPLETION),
+            ],
+        )
+        self.assertEqual(timeouts[1].status.accepted, StatusField.SUCCESS)
+        # The completed TC is removed without being reported.
+        self.assertEqual(len(self.pus_verificator), 1)
+        self.assertEqual(self.pus_verificator.counters, VerifCounters(1, 1, 0, 3))
+        self.assertEqual(len(self.pus_verificator.check_timeouts(now=15.0)), 1)
+        self.assertEqual(len(self.pus_verificator), 0)
+
+    def test_verif_dict_is_live(self):
+        verif_dict = self.pus_verificator.verif_dict
+        suc_set = SuccessSet(PusTelecommand(service=17, subservice=1))
+        self.pus_verificator.add_tc(suc_set.pus_tc)
+        self.assertEqual(list(verif_dict), [suc_set.req_id])
+        self.assertIn(suc_set.req_id, verif_dict)
+        self.assertIs(
+            verif_dict[suc_set.req_id], self.pus_verificator.get_status(suc_set.req_id)
+        )
+        with self.assertRaises(TypeError):
+            verif_dict[suc_set.req_id] = VerificationStatus()
+        self.pus_verificator.remove_entry(suc_set.req_id)
+        self.assertEqual(len(verif_dict), 0)
+
+    def test_timeout_heap_is_compacted(self):
+        self.pus_verificator = PusVerificator(
+            auto_remove_completed=True, timeout=10.0, clock=lambda: 0.0
+        )
+        suc_set = SuccessSet(PusTelecommand(service=17, subservice=1))
+        for _ in range(100):
+            self._regular_success_seq(suc_set)
+        self.assertEqual(len(self.pus_verificator), 0)
+        self.assertLessEqual(len(self.pus_verificator._timeout_heap), 1)
+        # A re-added TC with the same request ID and deadline is not reported twice.
+        self.pus_verificator.add_tc(suc_set.pus_tc)
+        self.assertEqual(len(self.pus_verificator.check_timeouts(now=10.0)), 1)
+        self.assertEqual(self.pus_verificator.counters, VerifCounters(0, 100, 0, 1))
+
     def _regular_success_seq(self, suc_set: SuccessSet):
         self.assertTrue(self.pus_verificator.add_tc(suc_set.pus_tc))
         check_res = self.pus_verificator.add_tm(suc_set.acc_suc_tm)